@@ -22,7 +22,7 @@ from application.services import (
     get_backtest_summary,
 )
 from domain.analysis import SIGNAL_DIRECTION
-from infrastructure.database import get_session
+from infrastructure.database import get_read_session
 
 router = APIRouter()
 
@@ -35,7 +35,7 @@ router = APIRouter()
 @limiter.limit("30/minute")
 def get_backtest_summary_route(
     request: Request,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
 ) -> BacktestSummaryResponse:
     data = get_backtest_summary(session)
     return BacktestSummaryResponse(**data)
@@ -51,7 +51,7 @@ def get_backtest_signal_detail_route(
     request: Request,
     signal: str,
     limit: int = Query(default=50, ge=1, le=200),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
 ) -> BacktestDetailResponse:
     signal_upper = signal.upper()
     if signal_upper not in SIGNAL_DIRECTION:
@@ -75,7 +75,7 @@ def get_backfill_status_route() -> BackfillStatusResponse:
 @limiter.limit("30/minute")
 def export_backtest_csv_route(
     request: Request,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
 ) -> StreamingResponse:
     rows = get_backtest_all_occurrences(session)
     fieldnames = [
@@ -7,6 +7,7 @@ Routes:
   POST   /gurus                    — Add custom guru
   DELETE /gurus/{guru_id}          — Deactivate a guru
   POST   /gurus/sync               — Trigger 13F sync for all gurus
+  GET    /gurus/sync-status        — 13F sync / backfill progress
   POST   /gurus/{guru_id}/sync     — Trigger 13F sync for one guru
   GET    /gurus/{guru_id}/filing   — Latest filing summary
   GET    /gurus/{guru_id}/holdings — All holdings with actions
@@ -42,6 +43,7 @@ from api.schemas import (
     GuruResponse,
     GuruStyleLiteral,
     GuruSummaryItem,
+    GuruSyncStatusResponse,
     HeatmapResponse,
     QoQResponse,
     ResonanceEntryResponse,
@@ -71,6 +73,7 @@ from application.stock.filing_service import (
     get_filing_summary,
     get_grand_portfolio,
     get_guru_filing_history,
+    get_guru_sync_status,
     get_holding_changes,
     get_holding_qoq,
     sync_all_gurus,
@@ -229,6 +232,15 @@ def sync_all(
     )
 
 
+@router.get(
+    "/sync-status",
+    response_model=GuruSyncStatusResponse,
+    summary="13F sync / backfill progress",
+)
+def get_sync_status() -> GuruSyncStatusResponse:
+    return GuruSyncStatusResponse(**get_guru_sync_status())
+
+
 @router.post(
     "/{guru_id}/sync",
     response_model=SyncResponse,
@@ -6,7 +6,7 @@ API — 掃描路由（非同步 fire-and-forget）。
 
 import threading
 
-from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlmodel import Session
 
 from api.rate_limit import limiter
@@ -16,7 +16,9 @@ from api.schemas import (
     FearGreedComponent,
     FearGreedResponse,
     LastScanResponse,
+    MarketBreadthResponse,
     PrewarmStatusResponse,
+    ScanLogCompactionResponse,
     ScanStatusResponse,
     SignalActivityItem,
     VIXData,
@@ -29,6 +31,10 @@ from domain.constants import (
     ERROR_DIGEST_IN_PROGRESS,
     ERROR_SCAN_IN_PROGRESS,
     FG_COMPONENT_WEIGHTS,
+    MARKET_BREADTH_HISTORY_DAYS,
+    MARKET_BREADTH_HISTORY_MAX_DAYS,
+    SCAN_LOG_RETENTION_DAYS,
+    SCAN_LOG_RETENTION_MIN_DAYS,
 )
 from i18n import get_user_language, t
 from infrastructure.database import engine, get_session
@@ -134,6 +140,27 @@ def get_fear_greed(
     )
 
 
+@router.get(
+    "/market/breadth",
+    response_model=MarketBreadthResponse,
+    summary="Daily market-sentiment breadth history",
+)
+def get_market_breadth(
+    response: Response,
+    days: int = Query(
+        default=MARKET_BREADTH_HISTORY_DAYS, ge=1, le=MARKET_BREADTH_HISTORY_MAX_DAYS
+    ),
+    session: Session = Depends(get_session),
+) -> MarketBreadthResponse:
+    """取得風向球每日跌破 60MA 比例序列（歷史市場情緒圖）。"""
+    response.headers["Cache-Control"] = (
+        "private, max-age=300, stale-while-revalidate=3600"
+    )
+    return MarketBreadthResponse(
+        history=scan_service.get_market_breadth(session, days=days)
+    )
+
+
 @router.post(
     "/scan", response_model=AcceptedResponse, summary="Trigger background scan"
 )
@@ -170,6 +197,38 @@ async def run_scan_route(
     )
 
 
+@router.post(
+    "/scan/compact-logs",
+    response_model=ScanLogCompactionResponse,
+    summary="Compact raw scan logs older than the retention window",
+)
+@limiter.limit("5/minute")
+def compact_scan_logs_route(
+    request: Request,
+    retention_days: int = Query(
+        default=SCAN_LOG_RETENTION_DAYS, ge=SCAN_LOG_RETENTION_MIN_DAYS
+    ),
+    session: Session = Depends(get_session),
+) -> ScanLogCompactionResponse:
+    """
+    ScanLog 保留政策：刪除超過保留天數的原始掃描紀錄（訊號區段永久保留）。
+    與掃描共用 mutex，避免與掃描寫入同時持有 SQLite 寫入鎖。
+    """
+    if not _scan_lock.acquire(blocking=False):
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "error_code": ERROR_SCAN_IN_PROGRESS,
+                "detail": t("api.scan_in_progress", lang=get_user_language(session)),
+            },
+        )
+    try:
+        result = scan_service.compact_scan_logs(session, retention_days=retention_days)
+    finally:
+        _scan_lock.release()
+    return ScanLogCompactionResponse(**result)
+
+
 @router.post(
     "/digest", response_model=AcceptedResponse, summary="Trigger weekly digest"
 )
@@ -47,6 +47,7 @@ from api.schemas.guru import (  # noqa: F401
     GuruResponse,
     GuruStyleLiteral,
     GuruSummaryItem,
+    GuruSyncStatusResponse,
     QoQHoldingItem,
     QoQQuarterSnapshot,
     QoQResponse,
@@ -122,11 +123,14 @@ from api.schemas.scan import (  # noqa: F401
     FearGreedComponent,
     FearGreedResponse,
     LastScanResponse,
+    MarketBreadthPoint,
+    MarketBreadthResponse,
     MoatResponse,
     PrewarmStatusResponse,
     PriceAlertCreateRequest,
     PriceAlertResponse,
     PriceHistoryPoint,
+    ScanLogCompactionResponse,
     ScanLogResponse,
     ScanResponse,
     ScanResult,
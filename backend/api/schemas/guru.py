@@ -99,6 +99,16 @@ class SyncAllResponse(BaseModel):
     results: list[SyncResponse] = []
 
 
+class GuruSyncStatusResponse(BaseModel):
+    """GET /gurus/sync-status 回傳的 13F 同步 / 回填進度。"""
+
+    is_syncing: bool
+    total_gurus: int
+    completed_gurus: int
+    total_filings: int
+    completed_filings: int
+
+
 # ---------------------------------------------------------------------------
 # Response Schemas — Resonance
 # ---------------------------------------------------------------------------
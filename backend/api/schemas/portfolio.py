@@ -184,6 +184,8 @@ class RebalanceResponse(BaseModel):
     health_level: str = "healthy"  # "healthy" | "caution" | "alert"
     sector_exposure: list[SectorExposureItem] = []
     calculated_at: str = ""
+    data_as_of: str | None = None  # 最舊報價的取得時間（可能為背景刷新前的舊值）
+    data_age_seconds: int | None = None
 
 
 class XRayAlertResponse(BaseModel):
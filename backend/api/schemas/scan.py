@@ -123,6 +123,31 @@ class LastScanResponse(BaseModel):
     fear_greed_score: int | None = None
 
 
+class MarketBreadthPoint(BaseModel):
+    """單日市場寬度：風向球跌破 60MA 的檔數與比例。"""
+
+    date: str
+    below: int
+    valid: int
+    below_60ma_pct: float
+    status: str
+
+
+class MarketBreadthResponse(BaseModel):
+    """GET /market/breadth 回應。"""
+
+    history: list[MarketBreadthPoint] = []
+
+
+class ScanLogCompactionResponse(BaseModel):
+    """POST /scan/compact-logs 回應。"""
+
+    retention_days: int
+    cutoff: str
+    deleted: int
+    seeded_transitions: int
+
+
 class ScanStatusResponse(BaseModel):
     """GET /scan/status 回應。"""
 
@@ -11,7 +11,12 @@ from typing import TYPE_CHECKING, Any
 
 import yfinance as yf
 
-from domain.analysis import HoldingSnapshot, QuarterInput, compute_clone_returns
+from domain.analysis import (
+    HoldingSnapshot,
+    PriceSeries,
+    QuarterInput,
+    compute_clone_returns,
+)
 from domain.constants import GURU_BACKTEST_CACHE_TTL, GURU_BACKTEST_MAX_QUARTERS
 from domain.enums import HoldingAction
 from i18n import t
@@ -193,11 +198,11 @@ def _download_price_history(
     benchmark: str,
     start_date: date,
     end_date: date,
-) -> tuple[dict[str, list[dict]], list[dict]]:
+) -> tuple[dict[str, PriceSeries], PriceSeries]:
     all_tickers = [*tickers, benchmark]
     unique_tickers = sorted({ticker for ticker in all_tickers if ticker})
     if not unique_tickers:
-        return {}, []
+        return {}, PriceSeries.empty()
 
     try:
         history_df = yf.download(
@@ -211,9 +216,9 @@ def _download_price_history(
         )
     except Exception as exc:
         logger.warning("Guru backtest 批次下載歷史價格失敗：%s", exc)
-        return {}, []
+        return {}, PriceSeries.empty()
 
-    series_map: dict[str, list[dict]] = {}
+    series_map: dict[str, PriceSeries] = {}
     for ticker in unique_tickers:
         series_map[ticker] = _extract_close_series(history_df, ticker)
 
@@ -223,20 +228,20 @@ def _download_price_history(
             for ticker, series in series_map.items()
             if ticker != benchmark
         },
-        series_map.get(benchmark, []),
+        series_map.get(benchmark, PriceSeries.empty()),
     )
 
 
-def _extract_close_series(history_df: Any, ticker: str) -> list[dict]:
+def _extract_close_series(history_df: Any, ticker: str) -> PriceSeries:
     try:
         frame = history_df[ticker]
     except (KeyError, TypeError):
         frame = history_df
     except Exception:
-        return []
+        return PriceSeries.empty()
 
     if frame is None or getattr(frame, "empty", True):
-        return []
+        return PriceSeries.empty()
 
     close_series: Any
     if getattr(frame, "ndim", 0) == 1:
@@ -244,19 +249,13 @@ def _extract_close_series(history_df: Any, ticker: str) -> list[dict]:
         close_series = frame.dropna()
     else:
         if "Close" not in frame:
-            return []
+            return PriceSeries.empty()
         close_series = frame["Close"].dropna()
 
-    rows: list[dict] = []
-    for idx, value in close_series.items():
-        try:
-            rows.append(
-                {
-                    "date": idx.date().isoformat(),
-                    "close": round(float(value), 6),
-                }
-            )
-        except Exception:
-            continue
-    rows.sort(key=lambda row: row["date"])
-    return rows
+    try:
+        return PriceSeries.from_columns(
+            [idx.date() for idx in close_series.index],
+            close_series.round(6).tolist(),
+        )
+    except Exception:
+        return PriceSeries.empty()
@@ -11,7 +11,10 @@ from domain.constants import DEFAULT_USER_ID
 from domain.entities import FXWatchConfig
 from domain.fx_analysis import FXTimingResult, assess_exchange_timing
 from i18n import get_user_language, t
-from infrastructure.market_data import get_forex_history_long
+from infrastructure.market_data import (
+    get_forex_history_long,
+    prime_forex_history_batch,
+)
 from infrastructure.notification import (
     is_notification_enabled,
     is_within_rate_limit,
@@ -242,6 +245,8 @@ def check_fx_watches(session: Session, user_id: str = DEFAULT_USER_ID) -> list[d
         logger.info("無啟用中的外匯監控配置")
         return []
 
+    # 單次批次下載預熱所有貨幣對的匯率歷史（USD 樞紐推導交叉匯率），逐筆分析皆命中快取
+    prime_forex_history_batch((w.base_currency, w.quote_currency) for w in watches)
     results = []
     for watch in watches:
         try:
@@ -308,6 +313,8 @@ def send_fx_watch_alerts(session: Session, user_id: str = DEFAULT_USER_ID) -> di
             "alerts": [],
         }
 
+    # 單次批次下載預熱所有貨幣對的匯率歷史（USD 樞紐推導交叉匯率），逐筆分析皆命中快取
+    prime_forex_history_batch((w.base_currency, w.quote_currency) for w in watches)
     triggered_alerts: list[dict] = []
     now = datetime.now(UTC)
 
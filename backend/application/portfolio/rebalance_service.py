@@ -4,13 +4,14 @@ Application — Rebalance Service：再平衡分析、匯率曝險、X-Ray、FX
 
 import json as _json
 import threading
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
 
-from cachetools import TTLCache
 from sqlmodel import Session, select
 
 from application.stock.stock_service import StockNotFoundError
-from domain.analysis import compute_daily_change_pct
+from domain.analysis import compute_daily_change_pct, compute_data_age_seconds
 from domain.constants import (
     DEFAULT_USER_ID,
     EQUITY_CATEGORIES,
@@ -36,6 +37,7 @@ from i18n import get_user_language, t
 from infrastructure.market_data import (
     are_all_signals_in_l1,
     get_crypto_price,
+    get_crypto_prices_batch,
     get_etf_sector_weights,
     get_etf_top_holdings,
     get_exchange_rates,
@@ -43,11 +45,11 @@ from infrastructure.market_data import (
     get_forex_history_long,
     get_technical_signals,
     get_ticker_sector,
-    prewarm_crypto_prices,
     prewarm_etf_holdings_batch,
     prewarm_etf_sector_weights_batch,
     prewarm_signals_batch,
     prewarm_ticker_sector_batch,
+    prime_forex_history_batch,
 )
 from infrastructure.notification import (
     is_notification_enabled,
@@ -55,27 +57,27 @@ from infrastructure.notification import (
     send_telegram_message_dual,
 )
 from infrastructure.repositories import log_notification_sent
+from infrastructure.shared_cache import SharedCache
 from logging_config import get_logger
 
 logger = get_logger(__name__)
 
 # 再平衡計算結果的短效快取（key = (display_currency, lang)）。
-# 避免同一時間多個前端請求（Dashboard + Allocation + 快照觸發）重複執行完整計算。
-_rebalance_cache: TTLCache = TTLCache(
-    maxsize=REBALANCE_CACHE_MAXSIZE, ttl=REBALANCE_CACHE_TTL
+# 避免同一時間多個前端請求（Dashboard + Allocation + 快照觸發）重複執行完整計算；
+# 經主機共享層讓多個 uvicorn worker 共用同一份結果。
+_rebalance_cache = SharedCache(
+    "rebalance", maxsize=REBALANCE_CACHE_MAXSIZE, ttl=REBALANCE_CACHE_TTL
 )
-_rebalance_cache_lock = threading.Lock()
 
 # In-flight 去重：同一 cache_key 同時只允許一個計算在飛行中。
 # 第二個到達的請求等待第一個完成後直接讀快取，避免重複的 yfinance 呼叫。
 _rebalance_inflight_lock = threading.Lock()
-_rebalance_inflight_events: dict[tuple, threading.Event] = {}
+_rebalance_inflight_events: dict[str, threading.Event] = {}
 
 
 def invalidate_rebalance_cache() -> None:
-    """主動清除再平衡快取（持倉變動後呼叫）。"""
-    with _rebalance_cache_lock:
-        _rebalance_cache.clear()
+    """主動清除再平衡快取（持倉變動後呼叫；所有 worker 同時失效）。"""
+    _rebalance_cache.clear()
 
 
 # ===========================================================================
@@ -83,19 +85,119 @@ def invalidate_rebalance_cache() -> None:
 # ===========================================================================
 
 
+def _prewarm_stock_signals(tickers: list[str]) -> None:
+    """並行預熱股票技術訊號（全部已在 L1 時略過）。"""
+    if not tickers:
+        return
+    if are_all_signals_in_l1(tickers):
+        logger.debug("所有 %d 檔股票技術訊號已在 L1 快取，略過預熱。", len(tickers))
+        return
+    logger.info("並行預熱 %d 檔股票技術訊號...", len(tickers))
+    prewarm_signals_batch(tickers)
+
+
+def _resolve_crypto_quotes(crypto_holdings: dict[str, str | None]) -> dict[str, dict]:
+    """
+    以單次 CoinGecko 批次請求解析所有加密貨幣報價（{ticker: coingecko_id}）。
+    同一組 ID 於各端點共用同一個批次快取鍵；批次缺漏者才逐檔回退（yfinance）。
+    """
+    coin_ids = sorted({cid for cid in crypto_holdings.values() if cid})
+    batch = get_crypto_prices_batch(coin_ids) if coin_ids else {}
+
+    quotes: dict[str, dict] = {}
+    for ticker, coin_id in crypto_holdings.items():
+        crypto_data = batch.get(coin_id) if coin_id else None
+        if crypto_data is None:
+            crypto_data = get_crypto_price(None, ticker)
+        price = crypto_data.get("price_usd") if crypto_data else None
+        change_24h_pct = crypto_data.get("change_24h_pct") if crypto_data else None
+        previous_close = None
+        if (
+            isinstance(price, (int, float))
+            and isinstance(change_24h_pct, (int, float))
+            and (1 + change_24h_pct / 100) != 0
+        ):
+            previous_close = price / (1 + change_24h_pct / 100)
+        quotes[ticker] = {"price": price, "previous_close": previous_close}
+    return quotes
+
+
+def _resolve_holding_quotes(holdings: Sequence) -> dict[str, dict]:
+    """
+    估值管線第一階段：收集所有非現金持倉的 distinct ticker / CoinGecko ID，
+    一次批次解析報價（股票訊號並行預熱、加密貨幣單次批次請求，兩者同時進行）。
+    各端點（再平衡、匯率曝險、壓力測試、提款、快照）共用此階段與底層 TTL 快取，
+    同一 TTL 視窗內每檔標的最多解析一次。
+
+    回傳 {ticker: {"price": float | None, "previous_close": float | None}}。
+    """
+    stock_tickers = sorted(
+        {
+            h.ticker
+            for h in holdings
+            if not h.is_cash and h.category != StockCategory.CRYPTO
+        }
+    )
+    crypto_holdings: dict[str, str | None] = {}
+    for h in holdings:
+        if not h.is_cash and h.category == StockCategory.CRYPTO:
+            crypto_holdings.setdefault(h.ticker, getattr(h, "coingecko_id", None))
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        stock_future = executor.submit(_prewarm_stock_signals, stock_tickers)
+        crypto_future = executor.submit(_resolve_crypto_quotes, crypto_holdings)
+        stock_future.result()
+        quotes = crypto_future.result()
+
+    for ticker in stock_tickers:
+        signals = get_technical_signals(ticker)
+        quotes[ticker] = {
+            "price": signals.get("price") if signals else None,
+            "previous_close": signals.get("previous_close") if signals else None,
+            "fetched_at": signals.get("fetched_at") if signals else None,
+        }
+    return quotes
+
+
+def _oldest_quote_time(quotes: dict[str, dict]) -> str | None:
+    """回傳報價中最舊的取得時間（ISO 8601），供回應標示資料新鮮度；皆無時回傳 None。"""
+    now = datetime.now(UTC)
+    stamps = [q["fetched_at"] for q in quotes.values() if q.get("fetched_at")]
+    if not stamps:
+        return None
+    return max(stamps, key=lambda ts: compute_data_age_seconds(ts, now) or 0)
+
+
+def _with_fresh_timestamps(result: dict) -> dict:
+    """快取命中時更新 calculated_at 與資料年齡（data_as_of 不變）。"""
+    now = datetime.now(UTC)
+    return {
+        **result,
+        "calculated_at": now.isoformat(),
+        "data_age_seconds": compute_data_age_seconds(result.get("data_as_of"), now),
+    }
+
+
 def _compute_holding_market_values(
     holdings: list,
     fx_rates: dict[str, float],
+    quotes: dict[str, dict] | None = None,
 ) -> tuple[dict[str, float], dict[str, float], dict[str, dict]]:
     """
     共用邏輯：計算所有持倉的當前與前一交易日市值（已換算目標幣別）。
     回傳 (currency_values, cash_currency_values, ticker_agg)。
 
+    quotes 為 _resolve_holding_quotes() 的結果；未提供時先批次解析，
+    之後的彙總為純記憶體計算（不再逐筆呼叫外部服務）。
+
     - currency_values: {幣別: 總市值} — 全部持倉（當前）
     - cash_currency_values: {幣別: 現金市值} — 僅現金部位
     - ticker_agg: {ticker: {category, currency, qty, mv, prev_mv, cost_sum, cost_qty, price, fx}}
       其中 prev_mv 為前一交易日市值，用於日漲跌計算
     """
+    if quotes is None:
+        quotes = _resolve_holding_quotes(holdings)
+
     currency_values: dict[str, float] = {}
     cash_currency_values: dict[str, float] = {}
     ticker_agg: dict[str, dict] = {}
@@ -117,41 +219,11 @@ def _compute_holding_market_values(
             cash_currency_values[h.currency] = (
                 cash_currency_values.get(h.currency, 0.0) + market_value
             )
-        elif h.category == StockCategory.CRYPTO:
-            crypto_data = get_crypto_price(
-                getattr(h, "coingecko_id", None),
-                h.ticker,
-            )
-            price = crypto_data.get("price_usd") if crypto_data else None
-            change_24h_pct = crypto_data.get("change_24h_pct") if crypto_data else None
-            if (
-                price is not None
-                and isinstance(price, (int, float))
-                and change_24h_pct is not None
-                and isinstance(change_24h_pct, (int, float))
-                and (1 + change_24h_pct / 100) != 0
-            ):
-                previous_close = price / (1 + change_24h_pct / 100)
-            else:
-                previous_close = None
-
-            if price is not None and isinstance(price, (int, float)):
-                market_value = h.quantity * price * fx
-            elif h.cost_basis is not None:
-                market_value = h.quantity * h.cost_basis * fx
-            else:
-                market_value = 0.0
-
-            if previous_close is not None and isinstance(previous_close, (int, float)):
-                previous_market_value = h.quantity * previous_close * fx
-                has_prev_close = True
-            else:
-                previous_market_value = market_value
         else:
-            # 非現金持倉：取得當前與前一交易日價格
-            signals = get_technical_signals(h.ticker)
-            price = signals.get("price") if signals else None
-            previous_close = signals.get("previous_close") if signals else None
+            # 非現金持倉（股票 / 加密貨幣）：取用已解析的當前與前一交易日價格
+            quote = quotes.get(h.ticker) or {}
+            price = quote.get("price")
+            previous_close = quote.get("previous_close")
 
             # 計算當前市值
             if price is not None and isinstance(price, (int, float)):
@@ -215,16 +287,15 @@ def calculate_rebalance(session: Session, display_currency: str = "USD") -> dict
     5. 委託 domain.rebalance 純函式計算偏移與建議
 
     結果以 (display_currency, lang) 為 key 快取 60 秒，避免短時間內重複計算。
-    快取命中時更新 calculated_at 為當前時間，避免回傳過期的計算時間戳。
+    快取命中時更新 calculated_at 與 data_age_seconds，避免回傳過期的時間戳。
     """
     lang = get_user_language(session)
-    _cache_key = (display_currency, lang)
+    _cache_key = f"{display_currency}:{lang}"
 
-    with _rebalance_cache_lock:
-        cached = _rebalance_cache.get(_cache_key)
-        if cached is not None:
-            logger.debug("再平衡快取命中：%s (%s)", display_currency, lang)
-            return {**cached, "calculated_at": datetime.now(UTC).isoformat()}
+    cached = _rebalance_cache.get(_cache_key)
+    if cached is not None:
+        logger.debug("再平衡快取命中：%s (%s)", display_currency, lang)
+        return _with_fresh_timestamps(cached)
 
     # In-flight 去重：同一 cache_key 同時只有一個計算在飛行中。
     # 後續請求等待主計算完成；若主計算失敗，由一位等待者晉升為新的主計算，
@@ -242,10 +313,9 @@ def calculate_rebalance(session: Session, display_currency: str = "USD") -> dict
         if not is_owner:
             logger.debug("再平衡計算去重等待：%s (%s)", display_currency, lang)
             event.wait()
-            with _rebalance_cache_lock:
-                cached = _rebalance_cache.get(_cache_key)
-                if cached is not None:
-                    return {**cached, "calculated_at": datetime.now(UTC).isoformat()}
+            cached = _rebalance_cache.get(_cache_key)
+            if cached is not None:
+                return _with_fresh_timestamps(cached)
             continue
 
         try:
@@ -260,7 +330,7 @@ def _do_calculate_rebalance(
     session: Session,
     display_currency: str,
     lang: str,
-    _cache_key: tuple,
+    _cache_key: str,
 ) -> dict:
     """再平衡計算的實際邏輯（由 calculate_rebalance 呼叫，已完成去重後執行）。
 
@@ -301,41 +371,10 @@ def _do_calculate_rebalance(
         {k: round(v, 4) for k, v in fx_rates.items()},
     )
 
-    # 3.5) 並行預熱：股票技術訊號 + 加密貨幣價格
-    stock_tickers = list(
-        {
-            h.ticker
-            for h in holdings
-            if not h.is_cash and h.category != StockCategory.CRYPTO
-        }
-    )
-    crypto_ids = list(
-        {
-            h.coingecko_id
-            for h in holdings
-            if (
-                not h.is_cash
-                and h.category == StockCategory.CRYPTO
-                and getattr(h, "coingecko_id", None)
-            )
-        }
-    )
-    if stock_tickers:
-        if are_all_signals_in_l1(stock_tickers):
-            logger.debug(
-                "所有 %d 檔股票技術訊號已在 L1 快取，略過預熱。", len(stock_tickers)
-            )
-        else:
-            logger.info("並行預熱 %d 檔股票技術訊號...", len(stock_tickers))
-            prewarm_signals_batch(stock_tickers)
-    if crypto_ids:
-        logger.info("並行預熱 %d 檔加密貨幣報價...", len(crypto_ids))
-        prewarm_crypto_prices(crypto_ids)
-
-    # 4) 使用共用邏輯計算各持倉市值
+    # 4) 估值管線：批次解析報價後，以共用邏輯計算各持倉市值
+    quotes = _resolve_holding_quotes(holdings)
     _currency_values, _cash_values, ticker_agg = _compute_holding_market_values(
-        holdings,
-        fx_rates,
+        holdings, fx_rates, quotes
     )
 
     # 4.5) 取得每個分類的市值合計
@@ -640,10 +679,13 @@ def _do_calculate_rebalance(
         if v > 0
     ]
 
-    result["calculated_at"] = datetime.now(UTC).isoformat()
+    # 報價可能為 stale-while-revalidate 回傳的舊值：標示最舊報價時間與年齡
+    now = datetime.now(UTC)
+    result["calculated_at"] = now.isoformat()
+    result["data_as_of"] = _oldest_quote_time(quotes)
+    result["data_age_seconds"] = compute_data_age_seconds(result["data_as_of"], now)
 
-    with _rebalance_cache_lock:
-        _rebalance_cache[_cache_key] = result
+    _rebalance_cache.set(_cache_key, result)
 
     return result
 
@@ -748,34 +790,11 @@ def calculate_currency_exposure(
         {k: round(v, 4) for k, v in fx_rates.items()},
     )
 
-    # 3.5) 並行預熱所有非現金持倉的技術訊號
-    stock_tickers = list(
-        {
-            h.ticker
-            for h in holdings
-            if not h.is_cash and h.category != StockCategory.CRYPTO
-        }
-    )
-    crypto_ids = list(
-        {
-            h.coingecko_id
-            for h in holdings
-            if (
-                not h.is_cash
-                and h.category == StockCategory.CRYPTO
-                and getattr(h, "coingecko_id", None)
-            )
-        }
-    )
-    if stock_tickers:
-        prewarm_signals_batch(stock_tickers)
-    if crypto_ids:
-        prewarm_crypto_prices(crypto_ids)
-
-    # 4) 使用共用邏輯計算市值（以本幣計價），同時追蹤現金部位
+    # 4) 估值管線：批次解析報價後計算市值（以本幣計價），同時追蹤現金部位
     currency_values, cash_currency_values, _ticker_agg = _compute_holding_market_values(
         holdings,
         fx_rates,
+        _resolve_holding_quotes(holdings),
     )
 
     total_value_home = sum(currency_values.values())
@@ -822,6 +841,8 @@ def calculate_currency_exposure(
     # 6) 偵測近期匯率變動（非本幣 → 本幣）
     fx_movements = []
     non_home_currencies = [cur for cur in currency_values if cur != home_currency]
+    # 單次批次下載預熱所有幣別的短期 / 長期匯率歷史（USD 樞紐推導交叉匯率）
+    prime_forex_history_batch((cur, home_currency) for cur in non_home_currencies)
     currency_histories: dict[str, list[dict]] = {}
     for cur in non_home_currencies:
         history = get_forex_history(cur, home_currency)
@@ -1136,7 +1157,8 @@ def calculate_withdrawal(
     holding_currencies = list({h.currency for h in holdings})
     fx_rates = get_exchange_rates(display_currency, holding_currencies)
 
-    # 4) 計算各持倉市值，建立 HoldingData 列表
+    # 4) 估值管線：批次解析報價後計算各持倉市值，建立 HoldingData 列表
+    quotes = _resolve_holding_quotes(holdings)
     category_values: dict[str, float] = {}
     holdings_data: list[HoldingData] = []
 
@@ -1147,18 +1169,8 @@ def calculate_withdrawal(
         if h.is_cash:
             market_value = h.quantity * fx
             price = 1.0
-        elif h.category == StockCategory.CRYPTO:
-            crypto_data = get_crypto_price(getattr(h, "coingecko_id", None), h.ticker)
-            price = crypto_data.get("price_usd") if crypto_data else None
-            if price is not None and isinstance(price, (int, float)):
-                market_value = h.quantity * price * fx
-            elif h.cost_basis is not None:
-                market_value = h.quantity * h.cost_basis * fx
-            else:
-                market_value = 0.0
         else:
-            signals = get_technical_signals(h.ticker)
-            price = signals.get("price") if signals else None
+            price = (quotes.get(h.ticker) or {}).get("price")
             if price is not None and isinstance(price, (int, float)):
                 market_value = h.quantity * price * fx
             elif h.cost_basis is not None:
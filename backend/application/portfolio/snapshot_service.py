@@ -7,12 +7,16 @@ Application — Portfolio Snapshot Service：每日快照的建立與查詢。
 import json as _json
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import UTC, date, datetime, timedelta
+from typing import TYPE_CHECKING
 
 from sqlmodel import Session, select
 
 from domain.entities import PortfolioSnapshot
 from logging_config import get_logger
 
+if TYPE_CHECKING:
+    from domain.analysis import PriceSeries
+
 logger = get_logger(__name__)
 
 
@@ -122,14 +126,12 @@ def backfill_benchmark_values(session: Session) -> int:
     使用基準指數的日期範圍收盤價歷史一次性補填。
 
     - 每支 ticker 僅一次 API 呼叫（共 4 次），不隨快照數量增加。
-    - 市場休日自動回退至最近交易日收盤價（pandas asof）。
+    - 市場休日自動回退至最近交易日收盤價（PriceSeries 二分搜尋）。
     - 同步更新 benchmark_value 向下相容欄位（^GSPC）。
 
     Returns:
         實際更新的快照數量（至少有一筆基準價格非 null 才計入）
     """
-    import pandas as pd
-
     from infrastructure.market_data import get_benchmark_close_history
 
     benchmark_tickers = ["^GSPC", "VT", "^N225", "^TWII"]
@@ -153,7 +155,7 @@ def backfill_benchmark_values(session: Session) -> int:
         max_date,
     )
 
-    price_history: dict[str, pd.Series | None] = {}
+    price_history: dict[str, PriceSeries | None] = {}
     for ticker in benchmark_tickers:
         series = get_benchmark_close_history(ticker, min_date, max_date)
         price_history[ticker] = series
@@ -174,11 +176,7 @@ def backfill_benchmark_values(session: Session) -> int:
                 prices[ticker] = None
                 continue
             try:
-                idx = pd.Timestamp(snap_date, tz="UTC")
-                if series.index.tz is None:
-                    series = series.tz_localize("UTC")
-                close = series.asof(idx)
-                prices[ticker] = float(close) if pd.notna(close) else None
+                prices[ticker] = series.last_close_on_or_before(snap_date)
             except Exception as exc:
                 logger.warning(
                     "收盤價取得失敗 ticker=%s date=%s：%s", ticker, snap_date, exc
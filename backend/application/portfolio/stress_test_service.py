@@ -32,7 +32,7 @@ def calculate_stress_test(
     1. 讀取所有持倉
     2. 取得匯率，將所有持倉轉換為 display_currency
     3. 計算持倉市值（複用 _compute_holding_market_values）
-    4. 批次預熱 Beta 快取（並行取得）
+    4. 批次預熱 Beta 快取（Beta 矩陣一次計算，不足者回退 yfinance info）
     5. 為每個持倉取得 Beta（使用 category fallback 當 yfinance 未提供時）
     6. 委託 domain.stress_test 純函式計算壓力測試結果
 
@@ -75,9 +75,9 @@ def calculate_stress_test(
         if data["category"] != StockCategory.CASH.value
     ]
 
-    # 批次預熱 Beta 快取（並行取得，避免串行呼叫）
+    # 批次預熱 Beta 快取：未命中者經本地日線倉儲一次取得歷史，以 Beta 矩陣一次計算
     if non_cash_tickers:
-        prewarm_beta_batch(non_cash_tickers)
+        prewarm_beta_batch(non_cash_tickers, download_history=True)
 
     # 5) 組裝帶 Beta 的持倉清單
     holdings_with_beta: list[dict] = []
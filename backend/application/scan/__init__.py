@@ -16,6 +16,7 @@ from application.scan.prewarm_service import (  # noqa: F401
     prewarm_all_caches,
 )
 from application.scan.scan_service import (  # noqa: F401
+    compact_scan_logs,
     create_price_alert,
     delete_price_alert,
     get_fear_greed,
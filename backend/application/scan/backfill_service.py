@@ -5,22 +5,24 @@ Application — ScanLog cold-start backfill service.
 from __future__ import annotations
 
 import threading
-from datetime import UTC, datetime, time
+from datetime import UTC, date, datetime, time
 
 from sqlmodel import Session, select
 
 from application.scan.backtest_service import invalidate_backtest_cache
 from domain.analysis import replay_historical_signals
 from domain.constants import (
+    BACKFILL_COMMIT_TICKERS,
     BACKFILL_HISTORY_PERIOD,
     BACKFILL_MARKET_STATUS,
     BACKFILL_MIN_HISTORY_DAYS,
     BACKFILL_SAMPLE_INTERVAL,
     SKIP_RSI_CATEGORIES,
+    YF_LANE_BACKFILL,
 )
-from domain.entities import ScanLog
+from domain.entities import ScanLog, SignalTransition
 from infrastructure import repositories as repo
-from infrastructure.market_data import batch_download_history_extended
+from infrastructure.market_data import batch_download_history_extended, request_lane
 from logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -58,6 +60,47 @@ def get_backfill_status() -> dict[str, int | bool]:
         }
 
 
+def _transition_logs(ticker: str, events: list[tuple[date, str]]) -> list[ScanLog]:
+    """Keep only signal transitions, dropping NORMAL periods."""
+    logs: list[ScanLog] = []
+    previous_signal: str | None = None
+    for signal_date, signal in events:
+        if signal == previous_signal:
+            continue
+        previous_signal = signal
+        if signal == "NORMAL":
+            continue
+        logs.append(
+            ScanLog(
+                stock_ticker=ticker,
+                signal=signal,
+                market_status=BACKFILL_MARKET_STATUS,
+                scanned_at=datetime.combine(signal_date, time.min, tzinfo=UTC),
+            )
+        )
+    return logs
+
+
+def _commit_backfill_batch(session: Session, batch: list[list[ScanLog]]) -> int:
+    """
+    寫入一批股票的回填紀錄（單一 executemany INSERT + 單次 commit），回傳寫入筆數。
+    失敗時 rollback 並回傳 0；該批股票沒有回填紀錄，下次回填會重新處理。
+    """
+    logs = [log for ticker_logs in batch for log in ticker_logs]
+    try:
+        inserted = repo.bulk_create_scan_logs(session, logs)
+        repo.record_signal_transitions(session, logs)
+        session.commit()
+    except Exception as exc:
+        session.rollback()
+        logger.warning(
+            "ScanLog backfill batch insert failed (%d tickers): %s", len(batch), exc
+        )
+        return 0
+    return inserted
+
+
+@request_lane(YF_LANE_BACKFILL)
 def backfill_scan_logs(session: Session) -> int:
     """
     Backfill synthetic ScanLog rows by replaying historical signal events.
@@ -83,12 +126,19 @@ def backfill_scan_logs(session: Session) -> int:
             _set_progress(in_progress=False, total=0, completed=0)
             return 0
 
+        # 同時參考訊號區段（原始 ScanLog 可能已被保留政策刪除，區段則永久保留）
         existing_backfilled_tickers = set(
             session.exec(
                 select(ScanLog.stock_ticker)
                 .where(ScanLog.market_status == BACKFILL_MARKET_STATUS)
                 .distinct()
             ).all()
+        ) | set(
+            session.exec(
+                select(SignalTransition.stock_ticker)
+                .where(SignalTransition.market_status == BACKFILL_MARKET_STATUS)
+                .distinct()
+            ).all()
         )
         pending_stocks = [
             stock for stock in stocks if stock.ticker not in existing_backfilled_tickers
@@ -115,6 +165,7 @@ def backfill_scan_logs(session: Session) -> int:
             min_days=BACKFILL_MIN_HISTORY_DAYS,
         )
 
+        logs_by_ticker: list[list[ScanLog]] = []
         for stock in pending_stocks:
             prices = history_map.get(stock.ticker)
             if not prices:
@@ -128,32 +179,19 @@ def backfill_scan_logs(session: Session) -> int:
                     sample_interval=BACKFILL_SAMPLE_INTERVAL,
                     include_normal=True,
                 )
-                previous_signal: str | None = None
-                for signal_date, signal in events:
-                    if signal == previous_signal:
-                        continue
-                    previous_signal = signal
-                    if signal == "NORMAL":
-                        continue
-                    repo.create_scan_log(
-                        session,
-                        ScanLog(
-                            stock_ticker=stock.ticker,
-                            signal=signal,
-                            market_status=BACKFILL_MARKET_STATUS,
-                            scanned_at=datetime.combine(
-                                signal_date, time.min, tzinfo=UTC
-                            ),
-                        ),
-                    )
-                    inserted += 1
-                session.commit()
+                logs = _transition_logs(stock.ticker, events)
+                if logs:
+                    logs_by_ticker.append(logs)
             except Exception as exc:
-                session.rollback()
                 logger.warning("ScanLog backfill failed for %s: %s", stock.ticker, exc)
             finally:
                 _increment_completed()
 
+        for start in range(0, len(logs_by_ticker), BACKFILL_COMMIT_TICKERS):
+            inserted += _commit_backfill_batch(
+                session, logs_by_ticker[start : start + BACKFILL_COMMIT_TICKERS]
+            )
+
         invalidate_backtest_cache()
         logger.info("ScanLog backfill finished. inserted=%d", inserted)
         return inserted
@@ -6,19 +6,20 @@ Application — Signal backtesting service orchestration.
 from __future__ import annotations
 
 import threading
-import time
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
 from domain.analysis import (
     BacktestSignalEvent,
-    compute_forward_returns,
+    as_price_series,
+    compute_forward_returns_batch,
     compute_signal_metrics,
     deduplicate_signal_events,
 )
 from domain.constants import BACKTEST_CACHE_TTL, BACKTEST_MAX_LOOKBACK_DAYS
 from infrastructure import repositories as repo
 from infrastructure.market_data import get_price_history
+from infrastructure.shared_cache import SharedCache
 from logging_config import get_logger
 
 if TYPE_CHECKING:
@@ -26,17 +27,16 @@ if TYPE_CHECKING:
 
 logger = get_logger(__name__)
 
+_BACKTEST_CACHE_KEY = "payload"
+
 _backtest_cache_lock = threading.Lock()
-_backtest_cache: dict[str, Any] = {}
-_backtest_cache_ts = 0.0
+_backtest_cache = SharedCache("backtest", maxsize=1, ttl=BACKTEST_CACHE_TTL)
 
 
 def invalidate_backtest_cache() -> None:
-    """Invalidate in-memory backtest cache."""
-    global _backtest_cache, _backtest_cache_ts
+    """Invalidate backtest cache in this process and every other worker."""
     with _backtest_cache_lock:
-        _backtest_cache = {}
-        _backtest_cache_ts = 0.0
+        _backtest_cache.clear()
 
 
 def _normalize_scan_time(scanned_at: datetime) -> datetime:
@@ -45,44 +45,47 @@ def _normalize_scan_time(scanned_at: datetime) -> datetime:
     return scanned_at.astimezone(UTC)
 
 
-def _to_events(logs: list) -> list[BacktestSignalEvent]:
+def _to_events(transitions: list, since: datetime) -> list[BacktestSignalEvent]:
+    # 起點早於回溯視窗但仍延續至視窗內的區段，以視窗起點作為事件時間（等同首筆視窗內掃描）
     return [
         BacktestSignalEvent(
-            ticker=log.stock_ticker,
-            signal=log.signal,
-            market_status=log.market_status,
-            scanned_at=_normalize_scan_time(log.scanned_at),
+            ticker=transition.stock_ticker,
+            signal=transition.signal,
+            market_status=transition.market_status,
+            scanned_at=max(_normalize_scan_time(transition.started_at), since),
         )
-        for log in logs
+        for transition in transitions
     ]
 
 
 def _build_payload(session: Session) -> dict[str, Any]:
     since = datetime.now(UTC) - timedelta(days=BACKTEST_MAX_LOOKBACK_DAYS)
-    raw_logs = repo.find_scan_logs_for_backtest(
+    transitions = repo.find_transitions_for_backtest(
         session, since=since, exclude_signals=None
     )
-    events = deduplicate_signal_events(_to_events(raw_logs))
+    events = deduplicate_signal_events(_to_events(transitions, since))
 
-    logger.info("Backtest events: raw=%d deduped=%d", len(raw_logs), len(events))
+    logger.info(
+        "Backtest events: transitions=%d deduped=%d", len(transitions), len(events)
+    )
 
-    prices_by_ticker: dict[str, list[dict]] = {}
-    returns_by_signal: dict[str, list[dict[int, float | None]]] = {}
-    occurrences_by_signal: dict[str, list[dict[str, Any]]] = {}
+    # 依 ticker 分組，每檔股價只載入一次，並以批次核心一次算出該檔全部事件的前瞻報酬
+    events_by_ticker: dict[str, list[int]] = {}
+    for position, event in enumerate(events):
+        events_by_ticker.setdefault(event.ticker, []).append(position)
 
-    for event in events:
-        if event.ticker not in prices_by_ticker:
-            prices = get_price_history(event.ticker) or []
-            prices_by_ticker[event.ticker] = sorted(
-                prices,
-                key=lambda point: str(point["date"]),
-            )
-
-        forward_returns = compute_forward_returns(
-            signal_date=event.scanned_at.date(),
-            price_series=prices_by_ticker[event.ticker],
-            already_sorted=True,
+    forward_returns_by_event: list[dict[int, float | None]] = [{}] * len(events)
+    for ticker, positions in events_by_ticker.items():
+        batch = compute_forward_returns_batch(
+            signal_dates=[events[position].scanned_at.date() for position in positions],
+            price_series=as_price_series(get_price_history(ticker)),
         )
+        for position, forward_returns in zip(positions, batch, strict=True):
+            forward_returns_by_event[position] = forward_returns
+
+    returns_by_signal: dict[str, list[dict[int, float | None]]] = {}
+    occurrences_by_signal: dict[str, list[dict[str, Any]]] = {}
+    for event, forward_returns in zip(events, forward_returns_by_event, strict=True):
         returns_by_signal.setdefault(event.signal, []).append(forward_returns)
         occurrences_by_signal.setdefault(event.signal, []).append(
             {
@@ -120,14 +123,12 @@ def _build_payload(session: Session) -> dict[str, Any]:
 
 
 def _get_or_build_payload(session: Session) -> dict[str, Any]:
-    global _backtest_cache, _backtest_cache_ts
     with _backtest_cache_lock:
-        now = time.time()
-        if _backtest_cache and now - _backtest_cache_ts < BACKTEST_CACHE_TTL:
-            return _backtest_cache
+        cached = _backtest_cache.get(_BACKTEST_CACHE_KEY)
+        if cached is not None:
+            return cached
         payload = _build_payload(session)
-        _backtest_cache = payload
-        _backtest_cache_ts = time.time()
+        _backtest_cache.set(_BACKTEST_CACHE_KEY, payload)
         return payload
 
 
@@ -6,7 +6,7 @@ Application — 啟動快取預熱服務。
 
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
 
 from sqlmodel import Session, select
 
@@ -16,15 +16,20 @@ from domain.constants import (
     EQUITY_CATEGORIES,
     FG_SPY_TICKER,
     GURU_BACKFILL_YEARS,
+    PREWARM_HOST_DONE_TTL,
+    PREWARM_HOST_LEASE_TTL,
+    PREWARM_HOST_TASK,
     SCAN_THREAD_POOL_SIZE,
     SKIP_MOAT_CATEGORIES,
     SKIP_PRICE_FETCH_CATEGORIES,
     SKIP_RSI_CATEGORIES,
+    YF_LANE_PREWARM,
 )
 from domain.entities import Holding, Stock
 from domain.enums import StockCategory
 from infrastructure.database import engine
 from infrastructure.market_data import (
+    LaneThreadPoolExecutor,
     batch_download_history,
     get_etf_sector_weights,
     get_fear_greed_index,
@@ -35,8 +40,13 @@ from infrastructure.market_data import (
     prewarm_moat_batch,
     prewarm_signals_batch,
     prime_signals_cache_batch,
+    request_lane,
+)
+from infrastructure.shared_cache import (
+    claim_host_task,
+    complete_host_task,
+    wait_for_lease_release,
 )
-from infrastructure.repositories import find_all_active_gurus
 from logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -59,6 +69,7 @@ def _set_prewarm_ready(value: bool) -> None:
         _prewarm_ready = value
 
 
+@request_lane(YF_LANE_PREWARM)
 def prewarm_all_caches() -> None:
     """非阻塞式啟動預熱 — 填充 L1/L2 快取。
 
@@ -67,8 +78,28 @@ def prewarm_all_caches() -> None:
     2. 其餘各階段並行執行：moat、fear_greed、etf_holdings、beta、
        guru_backfill、sector、etf_sector_weights
 
+    多個 uvicorn worker 同時啟動時，僅認領到主機租約的 worker 執行預熱；
+    其餘 worker 等待其完成後直接標記就緒（L2 磁碟快取為主機共享）。
+
     整個流程以 try/except 包裹，確保任何失敗都不會影響應用程式正常運作。
     """
+    lease = claim_host_task(PREWARM_HOST_TASK, PREWARM_HOST_LEASE_TTL)
+    if lease is None:
+        logger.info("快取預熱：同主機其他 worker 已負責預熱，等待其完成。")
+        wait_for_lease_release(PREWARM_HOST_TASK, PREWARM_HOST_LEASE_TTL)
+        _set_prewarm_ready(True)
+        return
+
+    try:
+        completed = _run_prewarm()
+    finally:
+        complete_host_task(PREWARM_HOST_TASK, lease, PREWARM_HOST_DONE_TTL)
+    if completed:
+        _prewarm_phase("scanlog_backfill", _run_scanlog_backfill)
+
+
+def _run_prewarm() -> bool:
+    """執行各預熱階段並標記就緒。DB 無法讀取或無任何標的時回傳 False。"""
     start = time.monotonic()
     logger.info("快取預熱啟動...")
 
@@ -77,12 +108,12 @@ def prewarm_all_caches() -> None:
     except Exception as exc:
         logger.error("快取預熱：無法讀取資料庫，中止預熱。%s", exc, exc_info=True)
         _set_prewarm_ready(True)  # 服務仍可運作，只是快取為冷啟動狀態
-        return
+        return False
 
     if not tickers["all"]:
         logger.info("快取預熱：資料庫中無任何股票或持倉，跳過預熱。")
         _set_prewarm_ready(True)
-        return
+        return False
 
     logger.info(
         "快取預熱：共 %d 檔標的（signals=%d, moat=%d, sector=%d, etf=%d, beta=%d, crypto=%d, etf_sector_weights=%d）",
@@ -147,7 +178,7 @@ def prewarm_all_caches() -> None:
             ("crypto", lambda: prewarm_crypto_prices(tickers["crypto"]))
         )
 
-    with ThreadPoolExecutor(max_workers=min(len(parallel_phases), 4)) as pool:
+    with LaneThreadPoolExecutor(max_workers=min(len(parallel_phases), 4)) as pool:
         phase_futures = {
             pool.submit(_prewarm_phase, name, fn): name for name, fn in parallel_phases
         }
@@ -163,7 +194,7 @@ def prewarm_all_caches() -> None:
     elapsed = time.monotonic() - start
     logger.info("快取預熱完成，耗時 %.1f 秒。", elapsed)
     _set_prewarm_ready(True)
-    _prewarm_phase("scanlog_backfill", _run_scanlog_backfill)
+    return True
 
 
 # ---------------------------------------------------------------------------
@@ -322,39 +353,24 @@ def _backfill_all_gurus() -> None:
     """對所有啟用中大師執行 5 年 13F 歷史回填。
 
     冪等：已同步的申報自動跳過，重複啟動安全。
+    EDGAR 下載由 filing_service 排程並行處理，進度見 /gurus/sync-status。
     """
     # Late import to avoid circular dependency (prewarm → filing_service → repositories)
-    from application.stock.filing_service import backfill_guru_filings
+    from application.stock.filing_service import backfill_all_gurus
 
     with Session(engine) as session:
-        gurus = find_all_active_gurus(session)
+        results = backfill_all_gurus(session, years=GURU_BACKFILL_YEARS)
 
-    if not gurus:
+    if not results:
         logger.info("快取預熱 [guru_backfill] 無啟用中大師，跳過回填。")
         return
 
-    logger.info("快取預熱 [guru_backfill] 開始回填 %d 位大師...", len(gurus))
-    for guru in gurus:
-        try:
-            with Session(engine) as session:
-                result = backfill_guru_filings(
-                    session, guru.id, years=GURU_BACKFILL_YEARS
-                )
-            logger.info(
-                "回填完成：%s，窗口內 %d 筆，已同步 %d，跳過 %d，錯誤 %d",
-                guru.display_name,
-                result["total_filings"],
-                result["synced"],
-                result["skipped"],
-                result["errors"],
-            )
-        except Exception as exc:
-            logger.warning(
-                "快取預熱 [guru_backfill] 大師回填失敗：%s (ID=%d), error=%s",
-                guru.display_name,
-                guru.id,
-                exc,
-            )
+    logger.info(
+        "快取預熱 [guru_backfill] 完成：%d 位大師，新同步 %d 筆申報，錯誤 %d 筆。",
+        len(results),
+        sum(r.get("synced", 0) for r in results),
+        sum(r.get("errors", 0) for r in results),
+    )
 
 
 def _run_scanlog_backfill() -> None:
@@ -367,7 +383,7 @@ def _run_scanlog_backfill() -> None:
 def _prewarm_sectors(tickers: list[str]) -> None:
     """對股票類持倉並行呼叫 get_ticker_sector()，填充磁碟快取。
 
-    以 ThreadPoolExecutor 並行處理；失敗的單筆記錄警告後繼續，不中斷整個預熱流程。
+    以 LaneThreadPoolExecutor 並行處理；失敗的單筆記錄警告後繼續，不中斷整個預熱流程。
     """
     total = len(tickers)
     ok_count = 0
@@ -377,7 +393,7 @@ def _prewarm_sectors(tickers: list[str]) -> None:
         logger.debug("快取預熱 [sector] %s → %s", ticker, sector or "N/A")
         return ticker, True
 
-    with ThreadPoolExecutor(max_workers=SCAN_THREAD_POOL_SIZE) as pool:
+    with LaneThreadPoolExecutor(max_workers=SCAN_THREAD_POOL_SIZE) as pool:
         futures = {pool.submit(_fetch_one, t): t for t in tickers}
         for future in as_completed(futures):
             ticker = futures[future]
@@ -392,7 +408,7 @@ def _prewarm_sectors(tickers: list[str]) -> None:
 def _prewarm_etf_sector_weights(tickers: list[str]) -> None:
     """對 ETF 標的並行呼叫 get_etf_sector_weights()，填充磁碟快取。
 
-    以 ThreadPoolExecutor 並行處理；失敗的單筆記錄警告後繼續，不中斷整個預熱流程。
+    以 LaneThreadPoolExecutor 並行處理；失敗的單筆記錄警告後繼續，不中斷整個預熱流程。
     """
     total = len(tickers)
     ok_count = 0
@@ -403,7 +419,7 @@ def _prewarm_etf_sector_weights(tickers: list[str]) -> None:
         logger.debug("快取預熱 [etf_sector_weights] %s → %d 板塊", ticker, sector_count)
         return ticker, sector_count
 
-    with ThreadPoolExecutor(max_workers=SCAN_THREAD_POOL_SIZE) as pool:
+    with LaneThreadPoolExecutor(max_workers=SCAN_THREAD_POOL_SIZE) as pool:
         futures = {pool.submit(_fetch_one, t): t for t in tickers}
         for future in as_completed(futures):
             ticker = futures[future]
@@ -4,7 +4,7 @@ Application — Scan Service：三層漏斗掃描、價格警報、掃描歷史
 """
 
 import json
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
 from datetime import UTC, datetime, timedelta
 
 from sqlmodel import Session, select
@@ -26,12 +26,14 @@ from domain.constants import (
     PRICE_ALERT_COOLDOWN_HOURS,
     SCAN_HISTORY_DEFAULT_LIMIT,
     SCAN_L1_WARM_THRESHOLD,
+    SCAN_LOG_RETENTION_DAYS,
     SCAN_THREAD_POOL_SIZE,
     SKIP_MOAT_CATEGORIES,
     SKIP_PRICE_FETCH_CATEGORIES,
     SKIP_RSI_CATEGORIES,
     VOLUME_SURGE_THRESHOLD,
     VOLUME_THIN_THRESHOLD,
+    YF_LANE_SCAN,
 )
 from domain.entities import PriceAlert, ScanLog, Stock
 from domain.enums import (
@@ -44,6 +46,7 @@ from domain.enums import (
 from i18n import get_user_language, t
 from infrastructure import repositories as repo
 from infrastructure.market_data import (
+    LaneThreadPoolExecutor,
     analyze_market_sentiment,
     analyze_moat_trend,
     batch_download_history,
@@ -51,8 +54,10 @@ from infrastructure.market_data import (
     get_bias_distribution,
     get_crypto_price,
     get_fear_greed_index,
+    get_market_breadth_history,
     get_technical_signals,
     prime_signals_cache_batch,
+    request_lane,
 )
 from infrastructure.notification import (
     is_notification_enabled,
@@ -89,6 +94,7 @@ def _insert_volume_qualifier(alert: str, qualifier: str) -> str:
 # ===========================================================================
 
 
+@request_lane(YF_LANE_SCAN)
 def run_scan(session: Session) -> dict:
     """
     V2 三層漏斗掃描：
@@ -111,6 +117,7 @@ def run_scan(session: Session) -> dict:
         for s in all_stocks
         if s.category.value not in SKIP_PRICE_FETCH_CATEGORIES
     ]
+    hist_batch: dict = {}
     l1_hits = count_signals_in_l1(scan_tickers)
     l1_hit_rate = l1_hits / len(scan_tickers) if scan_tickers else 1.0
     if l1_hit_rate >= SCAN_L1_WARM_THRESHOLD:
@@ -130,15 +137,18 @@ def run_scan(session: Session) -> dict:
             logger.warning("批次預熱失敗，回退至個別呼叫：%s", _batch_err)
 
     # === Layer 1: 市場情緒 ===
-    trend_stocks = [s for s in all_stocks if s.category == StockCategory.TREND_SETTER]
-    # ETF 不參與市場情緒計算（VTI/VT 本身就是大盤，會造成循環推理）
-    excluded_etfs = [s.ticker for s in trend_stocks if s.is_etf]
+    excluded_etfs = [
+        s.ticker
+        for s in all_stocks
+        if s.category == StockCategory.TREND_SETTER and s.is_etf
+    ]
     if excluded_etfs:
         logger.info("Layer 1 — 排除 ETF：%s", excluded_etfs)
-    trend_tickers = [s.ticker for s in trend_stocks if not s.is_etf]
+    trend_tickers = _sentiment_tickers(all_stocks)
     logger.info("Layer 1 — 風向球股票（情緒計算用）：%s", trend_tickers)
 
-    market_sentiment = analyze_market_sentiment(trend_tickers)
+    # 已批次下載的歷史直接組成收盤價矩陣計算寬度，不再逐檔查詢
+    market_sentiment = analyze_market_sentiment(trend_tickers, hist_map=hist_batch)
     market_status_value = market_sentiment.get("status", MarketSentiment.BULLISH.value)
     market_status_details_value = market_sentiment.get("details", "")
     logger.info(
@@ -388,7 +398,7 @@ def run_scan(session: Session) -> dict:
         }
 
     results: list[dict] = []
-    with ThreadPoolExecutor(max_workers=SCAN_THREAD_POOL_SIZE) as executor:
+    with LaneThreadPoolExecutor(max_workers=SCAN_THREAD_POOL_SIZE) as executor:
         futures = {
             executor.submit(_analyze_single_stock, s, market_status_value): s
             for s in all_stocks
@@ -400,16 +410,32 @@ def run_scan(session: Session) -> dict:
                 stock = futures[future]
                 logger.error("掃描 %s 失敗：%s", stock.ticker, exc, exc_info=True)
 
-    # === 持久化掃描紀錄 ===
-    for r in results:
-        scan_log = ScanLog(
+    # 於 commit 前擷取上次訊號快照（commit 會使 ORM 物件過期，逐檔存取將觸發 N 次重新載入）；
+    # SQLite 讀回的 datetime 可能為 naive，統一轉換為 UTC-aware
+    previous_state: dict[str, tuple[str, datetime | None]] = {
+        ticker: (
+            stock.last_scan_signal,
+            stock.signal_since.replace(tzinfo=UTC)
+            if stock.signal_since is not None and stock.signal_since.tzinfo is None
+            else stock.signal_since,
+        )
+        for ticker, stock in stock_map.items()
+    }
+
+    # === 持久化掃描紀錄（單一批次寫入，縮短 SQLite 寫入鎖持有時間）===
+    # 同一交易內增量維護訊號區段：訊號不變者僅延長區段，不另增列
+    scan_logs = [
+        ScanLog(
             stock_ticker=r["ticker"],
             signal=r["signal"],
             market_status=market_status_value,
             market_status_details=market_status_details_value,
             details=json.dumps(r["alerts"], ensure_ascii=False),
         )
-        repo.create_scan_log(session, scan_log)
+        for r in results
+    ]
+    repo.bulk_create_scan_logs(session, scan_logs)
+    repo.record_signal_transitions(session, scan_logs)
     session.commit()
 
     # === 檢查自訂價格警報 ===
@@ -422,42 +448,41 @@ def run_scan(session: Session) -> dict:
     category_icon = CATEGORY_ICON
     now = datetime.now(UTC)
 
-    # 比對每檔股票的 current signal vs last_scan_signal
-    new_or_changed: list[dict] = []  # signal 從 NORMAL→非 NORMAL，或非 NORMAL 類型改變
-    resolved: list[dict] = []  # signal 從非 NORMAL→NORMAL
-    signal_updates: dict[str, str] = {}
-    signal_since_updates: dict[str, datetime | None] = {}
-
-    for r in results:
-        ticker = r["ticker"]
-        current_signal = r["signal"]
-        stock_obj = stock_map.get(ticker)
-        prev_signal = (
-            stock_obj.last_scan_signal if stock_obj else ScanSignal.NORMAL.value
-        )
+    # 以集合比對 current signal vs last_scan_signal，只有訊號改變的股票需要通知與寫回
+    current_signals = {r["ticker"]: r["signal"] for r in results}
+    previous_signals = {
+        ticker: previous_state.get(ticker, (ScanSignal.NORMAL.value, None))[0]
+        for ticker in current_signals
+    }
+    changed = {
+        ticker
+        for ticker, signal in current_signals.items()
+        if signal != previous_signals[ticker]
+    }
 
-        signal_updates[ticker] = current_signal
-
-        if current_signal == prev_signal:
-            # 訊號不變，若股票物件存在才保留既有 signal_since（避免 None 覆蓋已存在的值）
-            if stock_obj is not None:
-                signal_since_updates[ticker] = stock_obj.signal_since
-            continue  # 無變化，不通知
-        # 訊號改變：重設 signal_since 為當下
-        signal_since_updates[ticker] = now
-        if current_signal != ScanSignal.NORMAL.value:
-            new_or_changed.append({**r, "_prev_signal": prev_signal})
-        else:
-            resolved.append(
-                {
-                    **r,
-                    "_prev_signal": prev_signal,
-                    "_prev_since": stock_obj.signal_since if stock_obj else None,
-                }
-            )
+    # signal 從 NORMAL→非 NORMAL，或非 NORMAL 類型改變
+    new_or_changed: list[dict] = [
+        {**r, "_prev_signal": previous_signals[r["ticker"]]}
+        for r in results
+        if r["ticker"] in changed and r["signal"] != ScanSignal.NORMAL.value
+    ]
+    # signal 從非 NORMAL→NORMAL
+    resolved: list[dict] = [
+        {
+            **r,
+            "_prev_signal": previous_signals[r["ticker"]],
+            "_prev_since": previous_state.get(r["ticker"], (None, None))[1],
+        }
+        for r in results
+        if r["ticker"] in changed and r["signal"] == ScanSignal.NORMAL.value
+    ]
 
-    # 持久化所有股票的最新 signal 與 signal_since（不論是否有變化）
-    repo.bulk_update_scan_signals(session, signal_updates, signal_since_updates)
+    # 僅寫回訊號改變的股票並重設 signal_since；未變化者 DB 中的值已是最新
+    repo.bulk_update_scan_signals(
+        session,
+        {ticker: current_signals[ticker] for ticker in changed},
+        dict.fromkeys(changed, now),
+    )
 
     has_changes = bool(new_or_changed) or bool(resolved)
 
@@ -663,7 +688,7 @@ def get_signal_activity(session: Session) -> list[dict]:
     """
     取得所有啟用股票中訊號非 NORMAL 者的活躍狀態。
     包含：訊號起始時間、持續天數、前一訊號、連續掃描次數、是否為新訊號（< 24h）。
-    使用單一批次查詢取得所有 ScanLog，避免 N+1 問題。
+    以單一批次查詢讀取訊號區段（SignalTransition），成本不隨原始掃描紀錄累積而增加。
     """
     now = datetime.now(UTC)
     non_normal_stocks = [
@@ -677,27 +702,25 @@ def get_signal_activity(session: Session) -> list[dict]:
         return []
 
     tickers = [s.ticker for s in non_normal_stocks]
-    logs_by_ticker = repo.find_recent_scan_logs_for_tickers(
-        session, tickers, limit_per_ticker=100
-    )
+    transitions_by_ticker = repo.find_recent_transitions_for_tickers(session, tickers)
 
     result: list[dict] = []
     for stock in non_normal_stocks:
         duration_days, is_new = compute_signal_duration(stock.signal_since, now)
 
-        logs = logs_by_ticker.get(stock.ticker, [])
+        transitions = transitions_by_ticker.get(stock.ticker, [])
         current_signal = stock.last_scan_signal
 
-        # Compute previous distinct signal from pre-fetched logs
+        # 由最新區段往回：相同訊號的區段累加掃描次數，第一個不同訊號即為前一訊號
         prev_signal: str | None = None
         changed_at = None
         consecutive_scans = 0
-        for log in logs:
-            if log.signal == current_signal:
-                consecutive_scans += 1
-            elif prev_signal is None:
-                prev_signal = log.signal
-                changed_at = log.scanned_at
+        for transition in transitions:
+            if transition.signal == current_signal:
+                consecutive_scans += transition.scan_count
+            else:
+                prev_signal = transition.signal
+                changed_at = transition.ended_at
                 break
 
         result.append(
@@ -718,6 +741,32 @@ def get_signal_activity(session: Session) -> list[dict]:
     return result
 
 
+def compact_scan_logs(
+    session: Session, retention_days: int = SCAN_LOG_RETENTION_DAYS
+) -> dict:
+    """
+    ScanLog 保留政策：刪除超過 retention_days 的原始掃描紀錄。
+    刪除前先為尚無訊號區段的股票由原始紀錄補建區段，確保歷史訊號完整保留於
+    SignalTransition（訊號活躍度與回測僅讀取區段表，不受刪除影響）。
+    """
+    cutoff = (datetime.now(UTC) - timedelta(days=retention_days)).replace(tzinfo=None)
+    seeded = repo.seed_signal_transitions(session)
+    deleted = repo.delete_scan_logs_before(session, cutoff)
+    session.commit()
+    logger.info(
+        "ScanLog 壓縮完成：刪除 %d 筆（保留 %d 天），補建 %d 個訊號區段。",
+        deleted,
+        retention_days,
+        seeded,
+    )
+    return {
+        "retention_days": retention_days,
+        "cutoff": cutoff.replace(tzinfo=UTC).isoformat(),
+        "deleted": deleted,
+        "seeded_transitions": seeded,
+    }
+
+
 # ===========================================================================
 # Price Alert Service
 # ===========================================================================
@@ -797,6 +846,28 @@ def toggle_price_alert(session: Session, alert_id: int) -> dict:
     return {"message": t(key, lang=lang), "is_active": alert.is_active}
 
 
+# ===========================================================================
+# Market Breadth
+# ===========================================================================
+
+
+def _sentiment_tickers(stocks: list[Stock]) -> list[str]:
+    """市場情緒計算用的風向球 ticker。"""
+    # ETF 不參與市場情緒計算（VTI/VT 本身就是大盤，會造成循環推理）
+    return [
+        s.ticker
+        for s in stocks
+        if s.category == StockCategory.TREND_SETTER and not s.is_etf
+    ]
+
+
+def get_market_breadth(session: Session, days: int) -> list[dict]:
+    """Daily market-sentiment breadth (share of trend setters below MA60)."""
+    return get_market_breadth_history(
+        _sentiment_tickers(repo.find_active_stocks(session)), days=days
+    )
+
+
 # ===========================================================================
 # Last Scan Status
 # ===========================================================================
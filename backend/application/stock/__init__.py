@@ -1,10 +1,12 @@
 """application.stock sub-package — re-exports public API for backward compatibility."""
 
 from application.stock.filing_service import (  # noqa: F401
+    backfill_all_gurus,
     backfill_guru_filings,
     get_dashboard_summary,
     get_filing_summary,
     get_guru_filing_history,
+    get_guru_sync_status,
     get_holding_changes,
     get_top_holdings,
     sync_all_gurus,
@@ -12,6 +12,10 @@ Application — Filing Service：13F 季報同步與持倉差異分析。
 8. 回傳摘要 dict
 """
 
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from datetime import date, timedelta
 
 from sqlmodel import Session
@@ -19,21 +23,31 @@ from sqlmodel import Session
 from domain.constants import (
     GURU_BACKFILL_FILING_COUNT,
     GURU_BACKFILL_YEARS,
+    GURU_FILING_COMMIT_BATCH,
+    GURU_SYNC_MAX_WORKERS,
     GURU_TOP_HOLDINGS_COUNT,
+    YF_LANE_BACKFILL,
 )
-from domain.entities import Guru, GuruFiling, GuruHolding
+from domain.entities import CusipTicker, Guru, GuruFiling, GuruHolding
 from domain.enums import HoldingAction
 from domain.smart_money import (
     classify_holding_change,
     compute_change_pct,
     compute_holding_weight,
 )
-from infrastructure.market_data import get_ticker_sector
+from infrastructure.market_data import (
+    get_ticker_sectors_bulk,
+    prewarm_ticker_sector_batch,
+    request_lane,
+)
 from infrastructure.repositories import (
+    defer_guru_analytics_refresh,
+    fill_missing_holding_sectors,
     find_activity_feed,
     find_all_active_gurus,
     find_all_guru_summaries,
     find_consensus_stocks,
+    find_cusip_tickers,
     find_filing_by_accession,
     find_filings_by_guru,
     find_guru_by_id,
@@ -43,11 +57,12 @@ from infrastructure.repositories import (
     find_sector_breakdown,
     save_filing,
     save_holdings_batch,
+    upsert_cusip_tickers,
 )
 from infrastructure.sec_edgar import (
     fetch_13f_filing_detail,
     get_latest_13f_filings,
-    map_cusip_to_ticker,
+    resolve_cusip,
 )
 from logging_config import get_logger
 
@@ -105,7 +120,7 @@ def backfill_guru_filings(
     1. 從 EDGAR 取回最多 GURU_BACKFILL_FILING_COUNT 筆申報
     2. 過濾出在 years 年窗口內的申報
     3. 依 report_date 升冪排序（舊→新），確保 diff 鏈正確
-    4. 逐筆呼叫 _sync_single_filing()（冪等：已同步者自動跳過）
+    4. 並行下載持倉明細，依序（舊→新）寫入（冪等：已同步者自動跳過）
     5. 回傳摘要 dict
 
     Args:
@@ -130,74 +145,46 @@ def backfill_guru_filings(
             "errors": 0,
         }
 
-    edgar_filings = get_latest_13f_filings(guru.cik, count=GURU_BACKFILL_FILING_COUNT)
-    if not edgar_filings:
-        logger.info("EDGAR 無 13F 申報可回填：%s (%s)", guru.display_name, guru.cik)
-        return {
-            "guru_id": guru_id,
-            "guru_display_name": guru.display_name,
-            "total_filings": 0,
-            "synced": 0,
-            "skipped": 0,
-            "errors": 0,
-        }
+    return _run_guru_filing_jobs(
+        session, [guru], _BACKFILL_MODE, years=years, today=_today
+    )[0]
 
-    cutoff = (_today or date.today()) - timedelta(days=years * 365)
-    in_window = [
-        f for f in edgar_filings if date.fromisoformat(f["report_date"]) >= cutoff
-    ]
-    # 升冪排序，讓舊季先同步，diff 鏈方向正確
-    in_window.sort(key=lambda f: f["report_date"])
 
-    # 批次查詢已同步的 accession numbers（避免 N 次個別 DB 查詢）
-    existing_filings = find_filings_by_guru(
-        session, guru.id, limit=GURU_BACKFILL_FILING_COUNT
-    )
-    existing_accessions = {f.accession_number for f in existing_filings}
-    new_filings = [
-        f for f in in_window if f["accession_number"] not in existing_accessions
-    ]
-    skipped = len(in_window) - len(new_filings)
+def backfill_all_gurus(
+    session: Session,
+    years: int = GURU_BACKFILL_YEARS,
+    _today: date | None = None,
+) -> list[dict]:
+    """
+    回填所有啟用中大師最近 N 年的 13F 歷史申報。
 
-    synced = errors = 0
-    for edgar_filing in new_filings:
-        try:
-            result = _sync_single_filing(session, guru, edgar_filing)
-            if result["status"] == "synced":
-                synced += 1
-            else:
-                errors += 1
-        except Exception as exc:
-            logger.warning(
-                "回填申報失敗：%s %s, error=%s",
-                guru.display_name,
-                edgar_filing.get("accession_number"),
-                exc,
-            )
-            errors += 1
+    所有大師的 EDGAR 申報清單與持倉明細並行下載，寫入時僅同一位大師的申報
+    依舊→新順序串行；進度可由 get_guru_sync_status() 查詢。
 
-    logger.info(
-        "13F 回填完成：%s，窗口內 %d 筆，已同步 %d，跳過 %d，錯誤 %d",
-        guru.display_name,
-        len(in_window),
-        synced,
-        skipped,
-        errors,
+    Args:
+        session: Database session
+        years: 回填年數（預設 GURU_BACKFILL_YEARS）
+        _today: 參考日期（測試注入用）
+
+    Returns:
+        每位大師的 backfill_guru_filings() 格式結果列表
+    """
+    gurus = find_all_active_gurus(session)
+    if not gurus:
+        logger.info("無啟用中的大師，跳過回填")
+        return []
+    return _run_guru_filing_jobs(
+        session, gurus, _BACKFILL_MODE, years=years, today=_today
     )
-    return {
-        "guru_id": guru_id,
-        "guru_display_name": guru.display_name,
-        "total_filings": len(in_window),
-        "synced": synced,
-        "skipped": skipped,
-        "errors": errors,
-    }
 
 
 def sync_all_gurus(session: Session) -> list[dict]:
     """
     批次同步所有啟用中大師的最新 13F 季報。
 
+    各大師的 EDGAR 查詢與持倉明細下載並行執行，寫入仍於同一 session 依序完成；
+    進度可由 get_guru_sync_status() 查詢。
+
     Args:
         session: Database session
 
@@ -209,25 +196,16 @@ def sync_all_gurus(session: Session) -> list[dict]:
         logger.info("無啟用中的大師，跳過同步")
         return []
 
-    results = []
-    for guru in gurus:
-        try:
-            result = sync_guru_filing(session, guru.id)
-            results.append(result)
-        except Exception as exc:
-            logger.warning(
-                "大師同步失敗：%s (ID=%d), error=%s", guru.display_name, guru.id, exc
-            )
-            results.append(
-                {
-                    "guru_id": guru.id,
-                    "guru_display_name": guru.display_name,
-                    "status": "error",
-                    "error": str(exc),
-                }
-            )
+    return _run_guru_filing_jobs(session, gurus, _SYNC_MODE)
 
-    return results
+
+def get_guru_sync_status() -> dict[str, int | bool]:
+    """回傳 13F 同步 / 回填排程的進度（大師數與申報數）。"""
+    with _sync_progress_lock:
+        return {
+            "is_syncing": _sync_active_runs > 0,
+            **_sync_progress,
+        }
 
 
 def get_filing_summary(session: Session, guru_id: int) -> dict | None:
@@ -439,10 +417,430 @@ def enrich_holdings_with_performance(
     return holdings
 
 
+def resolve_many_cusips(
+    session: Session, companies: dict[str, str], *, commit: bool = True
+) -> dict[str, str | None]:
+    """
+    批次解析 CUSIP → ticker。
+
+    先以單次查詢讀取持久化 CUSIP 索引；僅對索引中沒有的 CUSIP
+    （或尚未解析、但本次帶有新公司名稱者）執行對照表 / 名稱比對，並將結果寫回索引。
+
+    Args:
+        session: Database session
+        companies: cusip → 13F 公司名稱（前季清倉等無名稱者傳空字串）
+        commit: False 時索引寫入不 commit，與呼叫端的申報寫入同批 commit
+
+    Returns:
+        cusip → ticker（無法解析者為 None）
+    """
+    index = find_cusip_tickers(session, companies)
+    resolved: dict[str, str | None] = {}
+    pending: list[CusipTicker] = []
+
+    for cusip, company_name in companies.items():
+        entry = index.get(cusip)
+        if entry is not None and (
+            entry.ticker or not company_name or company_name == entry.company_name
+        ):
+            resolved[cusip] = entry.ticker
+            continue
+        ticker, source = resolve_cusip(cusip, company_name)
+        resolved[cusip] = ticker
+        pending.append(
+            CusipTicker(
+                cusip=cusip, ticker=ticker, company_name=company_name, source=source
+            )
+        )
+
+    if pending:
+        upsert_cusip_tickers(session, pending, commit=commit)
+        logger.debug("CUSIP 索引新增 / 更新 %d 筆", len(pending))
+    return resolved
+
+
+def fill_pending_holding_sectors(session: Session, tickers: set[str]) -> set[int]:
+    """
+    補齊 13F 同步時尚未解析的行業板塊。
+
+    以 prewarm_ticker_sector_batch 並行查詢 yfinance（結果寫入 30 天磁碟快取），
+    再將取得的 sector 回填至 sector 為空的持倉。
+
+    Args:
+        session: Database session
+        tickers: 待解析 sector 的 ticker 集合
+
+    Returns:
+        受影響的大師 ID 集合
+    """
+    prewarm_ticker_sector_batch(sorted(tickers))
+    sectors = {t: s for t, s in get_ticker_sectors_bulk(tickers).items() if s}
+    if not sectors:
+        return set()
+    return fill_missing_holding_sectors(session, sectors)
+
+
 # ---------------------------------------------------------------------------
 # Private helpers
 # ---------------------------------------------------------------------------
 
+# 背景 sector 回填佇列：多筆申報（sync_all / backfill）的待解析 ticker 合併處理，
+# 同一時間僅一條背景執行緒
+_sector_fill_lock = threading.Lock()
+_pending_sector_tickers: set[str] = set()
+_sector_fill_running = False
+
+
+def _schedule_sector_fill(tickers: set[str]) -> None:
+    """將待解析 sector 的 ticker 加入背景回填佇列（必要時啟動背景執行緒）。"""
+    global _sector_fill_running
+    with _sector_fill_lock:
+        _pending_sector_tickers.update(tickers)
+        if _sector_fill_running:
+            return
+        _sector_fill_running = True
+    threading.Thread(target=_run_sector_fill, daemon=True).start()
+
+
+@request_lane(YF_LANE_BACKFILL)
+def _run_sector_fill() -> None:
+    """背景執行緒：持續處理回填佇列直到清空。"""
+    global _sector_fill_running
+    from infrastructure.database import engine
+
+    while True:
+        with _sector_fill_lock:
+            tickers = set(_pending_sector_tickers)
+            _pending_sector_tickers.clear()
+            if not tickers:
+                _sector_fill_running = False
+                return
+        try:
+            with Session(engine) as session:
+                guru_ids = fill_pending_holding_sectors(session, tickers)
+            logger.info(
+                "背景 sector 回填完成：查詢 %d 檔，更新 %d 位大師持倉",
+                len(tickers),
+                len(guru_ids),
+            )
+        except Exception as exc:
+            logger.warning("背景 sector 回填失敗：%s", exc)
+
+
+# 13F 同步 / 回填排程：各大師的 EDGAR 申報清單與持倉明細由執行緒池並行下載
+# （總請求速率仍受 sec_edgar 的 SEC_EDGAR_RATE_LIMIT_CPS 限制器約束），
+# 資料庫寫入於呼叫端 session 進行，僅同一位大師的申報依舊→新串行套用。
+_SYNC_MODE = "sync"
+_BACKFILL_MODE = "backfill"
+
+_sync_progress_lock = threading.Lock()
+_sync_active_runs = 0
+_sync_progress: dict[str, int] = {
+    "total_gurus": 0,
+    "completed_gurus": 0,
+    "total_filings": 0,
+    "completed_filings": 0,
+}
+
+
+def _begin_sync_progress(total_gurus: int) -> None:
+    """開始一次排程；若無其他排程進行中則先重置進度。"""
+    global _sync_active_runs
+    with _sync_progress_lock:
+        if _sync_active_runs == 0:
+            _sync_progress.update(dict.fromkeys(_sync_progress, 0))
+        _sync_active_runs += 1
+        _sync_progress["total_gurus"] += total_gurus
+
+
+def _advance_sync_progress(**deltas: int) -> None:
+    with _sync_progress_lock:
+        for key, delta in deltas.items():
+            _sync_progress[key] += delta
+
+
+def _end_sync_progress() -> None:
+    global _sync_active_runs
+    with _sync_progress_lock:
+        _sync_active_runs -= 1
+
+
+@dataclass
+class _GuruFilingJob:
+    """單一大師的排程狀態：待套用申報佇列（舊→新）與結果。"""
+
+    guru: Guru
+    known_accessions: set[str]
+    queue: deque[tuple[dict, Future]] = field(default_factory=deque)
+    planned: bool = False
+    completed: bool = False
+    result: dict = field(default_factory=dict)
+
+
+def _run_guru_filing_jobs(
+    session: Session,
+    gurus: list[Guru],
+    mode: str,
+    years: int = GURU_BACKFILL_YEARS,
+    today: date | None = None,
+) -> list[dict]:
+    """
+    並行下載、依序套用多位大師的 13F 申報。
+
+    1. 每位大師提交一個「規劃」工作：查詢 EDGAR 申報清單
+    2. 規劃完成後，為每筆待同步申報提交持倉明細下載工作
+    3. 任一下載完成時，套用該大師佇列前端所有已就緒的申報（維持舊→新順序）
+
+    所有大師完成後 Smart Money 物化表只重算一次。
+
+    Returns:
+        依 gurus 順序排列的結果（sync 模式同 sync_guru_filing，
+        backfill 模式同 backfill_guru_filings）
+    """
+    count = 2 if mode == _SYNC_MODE else GURU_BACKFILL_FILING_COUNT
+    cutoff = (today or date.today()) - timedelta(days=years * 365)
+    jobs = [
+        _GuruFilingJob(
+            guru=guru,
+            known_accessions={
+                f.accession_number
+                for f in find_filings_by_guru(
+                    session, guru.id, limit=GURU_BACKFILL_FILING_COUNT
+                )
+            },
+        )
+        for guru in gurus
+    ]
+
+    _begin_sync_progress(len(jobs))
+    try:
+        with (
+            ThreadPoolExecutor(max_workers=GURU_SYNC_MAX_WORKERS) as executor,
+            defer_guru_analytics_refresh(session),
+        ):
+            owners: dict[Future, _GuruFilingJob] = {
+                executor.submit(get_latest_13f_filings, job.guru.cik, count=count): job
+                for job in jobs
+            }
+            pending = set(owners)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                ready: dict[int, _GuruFilingJob] = {}
+                for future in done:
+                    job = owners.pop(future)
+                    if not job.planned:
+                        for edgar_filing in _plan_guru_job(job, future, mode, cutoff):
+                            detail = executor.submit(
+                                fetch_13f_filing_detail,
+                                edgar_filing["accession_number"],
+                                job.guru.cik,
+                            )
+                            job.queue.append((edgar_filing, detail))
+                            owners[detail] = job
+                            pending.add(detail)
+                    ready[job.guru.id] = job
+                for job in ready.values():
+                    _drain_guru_job(session, job, mode)
+    finally:
+        _end_sync_progress()
+
+    return [job.result for job in jobs]
+
+
+def _plan_guru_job(
+    job: _GuruFilingJob, future: Future, mode: str, cutoff: date
+) -> list[dict]:
+    """依 EDGAR 申報清單決定需下載的申報（舊→新），並初始化該大師的結果。"""
+    guru = job.guru
+    job.planned = True
+    try:
+        edgar_filings = future.result()
+    except Exception as exc:
+        logger.warning(
+            "大師同步失敗：%s (ID=%d), error=%s", guru.display_name, guru.id, exc
+        )
+        job.result = {
+            "guru_id": guru.id,
+            "guru_display_name": guru.display_name,
+            "status": "error",
+            "error": str(exc),
+        }
+        if mode == _BACKFILL_MODE:
+            job.result.update(total_filings=0, synced=0, skipped=0, errors=0)
+        return []
+
+    if mode == _SYNC_MODE:
+        if not edgar_filings:
+            logger.warning("EDGAR 無 13F 申報：%s (%s)", guru.display_name, guru.cik)
+            job.result = {
+                "guru_id": guru.id,
+                "guru_display_name": guru.display_name,
+                "status": "error",
+                "error": "no 13F filings found on EDGAR",
+            }
+            return []
+        latest = edgar_filings[0]
+        if latest["accession_number"] in job.known_accessions:
+            job.result = _skipped_filing_result(guru, latest)
+            return []
+        _advance_sync_progress(total_filings=1)
+        return [latest]
+
+    # 升冪排序，讓舊季先同步，diff 鏈方向正確
+    in_window = sorted(
+        (f for f in edgar_filings if date.fromisoformat(f["report_date"]) >= cutoff),
+        key=lambda f: f["report_date"],
+    )
+    new_filings = [
+        f for f in in_window if f["accession_number"] not in job.known_accessions
+    ]
+    job.result = {
+        "guru_id": guru.id,
+        "guru_display_name": guru.display_name,
+        "total_filings": len(in_window),
+        "synced": 0,
+        "skipped": len(in_window) - len(new_filings),
+        "errors": 0,
+    }
+    if not edgar_filings:
+        logger.info("EDGAR 無 13F 申報可回填：%s (%s)", guru.display_name, guru.cik)
+    _advance_sync_progress(total_filings=len(new_filings))
+    return new_filings
+
+
+def _drain_guru_job(session: Session, job: _GuruFilingJob, mode: str) -> None:
+    """
+    套用佇列前端已下載完成的申報；佇列清空時標記該大師完成。
+
+    寫入每 GURU_FILING_COMMIT_BATCH 筆申報 commit 一次，離開前 commit 剩餘部分
+    （等待下載期間不持有未 commit 的寫入）。某筆申報寫入失敗時 rollback，
+    同批尚未 commit 的申報一併記為錯誤。
+    """
+    if job.completed:
+        return
+    guru = job.guru
+    batch: list[dict] = []
+    pending_sectors: set[str] = set()
+    while job.queue and job.queue[0][1].done():
+        edgar_filing, detail = job.queue.popleft()
+        _advance_sync_progress(completed_filings=1)
+        accession_number = edgar_filing["accession_number"]
+        # 重新檢查冪等：其他排程可能已於下載期間寫入同一申報
+        if find_filing_by_accession(session, accession_number):
+            _tally_filing_result(job, mode, _skipped_filing_result(guru, edgar_filing))
+            continue
+        try:
+            raw_holdings = detail.result()
+        except Exception as exc:
+            logger.warning(
+                "下載申報失敗：%s %s, error=%s",
+                guru.display_name,
+                accession_number,
+                exc,
+            )
+            _tally_filing_result(job, mode, _filing_error_result(guru, exc))
+            continue
+        try:
+            batch.append(
+                _apply_filing(
+                    session,
+                    guru,
+                    edgar_filing,
+                    raw_holdings,
+                    deferred_sectors=pending_sectors,
+                )
+            )
+        except Exception as exc:
+            logger.warning(
+                "同步申報失敗：%s %s, error=%s",
+                guru.display_name,
+                accession_number,
+                exc,
+            )
+            session.rollback()
+            for result in [*batch, _filing_error_result(guru, exc)]:
+                if result["status"] == "synced":
+                    result = _filing_error_result(guru, exc)
+                _tally_filing_result(job, mode, result)
+            batch.clear()
+            pending_sectors.clear()
+            continue
+        if len(batch) >= GURU_FILING_COMMIT_BATCH:
+            _commit_filing_batch(session, job, mode, batch, pending_sectors)
+    _commit_filing_batch(session, job, mode, batch, pending_sectors)
+
+    if job.queue:
+        return
+    job.completed = True
+    _advance_sync_progress(completed_gurus=1)
+    if mode == _BACKFILL_MODE and "status" not in job.result:
+        logger.info(
+            "13F 回填完成：%s，窗口內 %d 筆，已同步 %d，跳過 %d，錯誤 %d",
+            guru.display_name,
+            job.result["total_filings"],
+            job.result["synced"],
+            job.result["skipped"],
+            job.result["errors"],
+        )
+
+
+def _commit_filing_batch(
+    session: Session,
+    job: _GuruFilingJob,
+    mode: str,
+    batch: list[dict],
+    pending_sectors: set[str],
+) -> None:
+    """commit 已套用的申報並計入結果，再排程背景 sector 回填；commit 失敗時整批記為錯誤。"""
+    if not batch:
+        return
+    try:
+        session.commit()
+    except Exception as exc:
+        logger.warning(
+            "申報批次寫入失敗：%s，%d 筆，error=%s",
+            job.guru.display_name,
+            len(batch),
+            exc,
+        )
+        session.rollback()
+        batch[:] = [
+            _filing_error_result(job.guru, exc)
+            if result["status"] == "synced"
+            else result
+            for result in batch
+        ]
+    else:
+        # 背景回填使用獨立 session，須於 commit 後排程才讀得到新持倉
+        if pending_sectors:
+            _schedule_sector_fill(set(pending_sectors))
+    for result in batch:
+        _tally_filing_result(job, mode, result)
+    batch.clear()
+    pending_sectors.clear()
+
+
+def _tally_filing_result(job: _GuruFilingJob, mode: str, result: dict) -> None:
+    """將單筆申報結果計入該大師的排程結果。"""
+    if mode == _SYNC_MODE:
+        job.result = result
+    elif result["status"] == "synced":
+        job.result["synced"] += 1
+    elif result["status"] == "skipped":
+        job.result["skipped"] += 1
+    else:
+        job.result["errors"] += 1
+
+
+def _filing_error_result(guru: Guru, exc: Exception) -> dict:
+    """申報同步失敗的 error 回傳 dict。"""
+    return {
+        "guru_id": guru.id,
+        "guru_display_name": guru.display_name,
+        "status": "error",
+        "error": str(exc),
+    }
+
 
 def _sync_single_filing(session: Session, guru: Guru, edgar_filing_dict: dict) -> dict:
     """
@@ -470,17 +868,41 @@ def _sync_single_filing(session: Session, guru: Guru, edgar_filing_dict: dict) -
         logger.debug(
             "13F 申報已存在，跳過同步：%s %s", guru.display_name, accession_number
         )
-        return {
-            "guru_id": guru.id,
-            "guru_display_name": guru.display_name,
-            "status": "skipped",
-            "accession_number": accession_number,
-            "report_date": edgar_filing_dict["report_date"],
-            "filing_date": edgar_filing_dict["filing_date"],
-        }
+        return _skipped_filing_result(guru, edgar_filing_dict)
 
     # 下載並解析持倉明細
     raw_holdings = fetch_13f_filing_detail(accession_number, guru.cik)
+    return _apply_filing(session, guru, edgar_filing_dict, raw_holdings)
+
+
+def _skipped_filing_result(guru: Guru, edgar_filing_dict: dict) -> dict:
+    """已同步申報的 skipped 回傳 dict。"""
+    return {
+        "guru_id": guru.id,
+        "guru_display_name": guru.display_name,
+        "status": "skipped",
+        "accession_number": edgar_filing_dict["accession_number"],
+        "report_date": edgar_filing_dict["report_date"],
+        "filing_date": edgar_filing_dict["filing_date"],
+    }
+
+
+def _apply_filing(
+    session: Session,
+    guru: Guru,
+    edgar_filing_dict: dict,
+    raw_holdings: list[dict],
+    deferred_sectors: set[str] | None = None,
+) -> dict:
+    """
+    將已下載的 13F 持倉明細寫入資料庫（前季 diff、GuruFiling + GuruHolding）。
+
+    同一位大師的申報必須依 report_date 舊→新呼叫，diff 鏈才會正確。
+    deferred_sectors 非 None 時寫入僅 flush 不 commit，待解析 sector 的 ticker
+    累積至該集合，由呼叫端 commit 後再排程背景回填。
+    """
+    commit = deferred_sectors is None
+    accession_number = edgar_filing_dict["accession_number"]
     if not raw_holdings:
         logger.warning(
             "13F 持倉明細解析失敗：%s %s", guru.display_name, accession_number
@@ -510,13 +932,26 @@ def _sync_single_filing(session: Session, guru: Guru, edgar_filing_dict: dict) -
             holdings_count=len(raw_holdings),
             filing_url=edgar_filing_dict.get("filing_url", ""),
         ),
+        commit=commit,
     )
 
     # 組裝並分類 GuruHolding 列表（含前季完全消失的 SOLD_OUT）
-    holdings = _build_holdings(
-        raw_holdings, filing, guru, prev_holdings_map, total_value
+    holdings, pending_sectors = _build_holdings(
+        session,
+        raw_holdings,
+        filing,
+        guru,
+        prev_holdings_map,
+        total_value,
+        commit=commit,
     )
-    save_holdings_batch(session, holdings)
+    save_holdings_batch(session, holdings, guru_id=guru.id, commit=commit)
+
+    # 快取與靜態對照表皆未命中的 sector 於申報寫入後在背景補齊，不阻塞同步
+    if deferred_sectors is not None:
+        deferred_sectors |= pending_sectors
+    elif pending_sectors:
+        _schedule_sector_fill(pending_sectors)
 
     summary = _build_summary(guru, filing, holdings)
     logger.info(
@@ -553,36 +988,34 @@ def _snapshot_prev_holdings(session: Session, guru_id: int) -> dict[str, float]:
 
 
 def _build_holdings(
+    session: Session,
     raw_holdings: list[dict],
     filing: GuruFiling,
     guru: Guru,
     prev_map: dict[str, float],
     total_value: float,
-) -> list[GuruHolding]:
+    *,
+    commit: bool = True,
+) -> tuple[list[GuruHolding], set[str]]:
     """
     將 EDGAR 原始持倉列表轉換為 GuruHolding 物件，含分類與計算。
 
     同時處理前季有但本季完全消失的 CUSIP（SOLD_OUT），
     這類倉位不出現在 EDGAR XML 中，需從 prev_map 補充建立。
-    """
-    # Pass 1 — 解析所有 CUSIP → ticker 映射（含本季 + 前季清倉）
-    current_cusips: set[str] = set()
-    cusip_to_ticker: dict[str, str | None] = {}
-
-    for raw in raw_holdings:
-        cusip = raw["cusip"]
-        current_cusips.add(cusip)
-        cusip_to_ticker[cusip] = map_cusip_to_ticker(cusip, raw["company_name"])
 
-    for cusip in prev_map:
-        if cusip not in current_cusips:
-            cusip_to_ticker[cusip] = map_cusip_to_ticker(cusip, "")
+    Returns:
+        (holdings, 尚待解析 sector 的 ticker 集合)
+    """
+    # Pass 1 — 批次解析所有 CUSIP → ticker 映射（含本季 + 前季清倉）
+    current_cusips = {raw["cusip"] for raw in raw_holdings}
+    companies = dict.fromkeys(prev_map, "")
+    companies.update((raw["cusip"], raw["company_name"]) for raw in raw_holdings)
+    cusip_to_ticker = resolve_many_cusips(session, companies, commit=commit)
 
-    # Pass 2 — 批次解析 sector（每個唯一 ticker 只呼叫一次 get_ticker_sector）
+    # Pass 2 — 批次解析 sector（磁碟快取 + 靜態對照表，不發起 yfinance 請求）
     unique_tickers = {t for t in cusip_to_ticker.values() if t}
-    ticker_to_sector: dict[str, str | None] = {
-        t: get_ticker_sector(t) for t in unique_tickers
-    }
+    ticker_to_sector = get_ticker_sectors_bulk(unique_tickers)
+    pending_sectors = unique_tickers - ticker_to_sector.keys()
 
     holdings = []
 
@@ -638,7 +1071,7 @@ def _build_holdings(
                 )
             )
 
-    return holdings
+    return holdings, pending_sectors
 
 
 def _build_summary(guru: Guru, filing: GuruFiling, holdings: list[GuruHolding]) -> dict:
@@ -4,11 +4,15 @@ Application — Stock Service：股票 CRUD、匯入匯出、護城河查詢。
 
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import UTC, datetime
 
-from cachetools import TTLCache
 from sqlmodel import Session
 
-from domain.analysis import determine_scan_signal
+from domain.analysis import (
+    PriceSeries,
+    compute_data_age_seconds,
+    determine_scan_signal,
+)
 from domain.constants import (
     DEFAULT_IMPORT_CATEGORY,
     ENRICHED_CACHE_MAXSIZE,
@@ -36,10 +40,12 @@ from infrastructure.market_data import (
     get_technical_signals,
     get_ticker_sector_cached,
     get_tw_volatility_index,
+    prewarm_quote_batch,
 )
 from infrastructure.market_data import (
     get_price_history as _get_price_history,
 )
+from infrastructure.shared_cache import SharedCache
 from logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -87,6 +93,15 @@ def _str_to_tags(s: str) -> list[str]:
     return [tag.strip() for tag in s.split(",") if tag.strip()] if s else []
 
 
+def _category_value(stock: Stock) -> str:
+    """取得股票分類字串（相容 Enum 與純字串）。"""
+    return (
+        stock.category.value
+        if hasattr(stock.category, "value")
+        else str(stock.category)
+    )
+
+
 # ---------------------------------------------------------------------------
 # 共用內部工具
 # ---------------------------------------------------------------------------
@@ -573,9 +588,10 @@ def get_moat_for_ticker(session: Session, ticker: str) -> dict:
 # Batch Enriched Stocks（一次回傳所有股票 + 訊號 / 財報 / 股息）
 # ---------------------------------------------------------------------------
 
-# 短效快取，避免同一時間多個前端請求（Dashboard 多個元件）重複執行完整 yfinance 呼叫。
-_enriched_cache: TTLCache = TTLCache(
-    maxsize=ENRICHED_CACHE_MAXSIZE, ttl=ENRICHED_CACHE_TTL
+# 短效快取，避免同一時間多個前端請求（Dashboard 多個元件）重複執行完整 yfinance 呼叫；
+# 經主機共享層讓多個 uvicorn worker 共用同一份結果。
+_enriched_cache = SharedCache(
+    "enriched", maxsize=ENRICHED_CACHE_MAXSIZE, ttl=ENRICHED_CACHE_TTL
 )
 _enriched_cache_lock = threading.Lock()
 # 防止 thundering herd：快取未命中時，後續並行請求等待第一個請求完成後共享結果。
@@ -649,8 +665,8 @@ def get_enriched_stocks(session: Session) -> list[dict]:
             _enriched_in_progress = None
         raise
 
+    _enriched_cache.set(_cache_key, result)
     with _enriched_cache_lock:
-        _enriched_cache[_cache_key] = result
         if _enriched_in_progress is not None:
             _enriched_in_progress.set()
         _enriched_in_progress = None
@@ -666,9 +682,7 @@ def _compute_enriched_stocks(stocks: list[Stock]) -> list[dict]:
     for stock in stocks:
         enriched[stock.ticker] = {
             "ticker": stock.ticker,
-            "category": stock.category.value
-            if hasattr(stock.category, "value")
-            else str(stock.category),
+            "category": _category_value(stock),
             "current_thesis": stock.current_thesis,
             "current_tags": _str_to_tags(stock.current_tags),
             "display_order": stock.display_order,
@@ -686,8 +700,27 @@ def _compute_enriched_stocks(stocks: list[Stock]) -> list[dict]:
             "rsi": None,
             "market_cap": None,
             "trailing_pe": None,
+            "data_age_seconds": None,
         }
 
+    # 先以多檔 quote 批次填充財報日 / 不配息標的股息快取，
+    # 下方逐檔呼叫對已預熱的標的直接命中 L1，只有 quote 無法提供的欄位才逐檔查詢。
+    quote_tickers = [
+        stock.ticker
+        for stock in stocks
+        if _category_value(stock) != StockCategory.CRYPTO.value
+    ]
+    dividend_tickers = [
+        stock.ticker
+        for stock in stocks
+        if _category_value(stock) not in _SKIP_DIVIDEND_CATEGORIES
+        and _category_value(stock) != StockCategory.CRYPTO.value
+    ]
+    try:
+        prewarm_quote_batch(quote_tickers, dividend_tickers)
+    except Exception as exc:
+        logger.warning("多檔 quote 批次預熱失敗，改為逐檔查詢：%s", exc)
+
     def _fetch_enrichment(
         ticker: str, cat_value: str, coingecko_id: str | None
     ) -> tuple[str, dict | None, dict | None, dict | None, dict | None]:
@@ -746,9 +779,7 @@ def _compute_enriched_stocks(stocks: list[Stock]) -> list[dict]:
             executor.submit(
                 _fetch_enrichment,
                 stock.ticker,
-                stock.category.value
-                if hasattr(stock.category, "value")
-                else str(stock.category),
+                _category_value(stock),
                 stock.coingecko_id,
             ): stock.ticker
             for stock in stocks
@@ -768,6 +799,10 @@ def _compute_enriched_stocks(stocks: list[Stock]) -> list[dict]:
                     enriched[ticker]["price"] = (signals or {}).get("price")
                     enriched[ticker]["change_pct"] = (signals or {}).get("change_pct")
                     enriched[ticker]["rsi"] = (signals or {}).get("rsi")
+                    # 訊號可能為 stale-while-revalidate 回傳的舊值：標示資料年齡
+                    enriched[ticker]["data_age_seconds"] = compute_data_age_seconds(
+                        (signals or {}).get("fetched_at"), datetime.now(UTC)
+                    )
                     # Hybrid loading: quick-scan metrics also exposed at top-level.
                     enriched[ticker]["market_cap"] = (fundamentals or {}).get(
                         "market_cap"
@@ -819,8 +854,11 @@ def get_signals_for_ticker(ticker: str) -> dict | None:
 
 
 def get_price_history(ticker: str) -> list[dict] | None:
-    """Fetch price history for charting."""
-    return _get_price_history(ticker)
+    """Fetch price history for charting (PriceSeries → list-of-dict at the API edge)."""
+    history = _get_price_history(ticker)
+    if isinstance(history, PriceSeries):
+        return history.to_points()
+    return history
 
 
 def get_earnings_for_ticker(ticker: str) -> dict | None:
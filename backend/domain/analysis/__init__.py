@@ -8,6 +8,7 @@ from domain.analysis.analysis import (  # noqa: F401
     compute_bias_percentile,
     compute_composite_fear_greed,
     compute_daily_change_pct,
+    compute_data_age_seconds,
     compute_moving_average,
     compute_rsi,
     compute_signal_duration,
@@ -33,6 +34,7 @@ from domain.analysis.backtest import (  # noqa: F401
     BacktestSignalEvent,
     classify_confidence,
     compute_forward_returns,
+    compute_forward_returns_batch,
     compute_signal_metrics,
     deduplicate_signal_events,
     replay_historical_signals,
@@ -54,6 +56,17 @@ from domain.analysis.guru_backtest import (  # noqa: F401
     compute_clone_returns,
     compute_quarter_return,
 )
+from domain.analysis.indicators import (  # noqa: F401
+    IndicatorSeries,
+    compute_indicator_series,
+    rolling_moving_average,
+    rolling_rsi,
+    rolling_volume_ratio,
+)
+from domain.analysis.price_series import (  # noqa: F401
+    PriceSeries,
+    as_price_series,
+)
 from domain.analysis.smart_money import (  # noqa: F401
     classify_holding_change,
     compute_change_pct,
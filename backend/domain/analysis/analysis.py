@@ -785,3 +785,24 @@ def compute_signal_duration(
         signal_since = signal_since.replace(tzinfo=UTC)
     delta = now - signal_since
     return delta.days, delta.total_seconds() < SECONDS_PER_DAY
+
+
+def compute_data_age_seconds(
+    fetched_at: str | None,
+    now: datetime,
+) -> int | None:
+    """
+    由 ISO 8601 取得時間計算資料年齡（秒），供 UI 顯示報價新鮮度。
+
+    自動處理 naive datetime（補 UTC tzinfo）；未來時間視為 0。
+    fetched_at 為 None 或無法解析時回傳 None。純函式，無副作用。
+    """
+    if not fetched_at:
+        return None
+    try:
+        fetched = datetime.fromisoformat(fetched_at)
+    except (TypeError, ValueError):
+        return None
+    if fetched.tzinfo is None:
+        fetched = fetched.replace(tzinfo=UTC)
+    return max(int((now - fetched).total_seconds()), 0)
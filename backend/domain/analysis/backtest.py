@@ -5,17 +5,12 @@ Domain — Backtesting pure calculation helpers.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import date, datetime
 from statistics import median
 from typing import TYPE_CHECKING
 
-from domain.analysis.analysis import (
-    compute_bias,
-    compute_moving_average,
-    compute_rsi,
-    compute_volume_ratio,
-    determine_scan_signal,
-)
+from domain.analysis.analysis import compute_bias, determine_scan_signal
+from domain.analysis.indicators import compute_indicator_series
+from domain.analysis.price_series import PriceSeries, as_price_series
 from domain.constants import (
     BACKFILL_DEFAULT_MOAT,
     BACKFILL_MARKET_STATUS,
@@ -24,13 +19,13 @@ from domain.constants import (
     BACKTEST_MIN_SAMPLES_HIGH,
     BACKTEST_MIN_SAMPLES_MEDIUM,
     BACKTEST_WINDOWS,
-    MA60_WINDOW,
     MA200_WINDOW,
 )
 from domain.enums import ScanSignal
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
+    from datetime import date, datetime
 
 
 @dataclass(frozen=True)
@@ -76,67 +71,60 @@ def deduplicate_signal_events(
     return deduped
 
 
-def _price_date(price_point: dict) -> date:
-    return date.fromisoformat(str(price_point["date"]))
-
-
-def _price_close(price_point: dict) -> float:
-    return float(price_point["close"])
-
-
-def _price_volume(price_point: dict) -> float | None:
-    value = price_point.get("volume")
-    if value is None:
-        return None
-    return float(value)
-
-
-def _find_start_index(signal_date: date, sorted_prices: Sequence[dict]) -> int | None:
-    """
-    Find the first trading day index on/after signal_date.
-    """
-    for idx, point in enumerate(sorted_prices):
-        if _price_date(point) >= signal_date:
-            return idx
-    return None
-
-
 def compute_forward_returns(
     signal_date: date,
-    price_series: Sequence[dict],
+    price_series: PriceSeries | Sequence[dict],
     windows: Sequence[int] | None = None,
     already_sorted: bool = False,
 ) -> dict[int, float | None]:
     """
     Compute forward returns by trading-day index (not calendar days).
+
+    Accepts a PriceSeries (sorted once at construction, looked up by bisect) or
+    a legacy list of {"date", "close"} points. ``already_sorted`` is kept for
+    backwards compatibility; PriceSeries is always sorted.
     """
-    target_windows = list(windows or BACKTEST_WINDOWS)
-    if not price_series:
-        return dict.fromkeys(target_windows)
+    return compute_forward_returns_batch([signal_date], price_series, windows)[0]
 
-    sorted_prices = (
-        price_series if already_sorted else sorted(price_series, key=_price_date)
-    )
-    start_idx = _find_start_index(signal_date, sorted_prices)
-    if start_idx is None:
-        return dict.fromkeys(target_windows)
 
-    entry_price = _price_close(sorted_prices[start_idx])
-    if entry_price <= 0:
-        return dict.fromkeys(target_windows)
+def compute_forward_returns_batch(
+    signal_dates: Sequence[date],
+    price_series: PriceSeries | Sequence[dict],
+    windows: Sequence[int] | None = None,
+) -> list[dict[int, float | None]]:
+    """
+    Compute forward returns for many signal dates of one ticker at once.
 
-    returns: dict[int, float | None] = {}
+    All signal dates are mapped to trading-day indices in a single merge pass
+    over the series (dates ascending, as produced by the scan log query); each
+    window is then evaluated column-wise against the shared close array.
+    Returns one {window: return_pct | None} dict per signal date, in input order.
+    """
+    target_windows = list(windows or BACKTEST_WINDOWS)
+    series = as_price_series(price_series)
+    closes = series.closes
+    size = len(closes)
+    start_indices = series.indices_on_or_after(signal_dates)
+
+    columns: list[list[float | None]] = []
     for window in target_windows:
-        exit_idx = start_idx + window
-        if exit_idx >= len(sorted_prices):
-            returns[window] = None
-            continue
-        exit_price = _price_close(sorted_prices[exit_idx])
-        if exit_price <= 0:
-            returns[window] = None
-            continue
-        returns[window] = round((exit_price / entry_price - 1) * 100, 4)
-    return returns
+        column: list[float | None] = []
+        for start_idx in start_indices:
+            if start_idx is None or start_idx + window >= size:
+                column.append(None)
+                continue
+            entry_price = closes[start_idx]
+            exit_price = closes[start_idx + window]
+            if entry_price <= 0 or exit_price <= 0:
+                column.append(None)
+                continue
+            column.append(round((exit_price / entry_price - 1) * 100, 4))
+        columns.append(column)
+
+    return [
+        dict(zip(target_windows, row, strict=True))
+        for row in zip(*columns, strict=True)
+    ]
 
 
 def classify_confidence(sample_count: int) -> str:
@@ -147,80 +135,74 @@ def classify_confidence(sample_count: int) -> str:
     return "low"
 
 
-def _is_hit(signal_type: str, return_pct: float) -> bool:
+def _is_direction_hit(direction: str, return_pct: float) -> bool:
     """A flat (0%) return is conservatively treated as a miss for both directions."""
-    direction = SIGNAL_DIRECTION.get(signal_type, "buy")
     if direction == "sell":
         return return_pct < 0
     return return_pct > 0
 
 
+def _summarize_window(window: int, values: list[float], direction: str) -> dict:
+    sample_count = len(values)
+    if sample_count == 0:
+        return {
+            "window_days": window,
+            "hit_rate": 0.0,
+            "avg_return_pct": 0.0,
+            "median_return_pct": 0.0,
+            "sample_count": 0,
+        }
+    hits = sum(1 for value in values if _is_direction_hit(direction, value))
+    return {
+        "window_days": window,
+        "hit_rate": round(hits / sample_count, 4),
+        "avg_return_pct": round(sum(values) / sample_count, 4),
+        "median_return_pct": round(float(median(values)), 4),
+        "sample_count": sample_count,
+    }
+
+
 def compute_signal_metrics(
     forward_returns: Sequence[dict[int, float | None]],
     signal_type: str,
 ) -> dict:
     """
     Aggregate backtest metrics per window for a single signal type.
-    """
-    windows = sorted(
-        set(BACKTEST_WINDOWS) | {window for item in forward_returns for window in item}
-    )
-    window_metrics: list[dict] = []
-
-    for window in windows:
-        values: list[float] = [
-            float(item[window])
-            for item in forward_returns
-            if window in item and item[window] is not None
-        ]
-        sample_count = len(values)
-        if sample_count == 0:
-            window_metrics.append(
-                {
-                    "window_days": window,
-                    "hit_rate": 0.0,
-                    "avg_return_pct": 0.0,
-                    "median_return_pct": 0.0,
-                    "sample_count": 0,
-                }
-            )
-            continue
 
-        hits = sum(1 for value in values if _is_hit(signal_type, value))
-        window_metrics.append(
-            {
-                "window_days": window,
-                "hit_rate": round(hits / sample_count, 4),
-                "avg_return_pct": round(sum(values) / sample_count, 4),
-                "median_return_pct": round(float(median(values)), 4),
-                "sample_count": sample_count,
-            }
-        )
-
-    fp_values: list[float] = [
-        float(item[BACKTEST_FP_WINDOW])
-        for item in forward_returns
-        if BACKTEST_FP_WINDOW in item and item[BACKTEST_FP_WINDOW] is not None
-    ]
-    fp_sample_count = len(fp_values)
-    if fp_sample_count == 0:
+    The per-event return dicts are transposed into per-window columns in one
+    pass, so each window's hit rate / mean / median is computed once over a
+    flat list instead of re-scanning every event per window.
+    """
+    direction = SIGNAL_DIRECTION.get(signal_type, "buy")
+    columns: dict[int, list[float]] = {window: [] for window in BACKTEST_WINDOWS}
+    for item in forward_returns:
+        for window, value in item.items():
+            column = columns.setdefault(window, [])
+            if value is not None:
+                column.append(float(value))
+
+    fp_values = columns.get(BACKTEST_FP_WINDOW, [])
+    if not fp_values:
         false_positive_rate = 0.0
     else:
-        hits = sum(1 for value in fp_values if _is_hit(signal_type, value))
-        false_positive_rate = round(1 - hits / fp_sample_count, 4)
+        hits = sum(1 for value in fp_values if _is_direction_hit(direction, value))
+        false_positive_rate = round(1 - hits / len(fp_values), 4)
 
     return {
         "signal": signal_type,
-        "direction": SIGNAL_DIRECTION.get(signal_type, "buy"),
+        "direction": direction,
         "total_occurrences": len(forward_returns),
         "confidence": classify_confidence(len(forward_returns)),
-        "windows": window_metrics,
+        "windows": [
+            _summarize_window(window, columns[window], direction)
+            for window in sorted(columns)
+        ],
         "false_positive_rate": false_positive_rate,
     }
 
 
 def replay_historical_signals(
-    price_series: Sequence[dict],
+    price_series: PriceSeries | Sequence[dict],
     category: str,
     sample_interval: int = BACKFILL_SAMPLE_INTERVAL,
     include_normal: bool = False,
@@ -231,12 +213,16 @@ def replay_historical_signals(
     Returns sampled (date, signal) events every N trading days.
     By default NORMAL events are filtered out; set include_normal=True to retain
     full state transitions.
+
+    Indicators are computed once for the whole series by the rolling engine
+    (O(n)) and then sampled, instead of recomputing every prefix.
     """
     if len(price_series) < MA200_WINDOW:
         return []
 
-    sorted_prices = sorted(price_series, key=_price_date)
-    closes = [_price_close(point) for point in sorted_prices]
+    series = as_price_series(price_series)
+    closes = series.closes.tolist()
+    indicators = compute_indicator_series(closes, series.volumes)
     start_idx = MA200_WINDOW - 1
     if sample_interval <= 0:
         sample_interval = BACKFILL_SAMPLE_INTERVAL
@@ -244,33 +230,23 @@ def replay_historical_signals(
     events: list[tuple[date, str]] = []
     for idx in range(start_idx, len(closes), sample_interval):
         current_price = closes[idx]
-        prefix = closes[: idx + 1]
-
-        rsi = compute_rsi(prefix)
-        ma60 = compute_moving_average(prefix, MA60_WINDOW)
-        ma200 = compute_moving_average(prefix, MA200_WINDOW)
+        ma60 = indicators.ma60[idx]
+        ma200 = indicators.ma200[idx]
         bias = compute_bias(current_price, ma60) if ma60 is not None else None
         bias_200 = compute_bias(current_price, ma200) if ma200 is not None else None
-        prefix_points = sorted_prices[: idx + 1]
-        volumes = [_price_volume(point) for point in prefix_points]
-        volume_ratio = (
-            None
-            if any(volume is None for volume in volumes)
-            else compute_volume_ratio([float(volume) for volume in volumes])
-        )
 
         signal = determine_scan_signal(
             moat=BACKFILL_DEFAULT_MOAT,
-            rsi=rsi,
+            rsi=indicators.rsi[idx],
             bias=bias,
             bias_200=bias_200,
             category=category,
-            volume_ratio=volume_ratio,
+            volume_ratio=indicators.volume_ratio[idx],
             market_status=BACKFILL_MARKET_STATUS,
         ).value
         if not include_normal and signal == ScanSignal.NORMAL.value:
             continue
 
-        events.append((_price_date(sorted_prices[idx]), signal))
+        events.append((series.date_at(idx), signal))
 
     return events
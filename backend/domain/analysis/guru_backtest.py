@@ -5,7 +5,13 @@ Domain — Guru 13F backtesting pure calculation helpers.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import date
+from datetime import date, timedelta
+from typing import TYPE_CHECKING
+
+from domain.analysis.price_series import PriceSeries, as_price_series
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
 
 
 @dataclass(frozen=True)
@@ -37,36 +43,16 @@ class QuarterResult:
     holdings_count: int
 
 
-def _point_date(point: dict) -> date:
-    return date.fromisoformat(str(point["date"]))
-
-
-def _point_close(point: dict) -> float:
-    return float(point["close"])
-
+def _first_close_on_or_after(series: PriceSeries, target: date) -> float | None:
+    return series.first_close_on_or_after(target)
 
-def _first_close_on_or_after(series: list[dict], target: date) -> float | None:
-    for point in series:
-        if _point_date(point) >= target:
-            close = _point_close(point)
-            if close > 0:
-                return close
-    return None
 
-
-def _latest_close_on_or_before(series: list[dict], target: date) -> float | None:
-    latest: float | None = None
-    for point in series:
-        if _point_date(point) > target:
-            break
-        close = _point_close(point)
-        if close > 0:
-            latest = close
-    return latest
+def _latest_close_on_or_before(series: PriceSeries, target: date) -> float | None:
+    return series.last_close_on_or_before(target)
 
 
 def _compute_security_return(
-    series: list[dict],
+    series: PriceSeries,
     entry_date: date,
     exit_date: date,
 ) -> float | None:
@@ -86,7 +72,7 @@ def compute_alpha(clone_return_pct: float, benchmark_return_pct: float) -> float
 
 def compute_quarter_return(
     holdings: list[HoldingSnapshot],
-    price_data: dict[str, list[dict]],
+    price_data: Mapping[str, PriceSeries | list[dict]],
     entry_date: str,
     exit_date: str,
 ) -> float:
@@ -106,6 +92,7 @@ def compute_quarter_return(
         series = price_data.get(holding.ticker)
         if not series:
             continue
+        series = as_price_series(series)
         security_return = _compute_security_return(series, entry_dt, exit_dt)
         if security_return is None:
             continue
@@ -118,7 +105,7 @@ def compute_quarter_return(
 
 
 def _compute_benchmark_return(
-    benchmark_prices: list[dict],
+    benchmark_prices: PriceSeries,
     entry_date: str,
     exit_date: str,
 ) -> float:
@@ -133,7 +120,7 @@ def _compute_benchmark_return(
 
 def _compute_clone_return_on_date(
     holdings: list[HoldingSnapshot],
-    price_data: dict[str, list[dict]],
+    price_data: Mapping[str, PriceSeries | list[dict]],
     entry_dt: date,
     current_dt: date,
 ) -> float:
@@ -144,6 +131,7 @@ def _compute_clone_return_on_date(
         series = price_data.get(holding.ticker)
         if not series:
             continue
+        series = as_price_series(series)
 
         entry_close = _first_close_on_or_after(series, entry_dt)
         current_close = _latest_close_on_or_before(series, current_dt)
@@ -161,8 +149,8 @@ def _compute_clone_return_on_date(
 
 def compute_clone_returns(
     quarter_inputs: list[QuarterInput],
-    price_data: dict[str, list[dict]],
-    benchmark_prices: list[dict],
+    price_data: Mapping[str, PriceSeries | list[dict]],
+    benchmark_prices: PriceSeries | list[dict],
 ) -> dict:
     """
     Compute quarter-level returns and cumulative series for guru clone portfolio.
@@ -181,7 +169,11 @@ def compute_clone_returns(
         }
 
     sorted_quarters = sorted(quarter_inputs, key=lambda q: q.filing_date)
-    benchmark_sorted = sorted(benchmark_prices, key=_point_date)
+    benchmark_sorted = as_price_series(benchmark_prices)
+    # 統一轉為 PriceSeries 一次，之後逐日估值皆為二分搜尋
+    price_data = {
+        ticker: as_price_series(series) for ticker, series in price_data.items()
+    }
 
     quarter_results: list[QuarterResult] = []
     clone_cumulative_multiplier = 1.0
@@ -196,7 +188,7 @@ def compute_clone_returns(
         if idx + 1 < len(sorted_quarters):
             exit_date = sorted_quarters[idx + 1].filing_date
         elif benchmark_sorted:
-            exit_date = str(_point_date(benchmark_sorted[-1]))
+            exit_date = str(benchmark_sorted.date_at(-1))
         else:
             exit_date = entry_date
 
@@ -229,16 +221,12 @@ def compute_clone_returns(
 
         entry_dt = date.fromisoformat(entry_date)
         exit_dt = date.fromisoformat(exit_date)
-        for point in benchmark_sorted:
-            point_dt = _point_date(point)
-            if point_dt < entry_dt:
-                continue
-            if idx + 1 < len(sorted_quarters):
-                if point_dt >= exit_dt:
-                    break
-            elif point_dt > exit_dt:
-                break
-
+        # 以二分搜尋取得本季區間內的基準交易日（最後一季含出場日）
+        if idx + 1 < len(sorted_quarters):
+            window = benchmark_sorted.between(entry_dt, exit_dt - timedelta(days=1))
+        else:
+            window = benchmark_sorted.between(entry_dt, exit_dt)
+        for point_dt in window.dates:
             quarter_clone_on_date = _compute_clone_return_on_date(
                 holdings=quarter.holdings,
                 price_data=price_data,
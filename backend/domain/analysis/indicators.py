@@ -0,0 +1,141 @@
+"""
+Domain — 滾動技術指標引擎。
+單次線性掃描輸出完整指標序列（RSI、MA60、MA200、量比），
+序列第 i 筆等同於對前綴 values[: i + 1] 呼叫 analysis.py 的單點函式。
+
+供歷史回放（replay_historical_signals）與掃描紀錄回填使用，
+避免每個取樣點都重算整段前綴造成的 O(n²)。
+純函式，無副作用；僅使用標準函式庫（domain 層不引入 NumPy）。
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from domain.constants import (
+    MA60_WINDOW,
+    MA200_WINDOW,
+    RSI_PERIOD,
+    VOLUME_RATIO_LONG_DAYS,
+    VOLUME_RATIO_SHORT_DAYS,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+@dataclass(frozen=True)
+class IndicatorSeries:
+    """與輸入收盤價逐筆對齊的指標序列；資料不足的位置為 None。"""
+
+    rsi: list[float | None]
+    ma60: list[float | None]
+    ma200: list[float | None]
+    volume_ratio: list[float | None]
+
+
+def rolling_rsi(
+    closes: Sequence[float], period: int = RSI_PERIOD
+) -> list[float | None]:
+    """
+    Wilder's Smoothed RSI 的完整序列。
+    第 i 筆與 compute_rsi(closes[: i + 1]) 相同（同樣的種子與平滑遞迴，結果逐位一致）。
+    """
+    n = len(closes)
+    result: list[float | None] = [None] * n
+    if n < period + 1:
+        return result
+
+    gain_sum = 0.0
+    loss_sum = 0.0
+    for i in range(1, period + 1):
+        delta = closes[i] - closes[i - 1]
+        gain_sum += delta if delta > 0 else 0.0
+        loss_sum += -delta if delta < 0 else 0.0
+    avg_gain = gain_sum / period
+    avg_loss = loss_sum / period
+    result[period] = _rsi_value(avg_gain, avg_loss)
+
+    for i in range(period + 1, n):
+        delta = closes[i] - closes[i - 1]
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
+        result[i] = _rsi_value(avg_gain, avg_loss)
+    return result
+
+
+def _rsi_value(avg_gain: float, avg_loss: float) -> float:
+    if avg_loss == 0:
+        return 100.0
+    rs = avg_gain / avg_loss
+    return round(100.0 - (100.0 / (1.0 + rs)), 2)
+
+
+def _rolling_mean(values: Sequence[float], window: int) -> list[float | None]:
+    """以累加/扣除的滑動總和計算簡單移動平均（未四捨五入）。"""
+    n = len(values)
+    result: list[float | None] = [None] * n
+    if window <= 0 or n < window:
+        return result
+    running = 0.0
+    for i, value in enumerate(values):
+        running += value
+        if i >= window:
+            running -= values[i - window]
+        if i >= window - 1:
+            result[i] = running / window
+    return result
+
+
+def rolling_moving_average(values: Sequence[float], window: int) -> list[float | None]:
+    """
+    簡單移動平均線的完整序列（四捨五入至小數點後 2 位）。
+    第 i 筆對應 compute_moving_average(values[: i + 1], window)；
+    滑動總和與逐窗加總僅在浮點捨入層級可能有差異。
+    """
+    return [
+        round(mean, 2) if mean is not None else None
+        for mean in _rolling_mean(values, window)
+    ]
+
+
+def rolling_volume_ratio(volumes: Sequence[float | None]) -> list[float | None]:
+    """
+    量比（近 5 日均量 / 近 20 日均量）的完整序列。
+    與 compute_volume_ratio 相同：需至少 20 筆；前綴中出現缺值（None）後的位置皆為 None。
+    """
+    n = len(volumes)
+    result: list[float | None] = [None] * n
+    first_missing = next((i for i, v in enumerate(volumes) if v is None), n)
+    clean = [float(v) for v in volumes[:first_missing]]  # type: ignore[arg-type]
+
+    short_means = _rolling_mean(clean, VOLUME_RATIO_SHORT_DAYS)
+    long_means = _rolling_mean(clean, VOLUME_RATIO_LONG_DAYS)
+    for i in range(VOLUME_RATIO_LONG_DAYS - 1, first_missing):
+        avg_short = short_means[i]
+        avg_long = long_means[i]
+        if avg_short is not None and avg_long is not None and avg_long > 0:
+            result[i] = round(avg_short / avg_long, 2)
+    return result
+
+
+def compute_indicator_series(
+    closes: Sequence[float],
+    volumes: Sequence[float | None] | None = None,
+) -> IndicatorSeries:
+    """
+    一次計算掃描訊號所需的全部指標序列，總成本 O(n)。
+    volumes 未提供時，量比序列全為 None。
+    """
+    volume_ratio = (
+        rolling_volume_ratio(volumes) if volumes is not None else [None] * len(closes)
+    )
+    return IndicatorSeries(
+        rsi=rolling_rsi(closes),
+        ma60=rolling_moving_average(closes, MA60_WINDOW),
+        ma200=rolling_moving_average(closes, MA200_WINDOW),
+        volume_ratio=volume_ratio,
+    )
@@ -0,0 +1,265 @@
+"""
+Domain — 欄式收盤價序列（PriceSeries）。
+以連續陣列儲存日期（date ordinal）、收盤價與成交量，取代 list[dict] 的逐筆字典：
+- 建立時排序一次，之後所有日期查詢皆為二分搜尋（bisect）
+- 切片共用底層陣列（僅調整起訖位置），不複製資料
+- 與 list[{"date", "close"[, "volume"]}] 的轉換僅發生在 API 邊界
+
+僅使用標準函式庫（array + bisect；domain 層不引入 NumPy）。
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+
+
+def _to_date(value: object) -> date:
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+class PriceSeries:
+    """
+    依日期升冪排序的收盤價序列（唯讀）。
+
+    底層為 array('l') 日期序數、array('d') 收盤價與成交量（缺值以 NaN 表示）；
+    _start / _stop 標示此視圖在底層陣列中的範圍，切片只產生新視圖。
+    """
+
+    __slots__ = ("_closes", "_ordinals", "_start", "_stop", "_volumes")
+
+    def __init__(
+        self,
+        ordinals: array,
+        closes: array,
+        volumes: array | None = None,
+        start: int = 0,
+        stop: int | None = None,
+    ) -> None:
+        self._ordinals = ordinals
+        self._closes = closes
+        self._volumes = volumes
+        self._start = start
+        self._stop = len(ordinals) if stop is None else stop
+
+    # ------------------------------------------------------------------
+    # 建構
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def empty(cls) -> PriceSeries:
+        return cls(array("l"), array("d"))
+
+    @classmethod
+    def from_ordinals(
+        cls,
+        ordinals: Sequence[int],
+        closes: Sequence[float],
+        volumes: Sequence[float | None] | None = None,
+    ) -> PriceSeries:
+        """由平行欄位（日期以 date.toordinal() 表示）建立；未排序時依日期穩定排序。"""
+        order: Sequence[int] = range(len(ordinals))
+        if any(ordinals[i] > ordinals[i + 1] for i in range(len(ordinals) - 1)):
+            order = sorted(order, key=ordinals.__getitem__)
+        volume_column = None
+        if volumes is not None:
+            volume_column = array(
+                "d",
+                (math.nan if volumes[i] is None else float(volumes[i]) for i in order),
+            )
+        return cls(
+            array("l", (ordinals[i] for i in order)),
+            array("d", (float(closes[i]) for i in order)),
+            volume_column,
+        )
+
+    @classmethod
+    def from_columns(
+        cls,
+        dates: Sequence[date],
+        closes: Sequence[float],
+        volumes: Sequence[float | None] | None = None,
+    ) -> PriceSeries:
+        """由平行欄位（date 物件）建立；未排序時依日期穩定排序。"""
+        return cls.from_ordinals([d.toordinal() for d in dates], closes, volumes)
+
+    @classmethod
+    def from_points(cls, points: Iterable[Mapping]) -> PriceSeries:
+        """由 [{"date": "YYYY-MM-DD" | date, "close": float[, "volume": float]}] 建立。"""
+        rows = list(points)
+        has_volume = any(point.get("volume") is not None for point in rows)
+        return cls.from_columns(
+            [_to_date(point["date"]) for point in rows],
+            [float(point["close"]) for point in rows],
+            [point.get("volume") for point in rows] if has_volume else None,
+        )
+
+    # ------------------------------------------------------------------
+    # 序列介面
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, key: slice) -> PriceSeries:
+        """以位置切片產生共用底層陣列的視圖（不支援步長）。"""
+        start, stop, step = key.indices(len(self))
+        if step != 1:
+            raise ValueError("PriceSeries slicing does not support a step")
+        return PriceSeries(
+            self._ordinals,
+            self._closes,
+            self._volumes,
+            self._start + start,
+            self._start + max(start, stop),
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PriceSeries):
+            return NotImplemented
+        return self.to_points() == other.to_points()
+
+    def __repr__(self) -> str:
+        if not len(self):
+            return "PriceSeries(empty)"
+        return f"PriceSeries({len(self)} points, {self.date_at(0)}..{self.date_at(-1)})"
+
+    def __reduce__(self):
+        # 僅序列化視圖範圍內的資料（L2 磁碟快取 / 跨程序共享）
+        volumes = (
+            None if self._volumes is None else self._volumes[self._start : self._stop]
+        )
+        return (
+            PriceSeries,
+            (
+                self._ordinals[self._start : self._stop],
+                self._closes[self._start : self._stop],
+                volumes,
+            ),
+        )
+
+    # ------------------------------------------------------------------
+    # 欄位存取
+    # ------------------------------------------------------------------
+
+    @property
+    def closes(self) -> memoryview:
+        """收盤價欄位（唯讀、零複製）。"""
+        return memoryview(self._closes)[self._start : self._stop].toreadonly()
+
+    @property
+    def dates(self) -> list[date]:
+        return [date.fromordinal(o) for o in self._ordinals[self._start : self._stop]]
+
+    @property
+    def volumes(self) -> list[float | None] | None:
+        """成交量欄位（缺值為 None）；序列未含成交量時回傳 None。"""
+        if self._volumes is None:
+            return None
+        return [
+            None if math.isnan(v) else v
+            for v in self._volumes[self._start : self._stop]
+        ]
+
+    def _position(self, index: int) -> int:
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("PriceSeries index out of range")
+        return self._start + index
+
+    def date_at(self, index: int) -> date:
+        return date.fromordinal(self._ordinals[self._position(index)])
+
+    def close_at(self, index: int) -> float:
+        return self._closes[self._position(index)]
+
+    # ------------------------------------------------------------------
+    # 日期查詢（二分搜尋）
+    # ------------------------------------------------------------------
+
+    def index_on_or_after(self, target: date) -> int | None:
+        """第一個日期 >= target 的位置；不存在時回傳 None。"""
+        pos = bisect_left(self._ordinals, target.toordinal(), self._start, self._stop)
+        return pos - self._start if pos < self._stop else None
+
+    def index_on_or_before(self, target: date) -> int | None:
+        """最後一個日期 <= target 的位置；不存在時回傳 None。"""
+        pos = bisect_right(self._ordinals, target.toordinal(), self._start, self._stop)
+        return pos - 1 - self._start if pos > self._start else None
+
+    def indices_on_or_after(self, targets: Iterable[date]) -> list[int | None]:
+        """
+        批次版 index_on_or_after。targets 依日期遞增時，每次搜尋皆以前一個結果為下界，
+        整批等同一次合併走訪；遇到遞減日期時自動回到序列起點重新搜尋。
+        """
+        positions: list[int | None] = []
+        lo = self._start
+        previous = None
+        for target in targets:
+            ordinal = target.toordinal()
+            if previous is not None and ordinal < previous:
+                lo = self._start
+            lo = bisect_left(self._ordinals, ordinal, lo, self._stop)
+            previous = ordinal
+            positions.append(lo - self._start if lo < self._stop else None)
+        return positions
+
+    def first_close_on_or_after(self, target: date) -> float | None:
+        """target 當日或之後第一個正收盤價（跳過 0 / 負值等異常報價）。"""
+        pos = bisect_left(self._ordinals, target.toordinal(), self._start, self._stop)
+        for i in range(pos, self._stop):
+            if self._closes[i] > 0:
+                return self._closes[i]
+        return None
+
+    def last_close_on_or_before(self, target: date) -> float | None:
+        """target 當日或之前最後一個正收盤價（市場休日自動回退至前一交易日）。"""
+        pos = bisect_right(self._ordinals, target.toordinal(), self._start, self._stop)
+        for i in range(pos - 1, self._start - 1, -1):
+            if self._closes[i] > 0:
+                return self._closes[i]
+        return None
+
+    def between(self, start: date, end: date) -> PriceSeries:
+        """日期介於 [start, end] 的視圖（零複製）。"""
+        lo = bisect_left(self._ordinals, start.toordinal(), self._start, self._stop)
+        hi = bisect_right(self._ordinals, end.toordinal(), self._start, self._stop)
+        return PriceSeries(self._ordinals, self._closes, self._volumes, lo, max(lo, hi))
+
+    # ------------------------------------------------------------------
+    # API 邊界轉換
+    # ------------------------------------------------------------------
+
+    def to_points(self) -> list[dict]:
+        """轉回 [{"date": "YYYY-MM-DD", "close": float[, "volume": float | None]}]。"""
+        dates = (
+            date.fromordinal(o).isoformat()
+            for o in self._ordinals[self._start : self._stop]
+        )
+        closes = self._closes[self._start : self._stop]
+        volumes = self.volumes
+        if volumes is None:
+            return [{"date": d, "close": c} for d, c in zip(dates, closes, strict=True)]
+        return [
+            {"date": d, "close": c, "volume": v}
+            for d, c, v in zip(dates, closes, volumes, strict=True)
+        ]
+
+
+def as_price_series(value: PriceSeries | Sequence[Mapping] | None) -> PriceSeries:
+    """接受 PriceSeries、list-of-dict 或 None，統一轉為 PriceSeries。"""
+    if isinstance(value, PriceSeries):
+        return value
+    if not value:
+        return PriceSeries.empty()
+    return PriceSeries.from_points(value)
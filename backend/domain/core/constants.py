@@ -51,6 +51,10 @@ MARKET_BULLISH_MAX_PCT = 30  # ≤30%  → 🌤️ Bullish
 MARKET_NEUTRAL_MAX_PCT = 50  # ≤50%  → ⛅ Neutral
 MARKET_BEARISH_MAX_PCT = 70  # ≤70%  → 🌧️ Bearish
 # >70% → ⛈️ Strong Bearish
+MARKET_BREADTH_HISTORY_DAYS = (
+    120  # 市場寬度歷史序列預設交易日數（1y 歷史扣除 MA60 暖機）
+)
+MARKET_BREADTH_HISTORY_MAX_DAYS = 190
 
 # ---------------------------------------------------------------------------
 # Cache Configuration
@@ -73,11 +77,57 @@ ENRICHED_CACHE_MAXSIZE = 4
 ENRICHED_CACHE_TTL = 60  # 1 minute (same window as rebalance cache)
 RESONANCE_CACHE_TTL = 60  # 1 minute (dedup repeated page-load resonance queries)
 
+# Stale-while-revalidate：L1 過期（軟 TTL）後仍於硬 TTL 內時，先回傳 L2 舊值並於背景刷新；
+# 超過硬 TTL 才同步呼叫 yfinance。硬 TTL 與對應的 L2 磁碟 TTL 相同：
+# 凡 L2 仍可命中的資料一律立即回傳，不因年齡較大而改為同步抓取。
+SIGNALS_STALE_TTL = 3600  # 1 hour（同 DISK_SIGNALS_TTL）
+FUNDAMENTALS_STALE_TTL = 86400  # 24 hours（同 DISK_FUNDAMENTALS_TTL）
+DIVIDEND_STALE_TTL = 86400  # 24 hours（同 DISK_DIVIDEND_TTL）
+FOREX_STALE_TTL = 86400  # 24 hours（同 DISK_FOREX_TTL）
+SWR_REFRESH_WORKERS = 4  # 背景刷新執行緒數（請求仍經速率限制器節流）
+
 # ---------------------------------------------------------------------------
 # Persistent Data Directory — root for all app-written state files
 # ---------------------------------------------------------------------------
 DATA_DIR = "/app/data"
 
+# ---------------------------------------------------------------------------
+# Database — SQLite 效能設定檔（連線建立時套用 PRAGMA）與連線池
+# ---------------------------------------------------------------------------
+SQLITE_PERFORMANCE_PROFILES: dict[str, dict[str, str | int]] = {
+    # WAL：讀取不阻塞寫入；synchronous=NORMAL 在 WAL 下仍保證資料庫一致性
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,  # ms — 寫入鎖競爭時等待而非立即拋出 database is locked
+        "cache_size": -65536,  # 負值單位為 KiB → 64 MB page cache
+        "mmap_size": 268435456,  # 256 MB
+        "temp_store": "MEMORY",
+    },
+    "low_memory": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "cache_size": -8192,  # 8 MB
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+    },
+    # 保守模式：回滾日誌 + 完整同步（如資料目錄位於不支援共享記憶體的網路檔案系統）
+    "durable": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "busy_timeout": 5000,
+        "cache_size": -16384,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+    },
+}
+SQLITE_DEFAULT_PROFILE = "balanced"
+DB_POOL_SIZE = 10  # 常駐連線數（API 請求 + 背景掃描 / 快照 / 回填執行緒）
+DB_POOL_MAX_OVERFLOW = 10
+DB_POOL_TIMEOUT = 30  # seconds — 取得連線的等待上限
+DB_READ_POOL_SIZE = 4  # 唯讀分析連線池（長時間查詢不佔用寫入連線）
+
 # ---------------------------------------------------------------------------
 # Disk Cache (L2) — 持久化快取，容器重啟後仍可使用
 # ---------------------------------------------------------------------------
@@ -93,12 +143,69 @@ DISK_EARNINGS_TTL = 604800  # 7 days
 DISK_DIVIDEND_TTL = 86400  # 24 hours
 DISK_FUNDAMENTALS_TTL = 86400  # 24 hours
 
+# ---------------------------------------------------------------------------
+# OHLCV Price Store — 本地日線倉儲（增量同步，所有 period 共用同一份資料）
+# ---------------------------------------------------------------------------
+PRICE_STORE_DIR = "/app/data/price_store"
+PRICE_STORE_SIZE_LIMIT = 200 * 1024 * 1024  # 200 MB
+PRICE_STORE_SYNC_INTERVAL = 300  # 5 minutes — 同步後此區間內直接由本地提供
+PRICE_STORE_ANCHOR_TOLERANCE = (
+    0.001  # 錨點收盤價相對誤差；超過視為除權/分割，重新全量下載
+)
+
+# ---------------------------------------------------------------------------
+# Shared Cache — 主機共享快取層（多個 uvicorn worker 共用）
+# ---------------------------------------------------------------------------
+SHARED_CACHE_DIR = "/app/data/shared_cache"
+SHARED_CACHE_SIZE_LIMIT = 100 * 1024 * 1024  # 100 MB
+SHARED_LEASE_TTL = 120  # 跨程序租約持有上限秒數（持有者存活時由心跳續約至此上限）
+SHARED_LEASE_POLL_INTERVAL = 0.1  # 等待其他程序釋放租約的輪詢間隔（秒）
+SHARED_LEASE_HEARTBEAT_TTL = (
+    15  # 租約心跳過期秒數：持有程序崩潰 / 容器重啟後至多此秒數即釋放
+)
+SHARED_LEASE_HEARTBEAT_INTERVAL = 5  # 持有中租約的續約間隔（秒）
+PREWARM_HOST_TASK = "prewarm"
+PREWARM_HOST_LEASE_TTL = 1800  # 30 minutes — 預熱主流程的租約上限
+PREWARM_HOST_DONE_TTL = 300  # 5 minutes — 預熱完成後，晚啟動的 worker 不再重跑
+
 # ---------------------------------------------------------------------------
 # Rate Limiter
 # ---------------------------------------------------------------------------
 YFINANCE_RATE_LIMIT_CPS = (
     0.4  # calls per second — 2 req/5 sec (yfinance official recommendation)
 )
+# Token bucket：依 Yahoo 端點類別分別計算額度，另有全域上限避免總量失控
+YF_ENDPOINT_HISTORY = "history"  # chart API（Ticker.history）
+YF_ENDPOINT_INFO = "info"  # quoteSummary（info / calendar / holders / funds_data）
+YF_ENDPOINT_DOWNLOAD = "download"  # 多檔 chart 批次（yf.download）
+YF_QUOTE_BATCH_URL = "https://query1.finance.yahoo.com/v7/finance/quote"
+YF_QUOTE_BATCH_SIZE = 50  # 多檔 quote 單次請求的 symbol 上限
+# 全域桶為唯一的硬性上限（yfinance 建議值）；端點桶以同一速率運作，
+# 僅負責各端點的突發額度與 AIMD 退避，閒置端點的額度可由忙碌端點使用
+YFINANCE_GLOBAL_RATE_LIMIT_CPS = YFINANCE_RATE_LIMIT_CPS  # 所有端點合計上限
+YFINANCE_ENDPOINT_RATE_LIMITS: dict[str, float] = dict.fromkeys(
+    (YF_ENDPOINT_HISTORY, YF_ENDPOINT_INFO, YF_ENDPOINT_DOWNLOAD),
+    YFINANCE_GLOBAL_RATE_LIMIT_CPS,
+)
+YFINANCE_RATE_LIMIT_BURST = 3  # 閒置後可累積的突發額度（token 數）
+YFINANCE_BACKOFF_FACTOR = 0.5  # 觀察到 429 / 空回應時，速率乘以此係數
+YFINANCE_BACKOFF_MIN_MULTIPLIER = 0.125  # 退避下限：原速率的 1/8
+YFINANCE_BACKOFF_RECOVERY_STEP = 0.05  # 每次成功回應恢復的速率比例（加法遞增）
+# 請求通道：呼叫端以 context variable 宣告所屬通道，等待額度時依加權公平佇列排序
+# （權重越高越優先，低權重通道仍按比例取得額度，不會被餓死）
+YF_LANE_INTERACTIVE = "interactive"  # 使用者頁面載入（預設）
+YF_LANE_SCAN = "scan"  # 掃描
+YF_LANE_PREWARM = "prewarm"  # 啟動預熱、背景刷新
+YF_LANE_BACKFILL = "backfill"  # 歷史回填、13F 板塊解析
+YF_LANE_WEIGHTS: dict[str, float] = {
+    YF_LANE_INTERACTIVE: 8,
+    YF_LANE_SCAN: 4,
+    YF_LANE_PREWARM: 2,
+    YF_LANE_BACKFILL: 1,
+}
+# 單檔日線請求合併：窗口內並發的同參數請求合併為一次多檔 yf.download
+YF_HISTORY_COALESCE_WINDOW = 0.03  # 秒；首個請求等待其他請求加入的時間
+YF_HISTORY_COALESCE_MAX_BATCH = 50  # 單次合併下載的 ticker 上限（滿額即提前送出）
 COINGECKO_RATE_LIMIT_CPS = 0.5  # calls per second — 30 req/min (free tier)
 COINGECKO_API_URL = "https://api.coingecko.com/api/v3"
 
@@ -116,9 +223,10 @@ BACKFILL_SAMPLE_INTERVAL = 5
 BACKFILL_MARKET_STATUS = "BACKFILL"
 BACKFILL_DEFAULT_MOAT = "STABLE"
 BACKFILL_MIN_HISTORY_DAYS = 200  # MA200 warmup requirement for replay
+BACKFILL_COMMIT_TICKERS = 50  # 每批寫入並 commit 的股票數；單批失敗只影響該批
 
-SCAN_THREAD_POOL_SIZE = 2  # 2 threads match 0.4 req/sec global rate limit
-ENRICHED_THREAD_POOL_SIZE = 4  # 與 0.4 req/sec 速率限制相符，避免過度競爭
+SCAN_THREAD_POOL_SIZE = 4  # token bucket 等待時不持鎖，可並行使用各端點額度
+ENRICHED_THREAD_POOL_SIZE = 4  # 與 yfinance 端點額度相符，避免過度競爭
 ENRICHED_PER_TICKER_TIMEOUT = 30  # 每檔股票豐富資料超時（秒）— 配合 0.4 req/sec 放寬
 SCAN_STALE_SECONDS = 900  # 15 minutes — scanner skips if last scan is fresher
 SCAN_L1_WARM_THRESHOLD = 0.8  # skip batch_download if ≥80% of scan tickers are in L1
@@ -132,6 +240,8 @@ PRICE_ALERT_COOLDOWN_HOURS = 4
 WEEKLY_DIGEST_LOOKBACK_DAYS = 7
 SCAN_HISTORY_DEFAULT_LIMIT = 20
 LATEST_SCAN_LOGS_DEFAULT_LIMIT = 50
+SCAN_LOG_RETENTION_DAYS = 90  # raw ScanLog rows older than this are compacted away
+SCAN_LOG_RETENTION_MIN_DAYS = 14  # floor: weekly digest / scan history read raw logs
 INSTITUTIONAL_HOLDERS_TOP_N = 5
 MARGIN_TREND_QUARTERS = 5
 BETA_MIN_HISTORY_PERIODS = 60  # minimum paired return days for OLS beta computation
@@ -244,6 +354,9 @@ FX_DAILY_SPIKE_PCT = 1.5  # 單日波動門檻
 FX_SHORT_TERM_SWING_PCT = 2.0  # 5 日波段門檻
 FX_LONG_TERM_TREND_PCT = 8.0  # 3 個月趨勢門檻
 FX_HISTORY_PERIOD = "5d"  # yfinance period for short-term detection
+FX_HISTORY_DAYS = (
+    5  # trading days matching FX_HISTORY_PERIOD (sliced from the 3mo matrix)
+)
 FX_LONG_TERM_PERIOD = "3mo"  # yfinance period for long-term trend detection
 DISK_KEY_FOREX_HISTORY = "forex_history"
 DISK_FOREX_HISTORY_TTL = 3600  # 1 hour
@@ -383,7 +496,8 @@ DISK_KEY_MOAT = "moat"
 DISK_KEY_EARNINGS = "earnings"
 DISK_KEY_DIVIDEND = "dividend"
 DISK_KEY_FUNDAMENTALS = "fundamentals"
-DISK_KEY_PRICE_HISTORY = "price_history"
+# PriceSeries 欄式序列（更名使舊 list[dict] 磁碟快取自然失效）
+DISK_KEY_PRICE_HISTORY = "price_series"
 DISK_KEY_FOREX = "forex"
 DISK_KEY_ETF_HOLDINGS = "etf_holdings"
 DISK_KEY_ETF_SECTOR_WEIGHTS = "etf_sector_weights"
@@ -605,6 +719,12 @@ SEC_EDGAR_ARCHIVES_BASE_URL = "https://www.sec.gov"
 SEC_EDGAR_USER_AGENT = "Folio/1.0 (folio@example.com)"
 SEC_EDGAR_RATE_LIMIT_CPS = 10.0  # SEC allows 10 req/sec
 SEC_EDGAR_REQUEST_TIMEOUT = 15
+SEC_EDGAR_POOL_MAX_CONNECTIONS = 10  # 長駐連線池上限（與 10 req/sec 速率限制相當）
+SEC_EDGAR_KEEPALIVE_EXPIRY = 30.0  # 閒置連線保留秒數
+# CUSIP → ticker 索引（CusipTicker.source）
+CUSIP_SOURCE_STATIC = "static"  # 靜態對照表
+CUSIP_SOURCE_NAME_HINT = "name_hint"  # 由 13F 公司名稱推斷
+CUSIP_SOURCE_UNRESOLVED = "unresolved"  # 尚無法解析（名稱提示更新後於啟動時重試）
 
 # Default Gurus (CIK codes)
 DEFAULT_GURUS = [
@@ -713,6 +833,10 @@ NOTIFICATION_TYPE_GURU_ALERTS = "guru_alerts"
 
 GURU_BACKFILL_YEARS = 5  # 回填歷史 13F 資料的年數
 GURU_BACKFILL_FILING_COUNT = 20  # 每位大師最多取回 20 筆申報（約 5 年）
+GURU_SYNC_MAX_WORKERS = (
+    4  # 13F 同步 / 回填的 EDGAR 下載並行數（總速率仍受 SEC_EDGAR_RATE_LIMIT_CPS 限制）
+)
+GURU_FILING_COMMIT_BATCH = 5  # 同一大師每套用 N 筆申報 commit 一次；單批失敗只影響該批
 GURU_BACKTEST_CACHE_TTL = 3600  # 1 hour
 GURU_HEATMAP_CACHE_TTL = 300  # 5 minutes
 GURU_BACKTEST_MAX_QUARTERS = 12
@@ -721,6 +845,8 @@ GURU_BACKTEST_MAX_QUARTERS = 12
 GURU_FILING_CACHE_MAXSIZE = 50
 GURU_FILING_CACHE_TTL = 86400  # 24h (13F data is quarterly)
 DISK_GURU_FILING_TTL = 604800  # 7 days
+DISK_GURU_SUBMISSIONS_TTL = 86400  # 1 day（過期後以條件式請求重新驗證，未變更時 304）
+DISK_GURU_VALIDATOR_TTL = 7776000  # 90 days（ETag / Last-Modified 與對應內容）
 DISK_KEY_GURU_FILING = "guru_filing"
 DISK_SECTOR_TTL = 2592000  # 30 days (sectors change very rarely)
 DISK_KEY_SECTOR = "sector"
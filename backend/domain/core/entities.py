@@ -9,6 +9,7 @@ from datetime import UTC, date, datetime
 from sqlmodel import Column, Field, SQLModel, String
 
 from domain.constants import (
+    CUSIP_SOURCE_UNRESOLVED,
     DEFAULT_LANGUAGE,
     DEFAULT_NOTIFICATION_PREFERENCES,
     DEFAULT_NOTIFICATION_RATE_LIMITS,
@@ -77,6 +78,22 @@ class ScanLog(SQLModel, table=True):
     )
 
 
+class SignalTransition(SQLModel, table=True):
+    """
+    訊號區段（每檔股票連續相同訊號的掃描合併為一筆）。
+    掃描時增量維護：訊號不變則延長 ended_at 並累加 scan_count，訊號改變則新增區段；
+    原始 ScanLog 超過保留天數後可安全刪除，訊號活躍度與回測僅讀取本表。
+    """
+
+    id: int | None = Field(default=None, primary_key=True)
+    stock_ticker: str = Field(foreign_key="stock.ticker", description="對應股票代號")
+    signal: str = Field(description="掃描訊號（ScanSignal value）")
+    market_status: str = Field(description="區段起始掃描時的市場情緒")
+    started_at: datetime = Field(description="區段首次掃描時間")
+    ended_at: datetime = Field(description="區段最近一次掃描時間")
+    scan_count: int = Field(default=1, description="區段內掃描次數")
+
+
 class PriceAlert(SQLModel, table=True):
     """自訂價格警報。"""
 
@@ -280,6 +297,94 @@ class GuruHolding(SQLModel, table=True):
     sector: str | None = Field(default=None, description="GICS 行業板塊（yfinance）")
 
 
+class CusipTicker(SQLModel, table=True):
+    """CUSIP → 股票代號解析索引（靜態對照表與名稱推斷結果的持久化）。"""
+
+    cusip: str = Field(primary_key=True, description="CUSIP 代碼")
+    ticker: str | None = Field(
+        default=None, description="對應股票代號（None 為未解析）"
+    )
+    company_name: str = Field(default="", description="最近一次 13F 中的公司名稱")
+    source: str = Field(
+        default=CUSIP_SOURCE_UNRESOLVED,
+        description="解析來源（static / name_hint / unresolved）",
+    )
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(UTC),
+        description="最後更新時間",
+    )
+
+
+# ---------------------------------------------------------------------------
+# Smart Money 物化彙總表 — 13F 同步時重算，儀表板直接讀取
+# scope：空字串代表全部大師，否則為投資風格（僅含啟用中大師）
+# ---------------------------------------------------------------------------
+
+
+class GuruStat(SQLModel, table=True):
+    """大師最新申報摘要（集中度、換手率、申報數）。"""
+
+    guru_id: int = Field(primary_key=True, foreign_key="guru.id")
+    filing_id: int = Field(foreign_key="gurufiling.id", description="最新申報 ID")
+    report_date: str = Field(description="最新申報持倉基準日")
+    filing_date: str = Field(description="最新申報 SEC 公告日")
+    total_value: float | None = Field(default=None, description="總持倉市值 (千美元)")
+    holdings_count: int = Field(default=0, description="最新申報持倉數量")
+    filing_count: int = Field(default=0, description="已同步申報總數")
+    top5_concentration_pct: float | None = Field(
+        default=None, description="前五大持倉權重合計（排除清倉）"
+    )
+    turnover_pct: float | None = Field(
+        default=None, description="(新建倉 + 清倉) / 持倉數 × 100"
+    )
+
+
+class GuruTickerStat(SQLModel, table=True):
+    """跨大師個股持有彙總（排除清倉），供共識股與 Grand Portfolio 使用。"""
+
+    scope: str = Field(primary_key=True, description="彙總範圍（空字串或投資風格）")
+    ticker: str = Field(primary_key=True)
+    company_name: str = Field(default="")
+    sector: str | None = Field(default=None)
+    guru_count: int = Field(default=0, description="持有大師數")
+    guru_details: str = Field(
+        default="[]",
+        description="持有大師 JSON（[{display_name, action, weight_pct}]）",
+    )
+    total_value: float = Field(default=0.0, description="合計持倉市值 (千美元)")
+    consensus_avg_weight_pct: float | None = Field(
+        default=None, description="各大師（去重後）平均權重"
+    )
+    avg_weight_pct: float | None = Field(default=None, description="所有持倉平均權重")
+    weight_sum: float = Field(
+        default=0.0, description="有權重持倉的權重合計（增量更新用）"
+    )
+    weight_count: int = Field(default=0, description="有權重的持倉數（增量更新用）")
+    action_counts: str = Field(default="{}", description="動作計數 JSON")
+    dominant_action: str = Field(default=HoldingAction.UNCHANGED.value)
+
+
+class GuruActivityStat(SQLModel, table=True):
+    """跨大師買賣動向彙總（BUY：新建倉 / 加碼；SELL：清倉 / 減碼）。"""
+
+    scope: str = Field(primary_key=True, description="彙總範圍（空字串或投資風格）")
+    side: str = Field(primary_key=True, description="BUY | SELL")
+    ticker: str = Field(primary_key=True)
+    company_name: str = Field(default="")
+    guru_count: int = Field(default=0)
+    gurus: str = Field(default="[]", description="大師顯示名稱 JSON")
+    total_value: float = Field(default=0.0)
+
+
+class GuruSectorStat(SQLModel, table=True):
+    """跨大師行業板塊彙總（排除清倉，僅含有 sector 的持倉）。"""
+
+    scope: str = Field(primary_key=True, description="彙總範圍（空字串或投資風格）")
+    sector: str = Field(primary_key=True)
+    total_value: float = Field(default=0.0)
+    holding_count: int = Field(default=0)
+
+
 # ---------------------------------------------------------------------------
 # Portfolio Snapshots — 投資組合每日快照（供績效圖表使用）
 # ---------------------------------------------------------------------------
@@ -1,4 +1,9 @@
-from typing import Protocol, runtime_checkable
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Protocol, runtime_checkable
+
+if TYPE_CHECKING:
+    from domain.analysis.price_series import PriceSeries
 
 
 @runtime_checkable
@@ -9,8 +14,8 @@ class MarketDataProvider(Protocol):
         """RSI, MA200, MA60, bias, volume ratio, daily change."""
         ...
 
-    def get_price_history(self, ticker: str) -> list[dict] | None:  # pragma: no cover
-        """1-year close price history."""
+    def get_price_history(self, ticker: str) -> PriceSeries | None:  # pragma: no cover
+        """1-year close price history (date-sorted columnar series)."""
         ...
 
     def get_earnings_date(self, ticker: str) -> str | None:  # pragma: no cover
@@ -4,10 +4,15 @@ Consumers using ``from domain.entities import X`` continue to work unchanged.
 """
 
 from domain.core.entities import (  # noqa: F401
+    CusipTicker,
     FXWatchConfig,
     Guru,
+    GuruActivityStat,
     GuruFiling,
     GuruHolding,
+    GuruSectorStat,
+    GuruStat,
+    GuruTickerStat,
     Holding,
     NetWorthItem,
     NetWorthSnapshot,
@@ -16,6 +21,7 @@ from domain.core.entities import (  # noqa: F401
     PriceAlert,
     RemovalLog,
     ScanLog,
+    SignalTransition,
     Stock,
     SystemTemplate,
     ThesisLog,
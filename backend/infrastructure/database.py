@@ -1,24 +1,123 @@
 """
 Infrastructure — 資料庫連線與 Session 管理。
 使用 SQLite (透過 SQLModel / SQLAlchemy)。
+
+- engine：讀寫連線池，每條連線建立時套用效能設定檔的 PRAGMA（WAL、busy_timeout 等）
+- read_engine：檔案型資料庫的唯讀連線池（mode=ro + query_only），
+  供回測等長時間分析查詢使用；WAL 模式下不阻塞掃描寫入
 """
 
 import os
 from collections.abc import Generator
 
+from sqlalchemy import event
+from sqlalchemy.engine import URL, Engine, make_url
 from sqlmodel import Session, SQLModel, create_engine, select
 
+from domain.constants import (
+    DB_POOL_MAX_OVERFLOW,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_READ_POOL_SIZE,
+    SQLITE_DEFAULT_PROFILE,
+    SQLITE_PERFORMANCE_PROFILES,
+)
 from logging_config import get_logger
 
 logger = get_logger(__name__)
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///data/radar.db")
+DB_PERFORMANCE_PROFILE = os.getenv("DB_PERFORMANCE_PROFILE", SQLITE_DEFAULT_PROFILE)
 
 # SQLite 需要 check_same_thread=False 以支援多執行緒存取
 connect_args = {"check_same_thread": False}
-engine = create_engine(DATABASE_URL, echo=False, connect_args=connect_args)
 
-logger.info("資料庫連線位置：%s", DATABASE_URL)
+
+def _resolve_profile(name: str) -> dict[str, str | int]:
+    """取得效能設定檔；未知名稱退回預設設定檔。"""
+    profile = SQLITE_PERFORMANCE_PROFILES.get(name)
+    if profile is None:
+        logger.warning(
+            "未知的 DB_PERFORMANCE_PROFILE：%s，改用 %s。", name, SQLITE_DEFAULT_PROFILE
+        )
+        profile = SQLITE_PERFORMANCE_PROFILES[SQLITE_DEFAULT_PROFILE]
+    return profile
+
+
+def _is_file_database(url: URL) -> bool:
+    """是否為檔案型 SQLite（記憶體資料庫無法以獨立連線唯讀開啟）。"""
+    database = url.database or ""
+    return (
+        url.get_backend_name() == "sqlite"
+        and database not in ("", ":memory:")
+        and url.query.get("mode") != "memory"
+    )
+
+
+def _register_pragmas(
+    target: Engine, profile: dict[str, str | int], *, read_only: bool = False
+) -> None:
+    """於每條新連線建立時套用 PRAGMA。唯讀連線不可變更 journal_mode，改啟用 query_only。"""
+
+    @event.listens_for(target, "connect")
+    def _apply(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma, value in profile.items():
+                if read_only and pragma == "journal_mode":
+                    continue
+                cursor.execute(f"PRAGMA {pragma}={value}")
+            if read_only:
+                cursor.execute("PRAGMA query_only=ON")
+        finally:
+            cursor.close()
+
+
+def build_engine(url: str, profile_name: str = SQLITE_DEFAULT_PROFILE) -> Engine:
+    """建立讀寫 engine：檔案型資料庫使用固定大小連線池，並套用效能設定檔。"""
+    parsed = make_url(url)
+    pool_args: dict[str, int] = {}
+    if _is_file_database(parsed):
+        pool_args = {
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_POOL_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+        }
+    built = create_engine(url, echo=False, connect_args=connect_args, **pool_args)
+    if parsed.get_backend_name() == "sqlite":
+        _register_pragmas(built, _resolve_profile(profile_name))
+    return built
+
+
+def build_read_engine(
+    url: str, write_engine: Engine, profile_name: str = SQLITE_DEFAULT_PROFILE
+) -> Engine:
+    """
+    建立唯讀 engine（SQLite URI mode=ro）。
+    記憶體資料庫或非 SQLite 時直接回傳讀寫 engine（無法由獨立連線開啟同一份資料）。
+    """
+    parsed = make_url(url)
+    if not _is_file_database(parsed):
+        return write_engine
+    path = os.path.abspath(parsed.database or "")
+    built = create_engine(
+        f"sqlite:///file:{path}?mode=ro&uri=true",
+        echo=False,
+        connect_args=connect_args,
+        pool_size=DB_READ_POOL_SIZE,
+        max_overflow=DB_POOL_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+    )
+    _register_pragmas(built, _resolve_profile(profile_name), read_only=True)
+    return built
+
+
+engine = build_engine(DATABASE_URL, DB_PERFORMANCE_PROFILE)
+read_engine = build_read_engine(DATABASE_URL, engine, DB_PERFORMANCE_PROFILE)
+
+logger.info(
+    "資料庫連線位置：%s（效能設定檔：%s）", DATABASE_URL, DB_PERFORMANCE_PROFILE
+)
 
 
 def _run_migrations() -> None:
@@ -217,6 +316,8 @@ def _run_backtest_migrations() -> None:
 
     migrations = [
         "CREATE INDEX IF NOT EXISTS ix_scanlog_stock_ticker_scanned_at ON scanlog (stock_ticker, scanned_at);",
+        "CREATE INDEX IF NOT EXISTS ix_signaltransition_stock_ticker_started_at ON signaltransition (stock_ticker, started_at);",
+        "CREATE INDEX IF NOT EXISTS ix_signaltransition_ended_at ON signaltransition (ended_at);",
     ]
 
     with engine.connect() as conn:
@@ -275,6 +376,72 @@ def _backfill_signal_since() -> None:
             logger.info("signal_since 回填完成：%d 筆。", updated)
 
 
+def _seed_signal_transitions() -> None:
+    """首次建立訊號區段表時，由既有 ScanLog 折疊出各檔股票的訊號區段。"""
+    from infrastructure.persistence.repositories import seed_signal_transitions
+
+    with Session(engine) as session:
+        created = seed_signal_transitions(session)
+        session.commit()
+    if created:
+        logger.info("訊號區段回填完成：%d 筆。", created)
+
+
+def _backfill_guru_analytics() -> None:
+    """首次建立 Smart Money 物化表時，由既有 13F 申報全量重算一次。"""
+    from domain.entities import GuruFiling, GuruStat
+    from infrastructure.persistence.repositories import refresh_guru_analytics
+
+    with Session(engine) as session:
+        if session.exec(select(GuruStat).limit(1)).first() is not None:
+            return
+        if session.exec(select(GuruFiling).limit(1)).first() is None:
+            logger.debug("Smart Money 物化表無需回填。")
+            return
+        refresh_guru_analytics(session)
+    logger.info("Smart Money 物化表回填完成。")
+
+
+def _seed_cusip_index() -> None:
+    """
+    維護 CUSIP → ticker 索引：種入靜態對照表、收錄既有持倉中尚未索引的 CUSIP，
+    並以最新名稱提示重試未解析者；新解析出的代號回填至 ticker 為空的持倉。
+    """
+    from domain.constants import CUSIP_SOURCE_STATIC
+    from domain.entities import CusipTicker
+    from infrastructure.external.sec_edgar import get_static_cusip_map, resolve_cusip
+    from infrastructure.persistence.repositories import (
+        fill_missing_holding_tickers,
+        find_unindexed_holding_cusips,
+        find_unresolved_cusip_tickers,
+        upsert_cusip_tickers,
+    )
+
+    with Session(engine) as session:
+        entries = [
+            CusipTicker(cusip=cusip, ticker=ticker, source=CUSIP_SOURCE_STATIC)
+            for cusip, ticker in get_static_cusip_map().items()
+        ]
+        pending = find_unindexed_holding_cusips(session)
+        pending.update(
+            (entry.cusip, entry.company_name)
+            for entry in find_unresolved_cusip_tickers(session)
+        )
+        for cusip, company_name in pending.items():
+            ticker, source = resolve_cusip(cusip, company_name)
+            entries.append(
+                CusipTicker(
+                    cusip=cusip, ticker=ticker, company_name=company_name, source=source
+                )
+            )
+        changed = upsert_cusip_tickers(session, entries)
+        guru_ids = fill_missing_holding_tickers(session)
+    if changed or guru_ids:
+        logger.info(
+            "CUSIP 索引更新 %d 筆，回填 %d 位大師的持倉代號。", changed, len(guru_ids)
+        )
+
+
 def create_db_and_tables() -> None:
     """建立所有 SQLModel 定義的資料表（若不存在），並執行遷移與資料載入。"""
     # 確保所有 Entity 已被 import，SQLModel metadata 才會完整
@@ -294,9 +461,18 @@ def create_db_and_tables() -> None:
 
     _encrypt_plaintext_tokens()
     _backfill_signal_since()
+    _seed_signal_transitions()
+    _backfill_guru_analytics()
+    _seed_cusip_index()
 
 
 def get_session() -> Generator[Session, None, None]:
     """FastAPI Dependency：提供一個 DB Session，結束後自動關閉。"""
     with Session(engine) as session:
         yield session
+
+
+def get_read_session() -> Generator[Session, None, None]:
+    """FastAPI Dependency：提供唯讀分析用 Session（長時間查詢不阻塞掃描寫入）。"""
+    with Session(read_engine) as session:
+        yield session
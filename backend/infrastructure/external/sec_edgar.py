@@ -4,14 +4,17 @@ Infrastructure — SEC EDGAR API 適配器。
 負責 EDGAR 外部 API 呼叫、速率限制、快取管理。
 所有呼叫皆以 try/except 包裹，失敗時回傳結構化降級結果。
 含 tenacity 重試機制，針對暫時性網路錯誤自動指數退避重試。
+HTTP 請求共用長駐連線池（安裝 h2 時啟用 HTTP/2），submissions 以 ETag /
+Last-Modified 條件式請求重新驗證，未變更時僅需 304 回應。
 """
 
 import contextlib
 import os
-import re
 import threading
 import time
 import xml.etree.ElementTree as ET
+from collections import deque
+from collections.abc import Iterable, Iterator
 
 import diskcache
 import httpx
@@ -24,14 +27,21 @@ from tenacity import (
 )
 
 from domain.constants import (
+    CUSIP_SOURCE_NAME_HINT,
+    CUSIP_SOURCE_STATIC,
+    CUSIP_SOURCE_UNRESOLVED,
     DISK_CACHE_DIR,
     DISK_CACHE_SIZE_LIMIT,
     DISK_GURU_FILING_TTL,
+    DISK_GURU_SUBMISSIONS_TTL,
+    DISK_GURU_VALIDATOR_TTL,
     DISK_KEY_GURU_FILING,
     GURU_FILING_CACHE_MAXSIZE,
     GURU_FILING_CACHE_TTL,
     SEC_EDGAR_ARCHIVES_BASE_URL,
     SEC_EDGAR_BASE_URL,
+    SEC_EDGAR_KEEPALIVE_EXPIRY,
+    SEC_EDGAR_POOL_MAX_CONNECTIONS,
     SEC_EDGAR_RATE_LIMIT_CPS,
     SEC_EDGAR_REQUEST_TIMEOUT,
     SEC_EDGAR_USER_AGENT,
@@ -119,24 +129,111 @@ def _get_headers() -> dict[str, str]:
     return {"User-Agent": _USER_AGENT, "Accept-Encoding": "gzip, deflate"}
 
 
+try:
+    import h2  # noqa: F401
+
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+_client: httpx.Client | None = None
+_client_lock = threading.Lock()
+
+
+def _get_client() -> httpx.Client:
+    """
+    取得長駐 httpx.Client（lazy 建立，執行緒安全）。
+    連線池跨請求重用 TCP + TLS 連線；大師回填逐筆下載數十份申報時不再每次重新握手。
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(
+                    timeout=SEC_EDGAR_REQUEST_TIMEOUT,
+                    headers=_get_headers(),
+                    http2=_HTTP2_AVAILABLE,
+                    limits=httpx.Limits(
+                        max_connections=SEC_EDGAR_POOL_MAX_CONNECTIONS,
+                        max_keepalive_connections=SEC_EDGAR_POOL_MAX_CONNECTIONS,
+                        keepalive_expiry=SEC_EDGAR_KEEPALIVE_EXPIRY,
+                    ),
+                )
+                logger.debug("EDGAR HTTP 連線池已建立（HTTP/2=%s）。", _HTTP2_AVAILABLE)
+    return _client
+
+
+def close_http_client() -> None:
+    """關閉長駐連線池（應用程式關閉時呼叫；之後的請求會重新建立）。"""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
 @_edgar_retry
-def _http_get_json(url: str) -> dict:
-    """GET a JSON endpoint from EDGAR with rate limiting and retry."""
+def _http_get(url: str, validators: dict | None = None) -> httpx.Response:
+    """
+    GET an EDGAR URL through the pooled client with rate limiting and retry.
+    When validators (etag / last_modified) are given, sends a conditional
+    request; a 304 response is returned as-is instead of raising.
+    """
     _rate_limiter.wait()
-    with httpx.Client(timeout=SEC_EDGAR_REQUEST_TIMEOUT) as client:
-        resp = client.get(url, headers=_get_headers())
-        resp.raise_for_status()
-        return resp.json()
+    headers: dict[str, str] = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    resp = _get_client().get(url, headers=headers)
+    if resp.status_code == httpx.codes.NOT_MODIFIED and validators:
+        return resp
+    resp.raise_for_status()
+    return resp
+
+
+def _http_get_json(url: str, revalidate_key: str | None = None) -> dict:
+    """
+    GET a JSON endpoint from EDGAR.
+
+    revalidate_key 指定時，以 L2 中保存的 ETag / Last-Modified 發出條件式請求：
+    304 沿用 L2 保存的內容；200 則更新內容與驗證值。
+    """
+    if revalidate_key is None:
+        return _http_get(url).json()
+
+    stored = _disk_get(revalidate_key)
+    validators = stored if isinstance(stored, dict) and "payload" in stored else None
+    resp = _http_get(url, validators)
+    if validators is not None and resp.status_code == httpx.codes.NOT_MODIFIED:
+        logger.debug("EDGAR 條件式請求 304（內容未變更）：%s", url)
+        _disk_set(revalidate_key, validators, DISK_GURU_VALIDATOR_TTL)
+        return validators["payload"]
+
+    payload = resp.json()
+    etag = resp.headers.get("ETag")
+    last_modified = resp.headers.get("Last-Modified")
+    if etag or last_modified:
+        _disk_set(
+            revalidate_key,
+            {"etag": etag, "last_modified": last_modified, "payload": payload},
+            DISK_GURU_VALIDATOR_TTL,
+        )
+    return payload
 
 
 @_edgar_retry
-def _http_get_text(url: str) -> str:
-    """GET a text/XML endpoint from EDGAR with rate limiting and retry."""
+def _http_stream_13f_holdings(url: str) -> list[dict]:
+    """
+    串流 GET 13F information table 並邊下載邊解析（含速率限制與重試）。
+    回應本文以 iter_bytes() 分段直接餵入 XMLPullParser，不保留整份文件；
+    記憶體用量與文件大小無關。下載中斷（傳輸錯誤）整份重試。
+    """
     _rate_limiter.wait()
-    with httpx.Client(timeout=SEC_EDGAR_REQUEST_TIMEOUT) as client:
-        resp = client.get(url, headers=_get_headers())
+    with _get_client().stream("GET", url) as resp:
         resp.raise_for_status()
-        return resp.text
+        return _parse_13f_chunks(resp.iter_bytes(_XML_FEED_CHUNK_SIZE))
 
 
 def _discover_infotable_filename(accession_path: str, cik: str) -> str | None:
@@ -193,7 +290,8 @@ def _discover_infotable_filename(accession_path: str, cik: str) -> str | None:
 def fetch_company_filings(cik: str) -> dict:
     """
     取得 EDGAR 公司申報索引 (submissions JSON)。
-    結果以 CIK 為 key，L1+L2 雙層快取。
+    結果以 CIK 為 key，L1+L2 雙層快取；L2 過期後以條件式請求重新驗證，
+    SEC 回傳 304 時直接沿用先前下載的內容。
 
     Args:
         cik: 10-digit zero-padded SEC CIK code.
@@ -214,10 +312,11 @@ def fetch_company_filings(cik: str) -> dict:
         return disk_cached
 
     url = f"{SEC_EDGAR_BASE_URL}/submissions/CIK{cik}.json"
+    validator_key = f"{DISK_KEY_GURU_FILING}:submissions_validator:{cik}"
     try:
-        result = _http_get_json(url)
+        result = _http_get_json(url, revalidate_key=validator_key)
         _filing_cache[cik] = result
-        _disk_set(disk_key, result, DISK_GURU_FILING_TTL)
+        _disk_set(disk_key, result, DISK_GURU_SUBMISSIONS_TTL)
         logger.debug("EDGAR submissions 已取得並快取：CIK=%s", cik)
         return result
     except Exception as exc:
@@ -316,8 +415,7 @@ def fetch_13f_filing_detail(accession_number: str, cik: str) -> list[dict]:
         return disk_cached
 
     try:
-        xml_text = _http_get_text(xml_url)
-        holdings = _parse_13f_xml(xml_text)
+        holdings = _http_stream_13f_holdings(xml_url)
         _disk_set(cache_key, holdings, DISK_GURU_FILING_TTL)
         logger.info(
             "EDGAR infotable 解析完成：%s (%s), %d 筆持倉",
@@ -331,37 +429,51 @@ def fetch_13f_filing_detail(accession_number: str, cik: str) -> list[dict]:
         return []
 
 
-def map_cusip_to_ticker(cusip: str, company_name: str) -> str | None:
+def resolve_cusip(cusip: str, company_name: str) -> tuple[str | None, str]:
     """
-    盡力將 CUSIP 轉換為股票代號。
+    盡力將 CUSIP 轉換為股票代號，並回傳解析來源。
 
     策略（依優先順序）：
-    1. 靜態本地查找表 (_CUSIP_MAP)
-    2. 由公司名稱推斷常見代號（有限）
-    3. 回傳 None（未來 Phase 可串接 EDGAR company search API）
+    1. 靜態本地查找表 (_CUSIP_MAP) → CUSIP_SOURCE_STATIC
+    2. 公司名稱片段比對（所有提示以單次掃描比對）→ CUSIP_SOURCE_NAME_HINT
+    3. 無法解析 → (None, CUSIP_SOURCE_UNRESOLVED)
 
     Args:
         cusip: 9-character CUSIP identifier.
         company_name: Company name from 13F filing (best-effort hint).
 
     Returns:
-        Ticker symbol string or None if unmappable.
+        (ticker, source) tuple; ticker is None if unmappable.
     """
     # Normalize
     cusip = cusip.strip().upper()
-    name_upper = company_name.strip().upper()
 
     # 1. Static lookup table (most reliable, covers top holdings)
     ticker = _CUSIP_MAP.get(cusip)
     if ticker:
-        return ticker
+        return ticker, CUSIP_SOURCE_STATIC
 
     # 2. Name-based heuristic for well-known names
-    for fragment, sym in _NAME_HINTS.items():
-        if fragment in name_upper:
-            return sym
+    ticker = _name_hint_matcher.match(company_name.strip().upper())
+    if ticker:
+        return ticker, CUSIP_SOURCE_NAME_HINT
 
-    return None
+    return None, CUSIP_SOURCE_UNRESOLVED
+
+
+def map_cusip_to_ticker(cusip: str, company_name: str) -> str | None:
+    """
+    盡力將 CUSIP 轉換為股票代號（resolve_cusip 的簡化版，不含解析來源）。
+
+    Returns:
+        Ticker symbol string or None if unmappable.
+    """
+    return resolve_cusip(cusip, company_name)[0]
+
+
+def get_static_cusip_map() -> dict[str, str]:
+    """回傳靜態 CUSIP → ticker 對照表副本（供啟動時種入持久化索引）。"""
+    return dict(_CUSIP_MAP)
 
 
 # ---------------------------------------------------------------------------
@@ -369,79 +481,107 @@ def map_cusip_to_ticker(cusip: str, company_name: str) -> str | None:
 # ---------------------------------------------------------------------------
 
 
-def _parse_13f_xml(xml_text: str) -> list[dict]:
+_XML_FEED_CHUNK_SIZE = 64 * 1024
+
+
+def _local_name(tag: str) -> str:
+    """去除命名空間（{uri}infoTable → infoTable），讓新舊格式共用同一組標籤比對。"""
+    return tag.rpartition("}")[2]
+
+
+def _child_text(node: ET.Element, name: str) -> str:
+    """以本地標籤名稱取得子元素文字（不分命名空間）。"""
+    for child in node:
+        if _local_name(child.tag) == name:
+            return (child.text or "").strip()
+    return ""
+
+
+def _iter_13f_holdings(chunks: Iterable[str | bytes]) -> Iterator[dict]:
+    """
+    串流解析 13F information table：以 XMLPullParser 逐段餵入（如 HTTP 回應的位元組區塊），
+    每筆 infoTable 結束即產出持倉並清除已處理元素，不建立整份 ElementTree，
+    也不對整份文件做正規表示式替換；記憶體用量與持倉列數無關。
+
+    Raises:
+        ET.ParseError: XML 格式錯誤或內容不完整。
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    root: ET.Element | None = None
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            if event == "start":
+                if root is None:
+                    root = elem
+                continue
+            if _local_name(elem.tag) != "infoTable":
+                continue
+            holding = _holding_from_entry(elem)
+            if holding is not None:
+                yield holding
+            # 已處理的 infoTable 自根節點移除，避免累積
+            if root is not None:
+                root.clear()
+    parser.close()
+
+
+def _holding_from_entry(entry: ET.Element) -> dict | None:
+    try:
+        cusip = _child_text(entry, "cusip")
+        company_name = _child_text(entry, "nameOfIssuer")
+        # value is in thousands USD
+        value_str = _child_text(entry, "value")
+        # shrsOrPrnAmt contains sshPrnamt (shares) and sshPrnamtType
+        shares_str = "0"
+        for child in entry:
+            if _local_name(child.tag) == "shrsOrPrnAmt":
+                shares_str = _child_text(child, "sshPrnamt")
+                break
+
+        if not cusip or not company_name:
+            return None
+
+        return {
+            "cusip": cusip.upper(),
+            "company_name": company_name,
+            "value": float(value_str or 0),
+            "shares": float(shares_str or 0),
+        }
+    except Exception as exc:
+        logger.debug("13F infoTable 條目解析跳過：%s", exc)
+        return None
+
+
+def _parse_13f_xml(xml_text: str | bytes) -> list[dict]:
     """
     解析 SEC 13F information table XML，回傳持倉列表。
 
     EDGAR 13F XML 使用兩種命名空間變體：
     - 新格式 (2013+): ns 'com/xbrl/dim/2011'
     - 舊格式: no namespace
+    標籤以本地名稱比對，兩種格式皆適用（見 _iter_13f_holdings）。
+
+    XML 不完整或格式錯誤時回傳空列表（不保留部分結果，避免截斷的檔案
+    被誤判為大量清倉）。
 
     Returns:
         list of dicts: cusip, company_name, value (thousands USD), shares.
     """
-    # Strip namespace declarations to simplify parsing
-    xml_clean = xml_text
-    for ns_prefix in (
-        'xmlns="',
-        "xmlns:ns1=",
-        "xmlns:xsi=",
-        " xsi:schemaLocation=",
-    ):
-        if ns_prefix in xml_clean:
-            # Remove namespace URIs but keep tag names
-            xml_clean = re.sub(r'\s*xmlns[^"]*"[^"]*"', "", xml_clean)
-            xml_clean = re.sub(r'\s*xsi:schemaLocation="[^"]*"', "", xml_clean)
-            break
-
-    # Strip any residual namespace prefixes from tag names (ns1:infoTable → infoTable)
-    xml_clean = re.sub(r"<(/?)[\w]+:", r"<\1", xml_clean)
+    return _parse_13f_chunks(
+        xml_text[offset : offset + _XML_FEED_CHUNK_SIZE]
+        for offset in range(0, len(xml_text), _XML_FEED_CHUNK_SIZE)
+    )
+
 
+def _parse_13f_chunks(chunks: Iterable[str | bytes]) -> list[dict]:
+    """以分段輸入解析 13F XML（見 _parse_13f_xml）；格式錯誤或不完整時回傳空列表。"""
     try:
-        root = ET.fromstring(xml_clean)
+        return list(_iter_13f_holdings(chunks))
     except ET.ParseError as exc:
         logger.warning("13F XML 解析失敗：%s", exc)
         return []
 
-    holdings = []
-    # Both wrapper tag names used across EDGAR history
-    for entry in root.iter("infoTable"):
-        try:
-            cusip = _xml_text(entry, "cusip")
-            company_name = _xml_text(entry, "nameOfIssuer")
-            # value is in thousands USD
-            value_str = _xml_text(entry, "value")
-            # shrsOrPrnAmt contains sshPrnamt (shares) and sshPrnamtType
-            sh_node = entry.find("shrsOrPrnAmt")
-            shares_str = _xml_text(sh_node, "sshPrnamt") if sh_node is not None else "0"
-
-            if not cusip or not company_name:
-                continue
-
-            holdings.append(
-                {
-                    "cusip": cusip.strip().upper(),
-                    "company_name": company_name.strip(),
-                    "value": float(value_str or 0),
-                    "shares": float(shares_str or 0),
-                }
-            )
-        except Exception as exc:
-            logger.debug("13F infoTable 條目解析跳過：%s", exc)
-            continue
-
-    return holdings
-
-
-def _xml_text(node, tag: str) -> str:
-    """Safely extract text from an XML child element."""
-    if node is None:
-        return ""
-    child = node.find(tag)
-    if child is None or child.text is None:
-        return ""
-    return child.text.strip()
-
 
 def _date_to_quarter(date_str: str) -> int:
     """Convert YYYY-MM-DD to quarter number (1–4)."""
@@ -522,3 +662,67 @@ _NAME_HINTS: dict[str, str] = {
     "MASTERCARD INC": "MA",
     "VISA INC": "V",
 }
+
+
+class _NameHintMatcher:
+    """
+    公司名稱片段比對器（Aho–Corasick 自動機）。
+
+    所有片段編譯成單一自動機，名稱只需掃描一次即可找出全部命中片段，
+    取代逐一片段做子字串搜尋；多個片段同時命中時，以對照表中較前的片段優先
+    （與原本依序比對的結果一致）。
+    """
+
+    def __init__(self, hints: dict[str, str]) -> None:
+        self._tickers = list(hints.values())
+        self._goto: list[dict[str, int]] = [{}]
+        # 每個狀態（含 fail 鏈）命中片段的最小優先序；無命中為 None
+        self._best: list[int | None] = [None]
+        for priority, fragment in enumerate(hints):
+            state = 0
+            for char in fragment:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._best.append(None)
+                state = nxt
+            if self._best[state] is None:
+                self._best[state] = priority
+        self._fail = [0] * len(self._goto)
+        self._build_fail_links()
+
+    def _build_fail_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                inherited = self._best[self._fail[nxt]]
+                own = self._best[nxt]
+                if inherited is not None and (own is None or inherited < own):
+                    self._best[nxt] = inherited
+
+    def match(self, text: str) -> str | None:
+        """回傳 text 中命中的最高優先片段所對應的 ticker；無命中時回傳 None。"""
+        state = 0
+        best: int | None = None
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            hit = self._best[state]
+            if hit is not None and (best is None or hit < best):
+                best = hit
+                if best == 0:
+                    break
+        return None if best is None else self._tickers[best]
+
+
+_name_hint_matcher = _NameHintMatcher(_NAME_HINTS)
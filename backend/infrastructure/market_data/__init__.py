@@ -37,18 +37,27 @@ from infrastructure.market_data.market_data import (  # noqa: F401
     get_forex_history_long,
     get_fundamentals,
     get_jp_volatility_index,
+    get_market_breadth_history,
     get_price_history,
     get_stock_beta,
     get_technical_signals,
     get_ticker_sector,
     get_ticker_sector_cached,
+    get_ticker_sectors_bulk,
     get_tw_volatility_index,
     get_vix_data,
     prewarm_beta_batch,
     prewarm_etf_holdings_batch,
     prewarm_etf_sector_weights_batch,
     prewarm_moat_batch,
+    prewarm_quote_batch,
     prewarm_signals_batch,
     prewarm_ticker_sector_batch,
+    prime_forex_history_batch,
     prime_signals_cache_batch,
 )
+from infrastructure.market_data.request_scheduler import (  # noqa: F401
+    LaneThreadPoolExecutor,
+    current_request_lane,
+    request_lane,
+)
@@ -0,0 +1,90 @@
+"""
+Infrastructure — Beta 矩陣引擎。
+
+以「日期 × ticker」收盤價矩陣一次向量化計算所有持倉相對一或多個基準
+（SPY、VT、^N225、^TWII 等）的 Beta，取代逐檔呼叫 compute_beta：
+- 各檔日收益率以其自身交易日計算（休市日跨越的漲跌歸入復市當日），
+  再以日期對齊基準，僅使用兩側皆有收益率的日期（跨市場假日不致錯位）
+
+Beta = Cov(R_stock, R_market) / Var(R_market)，與 domain.analysis.compute_beta 定義一致。
+持倉與基準的日線由 market_data.py 批次取得，Beta 的 L1 / L2 快取亦由其寫入。
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from domain.constants import BETA_MIN_HISTORY_PERIODS
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def compute_return_matrix(close_matrix: pd.DataFrame) -> pd.DataFrame:
+    """
+    將收盤價矩陣轉為算術日收益率矩陣。
+    每欄以自身非缺值日期計算，再對齊回矩陣日期（當日無交易為 NaN）。
+    前一日收盤為 0 的收益率視為無效。
+    """
+    if close_matrix.empty:
+        return pd.DataFrame(dtype=float)
+    returns = close_matrix.apply(
+        lambda column: column.dropna().pct_change(fill_method=None)
+    ).reindex(close_matrix.index)
+    return returns.replace([np.inf, -np.inf], np.nan)
+
+
+def _paired_moments(
+    returns: pd.DataFrame, benchmark: str
+) -> tuple[pd.Series, pd.Series, pd.Series]:
+    """
+    計算各欄與基準於成對有效日期上的（母體）共變異數與基準變異數。
+
+    Returns:
+        (配對天數, Cov(R_i, R_b), Var(R_b))，皆以欄名為索引。
+    """
+    market = returns[benchmark]
+    paired = returns.notna() & market.notna().to_numpy()[:, None]
+    stock = returns.where(paired)
+    bench = pd.DataFrame(
+        np.where(paired, market.to_numpy()[:, None], np.nan),
+        index=returns.index,
+        columns=returns.columns,
+    )
+    count = paired.sum()
+    stock_dev = stock - stock.sum() / count
+    bench_dev = bench - bench.sum() / count
+    cov = (stock_dev * bench_dev).sum() / count
+    var_bench = (bench_dev**2).sum() / count
+    return count, cov, var_bench
+
+
+def compute_beta_matrix(
+    close_matrix: pd.DataFrame,
+    benchmarks: Sequence[str],
+    min_periods: int = BETA_MIN_HISTORY_PERIODS,
+) -> pd.DataFrame:
+    """
+    一次計算矩陣內所有 ticker 相對各基準的 Beta。
+
+    Args:
+        close_matrix: 「日期 × ticker」收盤價矩陣（需包含各基準欄）。
+        benchmarks:   基準 ticker 列表；不在矩陣中的基準略過。
+        min_periods:  最少成對有效收益率天數（不足者為 NaN）。
+
+    Returns:
+        「ticker × 基準」DataFrame；Beta 四捨五入至 2 位，
+        資料不足或基準變異數為 0 時為 NaN。
+    """
+    returns = compute_return_matrix(close_matrix)
+    betas: dict[str, pd.Series] = {}
+    for benchmark in benchmarks:
+        if benchmark not in returns:
+            continue
+        count, cov, var_bench = _paired_moments(returns, benchmark)
+        enough = (count >= min_periods) & (var_bench > 0)
+        betas[benchmark] = (cov / var_bench).where(enough).round(2)
+    return pd.DataFrame(betas)
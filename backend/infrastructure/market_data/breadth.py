@@ -0,0 +1,53 @@
+"""
+Infrastructure — 市場寬度（breadth）引擎。
+
+以「日期 × ticker」收盤價矩陣一次向量化計算每日各檔 MA60 與跌破比例，
+取代逐檔呼叫 get_technical_signals：
+- 掃描 Layer 1 直接使用 batch_download_history 已取得的歷史，不再發出額外請求
+- 同一份矩陣即可輸出每日寬度時間序列（儀表板歷史市場情緒圖）
+
+掃描與儀表板傳入的日線皆已由 market_data.py 下載，此處只做均線與計數。
+"""
+
+from __future__ import annotations
+
+import pandas as pd
+
+from domain.constants import MA60_WINDOW
+
+BREADTH_COLUMNS: tuple[str, ...] = ("below", "valid", "below_pct")
+
+
+def compute_breadth_series(
+    close_matrix: pd.DataFrame, window: int = MA60_WINDOW
+) -> pd.DataFrame:
+    """
+    計算每日跌破 N 日均線的檔數與比例。
+
+    每檔均線以其自身交易日計算（不受其他市場假日 NaN 影響），再向前填補
+    至矩陣日期；某檔當日休市時沿用其最近一次收盤與均線，使有效檔數穩定。
+    收盤價與均線皆四捨五入至 2 位後比較，與 get_technical_signals 的單點結果一致。
+
+    Returns:
+        以日期為索引的 DataFrame，欄位 below（跌破檔數）、valid（有效檔數）、
+        below_pct（跌破百分比，四捨五入至 1 位；valid 為 0 時為 0.0）。
+        僅保留至少一檔可計算均線的日期。
+    """
+    if close_matrix.empty:
+        return pd.DataFrame(columns=list(BREADTH_COLUMNS), dtype=float)
+
+    moving_avg = close_matrix.apply(
+        lambda column: column.dropna().rolling(window).mean()
+    ).reindex(close_matrix.index)
+    closes = close_matrix.ffill().round(2)
+    moving_avg = moving_avg.ffill().round(2)
+
+    valid_mask = closes.notna() & moving_avg.notna()
+    below_mask = valid_mask & (closes < moving_avg)
+
+    valid = valid_mask.sum(axis=1)
+    below = below_mask.sum(axis=1)
+    pct = (below / valid.where(valid > 0) * 100).round(1).fillna(0.0)
+
+    breadth = pd.DataFrame({"below": below, "valid": valid, "below_pct": pct})
+    return breadth[breadth["valid"] > 0]
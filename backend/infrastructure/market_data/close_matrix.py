@@ -0,0 +1,40 @@
+"""
+Infrastructure — 收盤價矩陣（日期 × ticker）。
+
+市場寬度、匯率矩陣與 Beta 矩陣引擎共用的輸入格式：將各檔日線的收盤價
+以日期聯集對齊為單一 DataFrame，後續運算皆以欄為單位向量化處理。
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pandas as pd
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+
+def build_close_matrix(hist_map: Mapping[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    將 {ticker: OHLCV DataFrame} 對齊為「日期 × ticker」收盤價矩陣。
+    以日期聯集外連接（跨市場假日不同時缺值為 NaN）；缺少 Close 欄位或為空者略過。
+    """
+    columns: dict[str, pd.Series] = {}
+    for ticker, frame in hist_map.items():
+        if frame is None or frame.empty or "Close" not in frame:
+            continue
+        closes = frame["Close"].dropna()
+        if closes.empty:
+            continue
+        index = pd.DatetimeIndex(closes.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        columns[ticker] = pd.Series(
+            closes.to_numpy(dtype=float), index=index.normalize()
+        )
+    if not columns:
+        return pd.DataFrame(dtype=float)
+    matrix = pd.DataFrame(columns)
+    matrix = matrix[~matrix.index.duplicated(keep="last")]
+    return matrix.sort_index()
@@ -0,0 +1,82 @@
+"""
+Infrastructure — 匯率矩陣（USD 樞紐）引擎。
+
+每個幣別僅需一檔 USD{CUR}=X 日線（1 USD = ? CUR），對齊為「日期 × 幣別」矩陣後，
+任意幣別組合（含 JPY/TWD 等交叉匯率與反向匯率）皆可本地推導：
+    1 BASE = ? QUOTE  =  matrix[QUOTE] / matrix[BASE]
+請求數由 O(組合數) 降為 O(幣別數)，且曝險監控與換匯時機監控共用同一份矩陣。
+即期匯率同理：各幣別僅快取 1 CUR = ? USD，任意顯示幣別的匯率皆由 cross_rate 本地換算。
+
+USD{CUR}=X 日線與即期報價由 market_data.py 的 FX 預熱下載並快取，此處只做換算。
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from infrastructure.market_data.close_matrix import build_close_matrix
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    import pandas as pd
+
+PIVOT_CURRENCY = "USD"
+
+
+def usd_pivot_symbol(currency: str) -> str:
+    """回傳 1 USD = ? currency 的 yfinance 代號（例如 TWD → "USDTWD=X"）。"""
+    return f"{PIVOT_CURRENCY}{currency}=X"
+
+
+def cross_rate(usd_values: Mapping[str, float], display: str, holding: str) -> float:
+    """
+    由各幣別的 USD 價值推導即期匯率：1 holding = ? display。
+    usd_values 為 {currency: 1 currency = ? USD}（USD 本身可省略）；
+    缺少任一幣別或分母非正數時回傳 1.0（與單一匯率查詢失敗時的預設值一致）。
+    """
+    if display == holding:
+        return 1.0
+    values = {PIVOT_CURRENCY: 1.0, **usd_values}
+    holding_usd = values.get(holding)
+    display_usd = values.get(display)
+    if not holding_usd or not display_usd or display_usd <= 0:
+        return 1.0
+    return holding_usd / display_usd
+
+
+def build_usd_pivot_matrix(hist_map: Mapping[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    將 {currency: USD{CUR}=X 的 OHLCV DataFrame} 對齊為「日期 × 幣別」矩陣。
+    值為 1 USD = ? 該幣別；非空矩陣另補 USD 欄（恆為 1.0）。
+    """
+    matrix = build_close_matrix(hist_map)
+    if not matrix.empty:
+        matrix[PIVOT_CURRENCY] = 1.0
+    return matrix
+
+
+def cross_rate_history(matrix: pd.DataFrame, base: str, quote: str) -> list[dict]:
+    """
+    由樞紐矩陣推導 1 base = ? quote 的每日收盤價。
+
+    僅保留至少一側（非 USD）當日有報價的日期，另一側休市時沿用其最近收盤；
+    任一側尚無資料或比值非正數的日期略過。
+
+    Returns:
+        [{"date": "YYYY-MM-DD", "close": float}, ...] 按日期升序（四捨五入至 4 位）；
+        base == quote 或任一幣別不在矩陣中時回傳空列表。
+    """
+    if base == quote or base not in matrix or quote not in matrix:
+        return []
+    legs = [cur for cur in (base, quote) if cur != PIVOT_CURRENCY]
+    traded = matrix[legs].notna().any(axis=1)
+    pair = matrix[[base, quote]].ffill()[traded].dropna()
+    rates = pair[quote] / pair[base]
+    rates = rates[np.isfinite(rates) & (rates > 0)]
+    return [
+        {"date": idx.strftime("%Y-%m-%d"), "close": round(float(rate), 4)}
+        for idx, rate in rates.items()
+    ]
@@ -0,0 +1,121 @@
+"""
+Infrastructure — 單檔日線請求合併（micro-batching）。
+
+多個執行緒幾乎同時 cache miss 時（如 _compute_enriched_stocks 的執行緒池、
+prewarm_signals_batch 的回退路徑），各自的單檔 history 請求會分別排隊等待限流額度。
+HistoryCoalescer 將短窗口內參數相同的單檔請求合併為一次多檔下載，
+再將各 ticker 的 DataFrame 分發回各自的呼叫端，呼叫端不需感知批次存在。
+窗口內僅有一檔時仍走單檔請求（history 端點額度），不佔用較保守的批次下載額度。
+
+採 leader / follower 模式，不需背景執行緒：
+- 第一個到達的請求開啟批次並成為 leader，等待窗口結束（或批次滿額）後送出下載
+- 窗口內到達的同 key 請求加入批次並等待 leader 分發結果
+- 下載例外轉拋給批次內所有呼叫端（由各自的重試機制處理）
+
+本模組不直接呼叫 yfinance：多檔下載函式由呼叫端（market_data.py）注入，
+速率限制與限流回報仍由呼叫端負責。
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+import pandas as pd
+
+from domain.constants import YF_HISTORY_COALESCE_MAX_BATCH, YF_HISTORY_COALESCE_WINDOW
+from logging_config import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+logger = get_logger(__name__)
+
+
+class _Batch:
+    """單一合併批次：收集 ticker，完成後保存分發結果或例外。"""
+
+    def __init__(self) -> None:
+        self.tickers: list[str] = []
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.frames: dict[str, pd.DataFrame] = {}
+        self.error: BaseException | None = None
+
+
+class HistoryCoalescer:
+    """
+    Thread-safe 單檔日線請求合併器。
+    key 相同（下載參數與請求通道一致）的請求於 window 秒內合併為一次 download(tickers)；
+    批次僅一檔時改呼叫該請求自身的 fetch_single()。
+    """
+
+    def __init__(
+        self,
+        window: float = YF_HISTORY_COALESCE_WINDOW,
+        max_batch: int = YF_HISTORY_COALESCE_MAX_BATCH,
+    ) -> None:
+        self._window = window
+        self._max_batch = max_batch
+        self._lock = threading.Lock()
+        self._open: dict[Hashable, _Batch] = {}
+
+    def fetch(
+        self,
+        ticker: str,
+        key: Hashable,
+        download: Callable[[list[str]], dict[str, pd.DataFrame]],
+        fetch_single: Callable[[], pd.DataFrame],
+    ) -> pd.DataFrame:
+        """
+        取得單一 ticker 的日線；與同 key 的並發請求合併下載。
+        fetch_single 為未合併時的單檔請求（僅 leader 在批次只有自身一檔時呼叫）。
+        批次結果缺少該 ticker 時回傳空 DataFrame（與單檔下載無資料的行為一致）。
+        """
+        with self._lock:
+            batch = self._open.get(key)
+            leader = batch is None
+            if leader:
+                batch = _Batch()
+                self._open[key] = batch
+            if ticker not in batch.tickers:
+                batch.tickers.append(ticker)
+            if len(batch.tickers) >= self._max_batch:
+                # 滿額即關閉批次，後續請求另開新批次
+                self._open.pop(key, None)
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self._window)
+            self._dispatch(key, batch, download, fetch_single)
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+        frame = batch.frames.get(ticker)
+        return frame if frame is not None else pd.DataFrame()
+
+    def _dispatch(
+        self,
+        key: Hashable,
+        batch: _Batch,
+        download: Callable[[list[str]], dict[str, pd.DataFrame]],
+        fetch_single: Callable[[], pd.DataFrame],
+    ) -> None:
+        with self._lock:
+            if self._open.get(key) is batch:
+                del self._open[key]
+            tickers = list(batch.tickers)
+        try:
+            if len(tickers) == 1:
+                batch.frames = {tickers[0]: fetch_single()}
+            else:
+                logger.debug(
+                    "合併 %d 檔單檔日線請求為一次下載（%s）。", len(tickers), key
+                )
+                batch.frames = download(tickers)
+        except Exception as exc:
+            batch.error = exc
+        finally:
+            batch.done.set()
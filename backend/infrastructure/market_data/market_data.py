@@ -12,12 +12,12 @@ import contextlib
 import math
 import threading
 import time
-from collections.abc import Callable
-from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Callable, Iterable
 from datetime import UTC, date, datetime, timedelta
 from typing import TypeVar
 
 import diskcache
+import pandas as pd
 import yfinance as yf
 from cachetools import TTLCache
 from curl_cffi import requests as cffi_requests
@@ -28,11 +28,13 @@ from tenacity import (
     stop_after_attempt,
     wait_exponential,
 )
+from yfinance.data import YfData
+from yfinance.exceptions import YFRateLimitError
 
 from domain.analysis import (
+    PriceSeries,
     classify_cnn_fear_greed,
     classify_vix,
-    compute_beta,
     compute_bias,
     compute_composite_fear_greed,
     compute_daily_change_pct,
@@ -97,6 +99,7 @@ from domain.constants import (
     DISK_SIGNALS_TTL,
     DIVIDEND_CACHE_MAXSIZE,
     DIVIDEND_CACHE_TTL,
+    DIVIDEND_STALE_TTL,
     EARNINGS_CACHE_MAXSIZE,
     EARNINGS_CACHE_TTL,
     ETF_HOLDINGS_CACHE_MAXSIZE,
@@ -118,14 +121,18 @@ from domain.constants import (
     FOREX_HISTORY_CACHE_TTL,
     FOREX_HISTORY_LONG_CACHE_MAXSIZE,
     FOREX_HISTORY_LONG_CACHE_TTL,
+    FOREX_STALE_TTL,
     FUNDAMENTALS_CACHE_MAXSIZE,
     FUNDAMENTALS_CACHE_TTL,
+    FUNDAMENTALS_STALE_TTL,
+    FX_HISTORY_DAYS,
     FX_HISTORY_PERIOD,
     FX_LONG_TERM_PERIOD,
     INSTITUTIONAL_HOLDERS_TOP_N,
     MA60_WINDOW,
     MA200_WINDOW,
     MARGIN_TREND_QUARTERS,
+    MARKET_BREADTH_HISTORY_DAYS,
     MIN_CLOSE_PRICES_FOR_CHANGE,
     MIN_HISTORY_DAYS_FOR_SIGNALS,
     MOAT_CACHE_MAXSIZE,
@@ -141,13 +148,27 @@ from domain.constants import (
     SCAN_THREAD_POOL_SIZE,
     SIGNALS_CACHE_MAXSIZE,
     SIGNALS_CACHE_TTL,
+    SIGNALS_STALE_TTL,
+    SWR_REFRESH_WORKERS,
     TWII_TICKER,
     VIX_HISTORY_PERIOD,
     VIX_TICKER,
+    YF_ENDPOINT_DOWNLOAD,
+    YF_ENDPOINT_HISTORY,
+    YF_ENDPOINT_INFO,
     YF_INFO_CACHE_MAXSIZE,
     YF_INFO_CACHE_TTL,
+    YF_LANE_PREWARM,
+    YF_LANE_WEIGHTS,
+    YF_QUOTE_BATCH_SIZE,
+    YF_QUOTE_BATCH_URL,
+    YFINANCE_BACKOFF_FACTOR,
+    YFINANCE_BACKOFF_MIN_MULTIPLIER,
+    YFINANCE_BACKOFF_RECOVERY_STEP,
+    YFINANCE_ENDPOINT_RATE_LIMITS,
+    YFINANCE_GLOBAL_RATE_LIMIT_CPS,
     YFINANCE_HISTORY_PERIOD,
-    YFINANCE_RATE_LIMIT_CPS,
+    YFINANCE_RATE_LIMIT_BURST,
     YFINANCE_RETRY_ATTEMPTS,
     YFINANCE_RETRY_WAIT_MAX,
     YFINANCE_RETRY_WAIT_MIN,
@@ -155,6 +176,25 @@ from domain.constants import (
 from domain.enums import FearGreedLevel, MarketSentiment, MoatStatus
 from domain.formatters import build_moat_details, build_signal_status
 from i18n import t
+from infrastructure.market_data import price_store
+from infrastructure.market_data.beta import compute_beta_matrix
+from infrastructure.market_data.breadth import compute_breadth_series
+from infrastructure.market_data.close_matrix import build_close_matrix
+from infrastructure.market_data.fx_matrix import (
+    PIVOT_CURRENCY,
+    build_usd_pivot_matrix,
+    cross_rate,
+    cross_rate_history,
+    usd_pivot_symbol,
+)
+from infrastructure.market_data.history_coalescer import HistoryCoalescer
+from infrastructure.market_data.request_scheduler import (
+    FairRequestQueue,
+    LaneThreadPoolExecutor,
+    current_request_lane,
+    request_lane,
+)
+from infrastructure.shared_cache import host_single_flight
 from logging_config import get_logger
 
 T = TypeVar("T")
@@ -196,24 +236,179 @@ def _is_dividend_error(result) -> bool:
 # ---------------------------------------------------------------------------
 
 
+class _TokenBucket:
+    """單一額度桶：以 rate 速率補充 token，最多累積 capacity 個（閒置後的突發額度）。"""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.base_rate = rate
+        self.capacity = capacity
+        self.multiplier = 1.0
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        return self.base_rate * self.multiplier
+
+    def refill(self, now: float) -> None:
+        """依經過時間補充 token。"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available_in(self) -> float:
+        """距離下一個完整 token 可用的秒數（需先 refill）。"""
+        return 0.0 if self.tokens >= 1.0 else (1.0 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1.0
+
+
 class RateLimiter:
-    """Thread-safe rate limiter，確保呼叫間隔不低於 min_interval。"""
+    """
+    Thread-safe token-bucket rate limiter with prioritized fair queuing。
+    每個 Yahoo 端點類別（history / info / download）各有一個額度桶，另有一個全域桶；
+    wait() 需同時取得兩者的 token。
+
+    等待者依呼叫端宣告的請求通道（request_lane）進入加權公平佇列：
+    端點桶有額度的等待者中，公平佇列標記最小者優先取得全域額度，
+    因此互動請求可插隊於掃描 / 預熱 / 回填之前，低優先通道仍按權重比例推進。
+    等待中以 Condition.wait 釋放鎖，慢速端點不會阻塞其他端點的呼叫。
+
+    觀察到 429 時（report_throttled）該端點速率減半並清空突發額度，
+    之後每次成功（report_success）以加法遞增逐步恢復至原速率（AIMD）。
+    """
+
+    def __init__(
+        self,
+        calls_per_second: float = YFINANCE_GLOBAL_RATE_LIMIT_CPS,
+        endpoint_rates: dict[str, float] | None = None,
+        burst: float = YFINANCE_RATE_LIMIT_BURST,
+        lane_weights: dict[str, float] | None = None,
+    ):
+        self._cond = threading.Condition()
+        self._burst = burst
+        rates = endpoint_rates or {}
+        # 全域桶與端點桶共用同一突發上限：閒置後各端點合計也不超過 burst 次
+        self._global = _TokenBucket(calls_per_second, burst)
+        self._buckets: dict[str, _TokenBucket] = {
+            endpoint: _TokenBucket(rate, burst) for endpoint, rate in rates.items()
+        }
+        self._queue = FairRequestQueue(lane_weights or YF_LANE_WEIGHTS)
+
+    def _bucket(self, endpoint: str) -> _TokenBucket:
+        bucket = self._buckets.get(endpoint)
+        if bucket is None:
+            bucket = _TokenBucket(self._global.base_rate, self._burst)
+            self._buckets[endpoint] = bucket
+        return bucket
+
+    def wait(self, endpoint: str = YF_ENDPOINT_HISTORY) -> None:
+        """依目前請求通道排隊，直到取得端點與全域額度。"""
+        with self._cond:
+            request = self._queue.enqueue(current_request_lane(), endpoint)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._global.refill(now)
+                    for bucket in self._buckets.values():
+                        bucket.refill(now)
+                    bucket = self._bucket(endpoint)
+                    bucket.refill(now)
+
+                    head = self._queue.first(
+                        lambda r: self._bucket(r.endpoint).available_in() == 0.0
+                    )
+                    if head is request and self._global.available_in() == 0.0:
+                        bucket.take()
+                        self._global.take()
+                        self._queue.dispatch(request)
+                        self._cond.notify_all()
+                        return
+
+                    # 非隊首且端點已有額度者等待隊首放行的通知
+                    delay = max(bucket.available_in(), self._global.available_in())
+                    self._cond.wait(delay if delay > 0 else None)
+            except BaseException:
+                self._queue.cancel(request)
+                self._cond.notify_all()
+                raise
+
+    def report_throttled(self, endpoint: str = YF_ENDPOINT_HISTORY) -> None:
+        """回報 429 限流：降低該端點速率並清空突發額度。"""
+        with self._cond:
+            bucket = self._bucket(endpoint)
+            bucket.refill(time.monotonic())
+            bucket.multiplier = max(
+                YFINANCE_BACKOFF_MIN_MULTIPLIER,
+                bucket.multiplier * YFINANCE_BACKOFF_FACTOR,
+            )
+            bucket.tokens = min(bucket.tokens, 0.0)
+            multiplier = bucket.multiplier
+            # 隊首可能因此失去額度，喚醒等待者重新選出隊首
+            self._cond.notify_all()
+        logger.warning(
+            "yfinance %s 端點疑似被限流，速率降至 %.0f%%。", endpoint, multiplier * 100
+        )
+
+    def report_success(self, endpoint: str = YF_ENDPOINT_HISTORY) -> None:
+        """回報成功回應：逐步恢復該端點速率。"""
+        with self._cond:
+            bucket = self._bucket(endpoint)
+            if bucket.multiplier < 1.0:
+                bucket.multiplier = min(
+                    1.0, bucket.multiplier + YFINANCE_BACKOFF_RECOVERY_STEP
+                )
 
-    def __init__(self, calls_per_second: float = YFINANCE_RATE_LIMIT_CPS):
-        self._min_interval = 1.0 / calls_per_second
-        self._lock = threading.Lock()
-        self._last_call = 0.0
+    def current_rates(self) -> dict[str, float]:
+        """回傳各端點目前的有效速率（calls/sec），供監控使用。"""
+        with self._cond:
+            return {endpoint: b.rate for endpoint, b in self._buckets.items()}
 
-    def wait(self) -> None:
-        with self._lock:
-            now = time.monotonic()
-            elapsed = now - self._last_call
-            if elapsed < self._min_interval:
-                time.sleep(self._min_interval - elapsed)
-            self._last_call = time.monotonic()
+    def queue_depths(self) -> dict[str, int]:
+        """回傳各請求通道目前等待額度的請求數，供監控使用。"""
+        with self._cond:
+            return self._queue.depths()
 
 
-_rate_limiter = RateLimiter(calls_per_second=YFINANCE_RATE_LIMIT_CPS)
+_rate_limiter = RateLimiter(
+    calls_per_second=YFINANCE_GLOBAL_RATE_LIMIT_CPS,
+    endpoint_rates=YFINANCE_ENDPOINT_RATE_LIMITS,
+)
+
+
+def _is_throttle_error(exc: BaseException) -> bool:
+    """判斷例外是否為 Yahoo 限流（429 / YFRateLimitError）。"""
+    if isinstance(exc, YFRateLimitError):
+        return True
+    message = str(exc)
+    return "429" in message or "Too Many Requests" in message
+
+
+def _download_was_throttled() -> bool:
+    """yf.download 最近一次呼叫吞掉的錯誤（yfinance.shared._ERRORS）是否含限流。"""
+    errors = getattr(yf.shared, "_ERRORS", None) or {}
+    return any(
+        "429" in str(err) or "Too Many Requests" in str(err) or "Rate limit" in str(err)
+        for err in errors.values()
+    )
+
+
+@contextlib.contextmanager
+def _yf_request(endpoint: str):
+    """
+    包裹單次 yfinance 請求：先取得端點額度，並依結果回報給限流器
+    （限流例外 → report_throttled；正常結束 → report_success）。
+    yf.download 吞掉的 429 由呼叫端依 yfinance 錯誤紀錄自行 report_throttled；
+    其餘空回應（DNS / 網路錯誤、下市標的）不視為限流，避免誤降速率。
+    """
+    _rate_limiter.wait(endpoint)
+    try:
+        yield
+    except Exception as exc:
+        if _is_throttle_error(exc):
+            _rate_limiter.report_throttled(endpoint)
+        raise
+    _rate_limiter.report_success(endpoint)
 
 
 # ---------------------------------------------------------------------------
@@ -224,16 +419,22 @@ _inflight_events: dict[str, threading.Event] = {}
 
 
 def _deduped_fetch(
-    key: str, fetcher: Callable[[], T], result_getter: Callable[[], T]
+    key: str,
+    fetcher: Callable[[], T],
+    result_getter: Callable[[], T],
+    shared_getter: Callable[[], T | None] | None = None,
 ) -> T:
     """確保同一 key 的 yfinance 呼叫在任意時刻只有一個在飛行中。
 
     若已有相同 key 的請求進行中，等待其完成後透過 result_getter 取用結果（例如讀 L1 快取）。
+    提供 shared_getter 時，執行緒層的主呼叫再經主機共享租約（host_single_flight）去重：
+    其他 uvicorn worker 正在抓取同一 key 時，等待其寫入 L2 後以 shared_getter 讀取。
 
     Args:
         key: 唯一識別此請求的字串（通常為 disk_prefix:ticker）。
         fetcher: 實際執行 yfinance 呼叫並寫入快取的函式。
         result_getter: 等待完成後用來讀取快取結果的函式（fetcher 寫入後呼叫）。
+        shared_getter: 讀取跨程序共享結果（L2）的函式，未命中回傳 None。
 
     Note: 同一 ticker 在 debug 日誌中出現兩筆「L1+L2 皆未命中」是正常現象。
     兩個並發請求都在進入 _deduped_fetch 之前就已記錄 cache miss；
@@ -255,6 +456,8 @@ def _deduped_fetch(
         return result_getter()
 
     try:
+        if shared_getter is not None:
+            return host_single_flight(f"fetch:{key}", fetcher, shared_getter)
         return fetcher()
     finally:
         # set() before pop(): any late-arriving thread that finds this event already set
@@ -264,6 +467,52 @@ def _deduped_fetch(
             _inflight_events.pop(key, None)
 
 
+# ---------------------------------------------------------------------------
+# Stale-while-revalidate 背景刷新：同一 key 同時最多排程一次
+# ---------------------------------------------------------------------------
+_revalidate_lock = threading.Lock()
+_revalidating: set[str] = set()
+_revalidate_executor = LaneThreadPoolExecutor(
+    max_workers=SWR_REFRESH_WORKERS, thread_name_prefix="swr-refresh"
+)
+
+
+def _schedule_revalidate(
+    key: str,
+    fetcher: Callable[[], T],
+    result_getter: Callable[[], T],
+    shared_getter: Callable[[], T | None] | None = None,
+) -> bool:
+    """
+    排程單一背景刷新（經 _deduped_fetch，與同步請求共用 in-flight 去重）。
+    同一 key 已排程或刷新中時略過；回傳是否實際排程。
+    背景刷新以預熱通道（YF_LANE_PREWARM）排隊，不與互動請求爭搶額度。
+    """
+    with _revalidate_lock:
+        if key in _revalidating:
+            return False
+        _revalidating.add(key)
+
+    @request_lane(YF_LANE_PREWARM)
+    def _run() -> None:
+        try:
+            _deduped_fetch(key, fetcher, result_getter, shared_getter)
+        except Exception as exc:
+            logger.warning("%s 背景刷新失敗（沿用舊值）：%s", key, exc)
+        finally:
+            with _revalidate_lock:
+                _revalidating.discard(key)
+
+    try:
+        _revalidate_executor.submit(_run)
+    except RuntimeError:
+        # 直譯器關閉中，執行緒池已停止接受工作
+        with _revalidate_lock:
+            _revalidating.discard(key)
+        return False
+    return True
+
+
 # ---------------------------------------------------------------------------
 # L1 快取（記憶體）：避免每次頁面載入都重複呼叫 yfinance
 # ---------------------------------------------------------------------------
@@ -328,6 +577,22 @@ def _disk_set(key: str, value, ttl: int) -> None:
         _disk_cache.set(key, value, expire=ttl)
 
 
+def _disk_age(key: str, ttl: int) -> float | None:
+    """
+    由 L2 到期時間推算資料年齡（秒）：寫入時 expire = ttl，故年齡 = ttl - 剩餘壽命。
+    無到期時間、ttl 非正數或讀取失敗時回傳 None（視為年齡未知）。
+    """
+    if ttl <= 0:
+        return None
+    try:
+        _value, expire_time = _disk_cache.get(key, expire_time=True)
+    except Exception:
+        return None
+    if expire_time is None:
+        return None
+    return max(ttl - (expire_time - time.time()), 0.0)
+
+
 def clear_all_caches() -> dict:
     """清除所有 L1 記憶體快取與 L2 磁碟快取。"""
     l1_caches = [
@@ -350,7 +615,8 @@ def clear_all_caches() -> dict:
     for cache in l1_caches:
         cache.clear()
     _disk_cache.clear()
-    logger.info("已清除所有快取（L1×%d + L2 磁碟）。", len(l1_caches))
+    price_store.clear_price_store()
+    logger.info("已清除所有快取（L1×%d + L2 磁碟 + 日線倉儲）。", len(l1_caches))
     return {"l1_cleared": len(l1_caches), "l2_cleared": True}
 
 
@@ -361,6 +627,7 @@ def _cached_fetch(
     disk_ttl: int,
     fetcher: Callable[[str], T],
     is_error: Callable[[T], bool] | None = None,
+    stale_ttl: int | None = None,
 ) -> T:
     """
     通用二層快取取得函式。
@@ -369,25 +636,26 @@ def _cached_fetch(
     is_error — 可選回呼函式，判斷 fetcher 結果是否為錯誤。
     若為錯誤，仍寫入 L1（短暫快取避免瞬間重複呼叫），但略過 L2/磁碟寫入，
     讓下次 L1 過期後可重新嘗試取得正確結果。
+
+    stale_ttl — 可選硬 TTL（秒），啟用 stale-while-revalidate：
+    L2 資料年齡未超過 L1 TTL（軟 TTL）時視為新鮮並回填 L1；
+    超過軟 TTL 但未超過 stale_ttl 時立即回傳舊值，並排程單一背景刷新；
+    超過 stale_ttl 才同步呼叫 fetcher。L1 為錯誤結果（剛刷新失敗）時沿用 L2 舊值，
+    待錯誤結果於 L1 過期後才再次嘗試，避免失敗期間每次請求都重新呼叫 yfinance。
     """
+    l1_error = False
     cached = l1_cache.get(ticker)
     if cached is not None:
         # If L1 has an error entry but L2 may have recovered valid data, fall through.
         if is_error is None or not is_error(cached):
             logger.debug("%s 命中 L1 快取（prefix=%s）。", ticker, disk_prefix)
             return cached
+        l1_error = True
         logger.debug(
             "%s L1 為錯誤結果，繼續嘗試 L2（prefix=%s）。", ticker, disk_prefix
         )
 
     disk_key = f"{disk_prefix}:{ticker}"
-    disk_cached = _disk_get(disk_key)
-    if disk_cached is not None:
-        logger.debug("%s 命中 L2 磁碟快取（prefix=%s）。", ticker, disk_prefix)
-        l1_cache[ticker] = disk_cached
-        return disk_cached
-
-    logger.debug("%s L1+L2 皆未命中（prefix=%s），呼叫 fetcher...", ticker, disk_prefix)
 
     def _do_fetch() -> T:
         res = fetcher(ticker)
@@ -411,7 +679,49 @@ def _cached_fetch(
         # fetcher 拋出例外（非錯誤哨兵）— 每個等待者各自重試一次（已由速率限制器節流）
         return fetcher(ticker)
 
-    return _deduped_fetch(disk_key, _do_fetch, _get_cached)
+    def _get_shared() -> T | None:
+        # 其他 worker 完成抓取後已寫入 L2（錯誤結果不寫 L2，等待者會自行重試）
+        disk_val = _disk_get(disk_key)
+        if disk_val is not None:
+            l1_cache[ticker] = disk_val
+        return disk_val
+
+    disk_cached = _disk_get(disk_key)
+    if disk_cached is not None:
+        age = _disk_age(disk_key, disk_ttl) if stale_ttl is not None else None
+        if age is None or age < l1_cache.ttl:
+            logger.debug("%s 命中 L2 磁碟快取（prefix=%s）。", ticker, disk_prefix)
+            l1_cache[ticker] = disk_cached
+            return disk_cached
+        if l1_error:
+            logger.debug(
+                "%s 近期刷新失敗，沿用 L2 舊值（age=%.0fs, prefix=%s）。",
+                ticker,
+                age,
+                disk_prefix,
+            )
+            return disk_cached
+        if age < stale_ttl:
+            logger.debug(
+                "%s 回傳 L2 舊值並排程背景刷新（age=%.0fs, prefix=%s）。",
+                ticker,
+                age,
+                disk_prefix,
+            )
+            _schedule_revalidate(disk_key, _do_fetch, _get_cached, _get_shared)
+            return disk_cached
+        logger.debug(
+            "%s L2 超過硬 TTL（age=%.0fs, prefix=%s），同步重新取得。",
+            ticker,
+            age,
+            disk_prefix,
+        )
+    else:
+        logger.debug(
+            "%s L1+L2 皆未命中（prefix=%s），呼叫 fetcher...", ticker, disk_prefix
+        )
+
+    return _deduped_fetch(disk_key, _do_fetch, _get_cached, _get_shared)
 
 
 def _get_session() -> cffi_requests.Session:
@@ -423,18 +733,45 @@ def _get_session() -> cffi_requests.Session:
 # Retryable yfinance network helpers
 # ---------------------------------------------------------------------------
 
+# 單檔日線請求合併器：同通道、同下載參數的並發請求合併為一次多檔 yf.download
+_history_coalescer = HistoryCoalescer()
+
 
 @_yf_retry
 def _yf_history(ticker: str, period: str):
     """
     取得 yfinance 歷史資料（含重試）。
     yf.Ticker() 僅建立本地物件（無 HTTP），屬性存取才觸發網路請求。
+    經由本地 OHLCV 倉儲：已涵蓋的區間僅下載增量 K 棒，剛同步過則完全不發請求。
+    需下載時經 _history_coalescer 與其他執行緒同參數的請求合併為一次 yf.download；
+    未與其他請求合併時仍以 Ticker.history 走 history 端點額度。
     空結果也視為可重試：yfinance 有時會吞掉 CurlError/SSL 錯誤，
     僅回傳空 DataFrame 而不拋出例外，導致 @_yf_retry 無法觸發。
     """
     stock = yf.Ticker(ticker, session=_get_session())
-    _rate_limiter.wait()
-    hist = stock.history(period=period)
+    lane = current_request_lane()
+
+    def _history(**kwargs):
+        with _yf_request(YF_ENDPOINT_HISTORY):
+            return stock.history(**kwargs)
+
+    def _fetch_period(fetch_period: str):
+        return _history_coalescer.fetch(
+            ticker,
+            (lane, "period", fetch_period),
+            lambda group: _download_frames(group, period=fetch_period),
+            lambda: _history(period=fetch_period),
+        )
+
+    def _fetch_since(start: date):
+        return _history_coalescer.fetch(
+            ticker,
+            (lane, "start", start),
+            lambda group: _download_frames(group, start=start),
+            lambda: _history(start=start),
+        )
+
+    hist = price_store.read_through(ticker, period, _fetch_period, _fetch_since)
     if hist.empty:
         raise OSError(
             f"{ticker}: yfinance returned empty history, possibly due to a swallowed network error"
@@ -448,8 +785,8 @@ def _yf_quarterly_financials(ticker: str):
     yf.Ticker() 僅建立本地物件（無 HTTP），屬性存取才觸發網路請求。
     """
     stock = yf.Ticker(ticker, session=_get_session())
-    _rate_limiter.wait()
-    return stock.quarterly_financials
+    with _yf_request(YF_ENDPOINT_INFO):
+        return stock.quarterly_financials
 
 
 @_yf_retry
@@ -458,8 +795,8 @@ def _yf_calendar(ticker: str):
     yf.Ticker() 僅建立本地物件（無 HTTP），屬性存取才觸發網路請求。
     """
     stock = yf.Ticker(ticker, session=_get_session())
-    _rate_limiter.wait()
-    return stock.calendar
+    with _yf_request(YF_ENDPOINT_INFO):
+        return stock.calendar
 
 
 @_yf_retry
@@ -472,8 +809,8 @@ def _yf_info(ticker: str):
         return cached
 
     stock = yf.Ticker(ticker, session=_get_session())
-    _rate_limiter.wait()
-    info = stock.info or {}
+    with _yf_request(YF_ENDPOINT_INFO):
+        info = stock.info or {}
     _yf_info_cache[ticker] = info
     return info
 
@@ -492,10 +829,10 @@ def _yf_history_short(ticker: str, period: str = "5d"):
     """取得 yfinance 短期歷史（匯率等，含重試）。
     空結果視為可重試（與 _yf_history 相同理由）。
     """
-    _rate_limiter.wait()
     session = _get_session()
     ticker_obj = yf.Ticker(ticker, session=session)
-    hist = ticker_obj.history(period=period)
+    with _yf_request(YF_ENDPOINT_HISTORY):
+        hist = ticker_obj.history(period=period)
     if hist.empty:
         raise OSError(
             f"{ticker}: yfinance returned empty short history, possibly due to a swallowed network error"
@@ -506,10 +843,27 @@ def _yf_history_short(ticker: str, period: str = "5d"):
 @_yf_retry
 def _yf_ticker_obj(ticker: str):
     """建立 yfinance Ticker 物件（含重試）。用於 ETF funds_data 等屬性存取。"""
-    _rate_limiter.wait()
+    _rate_limiter.wait(YF_ENDPOINT_INFO)
     return yf.Ticker(ticker, session=_get_session())
 
 
+@_yf_retry
+def _yf_quote_batch(tickers: list[str]) -> dict[str, dict]:
+    """
+    以 Yahoo 多檔 quote 端點（v7）一次取得多檔報價層級欄位（含重試）。
+    透過 yfinance 的 YfData 發送，沿用其 cookie / crumb 處理。
+    回傳 {symbol: quote_row}；Yahoo 未回傳的 symbol 不會出現在結果中。
+    """
+    data = YfData(session=_get_session())
+    with _yf_request(YF_ENDPOINT_INFO):
+        payload = data.get_raw_json(
+            YF_QUOTE_BATCH_URL,
+            params={"symbols": ",".join(tickers), "formatted": "false"},
+        )
+    rows = ((payload or {}).get("quoteResponse") or {}).get("result") or []
+    return {row["symbol"]: row for row in rows if row.get("symbol")}
+
+
 def _yf_dividend_data(ticker: str) -> tuple[dict, object]:
     """從單一 Ticker 物件取得 info 與股息歷史（含重試）。
     info 走 _yf_info（含短 TTL 快取）以共享給 fundamentals 路徑，降低重複呼叫。
@@ -523,8 +877,8 @@ def _yf_dividend_data(ticker: str) -> tuple[dict, object]:
 def _yf_dividends(ticker: str):
     """取得股息歷史（含重試）。"""
     stock = yf.Ticker(ticker, session=_get_session())
-    _rate_limiter.wait()
-    return stock.get_dividends()
+    with _yf_request(YF_ENDPOINT_HISTORY):
+        return stock.get_dividends()
 
 
 # ===========================================================================
@@ -605,7 +959,7 @@ def _fetch_signals_from_yf(ticker: str, pre_fetched_hist=None) -> dict:
         institutional_holders = None
         if stock is not None and not ticker.startswith("^"):
             try:
-                _rate_limiter.wait()
+                _rate_limiter.wait(YF_ENDPOINT_INFO)
                 holders_df = stock.institutional_holders
                 if holders_df is not None and not holders_df.empty:
                     top5 = holders_df.head(INSTITUTIONAL_HOLDERS_TOP_N)
@@ -663,7 +1017,8 @@ def _fetch_signals_from_yf(ticker: str, pre_fetched_hist=None) -> dict:
 def get_technical_signals(ticker: str) -> dict | None:
     """
     取得技術面訊號：RSI(14)、現價、200MA、60MA、Bias(%)、Volume Ratio。
-    結果快取 5 分鐘。錯誤結果僅寫入 L1（短暫），不寫入 L2/磁碟。
+    結果快取 5 分鐘；過期後 1 小時內先回傳舊值並於背景刷新（stale-while-revalidate）。
+    錯誤結果僅寫入 L1（短暫），不寫入 L2/磁碟。
     """
     return _cached_fetch(
         _signals_cache,
@@ -672,6 +1027,52 @@ def get_technical_signals(ticker: str) -> dict | None:
         DISK_SIGNALS_TTL,
         _fetch_signals_from_yf,
         is_error=_is_error_dict,
+        stale_ttl=SIGNALS_STALE_TTL,
+    )
+
+
+def _download_frames(tickers: list[str], **kwargs) -> dict:
+    """
+    以單次 yf.download() 下載多檔日線並拆分為 {ticker: DataFrame}。
+    kwargs 為 period= 或 start=；下載例外直接向上拋出。
+    """
+    with _yf_request(YF_ENDPOINT_DOWNLOAD):
+        data = yf.download(
+            tickers,
+            group_by="ticker",
+            threads=True,
+            progress=False,
+            auto_adjust=True,
+            **kwargs,
+        )
+    if data is None or data.empty:
+        # yf.download 會吞掉 429 等錯誤僅回傳空表；僅在錯誤紀錄確為限流時降速
+        if _download_was_throttled():
+            _rate_limiter.report_throttled(YF_ENDPOINT_DOWNLOAD)
+        return {}
+    frames: dict = {}
+    for ticker in tickers:
+        try:
+            if len(tickers) > 1 or (
+                isinstance(data.columns, pd.MultiIndex)
+                and ticker in data.columns.get_level_values(0)
+            ):
+                df = data[ticker]
+            else:
+                df = data
+            frames[ticker] = df.dropna(how="all")
+        except (KeyError, Exception) as e:
+            logger.debug("批次下載 %s 資料擷取失敗（已略過）：%s", ticker, e)
+    return frames
+
+
+def _read_history_batch(tickers: list[str], period: str) -> dict:
+    """經由本地 OHLCV 倉儲批次取得日線：僅對缺漏或過期的 ticker 發出 yf.download()。"""
+    return price_store.read_through_batch(
+        tickers,
+        period,
+        lambda group, fetch_period: _download_frames(group, period=fetch_period),
+        lambda group, start: _download_frames(group, start=start),
     )
 
 
@@ -680,26 +1081,18 @@ def batch_download_history(
 ) -> dict:
     """
     使用 yf.download() 一次批次下載多檔股票的價格歷史，大幅減少 HTTP 請求數量。
+    經由本地 OHLCV 倉儲，已入庫的 ticker 僅下載增量 K 棒。
     回傳 {ticker: DataFrame}，僅包含有效且資料量足夠的股票。
     失敗時靜默回傳空字典（呼叫端應回退至個別呼叫）。
     """
     if not tickers:
         return {}
     try:
-        _rate_limiter.wait()
-        data = yf.download(
-            tickers,
-            period=period,
-            group_by="ticker",
-            threads=True,
-            progress=False,
-            auto_adjust=True,
-        )
+        frames = _read_history_batch(tickers, period)
         result: dict = {}
         for ticker in tickers:
             try:
-                df = data[ticker] if len(tickers) > 1 else data
-                df = df.dropna(how="all")
+                df = frames[ticker]
                 if not df.empty and len(df) >= MIN_HISTORY_DAYS_FOR_SIGNALS:
                     result[ticker] = df
                 else:
@@ -721,30 +1114,22 @@ def batch_download_history_extended(
     tickers: list[str],
     period: str,
     min_days: int = BACKFILL_MIN_HISTORY_DAYS,
-) -> dict[str, list[dict]]:
+) -> dict[str, PriceSeries]:
     """
     使用 yf.download() 一次下載多檔延長歷史資料（回填用途）。
+    與掃描共用本地 OHLCV 倉儲，較短的 period 由同一份資料切片提供。
 
-    回傳 {ticker: [{"date": "...", "close": ...}, ...]}。
+    回傳 {ticker: PriceSeries}。
     僅保留資料筆數 >= min_days 的 ticker；失敗時回傳空 dict。
     """
     if not tickers:
         return {}
     try:
-        _rate_limiter.wait()
-        data = yf.download(
-            tickers,
-            period=period,
-            group_by="ticker",
-            threads=True,
-            progress=False,
-            auto_adjust=True,
-        )
-        result: dict[str, list[dict]] = {}
+        frames = _read_history_batch(tickers, period)
+        result: dict[str, PriceSeries] = {}
         for ticker in tickers:
             try:
-                df = data[ticker] if len(tickers) > 1 else data
-                df = df.dropna(how="all")
+                df = frames[ticker]
                 if df.empty:
                     continue
                 prices = _extract_price_history(df)
@@ -778,7 +1163,7 @@ def prime_signals_cache_batch(
     跳過已在 L1 快取中的 ticker。
     回傳成功預熱的股票數量（不含已在快取中的）。
     """
-    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from concurrent.futures import as_completed
 
     def _prime_one(ticker: str, hist) -> str:
         """回傳 'primed' | 'cached' | 'failed'。"""
@@ -793,7 +1178,7 @@ def prime_signals_cache_batch(
         return "primed"
 
     primed = already_cached = 0
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    with LaneThreadPoolExecutor(max_workers=max_workers) as executor:
         futures = {
             executor.submit(_prime_one, ticker, hist): ticker
             for ticker, hist in ticker_hist_map.items()
@@ -825,10 +1210,10 @@ def prewarm_signals_batch(
     已在 L1/L2 快取中的 ticker 不會重複呼叫 yfinance。
     回傳 {ticker: signals_dict} 對照表。
     """
-    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from concurrent.futures import as_completed
 
     results: dict[str, dict | None] = {}
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    with LaneThreadPoolExecutor(max_workers=max_workers) as executor:
         futures = {executor.submit(get_technical_signals, t): t for t in tickers}
         for future in as_completed(futures):
             ticker = futures[future]
@@ -867,15 +1252,27 @@ def are_all_signals_in_l1(tickers: list[str]) -> bool:
 # ===========================================================================
 
 
-def _extract_price_history(hist) -> list[dict]:
-    """從 yfinance history DataFrame 中提取收盤價列表（共用 helper）。"""
-    result = []
-    for idx, row in hist.iterrows():
-        date_str = (
-            idx.strftime("%Y-%m-%d") if hasattr(idx, "strftime") else str(idx)[:10]
-        )
-        result.append({"date": date_str, "close": round(row["Close"], 2)})
-    return result
+# 1970-01-01 的 date.toordinal()，datetime64[D] 天數 + 此值 = ordinal
+_EPOCH_ORDINAL = 719163
+
+
+def _extract_price_history(hist, decimals: int | None = 2) -> PriceSeries:
+    """
+    從 yfinance history DataFrame 中提取收盤價序列（共用 helper）。
+    以欄位向量化轉換（不逐列 iterrows），日期取交易所當地日期；
+    decimals=None 時保留原始收盤價。
+    """
+    index = hist.index
+    if getattr(index, "tz", None) is not None:
+        index = index.tz_localize(None)
+    try:
+        ordinals = (
+            index.values.astype("datetime64[D]").astype("int64") + _EPOCH_ORDINAL
+        ).tolist()
+    except (TypeError, ValueError):
+        ordinals = [date.fromisoformat(str(idx)[:10]).toordinal() for idx in index]
+    closes = hist["Close"] if decimals is None else hist["Close"].round(decimals)
+    return PriceSeries.from_ordinals(ordinals, closes.tolist())
 
 
 def _piggyback_price_history(ticker: str, hist) -> None:
@@ -895,21 +1292,21 @@ def _piggyback_price_history(ticker: str, hist) -> None:
         logger.debug("%s piggyback price_history 失敗（非致命）：%s", ticker, e)
 
 
-def _fetch_price_history_from_yf(ticker: str) -> list[dict]:
+def _fetch_price_history_from_yf(ticker: str) -> PriceSeries:
     """獨立 fetcher — 僅在 L1 + L2 皆未命中時才呼叫。"""
     try:
         _stock, hist = _yf_history(ticker, YFINANCE_HISTORY_PERIOD)
         if hist.empty:
-            return []
+            return PriceSeries.empty()
         return _extract_price_history(hist)
     except Exception as e:
         logger.error("無法取得 %s 股價歷史：%s", ticker, e, exc_info=True)
-        return []
+        return PriceSeries.empty()
 
 
-def get_price_history(ticker: str) -> list[dict] | None:
+def get_price_history(ticker: str) -> PriceSeries | None:
     """
-    取得股價收盤價歷史（1 年）。
+    取得股價收盤價歷史（1 年），回傳依日期排序的 PriceSeries。
     通常由 signals 的 piggyback 預先填充快取，幾乎不需額外 yfinance 呼叫。
     """
     return _cached_fetch(
@@ -925,16 +1322,16 @@ def get_benchmark_close_history(
     ticker: str,
     start: date,
     end: date,
-) -> object:
+) -> PriceSeries | None:
     """
     取得指定基準指數在 [start, end] 日期範圍內的每日收盤價序列。
 
-    回傳 pandas Series（index: DatetimeIndex, values: float），
-    僅包含有交易的日期。呼叫端可使用 .asof() 處理市場休日。
+    回傳 PriceSeries（僅包含有交易的日期，收盤價不四捨五入）。
+    呼叫端可使用 last_close_on_or_before() 處理市場休日。
     失敗或無資料時回傳 None。
     """
     try:
-        _rate_limiter.wait()
+        _rate_limiter.wait(YF_ENDPOINT_HISTORY)
         hist = yf.Ticker(ticker, session=_get_session()).history(
             start=start,
             end=end + timedelta(days=1),
@@ -942,7 +1339,7 @@ def get_benchmark_close_history(
         )
         if hist.empty:
             return None
-        return hist["Close"]
+        return _extract_price_history(hist, decimals=None)
     except Exception as exc:
         logger.warning(
             "無法取得基準指數 %s 歷史資料（%s～%s）：%s", ticker, start, end, exc
@@ -1151,10 +1548,10 @@ def prewarm_moat_batch(
     已在 L1/L2 快取中的 ticker 不會重複呼叫 yfinance。
     回傳 {ticker: moat_dict} 對照表。
     """
-    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from concurrent.futures import as_completed
 
     results: dict[str, dict | None] = {}
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    with LaneThreadPoolExecutor(max_workers=max_workers) as executor:
         futures = {executor.submit(analyze_moat_trend, t): t for t in tickers}
         for future in as_completed(futures):
             ticker = futures[future]
@@ -1171,10 +1568,15 @@ def prewarm_moat_batch(
 # ===========================================================================
 
 
-def analyze_market_sentiment(ticker_list: list[str]) -> dict:
+def analyze_market_sentiment(
+    ticker_list: list[str], hist_map: dict | None = None
+) -> dict:
     """
     分析風向球股票的整體市場情緒（5 階段）。
     接受動態的 ticker_list，計算跌破 60MA 的比例。
+
+    hist_map（如 run_scan 的 batch_download_history 結果）中已有歷史的 ticker
+    以收盤價矩陣一次計算，不再發出請求；其餘 ticker 才逐檔查詢技術訊號。
     """
     if not ticker_list:
         return {
@@ -1187,7 +1589,18 @@ def analyze_market_sentiment(ticker_list: list[str]) -> dict:
         below_count = 0
         valid_count = 0
 
+        matrix_hists = {
+            t: hist_map[t] for t in ticker_list if hist_map and t in hist_map
+        }
+        breadth = compute_breadth_series(build_close_matrix(matrix_hists))
+        if not breadth.empty:
+            latest = breadth.iloc[-1]
+            below_count += int(latest["below"])
+            valid_count += int(latest["valid"])
+
         for ticker in ticker_list:
+            if ticker in matrix_hists:
+                continue
             signals = get_technical_signals(ticker)
             if signals and "error" not in signals:
                 valid_count += 1
@@ -1236,6 +1649,36 @@ def analyze_market_sentiment(ticker_list: list[str]) -> dict:
         }
 
 
+def get_market_breadth_history(
+    ticker_list: list[str], days: int = MARKET_BREADTH_HISTORY_DAYS
+) -> list[dict]:
+    """
+    風向球股票的每日市場寬度（跌破 60MA 比例）時間序列，最近 days 個交易日。
+
+    歷史經由本地 OHLCV 倉儲讀取（掃描已同步者不會重新下載），
+    以收盤價矩陣一次計算整段序列。每筆含 date、below、valid、below_60ma_pct、status。
+    """
+    if not ticker_list:
+        return []
+    hist_map = batch_download_history(ticker_list)
+    breadth = compute_breadth_series(build_close_matrix(hist_map)).tail(days)
+    history: list[dict] = []
+    for day, row in breadth.iterrows():
+        sentiment, pct = determine_market_sentiment(
+            int(row["below"]), int(row["valid"])
+        )
+        history.append(
+            {
+                "date": day.date().isoformat(),
+                "below": int(row["below"]),
+                "valid": int(row["valid"]),
+                "below_60ma_pct": pct,
+                "status": sentiment.value,
+            }
+        )
+    return history
+
+
 # ===========================================================================
 # 財報日曆 (Earnings Calendar)
 # ===========================================================================
@@ -1356,6 +1799,7 @@ def get_dividend_info(ticker: str) -> dict:
         DISK_DIVIDEND_TTL,
         _fetch_dividend_from_yf,
         is_error=_is_dividend_error,
+        stale_ttl=DIVIDEND_STALE_TTL,
     )
     # Evict and re-fetch stale cache entries that predate the ytd_dividend_per_share field.
     if isinstance(result, dict) and "ytd_dividend_per_share" not in result:
@@ -1409,14 +1853,139 @@ def _fetch_fundamentals_from_yf(ticker: str) -> dict:
 
 
 def get_fundamentals(ticker: str) -> dict:
-    """取得股票基本面資料（L1 + L2 快取）。"""
+    """取得股票基本面資料（L1 + L2 快取，過期後背景刷新）。"""
     return _cached_fetch(
         _fundamentals_cache,
         ticker,
         DISK_KEY_FUNDAMENTALS,
         DISK_FUNDAMENTALS_TTL,
         _fetch_fundamentals_from_yf,
+        stale_ttl=FUNDAMENTALS_STALE_TTL,
+    )
+
+
+# ===========================================================================
+# 多檔 quote 批次預熱（財報日 / 股息）
+# ===========================================================================
+
+# 無財報的報價類型：批次即可確定 earnings_date 為 None，無需逐檔查日曆
+_NO_EARNINGS_QUOTE_TYPES = {"ETF", "MUTUALFUND", "INDEX", "CURRENCY", "CRYPTOCURRENCY"}
+_DIVIDEND_QUOTE_FIELDS = ("dividendRate", "trailingAnnualDividendRate", "dividendYield")
+
+
+def _is_cached(l1_cache: TTLCache, disk_prefix: str, ticker: str) -> bool:
+    return (
+        l1_cache.get(ticker) is not None
+        or _disk_get(f"{disk_prefix}:{ticker}") is not None
+    )
+
+
+def _prime_cache(
+    l1_cache: TTLCache, disk_prefix: str, disk_ttl: int, ticker: str, value
+) -> None:
+    l1_cache[ticker] = value
+    _disk_set(f"{disk_prefix}:{ticker}", value, disk_ttl)
+
+
+def _earnings_from_quote(ticker: str, row: dict) -> dict | None:
+    """
+    由 quote 欄位推得財報日結果；無法確定時回傳 None（交由逐檔日曆查詢）。
+    earningsTimestamp 在財報公布後、下一季排定前可能仍為上一季日期，過去日期一律回退。
+    """
+    timestamp = row.get("earningsTimestampStart") or row.get("earningsTimestamp")
+    if isinstance(timestamp, (int, float)):
+        earnings_day = datetime.fromtimestamp(timestamp, tz=UTC).date()
+        if earnings_day >= datetime.now(UTC).date():
+            return {"ticker": ticker, "earnings_date": earnings_day.isoformat()}
+        return None
+    if row.get("quoteType") in _NO_EARNINGS_QUOTE_TYPES:
+        return {"ticker": ticker, "earnings_date": None}
+    return None
+
+
+def _dividend_from_quote(ticker: str, row: dict) -> dict | None:
+    """
+    由 quote 欄位判斷是否為不配息標的；不配息時直接回傳完整結果。
+    僅在股息欄位有出現且皆為 0 / null 時視為不配息：Yahoo 對部分配息標的
+    （如部分非美股、新上市股）會省略這些欄位，欄位缺漏不代表不配息。
+    有配息或無法判斷者需除息日與年初至今股息歷史，回傳 None 交由逐檔查詢。
+    """
+    present = [field for field in _DIVIDEND_QUOTE_FIELDS if field in row]
+    if not present or any(row[field] for field in present):
+        return None
+    return {
+        "ticker": ticker,
+        "dividend_yield": None,
+        "ex_dividend_date": None,
+        "ytd_dividend_per_share": 0.0,
+    }
+
+
+def prewarm_quote_batch(
+    tickers: list[str], dividend_tickers: list[str] | None = None
+) -> int:
+    """
+    以多檔 quote 端點批次預熱財報日與股息快取（每 YF_QUOTE_BATCH_SIZE 檔一次請求）。
+
+    - 財報日：quote 含未來財報時間戳，或報價類型無財報（ETF 等）時直接寫入 L1/L2
+    - 股息：僅對 dividend_tickers 中確定不配息的標的寫入結果
+    - 無法由 quote 確定的欄位不寫入，之後 get_earnings_date / get_dividend_info
+      仍會逐檔查詢（基本面所需的毛利率、ROE、成長率等 quote 端點不提供，維持逐檔 info）
+
+    已在 L1/L2 的標的不會重新請求。回傳寫入的快取筆數；失敗時記錄警告並回傳已寫入筆數。
+    """
+    dividend_set = set(dividend_tickers or [])
+    need_earnings = {
+        t for t in tickers if not _is_cached(_earnings_cache, DISK_KEY_EARNINGS, t)
+    }
+    need_dividend = {
+        t for t in dividend_set if not _is_cached(_dividend_cache, DISK_KEY_DIVIDEND, t)
+    }
+    pending = sorted(need_earnings | need_dividend)
+    if not pending:
+        return 0
+
+    primed = 0
+    for start in range(0, len(pending), YF_QUOTE_BATCH_SIZE):
+        chunk = pending[start : start + YF_QUOTE_BATCH_SIZE]
+        try:
+            rows = _yf_quote_batch(chunk)
+        except Exception as exc:
+            logger.warning(
+                "多檔 quote 批次請求失敗（%d 檔），回退逐檔查詢：%s", len(chunk), exc
+            )
+            continue
+        for ticker in chunk:
+            row = rows.get(ticker)
+            if row is None:
+                continue
+            if ticker in need_earnings:
+                earnings = _earnings_from_quote(ticker, row)
+                if earnings is not None:
+                    _prime_cache(
+                        _earnings_cache,
+                        DISK_KEY_EARNINGS,
+                        DISK_EARNINGS_TTL,
+                        ticker,
+                        earnings,
+                    )
+                    primed += 1
+            if ticker in need_dividend:
+                dividend = _dividend_from_quote(ticker, row)
+                if dividend is not None:
+                    _prime_cache(
+                        _dividend_cache,
+                        DISK_KEY_DIVIDEND,
+                        DISK_DIVIDEND_TTL,
+                        ticker,
+                        dividend,
+                    )
+                    primed += 1
+
+    logger.info(
+        "多檔 quote 批次預熱：%d 檔標的，寫入 %d 筆快取。", len(pending), primed
     )
+    return primed
 
 
 # ===========================================================================
@@ -1466,16 +2035,38 @@ def _fetch_forex_rate(pair_key: str) -> float:
         return 1.0
 
 
+def _get_usd_value(currency: str) -> float:
+    """
+    取得 USD 樞紐匯率：1 單位 currency = ? USD。
+    每個幣別僅快取一筆（L1 + L2），任意幣別組合由 cross_rate 本地換算。
+    """
+    if currency == PIVOT_CURRENCY:
+        return 1.0
+    return _cached_fetch(
+        _forex_cache,
+        f"{PIVOT_CURRENCY}:{currency}",
+        DISK_KEY_FOREX,
+        DISK_FOREX_TTL,
+        _fetch_forex_rate,
+        stale_ttl=FOREX_STALE_TTL,
+    )
+
+
 def get_exchange_rate(display_currency: str, holding_currency: str) -> float:
     """
     取得匯率：1 單位 holding_currency = ? 單位 display_currency。
-    結果透過 L1 + L2 快取。
+    兩側皆經由 USD 樞紐匯率換算（含反向與交叉匯率），結果透過 L1 + L2 快取。
     """
     if display_currency == holding_currency:
         return 1.0
-    pair_key = f"{display_currency}:{holding_currency}"
-    return _cached_fetch(
-        _forex_cache, pair_key, DISK_KEY_FOREX, DISK_FOREX_TTL, _fetch_forex_rate
+    return cross_rate(
+        {
+            cur: _get_usd_value(cur)
+            for cur in (display_currency, holding_currency)
+            if cur != PIVOT_CURRENCY
+        },
+        display_currency,
+        holding_currency,
     )
 
 
@@ -1485,7 +2076,8 @@ def get_exchange_rates(
     """
     批次取得匯率：各 holding_currency → display_currency。
     回傳 dict[holding_currency, rate]，rate 表示 1 單位 holding = ? 單位 display。
-    快取命中時直接回傳；快取未命中時並行發起 yfinance 請求，縮短多幣別場景的等待時間。
+    僅對各幣別取得一次 USD 樞紐匯率（快取未命中時並行發起 yfinance 請求），
+    再於本地換算所有組合；切換顯示幣別時全部命中同一份樞紐快取，無需任何網路請求。
     """
     # Exclude display_currency itself — its rate is always 1.0
     foreign = set(holding_currencies) - {display_currency}
@@ -1493,20 +2085,23 @@ def get_exchange_rates(
     if not foreign:
         return rates
 
-    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from concurrent.futures import as_completed
 
-    with ThreadPoolExecutor(max_workers=len(foreign)) as executor:
+    pivot_currencies = (foreign | {display_currency}) - {PIVOT_CURRENCY}
+    usd_values: dict[str, float] = {}
+    with LaneThreadPoolExecutor(max_workers=max(len(pivot_currencies), 1)) as executor:
         futures = {
-            executor.submit(get_exchange_rate, display_currency, cur): cur
-            for cur in foreign
+            executor.submit(_get_usd_value, cur): cur for cur in pivot_currencies
         }
         for future in as_completed(futures):
             cur = futures[future]
             try:
-                rates[cur] = future.result()
+                usd_values[cur] = future.result()
             except Exception as exc:
                 logger.warning("並行取得匯率失敗（%s）：%s，使用 1.0", cur, exc)
-                rates[cur] = 1.0
+
+    for cur in foreign:
+        rates[cur] = cross_rate(usd_values, display_currency, cur)
     return rates
 
 
@@ -1644,6 +2239,75 @@ def get_forex_history_long(base: str, quote: str) -> list[dict]:
     return result if result else []
 
 
+def prime_forex_history_batch(pairs: Iterable[tuple[str, str]]) -> int:
+    """
+    以單次 yf.download() 預熱多組匯率歷史快取（短期 5 日 + 長期 3 個月）。
+    每個幣別僅下載一檔 USD{CUR}=X 的 3 個月日線，交叉匯率（如 JPY/TWD）與反向匯率
+    由 USD 樞紐矩陣本地推導；同一份矩陣同時寫入 get_forex_history 與
+    get_forex_history_long 的 L1 + L2 快取，供曝險監控與換匯時機監控共用。
+    兩層 L1 皆已命中的組合略過；下載失敗或缺少資料的組合不寫入，呼叫端回退至個別呼叫。
+    回傳寫入快取的組合數。
+    """
+    pending: list[tuple[str, str]] = []
+    for base, quote in dict.fromkeys((b.upper(), q.upper()) for b, q in pairs):
+        if base == quote:
+            continue
+        pair_key = f"{base}:{quote}"
+        if (
+            _forex_history_cache.get(pair_key) is not None
+            and _forex_history_long_cache.get(pair_key) is not None
+        ):
+            continue
+        pending.append((base, quote))
+    if not pending:
+        return 0
+
+    currencies = sorted({cur for pair in pending for cur in pair} - {"USD"})
+    symbols = {usd_pivot_symbol(cur): cur for cur in currencies}
+    try:
+        frames = _download_frames(list(symbols), period=FX_LONG_TERM_PERIOD)
+    except Exception as e:
+        logger.warning("匯率矩陣批次下載失敗，回退至個別呼叫：%s", e)
+        return 0
+    matrix = build_usd_pivot_matrix(
+        {
+            symbols[symbol]: frame
+            for symbol, frame in frames.items()
+            if symbol in symbols
+        }
+    )
+
+    primed = 0
+    for base, quote in pending:
+        long_history = cross_rate_history(matrix, base, quote)
+        if not long_history:
+            logger.debug("匯率矩陣缺少 %s/%s 資料，略過預熱。", base, quote)
+            continue
+        pair_key = f"{base}:{quote}"
+        short_history = long_history[-FX_HISTORY_DAYS:]
+        _forex_history_long_cache[pair_key] = long_history
+        _disk_set(
+            f"{DISK_KEY_FOREX_HISTORY_LONG}:{pair_key}",
+            long_history,
+            DISK_FOREX_HISTORY_LONG_TTL,
+        )
+        _forex_history_cache[pair_key] = short_history
+        _disk_set(
+            f"{DISK_KEY_FOREX_HISTORY}:{pair_key}",
+            short_history,
+            DISK_FOREX_HISTORY_TTL,
+        )
+        primed += 1
+
+    logger.info(
+        "匯率矩陣批次預熱：%d 個幣別，寫入 %d/%d 組匯率歷史。",
+        len(currencies),
+        primed,
+        len(pending),
+    )
+    return primed
+
+
 def _is_nan(val) -> bool:
     """安全判斷 NaN（支援 None / float）。"""
     if val is None:
@@ -1667,7 +2331,7 @@ def _fetch_etf_top_holdings(ticker: str) -> list[dict] | None:
     回傳 [{"symbol": "AAPL", "name": "Apple Inc.", "weight": 0.072}, ...] 或 None。
     非 ETF 標的會回傳 None。
     """
-    _rate_limiter.wait()
+    _rate_limiter.wait(YF_ENDPOINT_INFO)
     try:
         t = _yf_ticker_obj(ticker)
         fd = t.funds_data
@@ -1735,10 +2399,10 @@ def prewarm_etf_holdings_batch(
     並行預熱多檔 ETF 的成分股快取。
     回傳 {ticker: holdings_list_or_None} 對照表。
     """
-    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from concurrent.futures import as_completed
 
     results: dict[str, list[dict] | None] = {}
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    with LaneThreadPoolExecutor(max_workers=max_workers) as executor:
         futures = {executor.submit(get_etf_top_holdings, t): t for t in tickers}
         for future in as_completed(futures):
             ticker = futures[future]
@@ -1780,7 +2444,7 @@ def _fetch_etf_sector_weights(ticker: str) -> dict[str, float] | None:
     涵蓋 100% ETF 資產，比分析成分股更準確。
     非 ETF 標的或無資料時回傳 None。
     """
-    _rate_limiter.wait()
+    _rate_limiter.wait(YF_ENDPOINT_INFO)
     try:
         t = _yf_ticker_obj(ticker)
         fd = t.funds_data
@@ -1850,10 +2514,10 @@ def prewarm_etf_sector_weights_batch(
     非 ETF 標的會快速命中哨兵快取，不造成額外 yfinance 呼叫。
     回傳 {ticker: weights_or_None} 對照表。
     """
-    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from concurrent.futures import as_completed
 
     results: dict[str, dict[str, float] | None] = {}
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    with LaneThreadPoolExecutor(max_workers=max_workers) as executor:
         futures = {executor.submit(get_etf_sector_weights, t): t for t in tickers}
         for future in as_completed(futures):
             ticker = futures[future]
@@ -2018,7 +2682,7 @@ def _fetch_fear_greed(_key: str) -> dict:
     ]
 
     # Fetch VIX, CNN, and all 6 ETF histories fully in parallel (8 tasks)
-    with ThreadPoolExecutor(max_workers=8) as pool:
+    with LaneThreadPoolExecutor(max_workers=8) as pool:
         vix_future = pool.submit(get_vix_data)
         cnn_future = pool.submit(get_cnn_fear_greed)
         etf_futures = {
@@ -2252,67 +2916,97 @@ def get_stock_beta(ticker: str) -> float | None:
     return None if result == _BETA_NOT_AVAILABLE else result
 
 
-def _compute_and_cache_beta_from_history(
-    ticker: str,
-    stock_hist,
-    market_hist,
-) -> float | None:
+def _read_cached_beta(ticker: str) -> tuple[bool, float | None]:
     """
-    從批次下載的價格歷史 DataFrame 計算 Beta，並寫入 L1 + L2 快取。
-    stock_hist / market_hist 為 yf.download 回傳的 DataFrame（含 Close 欄）。
-
-    L1/L2 命中時直接回傳快取值，不重複計算。
-    計算失敗或資料不足時回退至 get_stock_beta（yfinance info）。
+    讀取 Beta L1 / L2 快取（L2 命中時回填 L1）。
+    回傳 (是否命中, Beta 或 None)；哨兵值轉為 None。
     """
     cached = _beta_cache.get(ticker)
-    if cached is not None:
-        return None if cached == _BETA_NOT_AVAILABLE else cached
-    disk_key = f"{DISK_KEY_BETA}:{ticker}"
-    disk_cached = _disk_get(disk_key)
-    if disk_cached is not None:
-        _beta_cache[ticker] = disk_cached
-        return None if disk_cached == _BETA_NOT_AVAILABLE else disk_cached
+    if cached is None:
+        cached = _disk_get(f"{DISK_KEY_BETA}:{ticker}")
+        if cached is None:
+            return False, None
+        _beta_cache[ticker] = cached
+    return True, None if cached == _BETA_NOT_AVAILABLE else cached
+
 
+def _compute_and_cache_betas_from_history(
+    tickers: list[str], hist_batch: dict, market_hist
+) -> dict[str, float]:
+    """
+    以 Beta 矩陣引擎一次計算多檔相對 SPY 的 Beta，並寫入 L1 + L2 快取。
+    hist_batch / market_hist 為 yf.download 回傳的 DataFrame（含 Close 欄），
+    各檔與 SPY 以日期對齊（見 infrastructure.market_data.beta）。
+    僅回傳成功計算者；資料不足的 ticker 由呼叫端回退至 get_stock_beta。
+    """
+    if not tickers:
+        return {}
     try:
-        stock_closes = stock_hist["Close"].dropna().tolist()
-        market_closes = market_hist["Close"].dropna().tolist()
-        beta = compute_beta(
-            [float(c) for c in stock_closes],
-            [float(c) for c in market_closes],
+        close_matrix = build_close_matrix(
+            {
+                **{ticker: hist_batch[ticker] for ticker in tickers},
+                FG_SPY_TICKER: market_hist,
+            }
         )
-        if beta is not None:
-            logger.info("%s Beta（歷史計算）= %.2f", ticker, beta)
-            _beta_cache[ticker] = beta
-            _disk_set(disk_key, beta, DISK_BETA_TTL)
-            return beta
-        logger.debug("%s 歷史資料不足以計算 Beta，回退至 yfinance info。", ticker)
+        betas = compute_beta_matrix(close_matrix, [FG_SPY_TICKER])
     except Exception as exc:
-        logger.warning(
-            "從歷史資料計算 %s Beta 失敗，回退至 yfinance info：%s", ticker, exc
-        )
-    return get_stock_beta(ticker)
+        logger.warning("Beta 矩陣計算失敗，回退至 yfinance info：%s", exc)
+        return {}
+    if betas.empty:
+        return {}
+
+    computed: dict[str, float] = {}
+    for ticker in tickers:
+        beta = betas[FG_SPY_TICKER].get(ticker)
+        if beta is None or pd.isna(beta):
+            logger.debug("%s 歷史資料不足以計算 Beta，回退至 yfinance info。", ticker)
+            continue
+        computed[ticker] = float(beta)
+        _beta_cache[ticker] = computed[ticker]
+        _disk_set(f"{DISK_KEY_BETA}:{ticker}", computed[ticker], DISK_BETA_TTL)
+    logger.info("Beta 矩陣計算完成：%d/%d 檔。", len(computed), len(tickers))
+    return computed
 
 
 def prewarm_beta_batch(
     tickers: list[str],
     max_workers: int = SCAN_THREAD_POOL_SIZE,
     hist_batch: dict | None = None,
+    download_history: bool = False,
 ) -> dict[str, float | None]:
     """
     並行預熱多檔股票的 Beta 快取。
 
-    快速路徑（hist_batch 提供）：以 OLS 回歸從已下載的價格歷史計算 Beta，
-    從 ~267s（逐一呼叫 yfinance info）降至 ~1s。
+    快速路徑（hist_batch 提供）：以 Beta 矩陣引擎從已下載的價格歷史一次計算
+    所有 Beta（日期對齊 SPY 的 OLS 回歸），從 ~267s（逐一呼叫 yfinance info）降至 ~1s。
     hist_batch 需包含 FG_SPY_TICKER（SPY）作為市場基準；若缺少則另行下載。
-    快速路徑會先檢查 L1/L2 快取，命中時直接回傳；計算失敗或資料不足時
+    快速路徑會先檢查 L1/L2 快取，命中時直接回傳；資料不足者
     自動回退至 yfinance info（慢速路徑）。
 
+    download_history=True 且未提供 hist_batch 時（如壓力測試），
+    僅對 L1/L2 未命中的 ticker 經由本地 OHLCV 倉儲批次取得歷史後走快速路徑。
+
     慢速路徑（hist_batch 未提供，或該 ticker 不在 hist_batch 中）：
     回退至原有的 yfinance info 呼叫（已含 L1/L2 快取檢查）。
 
     回傳 {ticker: beta_or_None} 對照表。
     """
-    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from concurrent.futures import as_completed
+
+    results: dict[str, float | None] = {}
+    if hist_batch is None and download_history and tickers:
+        uncached: list[str] = []
+        for ticker in tickers:
+            hit, beta = _read_cached_beta(ticker)
+            if hit:
+                results[ticker] = beta
+            else:
+                uncached.append(ticker)
+        if uncached:
+            hist_batch = batch_download_history(
+                list(dict.fromkeys([*uncached, FG_SPY_TICKER]))
+            )
+        tickers = uncached
 
     market_hist = None
     if hist_batch is not None:
@@ -2326,26 +3020,35 @@ def prewarm_beta_batch(
             except Exception as exc:
                 logger.warning("下載 SPY 歷史資料失敗，將回退至 yfinance info：%s", exc)
 
-    results: dict[str, float | None] = {}
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures: dict = {}
-        for ticker in tickers:
-            if (
-                hist_batch is not None
-                and market_hist is not None
-                and ticker in hist_batch
-                and ticker != FG_SPY_TICKER
-            ):
-                futures[
-                    executor.submit(
-                        _compute_and_cache_beta_from_history,
-                        ticker,
-                        hist_batch[ticker],
-                        market_hist,
-                    )
-                ] = ticker
+    fallback: list[str] = []
+    history_tickers: list[str] = []
+    for ticker in tickers:
+        if (
+            hist_batch is not None
+            and market_hist is not None
+            and ticker in hist_batch
+            and ticker != FG_SPY_TICKER
+        ):
+            hit, beta = _read_cached_beta(ticker)
+            if hit:
+                results[ticker] = beta
             else:
-                futures[executor.submit(get_stock_beta, ticker)] = ticker
+                history_tickers.append(ticker)
+        else:
+            fallback.append(ticker)
+
+    computed = _compute_and_cache_betas_from_history(
+        history_tickers, hist_batch or {}, market_hist
+    )
+    results.update(computed)
+    fallback.extend(ticker for ticker in history_tickers if ticker not in computed)
+    if not fallback:
+        return results
+
+    with LaneThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(get_stock_beta, ticker): ticker for ticker in fallback
+        }
         for future in as_completed(futures):
             ticker = futures[future]
             try:
@@ -2454,6 +3157,89 @@ def get_bias_distribution(ticker: str) -> dict:
 
 _SECTOR_NOT_FOUND: str = "__none__"  # 哨兵值：無法取得 sector 時的快取標記
 
+# 內建 GICS 行業板塊對照表（yfinance 命名），涵蓋大師持倉常見的大型股。
+# 磁碟快取未命中時優先使用，讓 13F 同步不必為這些代號等待 yfinance。
+_STATIC_SECTORS: dict[str, str] = {
+    # Technology
+    "AAPL": "Technology",
+    "MSFT": "Technology",
+    "NVDA": "Technology",
+    "AVGO": "Technology",
+    "ORCL": "Technology",
+    "CRM": "Technology",
+    "ADBE": "Technology",
+    "AMD": "Technology",
+    "INTC": "Technology",
+    "IBM": "Technology",
+    "CSCO": "Technology",
+    "QCOM": "Technology",
+    "TXN": "Technology",
+    "SNOW": "Technology",
+    "TSM": "Technology",
+    "UBER": "Technology",
+    # Communication Services
+    "GOOGL": "Communication Services",
+    "GOOG": "Communication Services",
+    "META": "Communication Services",
+    "NFLX": "Communication Services",
+    "DIS": "Communication Services",
+    "CMCSA": "Communication Services",
+    "T": "Communication Services",
+    "VZ": "Communication Services",
+    # Consumer Cyclical
+    "AMZN": "Consumer Cyclical",
+    "TSLA": "Consumer Cyclical",
+    "HD": "Consumer Cyclical",
+    "MCD": "Consumer Cyclical",
+    "NKE": "Consumer Cyclical",
+    "SBUX": "Consumer Cyclical",
+    # Consumer Defensive
+    "WMT": "Consumer Defensive",
+    "PEP": "Consumer Defensive",
+    "KO": "Consumer Defensive",
+    "PG": "Consumer Defensive",
+    "COST": "Consumer Defensive",
+    "KHC": "Consumer Defensive",
+    # Financial Services
+    "BRK/B": "Financial Services",
+    "BRK/A": "Financial Services",
+    "BRK-B": "Financial Services",
+    "BRK-A": "Financial Services",
+    "JPM": "Financial Services",
+    "BAC": "Financial Services",
+    "WFC": "Financial Services",
+    "GS": "Financial Services",
+    "MS": "Financial Services",
+    "C": "Financial Services",
+    "AXP": "Financial Services",
+    "PNC": "Financial Services",
+    "BLK": "Financial Services",
+    "MA": "Financial Services",
+    "V": "Financial Services",
+    "MCO": "Financial Services",
+    # Healthcare
+    "JNJ": "Healthcare",
+    "MRK": "Healthcare",
+    "PFE": "Healthcare",
+    "ABT": "Healthcare",
+    "MDT": "Healthcare",
+    "BMY": "Healthcare",
+    "UNH": "Healthcare",
+    "LLY": "Healthcare",
+    "ABBV": "Healthcare",
+    # Energy
+    "XOM": "Energy",
+    "CVX": "Energy",
+    "OXY": "Energy",
+    "COP": "Energy",
+    # Industrials
+    "HON": "Industrials",
+    "GE": "Industrials",
+    "CAT": "Industrials",
+    "UNP": "Industrials",
+    "BA": "Industrials",
+}
+
 
 def _fetch_sector_from_yf(ticker: str) -> str:
     """
@@ -2461,7 +3247,7 @@ def _fetch_sector_from_yf(ticker: str) -> str:
     回傳行業板塊字串，或 _SECTOR_NOT_FOUND 哨兵值（確保可快取 None 狀態）。
     """
     try:
-        _rate_limiter.wait()
+        _rate_limiter.wait(YF_ENDPOINT_INFO)
         info = _yf_info(ticker)
         sector = info.get("sector")
         if sector:
@@ -2511,6 +3297,31 @@ def get_ticker_sector_cached(ticker: str) -> str | None:
     return None
 
 
+def get_ticker_sectors_bulk(tickers: Iterable[str]) -> dict[str, str | None]:
+    """
+    批次解析多檔股票的行業板塊（非阻塞版本）。
+    依序查詢 L2 磁碟快取與內建靜態 GICS 對照表（命中時寫回磁碟快取），
+    不發起任何 yfinance 網路請求。
+
+    回傳 {ticker: sector | None}；僅包含已知結果（含確認無 sector 的哨兵值 → None），
+    未出現在回傳 dict 中的 ticker 即為待查詢，可交由 prewarm_ticker_sector_batch 補齊。
+    """
+    result: dict[str, str | None] = {}
+    for ticker in dict.fromkeys(tickers):
+        if not ticker:
+            continue
+        disk_key = f"{DISK_KEY_SECTOR}:{ticker}"
+        cached = _disk_get(disk_key)
+        if cached is not None:
+            result[ticker] = None if cached == _SECTOR_NOT_FOUND else cached
+            continue
+        sector = _STATIC_SECTORS.get(ticker)
+        if sector:
+            _disk_set(disk_key, sector, DISK_SECTOR_TTL)
+            result[ticker] = sector
+    return result
+
+
 def prewarm_ticker_sector_batch(
     tickers: list[str], max_workers: int = SCAN_THREAD_POOL_SIZE
 ) -> None:
@@ -2519,13 +3330,13 @@ def prewarm_ticker_sector_batch(
     已有磁碟快取的 ticker 直接跳過，避免不必要的 yfinance 請求。
     用於 Approach A 前的批次預熱，讓後續逐一查詢可命中快取。
     """
-    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from concurrent.futures import as_completed
 
     uncached = [t for t in tickers if _disk_get(f"{DISK_KEY_SECTOR}:{t}") is None]
     if not uncached:
         return
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    with LaneThreadPoolExecutor(max_workers=max_workers) as executor:
         futures = {executor.submit(get_ticker_sector, t): t for t in uncached}
         for future in as_completed(futures):
             ticker = futures[future]
@@ -2571,7 +3382,7 @@ def fetch_price_pair(tickers: list[str], report_date: str) -> dict[str, dict]:
     # Batch-fetch historical prices for uncached tickers
     if uncached_tickers:
         try:
-            _rate_limiter.wait()
+            _rate_limiter.wait(YF_ENDPOINT_DOWNLOAD)
             end_date = (
                 (datetime.fromisoformat(report_date) + timedelta(days=5))
                 .date()
@@ -2609,7 +3420,7 @@ def fetch_price_pair(tickers: list[str], report_date: str) -> dict[str, dict]:
     # Fetch current prices (never cached — always live)
     current_prices: dict[str, float | None] = dict.fromkeys(tickers)
     try:
-        _rate_limiter.wait()
+        _rate_limiter.wait(YF_ENDPOINT_DOWNLOAD)
         current = yf.download(
             tickers,
             period="5d",
@@ -1,4 +1,5 @@
 # pyright: reportReturnType=false
+from domain.analysis import PriceSeries
 from domain.enums import MoatStatus
 from logging_config import get_logger
 
@@ -61,7 +62,7 @@ class MarketDataResolver:
     def get_technical_signals(self, ticker: str) -> dict | None:
         return self._yf.get_technical_signals(ticker)
 
-    def get_price_history(self, ticker: str) -> list[dict] | None:
+    def get_price_history(self, ticker: str) -> PriceSeries | None:
         return self._yf.get_price_history(ticker)
 
     def get_earnings_date(self, ticker: str) -> str | None:
@@ -0,0 +1,377 @@
+"""
+Infrastructure — 本地 OHLCV 日線倉儲（增量同步）。
+
+每檔 ticker 保存一份以日期為索引的日線 DataFrame（Open/High/Low/Close/Volume），
+首次請求整段下載，之後只下載「錨點 K 棒」以後的增量並合併；
+所有 period（"5d"、"1y"、"2y"、"3y"…）皆由同一份資料切片提供。
+
+錨點為本地倒數第二根 K 棒（最後一根可能是盤中未收盤的資料）。
+增量下載會重新取得錨點，若其收盤價與本地不符（除權息 / 分割使
+auto_adjust 回溯調整整段歷史），則捨棄本地資料、整段重新下載。
+
+本模組不直接呼叫 yfinance：下載函式由呼叫端（market_data.py）注入，
+速率限制、重試與 session 管理仍由呼叫端負責。
+"""
+
+from __future__ import annotations
+
+import calendar
+import contextlib
+import math
+import re
+import threading
+import time
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+import diskcache
+import pandas as pd
+
+from domain.constants import (
+    PRICE_STORE_ANCHOR_TOLERANCE,
+    PRICE_STORE_DIR,
+    PRICE_STORE_SIZE_LIMIT,
+    PRICE_STORE_SYNC_INTERVAL,
+)
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+OHLCV_COLUMNS: tuple[str, ...] = ("Open", "High", "Low", "Close", "Volume")
+
+_KEY_PREFIX = "ohlcv"
+_PERIOD_PATTERN = re.compile(r"^(\d+)(d|wk|mo|y)$")
+
+_store = diskcache.Cache(PRICE_STORE_DIR, size_limit=PRICE_STORE_SIZE_LIMIT)
+
+# 同一 ticker 的同步互斥（signals / price_history / rogue wave 可能同時 cache miss）
+_ticker_locks_guard = threading.Lock()
+_ticker_locks: dict[str, threading.Lock] = {}
+
+
+# ---------------------------------------------------------------------------
+# Period helpers
+# ---------------------------------------------------------------------------
+
+
+def _shift_months(day: date, months: int) -> date:
+    total = day.year * 12 + (day.month - 1) + months
+    year, month_index = divmod(total, 12)
+    month = month_index + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def period_start(period: str, reference: date) -> date | None:
+    """
+    將 yfinance period 字串換算為相對 reference 的起始日期。
+    "Nd" 以交易日計，換算時預留週末與假日緩衝。
+    不支援的 period（如 "max"）回傳 None，呼叫端應略過倉儲直接下載。
+    """
+    if period == "ytd":
+        return date(reference.year, 1, 1)
+    match = _PERIOD_PATTERN.match(period)
+    if match is None:
+        return None
+    count, unit = int(match.group(1)), match.group(2)
+    if unit == "d":
+        return reference - timedelta(days=count * 7 // 5 + 4)
+    if unit == "wk":
+        return reference - timedelta(weeks=count)
+    if unit == "mo":
+        return _shift_months(reference, -count)
+    return _shift_months(reference, -12 * count)
+
+
+def _wider_period(a: str, b: str, reference: date) -> str:
+    """回傳涵蓋範圍較長的 period。"""
+    start_a = period_start(a, reference)
+    start_b = period_start(b, reference)
+    if start_a is None or start_b is None:
+        return a if start_a is None else b
+    return a if start_a <= start_b else b
+
+
+def _slice(bars: pd.DataFrame, period: str) -> pd.DataFrame:
+    """
+    從本地日線切出 period 對應的區段。
+    以最後一根 K 棒為基準（而非今日），停牌或資料延遲的 ticker 仍能取得完整區段。
+    """
+    if bars.empty:
+        return bars.copy()
+    match = _PERIOD_PATTERN.match(period)
+    if match is not None and match.group(2) == "d":
+        return bars.tail(int(match.group(1))).copy()
+    start = period_start(period, bars.index[-1].date())
+    if start is None:
+        return bars.copy()
+    return bars[bars.index >= pd.Timestamp(start)].copy()
+
+
+# ---------------------------------------------------------------------------
+# Storage
+# ---------------------------------------------------------------------------
+
+
+def normalize_bars(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    正規化 yfinance 回傳的日線：保留 OHLCV 欄位、索引轉為 tz-naive 日期、
+    去除無收盤價的列與重複日期（保留最後一筆，覆寫盤中未收盤資料）並排序。
+    """
+    columns = [c for c in OHLCV_COLUMNS if c in frame.columns]
+    bars = frame.loc[:, columns].copy()
+    index = pd.DatetimeIndex(bars.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    bars.index = index.normalize()
+    bars = bars.dropna(subset=["Close"]) if "Close" in bars.columns else bars
+    bars = bars[~bars.index.duplicated(keep="last")]
+    return bars.sort_index()
+
+
+def _key(ticker: str) -> str:
+    return f"{_KEY_PREFIX}:{ticker}"
+
+
+def _load(ticker: str) -> dict[str, Any] | None:
+    with contextlib.suppress(Exception):
+        return _store.get(_key(ticker))
+    return None
+
+
+def _save(ticker: str, bars: pd.DataFrame, covered_from: date, period: str) -> None:
+    record = {
+        "bars": bars,
+        "covered_from": covered_from,
+        "period": period,
+        "synced_at": time.time(),
+    }
+    with contextlib.suppress(Exception):
+        _store.set(_key(ticker), record)
+
+
+def _ticker_lock(ticker: str) -> threading.Lock:
+    with _ticker_locks_guard:
+        lock = _ticker_locks.get(ticker)
+        if lock is None:
+            lock = threading.Lock()
+            _ticker_locks[ticker] = lock
+        return lock
+
+
+def clear_price_store() -> None:
+    """清除本地日線倉儲（下次請求將整段重新下載）。"""
+    with contextlib.suppress(Exception):
+        _store.clear()
+
+
+# ---------------------------------------------------------------------------
+# Sync planning
+# ---------------------------------------------------------------------------
+
+_PASSTHROUGH = "passthrough"
+_FRESH = "fresh"
+_DELTA = "delta"
+_FULL = "full"
+
+
+def _plan(
+    record: dict[str, Any] | None, period: str, today: date
+) -> tuple[str, date | None]:
+    """
+    決定同步方式：
+    - passthrough：period 無法換算（如 "max"），直接下載不入庫
+    - fresh：本地已涵蓋且剛同步過，不需網路請求
+    - delta：本地已涵蓋但需補最新 K 棒，回傳錨點日期
+    - full：本地未涵蓋所需區間，整段下載
+    """
+    start = period_start(period, today)
+    if start is None:
+        return _PASSTHROUGH, None
+    if record is None or record["covered_from"] > start:
+        return _FULL, None
+    bars = record["bars"]
+    if time.time() - record["synced_at"] < PRICE_STORE_SYNC_INTERVAL:
+        return _FRESH, None
+    if len(bars) < 2:
+        return _FULL, None
+    return _DELTA, bars.index[-2].date()
+
+
+def _merge_delta(
+    ticker: str, bars: pd.DataFrame, delta: pd.DataFrame, anchor: date
+) -> pd.DataFrame | None:
+    """
+    將增量 K 棒合併至本地資料。
+    錨點缺漏或收盤價不符（歷史已被回溯調整）時回傳 None，呼叫端需整段重新下載。
+    """
+    anchor_ts = pd.Timestamp(anchor)
+    if anchor_ts not in delta.index or anchor_ts not in bars.index:
+        logger.info("%s 增量資料缺少錨點 %s，改為整段重新下載。", ticker, anchor)
+        return None
+    stored_close = float(bars.at[anchor_ts, "Close"])
+    fetched_close = float(delta.at[anchor_ts, "Close"])
+    if not math.isclose(
+        stored_close, fetched_close, rel_tol=PRICE_STORE_ANCHOR_TOLERANCE
+    ):
+        logger.info(
+            "%s 錨點收盤價不符（本地 %.4f，最新 %.4f），疑似除權息或分割，整段重新下載。",
+            ticker,
+            stored_close,
+            fetched_close,
+        )
+        return None
+    merged = pd.concat([bars[bars.index < anchor_ts], delta])
+    return normalize_bars(merged)
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def read_through(
+    ticker: str,
+    period: str,
+    fetch_period: Callable[[str], pd.DataFrame],
+    fetch_since: Callable[[date], pd.DataFrame],
+) -> pd.DataFrame:
+    """
+    取得單一 ticker 的日線（經由本地倉儲）。
+
+    fetch_period(period) — 整段下載（如 stock.history(period=...)）。
+    fetch_since(start) — 自 start（含）起的增量下載。
+    下載例外直接向上拋出（由呼叫端的重試機制處理）；
+    整段下載回傳空資料時不入庫，回傳空 DataFrame。
+    """
+    with _ticker_lock(ticker):
+        today = date.today()
+        record = _load(ticker)
+        action, anchor = _plan(record, period, today)
+
+        if action == _PASSTHROUGH:
+            return fetch_period(period)
+        if action == _FRESH:
+            logger.debug("%s 日線命中本地倉儲（period=%s）。", ticker, period)
+            return _slice(record["bars"], period)
+
+        fetch_p = period
+        if action == _DELTA:
+            delta = normalize_bars(fetch_since(anchor))
+            if delta.empty:
+                logger.warning(
+                    "%s 增量下載回傳空資料，暫以本地日線提供（下次再同步）。", ticker
+                )
+                return _slice(record["bars"], period)
+            merged = _merge_delta(ticker, record["bars"], delta, anchor)
+            if merged is not None:
+                _save(ticker, merged, record["covered_from"], record["period"])
+                logger.debug(
+                    "%s 日線增量同步完成（自 %s 起 %d 筆）。",
+                    ticker,
+                    anchor,
+                    len(delta),
+                )
+                return _slice(merged, period)
+            fetch_p = _wider_period(period, record["period"], today)
+
+        bars = normalize_bars(fetch_period(fetch_p))
+        if bars.empty:
+            return bars
+        _save(ticker, bars, period_start(fetch_p, today), fetch_p)
+        logger.debug(
+            "%s 日線整段下載入庫（period=%s，%d 筆）。", ticker, fetch_p, len(bars)
+        )
+        return _slice(bars, period)
+
+
+def read_through_batch(
+    tickers: list[str],
+    period: str,
+    download_period: Callable[[list[str], str], dict[str, pd.DataFrame]],
+    download_since: Callable[[list[str], date], dict[str, pd.DataFrame]],
+) -> dict[str, pd.DataFrame]:
+    """
+    批次取得多檔 ticker 的日線（經由本地倉儲）。
+
+    已同步者直接由本地提供；需補增量者合併為一次 download_since（以最早錨點為起點）；
+    未涵蓋或錨點不符者依下載區間分組，各以一次 download_period 整段下載。
+    增量下載失敗時沿用本地既有日線；整段下載失敗的群組僅記錄警告並略過，
+    回傳結果不含該群組的 ticker。
+    """
+    if not tickers:
+        return {}
+    today = date.today()
+
+    if period_start(period, today) is None:
+        return download_period(tickers, period)
+
+    result: dict[str, pd.DataFrame] = {}
+    records: dict[str, dict[str, Any] | None] = {}
+    anchors: dict[str, date] = {}
+    full_groups: dict[str, list[str]] = {}
+    fresh = 0
+
+    for ticker in tickers:
+        record = _load(ticker)
+        records[ticker] = record
+        action, anchor = _plan(record, period, today)
+        if action == _FRESH:
+            result[ticker] = _slice(record["bars"], period)
+            fresh += 1
+        elif action == _DELTA and anchor is not None:
+            anchors[ticker] = anchor
+        else:
+            full_groups.setdefault(period, []).append(ticker)
+
+    if anchors:
+        delta_tickers = list(anchors)
+        try:
+            frames = download_since(delta_tickers, min(anchors.values()))
+        except Exception as exc:
+            logger.warning(
+                "日線批次增量下載失敗（%d 檔沿用本地資料）：%s", len(anchors), exc
+            )
+            frames = {}
+        for ticker in delta_tickers:
+            record = records[ticker]
+            frame = frames.get(ticker)
+            delta = normalize_bars(frame) if frame is not None else None
+            if delta is None or delta.empty:
+                result[ticker] = _slice(record["bars"], period)
+                continue
+            merged = _merge_delta(ticker, record["bars"], delta, anchors[ticker])
+            if merged is None:
+                fetch_p = _wider_period(period, record["period"], today)
+                full_groups.setdefault(fetch_p, []).append(ticker)
+                continue
+            _save(ticker, merged, record["covered_from"], record["period"])
+            result[ticker] = _slice(merged, period)
+
+    for fetch_p, group in full_groups.items():
+        try:
+            frames = download_period(group, fetch_p)
+        except Exception as exc:
+            logger.warning("日線批次整段下載失敗（略過 %d 檔）：%s", len(group), exc)
+            continue
+        covered_from = period_start(fetch_p, today)
+        for ticker in group:
+            frame = frames.get(ticker)
+            if frame is None:
+                continue
+            bars = normalize_bars(frame)
+            if bars.empty:
+                continue
+            _save(ticker, bars, covered_from, fetch_p)
+            result[ticker] = _slice(bars, period)
+
+    logger.debug(
+        "日線批次同步：%d 檔本地命中、%d 檔增量、%d 檔整段（period=%s）。",
+        fresh,
+        len(anchors),
+        sum(len(g) for g in full_groups.values()),
+        period,
+    )
+    return result
@@ -0,0 +1,119 @@
+"""
+Infrastructure — yfinance 請求排程（優先權通道 + 加權公平佇列）。
+
+所有 yfinance 呼叫共用同一份速率額度；呼叫端以 context variable 宣告所屬通道
+（互動 > 掃描 > 預熱 > 回填），不需更動既有函式簽章：
+    with request_lane(YF_LANE_SCAN): ...
+    @request_lane(YF_LANE_BACKFILL)
+    def backfill(...): ...
+
+等待額度的請求依 start-time fair queuing 排序：每個請求的起始標記為
+max(虛擬時間, 該通道上一筆的完成標記)，完成標記再加上 1 / 通道權重。
+高權重通道的標記推進較慢因而優先取得額度；新到達的請求標記不早於目前虛擬時間，
+低權重通道仍按權重比例推進，不會被餓死。
+
+ThreadPoolExecutor 不會將 contextvars 傳入工作執行緒，扇出工作請使用 LaneThreadPoolExecutor。
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from domain.constants import YF_LANE_INTERACTIVE, YF_LANE_WEIGHTS
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Mapping
+
+_request_lane: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "yf_request_lane", default=YF_LANE_INTERACTIVE
+)
+
+
+def current_request_lane() -> str:
+    """回傳目前執行內容所屬的請求通道（未宣告時為互動通道）。"""
+    return _request_lane.get()
+
+
+@contextlib.contextmanager
+def request_lane(lane: str) -> Iterator[None]:
+    """宣告區塊內（或被裝飾函式內）的 yfinance 請求所屬通道；可巢狀，離開時還原。"""
+    if lane not in YF_LANE_WEIGHTS:
+        raise ValueError(f"未知的請求通道：{lane}")
+    token = _request_lane.set(lane)
+    try:
+        yield
+    finally:
+        _request_lane.reset(token)
+
+
+class LaneThreadPoolExecutor(ThreadPoolExecutor):
+    """submit() 時複製呼叫端的 contextvars，使工作執行緒沿用呼叫端的請求通道。"""
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+@dataclass(eq=False)
+class QueuedRequest:
+    """佇列中的單一請求（lane / endpoint 與公平佇列標記）。"""
+
+    lane: str
+    endpoint: str
+    start_tag: float
+    seq: int = field(compare=False)
+
+
+class FairRequestQueue:
+    """
+    加權公平佇列（start-time fair queuing）。非執行緒安全，由呼叫端持鎖操作。
+    """
+
+    def __init__(self, weights: Mapping[str, float] = YF_LANE_WEIGHTS) -> None:
+        self._weights = dict(weights)
+        self._virtual_time = 0.0
+        self._lane_finish: dict[str, float] = {}
+        self._seq = itertools.count()
+        self._waiting: list[QueuedRequest] = []
+
+    def __len__(self) -> int:
+        return len(self._waiting)
+
+    def enqueue(self, lane: str, endpoint: str) -> QueuedRequest:
+        """加入佇列並依通道權重計算起始標記。"""
+        weight = self._weights.get(lane) or min(self._weights.values())
+        start = max(self._virtual_time, self._lane_finish.get(lane, 0.0))
+        self._lane_finish[lane] = start + 1.0 / weight
+        request = QueuedRequest(lane, endpoint, start, next(self._seq))
+        self._waiting.append(request)
+        return request
+
+    def first(
+        self, eligible: Callable[[QueuedRequest], bool] | None = None
+    ) -> QueuedRequest | None:
+        """回傳符合條件者中標記最小（同標記依到達順序）的請求；無則回傳 None。"""
+        candidates = [r for r in self._waiting if eligible is None or eligible(r)]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda r: (r.start_tag, r.seq))
+
+    def dispatch(self, request: QueuedRequest) -> None:
+        """移出佇列並將虛擬時間推進至該請求的起始標記。"""
+        self._waiting.remove(request)
+        self._virtual_time = max(self._virtual_time, request.start_tag)
+
+    def cancel(self, request: QueuedRequest) -> None:
+        """移出佇列（等待中斷時），不推進虛擬時間。"""
+        with contextlib.suppress(ValueError):
+            self._waiting.remove(request)
+
+    def depths(self) -> dict[str, int]:
+        """回傳各通道目前等待中的請求數，供監控使用。"""
+        depths: dict[str, int] = {}
+        for request in self._waiting:
+            depths[request.lane] = depths.get(request.lane, 0) + 1
+        return depths
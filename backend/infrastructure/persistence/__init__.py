@@ -6,6 +6,7 @@ Re-exports the public API of persistence.repositories so that
 """
 
 from infrastructure.persistence.repositories import (  # noqa: F401
+    bulk_create_scan_logs,
     bulk_update_display_order,
     bulk_update_scan_signals,
     create_fx_watch,
@@ -14,10 +15,14 @@ from infrastructure.persistence.repositories import (  # noqa: F401
     create_scan_log,
     create_thesis_log,
     deactivate_guru,
+    defer_guru_analytics_refresh,
     delete_all_holdings,
     delete_fx_watch,
     delete_holding,
     delete_price_alert,
+    delete_scan_logs_before,
+    fill_missing_holding_sectors,
+    fill_missing_holding_tickers,
     find_active_alerts_for_stock,
     find_active_fx_watches,
     find_active_profile,
@@ -30,6 +35,7 @@ from infrastructure.persistence.repositories import (  # noqa: F401
     find_all_guru_summaries,
     find_all_holdings,
     find_consensus_stocks,
+    find_cusip_tickers,
     find_filing_by_accession,
     find_filings_by_guru,
     find_fx_watch_by_id,
@@ -47,6 +53,7 @@ from infrastructure.persistence.repositories import (  # noqa: F401
     find_notable_changes_all_gurus,
     find_price_alert_by_id,
     find_profile_by_id,
+    find_recent_transitions_for_tickers,
     find_removal_history,
     find_scan_history,
     find_scan_logs_since,
@@ -55,8 +62,13 @@ from infrastructure.persistence.repositories import (  # noqa: F401
     find_system_templates,
     find_telegram_settings,
     find_thesis_history,
+    find_transitions_for_backtest,
+    find_unindexed_holding_cusips,
+    find_unresolved_cusip_tickers,
     find_user_preferences,
     get_max_thesis_version,
+    record_signal_transitions,
+    refresh_guru_analytics,
     save_filing,
     save_guru,
     save_holding,
@@ -65,8 +77,10 @@ from infrastructure.persistence.repositories import (  # noqa: F401
     save_stock,
     save_telegram_settings,
     save_user_preferences,
+    seed_signal_transitions,
     update_fx_watch,
     update_fx_watch_last_alerted,
     update_guru,
     update_stock,
+    upsert_cusip_tickers,
 )
@@ -5,9 +5,16 @@ Infrastructure — Repository Pattern。
 集中管理所有資料庫查詢，讓 Service 層不直接接觸 ORM 語法。
 """
 
+import json
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 
-from sqlmodel import Session, func, select
+from sqlalchemy import Row
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, delete, func, insert, select, update
 
 from domain.constants import (
     DEFAULT_USER_ID,
@@ -15,15 +22,21 @@ from domain.constants import (
     SCAN_HISTORY_DEFAULT_LIMIT,
 )
 from domain.entities import (
+    CusipTicker,
     FXWatchConfig,
     Guru,
+    GuruActivityStat,
     GuruFiling,
     GuruHolding,
+    GuruSectorStat,
+    GuruStat,
+    GuruTickerStat,
     Holding,
     NotificationLog,
     PriceAlert,
     RemovalLog,
     ScanLog,
+    SignalTransition,
     Stock,
     SystemTemplate,
     ThesisLog,
@@ -106,14 +119,25 @@ def bulk_update_scan_signals(
     updates: dict[str, str],
     signal_since_updates: dict[str, datetime | None] | None = None,
 ) -> None:
-    """批次更新多檔股票的 last_scan_signal 與 signal_since。"""
+    """
+    批次更新多檔股票的 last_scan_signal 與 signal_since。
+    以主鍵 executemany UPDATE 一次寫入，不載入完整 ORM 物件；不存在的 ticker 略過。
+    """
     if not updates:
         return
-    stocks = session.exec(select(Stock).where(Stock.ticker.in_(updates.keys()))).all()
-    for stock in stocks:
-        stock.last_scan_signal = updates[stock.ticker]
-        if signal_since_updates and stock.ticker in signal_since_updates:
-            stock.signal_since = signal_since_updates[stock.ticker]
+    existing = set(
+        session.exec(select(Stock.ticker).where(Stock.ticker.in_(updates.keys()))).all()
+    )
+    rows: list[dict] = []
+    for ticker, signal in updates.items():
+        if ticker not in existing:
+            continue
+        row: dict = {"ticker": ticker, "last_scan_signal": signal}
+        if signal_since_updates and ticker in signal_since_updates:
+            row["signal_since"] = signal_since_updates[ticker]
+        rows.append(row)
+    if rows:
+        session.exec(update(Stock), params=rows)
     session.commit()
 
 
@@ -121,69 +145,80 @@ def find_previous_distinct_signal(
     session: Session, ticker: str, current_signal: str
 ) -> tuple[str | None, datetime | None]:
     """
-    在 ScanLog 中找到緊接在目前連續訊號之前的最後一個不同訊號及其時間。
-    回傳 (previous_signal, changed_at)，若無則回傳 (None, None)。
+    在 SignalTransition 中找到緊接在目前連續訊號之前的最後一個不同訊號，
+    及其最後一次掃描時間。回傳 (previous_signal, changed_at)，若無則回傳 (None, None)。
     """
-    logs = list(
-        session.exec(
-            select(ScanLog)
-            .where(ScanLog.stock_ticker == ticker)
-            .order_by(ScanLog.scanned_at.desc())  # type: ignore[union-attr]
-            .limit(100)
-        ).all()
-    )
-    idx = 0
-    while idx < len(logs) and logs[idx].signal == current_signal:
-        idx += 1
-    if idx < len(logs):
-        return logs[idx].signal, logs[idx].scanned_at
+    for transition in _find_recent_transitions(session, ticker):
+        if transition.signal != current_signal:
+            return transition.signal, transition.ended_at
     return None, None
 
 
 def count_consecutive_scans(session: Session, ticker: str, signal: str) -> int:
-    """計算目前訊號連續出現的掃描次數（從最新往回算）。"""
-    logs = list(
-        session.exec(
-            select(ScanLog)
-            .where(ScanLog.stock_ticker == ticker)
-            .order_by(ScanLog.scanned_at.desc())  # type: ignore[union-attr]
-            .limit(50)
-        ).all()
-    )
+    """計算目前訊號連續出現的掃描次數（從最新區段往回累加 scan_count）。"""
     count = 0
-    for log in logs:
-        if log.signal == signal:
-            count += 1
-        else:
+    for transition in _find_recent_transitions(session, ticker):
+        if transition.signal != signal:
             break
+        count += transition.scan_count
     return max(count, 1)
 
 
+def _find_recent_transitions(
+    session: Session, ticker: str, limit: int = 10
+) -> list[SignalTransition]:
+    """取得指定股票最近的訊號區段（起始時間降序）。"""
+    return list(
+        session.exec(
+            select(SignalTransition)
+            .where(SignalTransition.stock_ticker == ticker)
+            .order_by(SignalTransition.started_at.desc())  # type: ignore[union-attr]
+            .limit(limit)
+        ).all()
+    )
+
+
 def find_recent_scan_logs_for_tickers(
     session: Session, tickers: list[str], limit_per_ticker: int = 100
-) -> dict[str, list[ScanLog]]:
+) -> dict[str, list[Row]]:
     """
     一次批次取得多檔股票的最新 ScanLog（單一 SQL 查詢）。
-    回傳 ticker → logs（時間降序）的對應表，供呼叫端自行計算統計值。
-    使用 ROW_NUMBER 窗函數或 Python 端分組取 top-N。
+    回傳 ticker → 紀錄（時間降序）的對應表，供呼叫端自行計算統計值。
+
+    以 ROW_NUMBER() OVER (PARTITION BY stock_ticker ORDER BY scanned_at DESC)
+    於 SQL 端取各檔 top-N（走 ix_scanlog_stock_ticker_scanned_at 索引），
+    僅投影 signal / market_status / scanned_at 欄位，不載入完整 ORM 物件；
+    回傳列支援屬性存取（row.signal、row.scanned_at）。
     """
     if not tickers:
         return {}
-    all_logs = list(
-        session.exec(
-            select(ScanLog)
-            .where(ScanLog.stock_ticker.in_(tickers))  # type: ignore[union-attr]
-            .order_by(
-                ScanLog.stock_ticker,  # type: ignore[union-attr]
-                ScanLog.scanned_at.desc(),  # type: ignore[union-attr]
+    ranked = (
+        select(
+            ScanLog.stock_ticker,
+            ScanLog.signal,
+            ScanLog.market_status,
+            ScanLog.scanned_at,
+            func.row_number()
+            .over(
+                partition_by=ScanLog.stock_ticker,
+                order_by=ScanLog.scanned_at.desc(),  # type: ignore[union-attr]
             )
-        ).all()
-    )
-    grouped: dict[str, list[ScanLog]] = {}
-    for log in all_logs:
-        bucket = grouped.setdefault(log.stock_ticker, [])
-        if len(bucket) < limit_per_ticker:
-            bucket.append(log)
+            .label("row_rank"),
+        ).where(ScanLog.stock_ticker.in_(tickers))  # type: ignore[union-attr]
+    ).subquery()
+    rows = session.exec(
+        select(
+            ranked.c.stock_ticker,
+            ranked.c.signal,
+            ranked.c.market_status,
+            ranked.c.scanned_at,
+        )
+        .where(ranked.c.row_rank <= limit_per_ticker)
+        .order_by(ranked.c.stock_ticker, ranked.c.row_rank)
+    ).all()
+    grouped: dict[str, list[Row]] = {}
+    for row in rows:
+        grouped.setdefault(row.stock_ticker, []).append(row)
     return grouped
 
 
@@ -286,6 +321,18 @@ def create_scan_log(session: Session, log: ScanLog) -> None:
     session.add(log)
 
 
+def bulk_create_scan_logs(session: Session, logs: list[ScanLog]) -> int:
+    """
+    批次新增掃描紀錄（單一 executemany INSERT，不經 ORM unit of work）。
+    由呼叫端 commit；回傳寫入筆數。
+    """
+    if not logs:
+        return 0
+    rows = [log.model_dump(exclude={"id"}) for log in logs]
+    session.exec(insert(ScanLog), params=rows)
+    return len(rows)
+
+
 def find_scan_history(
     session: Session, ticker: str, limit: int = SCAN_HISTORY_DEFAULT_LIMIT
 ) -> list[ScanLog]:
@@ -344,6 +391,234 @@ def find_scan_logs_for_backtest(
     return list(session.exec(statement).all())
 
 
+def delete_scan_logs_before(session: Session, cutoff: datetime) -> int:
+    """刪除早於 cutoff 的原始掃描紀錄（由呼叫端 commit）；回傳刪除筆數。"""
+    result = session.exec(
+        delete(ScanLog).where(ScanLog.scanned_at < cutoff)  # type: ignore[operator]
+    )
+    return result.rowcount or 0
+
+
+# ===========================================================================
+# SignalTransition Repository
+# ===========================================================================
+
+
+def _as_naive_utc(value: datetime) -> datetime:
+    """統一為 naive UTC（SQLite 讀回的 datetime 不含時區），供區段時間比較。"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
+def _find_latest_transitions(
+    session: Session, tickers: Iterable[str]
+) -> dict[str, SignalTransition]:
+    """批次取得多檔股票最新（started_at 最大）的訊號區段。"""
+    tickers = list(tickers)
+    if not tickers:
+        return {}
+    latest = (
+        select(
+            SignalTransition.stock_ticker,
+            func.max(SignalTransition.started_at).label("max_started"),
+        )
+        .where(SignalTransition.stock_ticker.in_(tickers))  # type: ignore[union-attr]
+        .group_by(SignalTransition.stock_ticker)
+    ).subquery()
+    statement = select(SignalTransition).join(
+        latest,
+        (SignalTransition.stock_ticker == latest.c.stock_ticker)
+        & (SignalTransition.started_at == latest.c.max_started),
+    )
+    return {row.stock_ticker: row for row in session.exec(statement).all()}
+
+
+def _fold_transitions(
+    logs: Iterable[ScanLog], latest: dict[str, dict]
+) -> tuple[list[dict], dict[int, dict]]:
+    """
+    將掃描紀錄折疊進各檔最新區段（純記憶體，不觸及 DB）。
+
+    latest 為 ticker → 最新區段欄位 dict（含 id；新區段 id 為 None），會被就地更新。
+    logs 需依 (ticker, scanned_at) 升冪排序。
+    與最新區段訊號相同且不早於其起點者延長區段；否則新增區段。
+    早於最新區段起點的紀錄（如即時掃描後才執行的歷史回填）另以各檔的歷史游標折疊：
+    連續相同訊號合併為同一區段，不影響最新區段。
+
+    Returns:
+        (待新增區段列表, 待更新既有區段 {id: 欄位 dict})
+    """
+    created: list[dict] = []
+    updated: dict[int, dict] = {}
+    history: dict[str, dict] = {}
+    for log in logs:
+        scanned_at = _as_naive_utc(log.scanned_at)
+        current = latest.get(log.stock_ticker)
+        out_of_order = current is not None and scanned_at < current["started_at"]
+        target = history.get(log.stock_ticker) if out_of_order else current
+        if (
+            target is not None
+            and target["signal"] == log.signal
+            and scanned_at >= target["started_at"]
+        ):
+            target["ended_at"] = max(target["ended_at"], scanned_at)
+            target["scan_count"] += 1
+            if target["id"] is not None:
+                updated[target["id"]] = target
+            continue
+        transition = {
+            "id": None,
+            "stock_ticker": log.stock_ticker,
+            "signal": log.signal,
+            "market_status": log.market_status,
+            "started_at": scanned_at,
+            "ended_at": scanned_at,
+            "scan_count": 1,
+        }
+        created.append(transition)
+        if out_of_order:
+            history[log.stock_ticker] = transition
+        else:
+            latest[log.stock_ticker] = transition
+    return created, updated
+
+
+def _write_transitions(
+    session: Session, created: list[dict], updated: dict[int, dict]
+) -> None:
+    """以 executemany INSERT / UPDATE 寫入折疊結果（由呼叫端 commit）。"""
+    if created:
+        session.exec(
+            insert(SignalTransition),
+            params=[{k: v for k, v in row.items() if k != "id"} for row in created],
+        )
+    if updated:
+        session.exec(
+            update(SignalTransition),
+            params=[
+                {
+                    "id": row["id"],
+                    "ended_at": row["ended_at"],
+                    "scan_count": row["scan_count"],
+                }
+                for row in updated.values()
+            ],
+        )
+
+
+def record_signal_transitions(session: Session, logs: Sequence[ScanLog]) -> int:
+    """
+    依新寫入的掃描紀錄增量維護 SignalTransition（單一查詢 + 批次寫入）。
+    訊號不變者延長最新區段，訊號改變者新增區段；由呼叫端 commit。
+    回傳新增區段數。
+    """
+    if not logs:
+        return 0
+    latest = {
+        ticker: {
+            "id": row.id,
+            "signal": row.signal,
+            "started_at": _as_naive_utc(row.started_at),
+            "ended_at": _as_naive_utc(row.ended_at),
+            "scan_count": row.scan_count,
+        }
+        for ticker, row in _find_latest_transitions(
+            session, {log.stock_ticker for log in logs}
+        ).items()
+    }
+    ordered = sorted(
+        logs, key=lambda log: (log.stock_ticker, _as_naive_utc(log.scanned_at))
+    )
+    created, updated = _fold_transitions(ordered, latest)
+    _write_transitions(session, created, updated)
+    return len(created)
+
+
+def seed_signal_transitions(
+    session: Session, tickers: Iterable[str] | None = None
+) -> int:
+    """
+    為尚無任何訊號區段的股票，由其全部原始 ScanLog 重建區段（串流讀取，逐檔折疊）。
+    tickers 為 None 時處理所有有掃描紀錄的股票。由呼叫端 commit；回傳新增區段數。
+    """
+    covered = set(session.exec(select(SignalTransition.stock_ticker).distinct()).all())
+    statement = select(ScanLog.stock_ticker).distinct()
+    if tickers is not None:
+        statement = statement.where(ScanLog.stock_ticker.in_(list(tickers)))  # type: ignore[union-attr]
+    pending = sorted(set(session.exec(statement).all()) - covered)
+    if not pending:
+        return 0
+    logs = session.exec(
+        select(ScanLog)
+        .where(ScanLog.stock_ticker.in_(pending))  # type: ignore[union-attr]
+        .order_by(
+            ScanLog.stock_ticker,  # type: ignore[union-attr]
+            ScanLog.scanned_at.asc(),  # type: ignore[union-attr]
+        )
+        .execution_options(yield_per=1000)
+    )
+    created, _updated = _fold_transitions(logs, {})
+    _write_transitions(session, created, {})
+    return len(created)
+
+
+def find_recent_transitions_for_tickers(
+    session: Session, tickers: list[str], limit_per_ticker: int = 10
+) -> dict[str, list[SignalTransition]]:
+    """
+    一次批次取得多檔股票最近的訊號區段（單一 SQL 查詢）。
+    回傳 ticker → 區段（起始時間降序）的對應表；區段僅在訊號改變時新增，資料量與掃描頻率無關。
+    各檔 top-N 以 ROW_NUMBER 窗函數於 SQL 端截取。
+    """
+    if not tickers:
+        return {}
+    ranked = (
+        select(
+            SignalTransition,
+            func.row_number()
+            .over(
+                partition_by=SignalTransition.stock_ticker,
+                order_by=SignalTransition.started_at.desc(),  # type: ignore[union-attr]
+            )
+            .label("row_rank"),
+        ).where(SignalTransition.stock_ticker.in_(tickers))  # type: ignore[union-attr]
+    ).subquery()
+    transition = aliased(SignalTransition, ranked)
+    rows = session.exec(
+        select(transition)
+        .where(ranked.c.row_rank <= limit_per_ticker)
+        .order_by(ranked.c.stock_ticker, ranked.c.row_rank)
+    ).all()
+    grouped: dict[str, list[SignalTransition]] = {}
+    for row in rows:
+        grouped.setdefault(row.stock_ticker, []).append(row)
+    return grouped
+
+
+def find_transitions_for_backtest(
+    session: Session,
+    since: datetime,
+    exclude_signals: list[str] | None = None,
+) -> list[SignalTransition]:
+    """
+    取得回測用訊號區段（依 ticker、起始時間升序），包含於 since 之後仍持續的區段。
+
+    預設排除 NORMAL，避免把「無動作」訊號視為回測樣本。
+    """
+    excluded = exclude_signals or ["NORMAL"]
+    statement = (
+        select(SignalTransition)
+        .where(SignalTransition.ended_at >= _as_naive_utc(since))  # type: ignore[operator]
+        .where(~SignalTransition.signal.in_(excluded))  # type: ignore[union-attr]
+        .order_by(
+            SignalTransition.stock_ticker,  # type: ignore[union-attr]
+            SignalTransition.started_at.asc(),  # type: ignore[union-attr]
+        )
+    )
+    return list(session.exec(statement).all())
+
+
 # ===========================================================================
 # PriceAlert Repository
 # ===========================================================================
@@ -526,18 +801,20 @@ def save_guru(session: Session, guru: Guru) -> Guru:
 
 
 def update_guru(session: Session, guru: Guru) -> Guru:
-    """更新大師（含 refresh）。"""
+    """更新大師（含 refresh），並重算 Smart Money 物化表（名稱 / 風格可能變更）。"""
     session.add(guru)
     session.commit()
+    _mark_guru_analytics_stale(session)
     session.refresh(guru)
     return guru
 
 
 def deactivate_guru(session: Session, guru: Guru) -> None:
-    """停用大師（軟刪除）。"""
+    """停用大師（軟刪除），並重算 Smart Money 物化表。"""
     guru.is_active = False
     session.add(guru)
     session.commit()
+    _mark_guru_analytics_stale(session)
 
 
 # ===========================================================================
@@ -579,9 +856,19 @@ def find_filing_by_accession(
     return session.exec(statement).first()
 
 
-def save_filing(session: Session, filing: GuruFiling) -> GuruFiling:
-    """新增 13F 申報記錄（含 refresh）。"""
+def save_filing(
+    session: Session, filing: GuruFiling, *, commit: bool = True
+) -> GuruFiling:
+    """
+    新增 13F 申報記錄（含 refresh）。
+    Smart Money 物化表不在此重算：申報寫入後應接著以 save_holdings_batch 寫入持倉，
+    由其於持倉就緒後重算一次（避免以尚無持倉的申報先重算一輪）。
+    commit=False 時僅 flush（取得 id），由呼叫端合併多筆申報後再 commit。
+    """
     session.add(filing)
+    if not commit:
+        session.flush()
+        return filing
     session.commit()
     session.refresh(filing)
     return filing
@@ -642,11 +929,67 @@ def find_holdings_by_ticker_across_gurus(
     return list(session.exec(statement).all())
 
 
-def save_holdings_batch(session: Session, holdings: list[GuruHolding]) -> None:
-    """批次儲存持倉記錄（單次 commit）。"""
+def save_holdings_batch(
+    session: Session,
+    holdings: list[GuruHolding],
+    guru_id: int | None = None,
+    *,
+    commit: bool = True,
+) -> None:
+    """
+    批次儲存持倉記錄（單次 commit），並重算受影響大師的 Smart Money 物化表。
+    guru_id 為剛寫入申報的大師：持倉為空時仍需重算其申報數 / 最新申報日。
+    commit=False 時僅 flush，由呼叫端 commit（同一 session 的後續查詢仍讀得到）。
+    """
+    guru_ids = {holding.guru_id for holding in holdings}
+    if guru_id is not None:
+        guru_ids.add(guru_id)
+    if guru_ids:
+        _record_guru_analytics_baseline(session, guru_ids)
     for holding in holdings:
         session.add(holding)
+    if commit:
+        session.commit()
+    else:
+        session.flush()
+    if guru_ids:
+        _mark_guru_analytics_stale(session, guru_ids)
+
+
+def fill_missing_holding_sectors(session: Session, sectors: dict[str, str]) -> set[int]:
+    """
+    以 ticker → sector 回填 sector 為空的持倉（13F 同步後非同步補齊板塊），
+    每個板塊一次 UPDATE；回傳受影響的大師 ID 集合並重算其 Smart Money 物化表。
+    """
+    tickers_by_sector: dict[str, list[str]] = {}
+    for ticker, sector in sectors.items():
+        tickers_by_sector.setdefault(sector, []).append(ticker)
+
+    guru_ids = set(
+        session.exec(
+            select(GuruHolding.guru_id)
+            .where(
+                GuruHolding.sector.is_(None),  # type: ignore[union-attr]
+                GuruHolding.ticker.in_(list(sectors)),  # type: ignore[union-attr]
+            )
+            .distinct()
+        ).all()
+    )
+    if not guru_ids:
+        return set()
+    _record_guru_analytics_baseline(session, guru_ids)
+    for sector, tickers in tickers_by_sector.items():
+        session.exec(
+            update(GuruHolding)
+            .where(
+                GuruHolding.sector.is_(None),  # type: ignore[union-attr]
+                GuruHolding.ticker.in_(tickers),  # type: ignore[union-attr]
+            )
+            .values(sector=sector)
+        )
     session.commit()
+    _mark_guru_analytics_stale(session, guru_ids)
+    return guru_ids
 
 
 def _latest_filing_ids_subquery(style: str | None = None):
@@ -685,7 +1028,7 @@ def _latest_filing_ids_subquery(style: str | None = None):
 
 def find_all_guru_summaries(session: Session, style: str | None = None) -> list[dict]:
     """
-    查詢所有啟用中大師的最新申報摘要（含申報總筆數）。
+    查詢所有啟用中大師的最新申報摘要（讀取物化表 GuruStat）。
 
     當提供 style 時，僅回傳符合該投資風格的大師。
 
@@ -694,96 +1037,31 @@ def find_all_guru_summaries(session: Session, style: str | None = None) -> list[
         total_value, holdings_count, filing_count,
         top5_concentration_pct, turnover_pct
     """
-    from domain.enums import HoldingAction
-
-    # 子查詢：每位大師最新申報日期
-    latest_subq = (
-        select(
-            GuruFiling.guru_id,
-            func.max(GuruFiling.report_date).label("max_report"),
-        ).group_by(GuruFiling.guru_id)
-    ).subquery()
-
-    # 每位大師的申報數
-    count_subq = (
-        select(
-            GuruFiling.guru_id,
-            func.count(GuruFiling.id).label("filing_count"),
-        ).group_by(GuruFiling.guru_id)
-    ).subquery()
-
-    # 取得最新申報記錄
-    latest_filing_stmt = select(GuruFiling).join(
-        latest_subq,
-        (GuruFiling.guru_id == latest_subq.c.guru_id)
-        & (GuruFiling.report_date == latest_subq.c.max_report),
+    statement = (
+        select(Guru, GuruStat)
+        .join(GuruStat, GuruStat.guru_id == Guru.id, isouter=True)
+        .where(Guru.is_active == True)  # noqa: E712
+        .order_by(Guru.id)
     )
-    latest_filings = {f.guru_id: f for f in session.exec(latest_filing_stmt).all()}
-
-    # 取得申報數
-    filing_counts = {
-        row[0]: row[1]
-        for row in session.exec(
-            select(count_subq.c.guru_id, count_subq.c.filing_count)
-        ).all()
-    }
-
-    guru_stmt = select(Guru).where(Guru.is_active == True).order_by(Guru.id)  # noqa: E712
     if style is not None:
-        guru_stmt = guru_stmt.where(Guru.style == style)
-    gurus = session.exec(guru_stmt).all()
-
-    results = []
-    for guru in gurus:
-        filing = latest_filings.get(guru.id)
-
-        top5_concentration_pct = None
-        turnover_pct = None
+        statement = statement.where(Guru.style == style)
 
-        if filing:
-            # Top-5 concentration: sum of top-5 weight_pct excluding SOLD_OUT
-            top5 = session.exec(
-                select(GuruHolding.weight_pct)
-                .where(
-                    GuruHolding.filing_id == filing.id,
-                    GuruHolding.weight_pct.isnot(None),  # type: ignore[union-attr]
-                    GuruHolding.action != HoldingAction.SOLD_OUT.value,
-                )
-                .order_by(GuruHolding.weight_pct.desc())
-                .limit(5)
-            ).all()
-            if top5:
-                top5_concentration_pct = round(sum(top5), 1)
-
-            # Turnover: (new_positions + sold_out) / holdings_count * 100
-            if filing.holdings_count > 0:
-                action_counts = session.exec(
-                    select(GuruHolding.action, func.count().label("cnt"))
-                    .where(GuruHolding.filing_id == filing.id)
-                    .group_by(GuruHolding.action)
-                ).all()
-                action_map = dict(action_counts)
-                churned = action_map.get(
-                    HoldingAction.NEW_POSITION.value, 0
-                ) + action_map.get(HoldingAction.SOLD_OUT.value, 0)
-                turnover_pct = round(churned / filing.holdings_count * 100, 1)
-
-        results.append(
-            {
-                "id": guru.id,
-                "display_name": guru.display_name,
-                "latest_report_date": filing.report_date if filing else None,
-                "latest_filing_date": filing.filing_date if filing else None,
-                "total_value": filing.total_value if filing else None,
-                "holdings_count": filing.holdings_count if filing else 0,
-                "filing_count": filing_counts.get(guru.id, 0),
-                "style": guru.style,
-                "tier": guru.tier,
-                "top5_concentration_pct": top5_concentration_pct,
-                "turnover_pct": turnover_pct,
-            }
-        )
-    return results
+    return [
+        {
+            "id": guru.id,
+            "display_name": guru.display_name,
+            "latest_report_date": stat.report_date if stat else None,
+            "latest_filing_date": stat.filing_date if stat else None,
+            "total_value": stat.total_value if stat else None,
+            "holdings_count": stat.holdings_count if stat else 0,
+            "filing_count": stat.filing_count if stat else 0,
+            "style": guru.style,
+            "tier": guru.tier,
+            "top5_concentration_pct": stat.top5_concentration_pct if stat else None,
+            "turnover_pct": stat.turnover_pct if stat else None,
+        }
+        for guru, stat in session.exec(statement).all()
+    ]
 
 
 def find_holding_history_by_guru(
@@ -925,123 +1203,64 @@ def find_notable_changes_all_gurus(
 
 
 def find_consensus_stocks(session: Session, style: str | None = None) -> list[dict]:
-    """Return tickers held by >1 active guru in their latest filings.
+    """Return tickers held by >1 guru in their latest filings.
 
     Excludes SOLD_OUT positions. Returns enriched shape with per-guru
     action/weight detail, avg weight, sector, and company name.
-    When style is provided, only includes gurus of that investment style.
+    When style is provided, only includes active gurus of that investment style.
+    Reads the GuruTickerStat materialized table (refreshed on 13F sync).
     """
-    from domain.enums import HoldingAction
-
-    latest_ids = _latest_filing_ids_subquery(style=style)
-
-    # Single query: all relevant holdings with guru display names
-    stmt = (
-        select(GuruHolding, Guru.display_name)
-        .join(latest_ids, GuruHolding.filing_id == latest_ids.c.filing_id)
-        .join(Guru, GuruHolding.guru_id == Guru.id)
+    statement = (
+        select(GuruTickerStat)
         .where(
-            GuruHolding.ticker.isnot(None),  # type: ignore[union-attr]
-            GuruHolding.action != HoldingAction.SOLD_OUT.value,
+            GuruTickerStat.scope == _analytics_scope(style),
+            GuruTickerStat.guru_count > 1,
         )
-    )
-    rows = session.exec(stmt).all()
-
-    # Aggregate: ticker → {company_name, sector, guru_details, total_value}
-    ticker_map: dict[str, dict] = {}
-    for holding, guru_display_name in rows:
-        t = holding.ticker
-        if t not in ticker_map:
-            ticker_map[t] = {
-                "company_name": holding.company_name,
-                "sector": holding.sector,
-                "guru_details": [],
-                "total_value": 0.0,
-            }
-        # Deduplicate by display_name (one guru may hold multiple CUSIPs for same ticker)
-        if not any(
-            g["display_name"] == guru_display_name
-            for g in ticker_map[t]["guru_details"]
-        ):
-            ticker_map[t]["guru_details"].append(
-                {
-                    "display_name": guru_display_name,
-                    "action": holding.action,
-                    "weight_pct": holding.weight_pct,
-                }
-            )
-        ticker_map[t]["total_value"] += holding.value
-
-    result = []
-    for t, d in ticker_map.items():
-        guru_details = d["guru_details"]
-        if len(guru_details) <= 1:
-            continue
-        weights = [g["weight_pct"] for g in guru_details if g["weight_pct"] is not None]
-        avg_weight_pct = sum(weights) / len(weights) if weights else None
-        result.append(
-            {
-                "ticker": t,
-                "company_name": d["company_name"],
-                "guru_count": len(guru_details),
-                "gurus": guru_details,
-                "total_value": d["total_value"],
-                "avg_weight_pct": avg_weight_pct,
-                "sector": d["sector"],
-            }
+        .order_by(
+            GuruTickerStat.guru_count.desc(),  # type: ignore[union-attr]
+            GuruTickerStat.total_value.desc(),  # type: ignore[union-attr]
+            GuruTickerStat.ticker,
         )
-
-    result.sort(key=lambda x: (-x["guru_count"], -x["total_value"]))
-    return result
+    )
+    return [
+        {
+            "ticker": stat.ticker,
+            "company_name": stat.company_name,
+            "guru_count": stat.guru_count,
+            "gurus": json.loads(stat.guru_details),
+            "total_value": stat.total_value,
+            "avg_weight_pct": stat.consensus_avg_weight_pct,
+            "sector": stat.sector,
+        }
+        for stat in session.exec(statement).all()
+    ]
 
 
 def find_sector_breakdown(session: Session, style: str | None = None) -> list[dict]:
     """
-    彙總所有大師最新申報中有 sector 資料的持倉，依板塊分組。
+    讀取大師最新申報的行業板塊彙總（物化表 GuruSectorStat）。
 
     當提供 style 時，僅彙總符合該投資風格大師的持倉。
 
     回傳 list of dict（依 weight_pct 降序），每筆含：
         sector, total_value, holding_count, weight_pct
     """
-    from domain.enums import HoldingAction
-
-    latest_filing_ids_subq = _latest_filing_ids_subquery(style=style)
-
-    holdings_stmt = (
-        select(GuruHolding)
-        .join(
-            latest_filing_ids_subq,
-            GuruHolding.filing_id == latest_filing_ids_subq.c.filing_id,
-        )
-        .where(
-            GuruHolding.sector.isnot(None),  # type: ignore[union-attr]
-            GuruHolding.action != HoldingAction.SOLD_OUT.value,
-        )
-    )
-    holdings = session.exec(holdings_stmt).all()
-
-    sector_map: dict[str, dict] = {}
-    for h in holdings:
-        s = h.sector
-        if s not in sector_map:
-            sector_map[s] = {"total_value": 0.0, "holding_count": 0}
-        sector_map[s]["total_value"] += h.value
-        sector_map[s]["holding_count"] += 1
-
-    grand_total = sum(d["total_value"] for d in sector_map.values())
+    stats = session.exec(
+        select(GuruSectorStat).where(GuruSectorStat.scope == _analytics_scope(style))
+    ).all()
+    grand_total = sum(s.total_value for s in stats)
 
-    result = []
-    for sector, d in sector_map.items():
-        weight_pct = (d["total_value"] / grand_total * 100) if grand_total > 0 else 0.0
-        result.append(
-            {
-                "sector": sector,
-                "total_value": d["total_value"],
-                "holding_count": d["holding_count"],
-                "weight_pct": round(weight_pct, 2),
-            }
-        )
+    result = [
+        {
+            "sector": s.sector,
+            "total_value": s.total_value,
+            "holding_count": s.holding_count,
+            "weight_pct": round(s.total_value / grand_total * 100, 2)
+            if grand_total > 0
+            else 0.0,
+        }
+        for s in stats
+    ]
     result.sort(key=lambda x: x["weight_pct"], reverse=True)
     return result
 
@@ -1049,7 +1268,7 @@ def find_sector_breakdown(session: Session, style: str | None = None) -> list[di
 def find_activity_feed(
     session: Session, limit: int = 15, style: str | None = None
 ) -> dict:
-    """Aggregate holdings across all gurus' latest filings.
+    """Return the most bought / most sold tickers across gurus' latest filings.
 
     Returns two ranked lists:
     - most_bought: tickers with the most NEW_POSITION / INCREASED actions
@@ -1057,176 +1276,825 @@ def find_activity_feed(
 
     Each item: ticker, company_name, guru_count, gurus (display names), total_value.
     Sorted by guru_count DESC, then total_value DESC.
-    When style is provided, only includes gurus of that investment style.
-    Uses a single query + Python aggregation (same pattern as find_consensus_stocks).
+    When style is provided, only includes active gurus of that investment style.
+    Reads the GuruActivityStat materialized table (refreshed on 13F sync).
     """
-    from domain.enums import HoldingAction
+    scope = _analytics_scope(style)
 
-    latest_ids = _latest_filing_ids_subquery(style=style)
+    def _ranked(side: str) -> list[dict]:
+        statement = (
+            select(GuruActivityStat)
+            .where(GuruActivityStat.scope == scope, GuruActivityStat.side == side)
+            .order_by(
+                GuruActivityStat.guru_count.desc(),  # type: ignore[union-attr]
+                GuruActivityStat.total_value.desc(),  # type: ignore[union-attr]
+                GuruActivityStat.ticker,
+            )
+            .limit(limit)
+        )
+        return [
+            {
+                "ticker": stat.ticker,
+                "company_name": stat.company_name,
+                "guru_count": stat.guru_count,
+                "gurus": json.loads(stat.gurus),
+                "total_value": stat.total_value,
+            }
+            for stat in session.exec(statement).all()
+        ]
 
-    buy_actions = [HoldingAction.NEW_POSITION.value, HoldingAction.INCREASED.value]
-    sell_actions = [HoldingAction.SOLD_OUT.value, HoldingAction.DECREASED.value]
-    all_actions = buy_actions + sell_actions
+    return {
+        "most_bought": _ranked(_ACTIVITY_BUY),
+        "most_sold": _ranked(_ACTIVITY_SELL),
+    }
 
-    # Single query: fetch all relevant holdings with guru display names
-    stmt = (
-        select(GuruHolding, Guru.display_name)
-        .join(
-            latest_ids,
-            GuruHolding.filing_id == latest_ids.c.filing_id,
+
+def find_grand_portfolio(session: Session, style: str | None = None) -> dict:
+    """Return the aggregated Grand Portfolio across gurus' latest filings.
+
+    Excludes SOLD_OUT positions. Returns items sorted by combined_weight_pct DESC.
+    When style is provided, only includes active gurus of that investment style.
+    Reads the GuruTickerStat materialized table (refreshed on 13F sync).
+    """
+    stats = session.exec(
+        select(GuruTickerStat)
+        .where(GuruTickerStat.scope == _analytics_scope(style))
+        .order_by(
+            GuruTickerStat.total_value.desc(),  # type: ignore[union-attr]
+            GuruTickerStat.ticker,
         )
-        .join(Guru, GuruHolding.guru_id == Guru.id)
+    ).all()
+    grand_total = sum(s.total_value for s in stats)
+
+    items = [
+        {
+            "ticker": stat.ticker,
+            "company_name": stat.company_name,
+            "sector": stat.sector,
+            "guru_count": stat.guru_count,
+            "gurus": [g["display_name"] for g in json.loads(stat.guru_details)],
+            "total_value": stat.total_value,
+            "avg_weight_pct": stat.avg_weight_pct,
+            "combined_weight_pct": round(
+                stat.total_value / grand_total * 100 if grand_total > 0 else 0, 3
+            ),
+            "dominant_action": stat.dominant_action,
+            "action_counts": json.loads(stat.action_counts),
+        }
+        for stat in stats
+    ]
+    items.sort(key=lambda x: x["combined_weight_pct"], reverse=True)
+
+    # Sector breakdown for the grand portfolio
+    sector_map: dict[str, float] = {}
+    for item in items:
+        sector = item["sector"] or "Unknown"
+        sector_map[sector] = sector_map.get(sector, 0) + item["total_value"]
+    sector_breakdown = [
+        {
+            "sector": s,
+            "total_value": v,
+            "holding_count": sum(1 for i in items if (i["sector"] or "Unknown") == s),
+            "weight_pct": round(v / grand_total * 100, 2) if grand_total > 0 else 0,
+        }
+        for s, v in sorted(sector_map.items(), key=lambda x: x[1], reverse=True)
+    ]
+
+    return {
+        "items": items,
+        "total_value": grand_total,
+        "unique_tickers": len(items),
+        "sector_breakdown": sector_breakdown,
+    }
+
+
+# ===========================================================================
+# CusipTicker Repository — CUSIP → ticker 持久化索引
+# ===========================================================================
+
+
+def find_cusip_tickers(
+    session: Session, cusips: Iterable[str]
+) -> dict[str, CusipTicker]:
+    """以單次 IN 查詢批次讀取 CUSIP 索引，回傳 cusip → CusipTicker。"""
+    keys = sorted(set(cusips))
+    if not keys:
+        return {}
+    statement = select(CusipTicker).where(CusipTicker.cusip.in_(keys))  # type: ignore[union-attr]
+    return {entry.cusip: entry for entry in session.exec(statement).all()}
+
+
+def find_unresolved_cusip_tickers(session: Session) -> list[CusipTicker]:
+    """查詢尚未解析出 ticker 的 CUSIP（名稱提示更新後重試用）。"""
+    statement = select(CusipTicker).where(CusipTicker.ticker.is_(None))  # type: ignore[union-attr]
+    return list(session.exec(statement).all())
+
+
+def find_unindexed_holding_cusips(session: Session) -> dict[str, str]:
+    """查詢持倉中出現過、但尚未寫入 CUSIP 索引的 cusip → 公司名稱。"""
+    statement = (
+        select(GuruHolding.cusip, func.max(GuruHolding.company_name))
         .where(
-            GuruHolding.action.in_(all_actions),
-            GuruHolding.ticker.isnot(None),  # type: ignore[union-attr]
+            GuruHolding.cusip.notin_(select(CusipTicker.cusip))  # type: ignore[union-attr]
         )
+        .group_by(GuruHolding.cusip)
     )
-    rows = session.exec(stmt).all()
-
-    def _aggregate(actions: list[str]) -> list[dict]:
-        # ticker → {company_name, gurus (deduped), total_value}
-        ticker_map: dict[str, dict] = {}
-        for holding, guru_display_name in rows:
-            if holding.action not in actions:
-                continue
-            t = holding.ticker
-            if t not in ticker_map:
-                ticker_map[t] = {
-                    "company_name": holding.company_name,
-                    "gurus": [],
-                    "total_value": 0.0,
-                }
-            if guru_display_name not in ticker_map[t]["gurus"]:
-                ticker_map[t]["gurus"].append(guru_display_name)
-            ticker_map[t]["total_value"] += holding.value
+    return {cusip: name or "" for cusip, name in session.exec(statement).all()}
 
-        result = [
-            {
-                "ticker": t,
-                "company_name": d["company_name"],
-                "guru_count": len(d["gurus"]),
-                "gurus": d["gurus"],
-                "total_value": d["total_value"],
-            }
-            for t, d in ticker_map.items()
-        ]
-        result.sort(key=lambda x: (-x["guru_count"], -x["total_value"]))
-        return result[:limit]
 
-    return {
-        "most_bought": _aggregate(buy_actions),
-        "most_sold": _aggregate(sell_actions),
+def upsert_cusip_tickers(
+    session: Session, entries: Sequence[CusipTicker], *, commit: bool = True
+) -> int:
+    """
+    批次寫入 / 更新 CUSIP 索引（單次 commit），回傳實際變更筆數。
+    既有記錄僅在 ticker / 來源 / 公司名稱改變時更新；未提供公司名稱時保留原值。
+    commit=False 時與呼叫端的申報寫入同批 commit。
+    以 INSERT ... ON CONFLICT(cusip) DO UPDATE 寫入：並發的另一個 session
+    先寫入同一 CUSIP 時改為更新，不會因主鍵衝突中斷呼叫端的同步流程。
+    """
+    existing = {
+        cusip: (row.ticker, row.source, row.company_name)
+        for cusip, row in find_cusip_tickers(
+            session, (entry.cusip for entry in entries)
+        ).items()
     }
+    now = datetime.now(UTC)
+    rows: dict[str, dict] = {}
+    for entry in entries:
+        current = existing.get(entry.cusip)
+        company_name = entry.company_name or (current[2] if current else "")
+        state = (entry.ticker, entry.source, company_name)
+        if state == current:
+            continue
+        existing[entry.cusip] = state
+        rows[entry.cusip] = {
+            "cusip": entry.cusip,
+            "ticker": entry.ticker,
+            "source": entry.source,
+            "company_name": entry.company_name,
+            "updated_at": now,
+        }
+    if not rows:
+        return 0
+    statement = sqlite_insert(CusipTicker)
+    statement = statement.on_conflict_do_update(
+        index_elements=[CusipTicker.cusip],
+        set_={
+            "ticker": statement.excluded.ticker,
+            "source": statement.excluded.source,
+            "company_name": func.coalesce(
+                func.nullif(statement.excluded.company_name, ""),
+                CusipTicker.company_name,
+            ),
+            "updated_at": statement.excluded.updated_at,
+        },
+    )
+    session.exec(statement, params=list(rows.values()))  # type: ignore[call-overload]
+    if commit:
+        session.commit()
+    return len(rows)
 
 
-def find_grand_portfolio(session: Session, style: str | None = None) -> dict:
-    """Aggregate holdings across all active gurus' latest filings.
+def fill_missing_holding_tickers(session: Session) -> set[int]:
+    """
+    以 CUSIP 索引回填 ticker 為空的持倉（索引新解析出代號時），
+    回傳受影響的大師 ID 集合並重算其 Smart Money 物化表。
+    """
+    resolved = select(CusipTicker.cusip).where(CusipTicker.ticker.isnot(None))  # type: ignore[union-attr]
+    missing = (
+        GuruHolding.ticker.is_(None),  # type: ignore[union-attr]
+        GuruHolding.cusip.in_(resolved),  # type: ignore[union-attr]
+    )
+    guru_ids = set(
+        session.exec(select(GuruHolding.guru_id).where(*missing).distinct()).all()
+    )
+    if not guru_ids:
+        return set()
+    _record_guru_analytics_baseline(session, guru_ids)
+    session.exec(
+        update(GuruHolding)
+        .where(*missing)
+        .values(
+            ticker=select(CusipTicker.ticker)
+            .where(CusipTicker.cusip == GuruHolding.cusip)
+            .scalar_subquery()
+        )
+    )
+    session.commit()
+    _mark_guru_analytics_stale(session, guru_ids)
+    return guru_ids
 
-    Groups by ticker in Python. Excludes SOLD_OUT positions.
-    Returns items sorted by combined_weight_pct DESC.
-    When style is provided, only includes gurus of that investment style.
-    Uses a single query + Python aggregation (same pattern as find_activity_feed).
+
+# ===========================================================================
+# Guru Analytics — 物化彙總表維護（13F 同步 / 大師異動時重算）
+# ===========================================================================
+
+_ACTIVITY_BUY = "BUY"
+_ACTIVITY_SELL = "SELL"
+_ANALYTICS_DEFER_KEY = "guru_analytics_deferred"
+_ANALYTICS_BASELINE_KEY = "guru_analytics_baseline"
+
+
+def _analytics_scope(style: str | None) -> str:
+    """style → 物化表 scope（None 以空字串代表全部大師）。"""
+    return style or ""
+
+
+@contextmanager
+def defer_guru_analytics_refresh(session: Session) -> Iterator[None]:
     """
-    from domain.enums import HoldingAction
+    延遲物化表重算：區塊內的申報 / 持倉寫入僅記錄受影響大師，
+    離開時合併為一次重算（批次同步、回填多季申報時避免每筆申報各重算一次）。
+    巢狀使用時由最外層負責重算。
+    """
+    if _ANALYTICS_DEFER_KEY in session.info:
+        yield
+        return
 
-    latest_ids = _latest_filing_ids_subquery(style=style)
+    pending: dict[str, set[int] | bool] = {"guru_ids": set(), "all": False}
+    session.info[_ANALYTICS_DEFER_KEY] = pending
+    try:
+        yield
+    finally:
+        del session.info[_ANALYTICS_DEFER_KEY]
+        if pending["all"]:
+            refresh_guru_analytics(session)
+        elif pending["guru_ids"]:
+            refresh_guru_analytics(session, pending["guru_ids"])  # type: ignore[arg-type]
 
-    # Single query: fetch all non-SOLD_OUT holdings with guru display names
-    stmt = (
-        select(GuruHolding, Guru.display_name)
-        .join(
-            latest_ids,
-            GuruHolding.filing_id == latest_ids.c.filing_id,
+
+def _mark_guru_analytics_stale(
+    session: Session, guru_ids: set[int] | None = None
+) -> None:
+    """大師資料異動後重算物化表；guru_ids=None 表示大師屬性變更，全部重算。"""
+    pending = session.info.get(_ANALYTICS_DEFER_KEY)
+    if pending is None:
+        refresh_guru_analytics(session, guru_ids)
+    elif guru_ids is None:
+        pending["all"] = True
+    else:
+        pending["guru_ids"] |= guru_ids
+
+
+def refresh_guru_analytics(session: Session, guru_ids: set[int] | None = None) -> None:
+    """
+    重算 Smart Money 物化彙總表。
+
+    - guru_ids 指定時：僅重算這些大師的 GuruStat，並以增量方式更新其所屬 scope
+      （全部大師 + 各自投資風格）的個股 / 動向 / 板塊彙總：扣除先前計入的最新申報持倉、
+      加入新的最新申報持倉，成本與這些大師的持倉數成正比，與全部持倉總數無關
+    - guru_ids=None：全部重算（大師更名、停用、變更風格或首次建立物化表時）
+    """
+    baselines: dict[int, list[_Contribution]] = session.info.pop(
+        _ANALYTICS_BASELINE_KEY, {}
+    )
+    if guru_ids is None:
+        styles = session.exec(
+            select(Guru.style).where(Guru.style.isnot(None)).distinct()  # type: ignore[union-attr]
+        ).all()
+        for model in (GuruStat, GuruTickerStat, GuruActivityStat, GuruSectorStat):
+            session.exec(delete(model))
+        _refresh_guru_stats(session, None)
+        for scope in {"", *styles}:
+            _rebuild_scope_stats(session, scope)
+        session.commit()
+        return
+
+    # 扣除基準：寫入前已記錄者沿用快照，其餘（僅新增申報）讀取目前計入物化表的持倉
+    removed = [row for gid in guru_ids & baselines.keys() for row in baselines[gid]]
+    unrecorded = guru_ids - baselines.keys()
+    if unrecorded:
+        removed.extend(_materialized_contributions(session, unrecorded))
+    removed.sort(key=lambda row: row.holding_id)
+    if baselines.keys() - guru_ids:
+        session.info[_ANALYTICS_BASELINE_KEY] = {
+            gid: rows for gid, rows in baselines.items() if gid not in guru_ids
+        }
+
+    session.exec(delete(GuruStat).where(GuruStat.guru_id.in_(guru_ids)))  # type: ignore[union-attr]
+    _refresh_guru_stats(session, guru_ids)
+    added = _materialized_contributions(session, guru_ids)
+
+    scopes = {"", *(row.style for row in (*removed, *added) if row.style)}
+    for scope in scopes:
+        _apply_scope_delta(
+            session,
+            scope,
+            [row for row in removed if _in_scope(row, scope)],
+            [row for row in added if _in_scope(row, scope)],
+        )
+    session.commit()
+
+
+@dataclass(frozen=True)
+class _Contribution:
+    """計入物化表的單筆持倉快照（與 ORM 物件脫鉤，UPDATE 後仍保留寫入前的值）。"""
+
+    holding_id: int
+    guru_id: int
+    display_name: str
+    style: str | None  # 所屬投資風格 scope（停用或未分類的大師為 None）
+    ticker: str | None
+    company_name: str
+    sector: str | None
+    action: str
+    value: float
+    weight_pct: float | None
+
+
+def _in_scope(row: _Contribution, scope: str) -> bool:
+    return not scope or row.style == scope
+
+
+def _to_contributions(
+    rows: Sequence[tuple[GuruHolding, str, str | None, bool]],
+) -> list[_Contribution]:
+    return [
+        _Contribution(
+            holding_id=holding.id,
+            guru_id=holding.guru_id,
+            display_name=display_name,
+            style=style if is_active else None,
+            ticker=holding.ticker,
+            company_name=holding.company_name,
+            sector=holding.sector,
+            action=holding.action,
+            value=holding.value,
+            weight_pct=holding.weight_pct,
         )
+        for holding, display_name, style, is_active in rows
+    ]
+
+
+def _materialized_contributions(
+    session: Session, guru_ids: set[int]
+) -> list[_Contribution]:
+    """
+    目前計入物化表的持倉（依持倉 ID 排序）：各大師 GuruStat 記錄的最新基準日申報。
+    ID 不大於 GuruStat.filing_id 者才算，重算後才寫入的同基準日申報不在其內。
+    """
+    rows = session.exec(
+        select(GuruHolding, Guru.display_name, Guru.style, Guru.is_active)
+        .join(GuruFiling, GuruHolding.filing_id == GuruFiling.id)
+        .join(GuruStat, GuruFiling.guru_id == GuruStat.guru_id)
         .join(Guru, GuruHolding.guru_id == Guru.id)
         .where(
-            GuruHolding.action != HoldingAction.SOLD_OUT.value,
-            GuruHolding.ticker.isnot(None),  # type: ignore[union-attr]
+            GuruStat.guru_id.in_(guru_ids),  # type: ignore[union-attr]
+            GuruFiling.report_date == GuruStat.report_date,
+            GuruFiling.id <= GuruStat.filing_id,  # type: ignore[operator]
         )
+        .order_by(GuruHolding.id)  # type: ignore[arg-type]
+    ).all()
+    return _to_contributions(rows)
+
+
+def _record_guru_analytics_baseline(session: Session, guru_ids: set[int]) -> None:
+    """
+    修改持倉前記錄這些大師目前計入物化表的持倉，作為增量重算的扣除基準
+    （UPDATE 既有持倉或寫入已計入的申報後，重算當下已讀不到修改前的值）。
+    同一大師已有基準時保留最早的一份。
+    """
+    baselines = session.info.setdefault(_ANALYTICS_BASELINE_KEY, {})
+    missing = guru_ids - baselines.keys()
+    if not missing:
+        return
+    for gid in missing:
+        baselines[gid] = []
+    for row in _materialized_contributions(session, missing):
+        baselines[row.guru_id].append(row)
+
+
+def _refresh_guru_stats(session: Session, guru_ids: set[int] | None) -> None:
+    """重算 GuruStat：最新申報、申報數、前五大集中度與換手率（不 commit）。"""
+    from domain.enums import HoldingAction
+
+    filings_stmt = select(GuruFiling).order_by(
+        GuruFiling.guru_id,
+        GuruFiling.report_date,
+        GuruFiling.id,  # type: ignore[arg-type]
     )
-    rows = session.exec(stmt).all()
+    if guru_ids is not None:
+        filings_stmt = filings_stmt.where(GuruFiling.guru_id.in_(guru_ids))  # type: ignore[union-attr]
+
+    filing_counts: dict[int, int] = {}
+    latest: dict[int, GuruFiling] = {}
+    for filing in session.exec(filings_stmt).all():
+        filing_counts[filing.guru_id] = filing_counts.get(filing.guru_id, 0) + 1
+        latest[filing.guru_id] = filing
+
+    holdings_by_filing: dict[int, list[tuple[str, float | None]]] = {}
+    if latest:
+        for filing_id, action, weight_pct in session.exec(
+            select(
+                GuruHolding.filing_id, GuruHolding.action, GuruHolding.weight_pct
+            ).where(
+                GuruHolding.filing_id.in_([f.id for f in latest.values()])  # type: ignore[union-attr]
+            )
+        ).all():
+            holdings_by_filing.setdefault(filing_id, []).append((action, weight_pct))
+
+    rows = []
+    for guru_id, filing in latest.items():
+        holdings = holdings_by_filing.get(filing.id, [])
+
+        # Top-5 concentration: sum of top-5 weight_pct excluding SOLD_OUT
+        top5 = sorted(
+            (
+                w
+                for action, w in holdings
+                if w is not None and action != HoldingAction.SOLD_OUT.value
+            ),
+            reverse=True,
+        )[:5]
+        top5_concentration_pct = round(sum(top5), 1) if top5 else None
+
+        # Turnover: (new_positions + sold_out) / holdings_count * 100
+        turnover_pct = None
+        if filing.holdings_count > 0:
+            churned = sum(
+                1
+                for action, _ in holdings
+                if action
+                in (HoldingAction.NEW_POSITION.value, HoldingAction.SOLD_OUT.value)
+            )
+            turnover_pct = round(churned / filing.holdings_count * 100, 1)
 
-    # ticker → {company_name, sector, gurus (deduped), total_value, weight_pct_sum,
-    #           weight_pct_count, action_counts}
-    ticker_map: dict[str, dict] = {}
-    for holding, guru_display_name in rows:
-        t = holding.ticker
-        if t not in ticker_map:
-            ticker_map[t] = {
-                "company_name": holding.company_name,
-                "sector": holding.sector,
-                "gurus": [],
+        rows.append(
+            {
+                "guru_id": guru_id,
+                "filing_id": filing.id,
+                "report_date": filing.report_date,
+                "filing_date": filing.filing_date,
+                "total_value": filing.total_value,
+                "holdings_count": filing.holdings_count,
+                "filing_count": filing_counts[guru_id],
+                "top5_concentration_pct": top5_concentration_pct,
+                "turnover_pct": turnover_pct,
+            }
+        )
+    if rows:
+        session.exec(insert(GuruStat), params=rows)
+
+
+def _rebuild_scope_stats(session: Session, scope: str) -> None:
+    """以單次查詢載入 scope 內所有最新持倉，重建個股 / 動向 / 板塊彙總（不 commit）。"""
+    latest_ids = _latest_filing_ids_subquery(style=scope or None)
+    rows = session.exec(
+        select(GuruHolding, Guru.display_name, Guru.style, Guru.is_active)
+        .join(latest_ids, GuruHolding.filing_id == latest_ids.c.filing_id)
+        .join(Guru, GuruHolding.guru_id == Guru.id)
+        .order_by(GuruHolding.id)  # type: ignore[arg-type]
+    ).all()
+    _apply_scope_delta(session, scope, [], _to_contributions(rows), rebuild=True)
+
+
+def _apply_scope_delta(
+    session: Session,
+    scope: str,
+    removed: Sequence[_Contribution],
+    added: Sequence[_Contribution],
+    rebuild: bool = False,
+) -> None:
+    """
+    將持倉增減套用至 scope 的個股 / 動向 / 板塊彙總（不 commit）。
+    僅讀寫 removed / added 涉及的 ticker 與板塊；rebuild=True 時自空表開始累加。
+    removed / added 需依持倉 ID 排序，使大師清單順序與全量重算一致。
+    """
+    tickers = {row.ticker for row in (*removed, *added) if row.ticker is not None}
+    sectors = {row.sector for row in (*removed, *added) if row.sector is not None}
+
+    if rebuild:
+        for model in (GuruTickerStat, GuruActivityStat, GuruSectorStat):
+            session.exec(delete(model).where(model.scope == scope))
+        ticker_state: dict[str, dict] = {}
+        activity_state: dict[tuple[str, str], dict] = {}
+        sector_state: dict[str, dict] = {}
+    else:
+        ticker_state = _load_ticker_state(session, scope, tickers)
+        activity_state = _load_activity_state(session, scope, tickers)
+        sector_state = _load_sector_state(session, scope, sectors)
+        for model in (GuruTickerStat, GuruActivityStat):
+            session.exec(
+                delete(model).where(model.scope == scope, model.ticker.in_(tickers))  # type: ignore[union-attr]
+            )
+        session.exec(
+            delete(GuruSectorStat).where(
+                GuruSectorStat.scope == scope,
+                GuruSectorStat.sector.in_(sectors),  # type: ignore[union-attr]
+            )
+        )
+
+    _apply_ticker_delta(ticker_state, removed, added)
+    _apply_activity_delta(activity_state, removed, added)
+    _apply_sector_delta(sector_state, removed, added)
+
+    for model, stat_rows in (
+        (GuruTickerStat, _ticker_stat_rows(scope, ticker_state)),
+        (GuruActivityStat, _activity_stat_rows(scope, activity_state)),
+        (GuruSectorStat, _sector_stat_rows(scope, sector_state)),
+    ):
+        if stat_rows:
+            session.exec(insert(model), params=stat_rows)
+
+
+def _first_by_guru(
+    rows: Iterable[_Contribution], key: Callable[[_Contribution], tuple | None]
+) -> dict[tuple, _Contribution]:
+    """依 (彙總鍵, 大師名稱) 取每位大師的首筆持倉（代表該大師，順序即首見順序）。"""
+    firsts: dict[tuple, _Contribution] = {}
+    for row in rows:
+        k = key(row)
+        if k is not None:
+            firsts.setdefault((k, row.display_name), row)
+    return firsts
+
+
+def _load_ticker_state(
+    session: Session, scope: str, tickers: set[str]
+) -> dict[str, dict]:
+    if not tickers:
+        return {}
+    stats = session.exec(
+        select(GuruTickerStat).where(
+            GuruTickerStat.scope == scope,
+            GuruTickerStat.ticker.in_(tickers),  # type: ignore[union-attr]
+        )
+    ).all()
+    return {
+        stat.ticker: {
+            "company_name": stat.company_name,
+            "sector": stat.sector,
+            "guru_details": json.loads(stat.guru_details),
+            "total_value": stat.total_value,
+            "weight_sum": stat.weight_sum,
+            "weight_count": stat.weight_count,
+            "action_counts": json.loads(stat.action_counts),
+        }
+        for stat in stats
+    }
+
+
+def _apply_ticker_delta(
+    state: dict[str, dict],
+    removed: Sequence[_Contribution],
+    added: Sequence[_Contribution],
+) -> None:
+    """
+    個股彙總（排除清倉）：扣除 removed、加入 added。同一大師持有多個 CUSIP 時以首筆代表；
+    代表持倉不變（原地修改）者保留原本在大師清單中的位置，否則移至清單末端。
+    """
+    from domain.enums import HoldingAction
+
+    def _key(row: _Contribution) -> tuple | None:
+        if row.ticker is None or row.action == HoldingAction.SOLD_OUT.value:
+            return None
+        return (row.ticker,)
+
+    old_firsts = _first_by_guru(removed, _key)
+    new_firsts = _first_by_guru(added, _key)
+
+    for row in removed:
+        d = state.get(row.ticker) if _key(row) else None
+        if d is None:
+            continue
+        d["total_value"] -= row.value or 0.0
+        if row.weight_pct is not None:
+            d["weight_sum"] -= row.weight_pct
+            d["weight_count"] -= 1
+        ac = d["action_counts"]
+        ac[row.action] = ac.get(row.action, 0) - 1
+        if ac[row.action] <= 0:
+            del ac[row.action]
+    for ((ticker,), name), first in old_firsts.items():
+        d = state.get(ticker)
+        new_first = new_firsts.get(((ticker,), name))
+        if d is None or (new_first and new_first.holding_id == first.holding_id):
+            continue
+        d["guru_details"] = [g for g in d["guru_details"] if g["display_name"] != name]
+    for ticker in [t for t, d in state.items() if not d["action_counts"]]:
+        del state[ticker]
+
+    for row in added:
+        if _key(row) is None:
+            continue
+        d = state.setdefault(
+            row.ticker,
+            {
+                "company_name": row.company_name,
+                "sector": row.sector,
+                "guru_details": [],
                 "total_value": 0.0,
-                "weight_pct_sum": 0.0,
-                "weight_pct_count": 0,
+                "weight_sum": 0.0,
+                "weight_count": 0,
                 "action_counts": {},
-            }
-        if guru_display_name not in ticker_map[t]["gurus"]:
-            ticker_map[t]["gurus"].append(guru_display_name)
-        ticker_map[t]["total_value"] += holding.value or 0.0
-        if holding.weight_pct is not None:
-            ticker_map[t]["weight_pct_sum"] += holding.weight_pct
-            ticker_map[t]["weight_pct_count"] += 1
-        ac = ticker_map[t]["action_counts"]
-        ac[holding.action] = ac.get(holding.action, 0) + 1
-
-    grand_total = sum(d["total_value"] for d in ticker_map.values())
-
-    items = []
-    for t, d in ticker_map.items():
-        combined_weight_pct = (
-            d["total_value"] / grand_total * 100 if grand_total > 0 else 0
+            },
         )
-        avg_weight_pct = (
-            d["weight_pct_sum"] / d["weight_pct_count"]
-            if d["weight_pct_count"] > 0
-            else None
+        if d["sector"] is None:
+            d["sector"] = row.sector
+        d["total_value"] += row.value or 0.0
+        if row.weight_pct is not None:
+            d["weight_sum"] += row.weight_pct
+            d["weight_count"] += 1
+        ac = d["action_counts"]
+        ac[row.action] = ac.get(row.action, 0) + 1
+    for ((ticker,), name), first in new_firsts.items():
+        entry = {
+            "display_name": name,
+            "action": first.action,
+            "weight_pct": first.weight_pct,
+        }
+        details = state[ticker]["guru_details"]
+        index = next(
+            (i for i, g in enumerate(details) if g["display_name"] == name), None
         )
-        dominant_action = (
-            max(d["action_counts"], key=d["action_counts"].get)
-            if d["action_counts"]
-            else HoldingAction.UNCHANGED.value
+        if index is None:
+            details.append(entry)
+        else:
+            details[index] = entry
+
+
+def _ticker_stat_rows(scope: str, state: dict[str, dict]) -> list[dict]:
+    """
+    個股彙總列。動作計數依 HoldingAction 定義順序排列，主要動作同票時取先列者，
+    使增量更新與全量重算的結果不受持倉處理順序影響。
+    """
+    from domain.enums import HoldingAction
+
+    action_order = {action.value: i for i, action in enumerate(HoldingAction)}
+    result = []
+    for ticker, d in state.items():
+        action_counts = dict(
+            sorted(
+                d["action_counts"].items(),
+                key=lambda item: action_order.get(item[0], len(action_order)),
+            )
         )
-        items.append(
+        guru_weights = [
+            g["weight_pct"] for g in d["guru_details"] if g["weight_pct"] is not None
+        ]
+        result.append(
             {
-                "ticker": t,
+                "scope": scope,
+                "ticker": ticker,
                 "company_name": d["company_name"],
                 "sector": d["sector"],
-                "guru_count": len(d["gurus"]),
-                "gurus": d["gurus"],
+                "guru_count": len(d["guru_details"]),
+                "guru_details": json.dumps(d["guru_details"]),
                 "total_value": d["total_value"],
-                "avg_weight_pct": avg_weight_pct,
-                "combined_weight_pct": round(combined_weight_pct, 3),
-                "dominant_action": dominant_action,
-                "action_counts": dict(d["action_counts"]),
+                "consensus_avg_weight_pct": (
+                    sum(guru_weights) / len(guru_weights) if guru_weights else None
+                ),
+                "avg_weight_pct": (
+                    d["weight_sum"] / d["weight_count"] if d["weight_count"] else None
+                ),
+                "weight_sum": d["weight_sum"],
+                "weight_count": d["weight_count"],
+                "action_counts": json.dumps(action_counts),
+                "dominant_action": max(action_counts, key=action_counts.get),  # type: ignore[arg-type]
             }
         )
+    return result
 
-    items.sort(key=lambda x: x["combined_weight_pct"], reverse=True)
 
-    # Sector breakdown for the grand portfolio
-    sector_map: dict[str, float] = {}
-    for item in items:
-        sector = item["sector"] or "Unknown"
-        sector_map[sector] = sector_map.get(sector, 0) + item["total_value"]
-    sector_breakdown = [
+def _load_activity_state(
+    session: Session, scope: str, tickers: set[str]
+) -> dict[tuple[str, str], dict]:
+    if not tickers:
+        return {}
+    stats = session.exec(
+        select(GuruActivityStat).where(
+            GuruActivityStat.scope == scope,
+            GuruActivityStat.ticker.in_(tickers),  # type: ignore[union-attr]
+        )
+    ).all()
+    return {
+        (stat.side, stat.ticker): {
+            "company_name": stat.company_name,
+            "gurus": json.loads(stat.gurus),
+            "total_value": stat.total_value,
+        }
+        for stat in stats
+    }
+
+
+def _apply_activity_delta(
+    state: dict[tuple[str, str], dict],
+    removed: Sequence[_Contribution],
+    added: Sequence[_Contribution],
+) -> None:
+    """買方（新建倉 / 加碼）與賣方（清倉 / 減碼）動向：扣除 removed、加入 added。"""
+    from domain.enums import HoldingAction
+
+    sides = {
+        HoldingAction.NEW_POSITION.value: _ACTIVITY_BUY,
+        HoldingAction.INCREASED.value: _ACTIVITY_BUY,
+        HoldingAction.SOLD_OUT.value: _ACTIVITY_SELL,
+        HoldingAction.DECREASED.value: _ACTIVITY_SELL,
+    }
+
+    def _key(row: _Contribution) -> tuple | None:
+        side = sides.get(row.action)
+        if row.ticker is None or side is None:
+            return None
+        return (side, row.ticker)
+
+    old_firsts = _first_by_guru(removed, _key)
+    new_firsts = _first_by_guru(added, _key)
+
+    for row in removed:
+        key = _key(row)
+        if key is not None and key in state:
+            state[key]["total_value"] -= row.value
+    for (key, name), first in old_firsts.items():
+        d = state.get(key)
+        new_first = new_firsts.get((key, name))
+        if d is None or (new_first and new_first.holding_id == first.holding_id):
+            continue
+        if name in d["gurus"]:
+            d["gurus"].remove(name)
+    for key in [k for k, d in state.items() if not d["gurus"]]:
+        del state[key]
+
+    for row in added:
+        key = _key(row)
+        if key is None:
+            continue
+        d = state.setdefault(
+            key, {"company_name": row.company_name, "gurus": [], "total_value": 0.0}
+        )
+        if row.display_name not in d["gurus"]:
+            d["gurus"].append(row.display_name)
+        d["total_value"] += row.value
+
+
+def _activity_stat_rows(scope: str, state: dict[tuple[str, str], dict]) -> list[dict]:
+    return [
         {
-            "sector": s,
-            "total_value": v,
-            "holding_count": sum(1 for i in items if (i["sector"] or "Unknown") == s),
-            "weight_pct": round(v / grand_total * 100, 2) if grand_total > 0 else 0,
+            "scope": scope,
+            "side": side,
+            "ticker": ticker,
+            "company_name": d["company_name"],
+            "guru_count": len(d["gurus"]),
+            "gurus": json.dumps(d["gurus"]),
+            "total_value": d["total_value"],
         }
-        for s, v in sorted(sector_map.items(), key=lambda x: x[1], reverse=True)
+        for (side, ticker), d in state.items()
     ]
 
+
+def _load_sector_state(
+    session: Session, scope: str, sectors: set[str]
+) -> dict[str, dict]:
+    if not sectors:
+        return {}
+    stats = session.exec(
+        select(GuruSectorStat).where(
+            GuruSectorStat.scope == scope,
+            GuruSectorStat.sector.in_(sectors),  # type: ignore[union-attr]
+        )
+    ).all()
     return {
-        "items": items,
-        "total_value": grand_total,
-        "unique_tickers": len(items),
-        "sector_breakdown": sector_breakdown,
+        stat.sector: {"total_value": stat.total_value, "count": stat.holding_count}
+        for stat in stats
     }
 
 
+def _apply_sector_delta(
+    state: dict[str, dict],
+    removed: Sequence[_Contribution],
+    added: Sequence[_Contribution],
+) -> None:
+    """行業板塊彙總（僅含有 sector 的非清倉持倉）：扣除 removed、加入 added。"""
+    from domain.enums import HoldingAction
+
+    sold_out = HoldingAction.SOLD_OUT.value
+    for row in removed:
+        d = state.get(row.sector) if row.action != sold_out else None
+        if d is not None:
+            d["total_value"] -= row.value
+            d["count"] -= 1
+    for sector in [s for s, d in state.items() if d["count"] <= 0]:
+        del state[sector]
+    for row in added:
+        if row.sector is None or row.action == sold_out:
+            continue
+        d = state.setdefault(row.sector, {"total_value": 0.0, "count": 0})
+        d["total_value"] += row.value
+        d["count"] += 1
+
+
+def _sector_stat_rows(scope: str, state: dict[str, dict]) -> list[dict]:
+    return [
+        {
+            "scope": scope,
+            "sector": sector,
+            "total_value": d["total_value"],
+            "holding_count": d["count"],
+        }
+        for sector, d in state.items()
+    ]
+
+
 # ===========================================================================
 # Holding Repository
 # ===========================================================================
@@ -7,5 +7,7 @@ from infrastructure.external.sec_edgar import (  # noqa: F401
     fetch_13f_filing_detail,
     fetch_company_filings,
     get_latest_13f_filings,
+    get_static_cusip_map,
     map_cusip_to_ticker,
+    resolve_cusip,
 )
@@ -0,0 +1,283 @@
+"""
+Infrastructure — 主機共享快取層（跨 uvicorn worker）。
+
+以 diskcache（SQLite）作為同一主機上所有 worker 程序共用的儲存：
+- SharedCache：程序內 TTLCache（L1）＋ 共享層，clear() 以世代號使所有 worker 同時失效
+- 跨程序租約（lease）：acquire_lease / release_lease，以短效期寫入並由持有程序的心跳續約，
+  持有者崩潰或容器重啟時數秒內自動過期
+- host_single_flight：同一 key 在整台主機上只有一個程序實際執行計算
+- claim_host_task / complete_host_task：啟動任務（如快取預熱）每台主機只執行一次
+
+所有 diskcache 操作失敗皆非致命：讀取視為未命中，租約視為已取得（退化為單程序行為）。
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+import diskcache
+from cachetools import TTLCache
+
+from domain.constants import (
+    SHARED_CACHE_DIR,
+    SHARED_CACHE_SIZE_LIMIT,
+    SHARED_LEASE_HEARTBEAT_INTERVAL,
+    SHARED_LEASE_HEARTBEAT_TTL,
+    SHARED_LEASE_POLL_INTERVAL,
+    SHARED_LEASE_TTL,
+)
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+_LEASE_PREFIX = "lease"
+_DONE_PREFIX = "done"
+_GENERATION_PREFIX = "gen"
+
+_shared = diskcache.Cache(SHARED_CACHE_DIR, size_limit=SHARED_CACHE_SIZE_LIMIT)
+
+
+def clear_shared_cache() -> None:
+    """清除共享層所有項目（含租約與世代號）。"""
+    with contextlib.suppress(Exception):
+        _shared.clear()
+
+
+# ---------------------------------------------------------------------------
+# SharedCache：L1 + 主機共享層
+# ---------------------------------------------------------------------------
+
+
+class SharedCache:
+    """
+    兩層快取：程序內 TTLCache（L1）＋ 主機共享 diskcache。
+    L1 項目記錄寫入時的世代號；任一 worker 呼叫 clear() 遞增共享世代號後，
+    其他 worker 的 L1 與舊世代的共享項目即不再命中。
+    """
+
+    def __init__(self, namespace: str, maxsize: int, ttl: float) -> None:
+        self._namespace = namespace
+        self._ttl = ttl
+        self._local: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def _generation(self) -> int:
+        try:
+            return int(_shared.get(f"{_GENERATION_PREFIX}:{self._namespace}", 0))
+        except Exception:
+            return 0
+
+    def _shared_key(self, key: str, generation: int) -> str:
+        return f"{self._namespace}:{generation}:{key}"
+
+    def get(self, key: str) -> Any | None:
+        """依序查 L1、共享層；皆未命中回傳 None。"""
+        generation = self._generation()
+        with self._lock:
+            entry = self._local.get(key)
+        if entry is not None and entry[0] == generation:
+            return entry[1]
+
+        try:
+            value = _shared.get(self._shared_key(key, generation))
+        except Exception:
+            value = None
+        if value is not None:
+            with self._lock:
+                self._local[key] = (generation, value)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """寫入 L1 與共享層。共享層寫入失敗（如無法序列化）時靜默略過。"""
+        generation = self._generation()
+        with self._lock:
+            self._local[key] = (generation, value)
+        with contextlib.suppress(Exception):
+            _shared.set(self._shared_key(key, generation), value, expire=self._ttl)
+
+    def clear(self) -> None:
+        """清除本程序 L1，並遞增共享世代號使所有 worker 的快取失效。"""
+        with self._lock:
+            self._local.clear()
+        with contextlib.suppress(Exception):
+            _shared.incr(f"{_GENERATION_PREFIX}:{self._namespace}", default=0)
+
+
+# ---------------------------------------------------------------------------
+# 跨程序租約
+# ---------------------------------------------------------------------------
+
+
+def _lease_key(name: str) -> str:
+    return f"{_LEASE_PREFIX}:{name}"
+
+
+# 本程序持有中的租約：{key: (token, 持有上限的 monotonic 時間)}，由心跳執行緒續約
+_held_lock = threading.Lock()
+_held_leases: dict[str, tuple[str, float]] = {}
+_heartbeat_thread: threading.Thread | None = None
+
+
+def _heartbeat_expire(deadline: float) -> float:
+    return max(0.0, min(SHARED_LEASE_HEARTBEAT_TTL, deadline - time.monotonic()))
+
+
+def _renew_held_leases() -> None:
+    """續約本程序持有中的租約；已達持有上限或已非本程序持有者不再續約（任其過期）。"""
+    with _held_lock:
+        held = list(_held_leases.items())
+    for key, (token, deadline) in held:
+        renewed = False
+        expire = _heartbeat_expire(deadline)
+        if expire > 0:
+            with contextlib.suppress(Exception), _shared.transact():
+                if _shared.get(key) == token:
+                    renewed = _shared.touch(key, expire=expire)
+        if not renewed:
+            with _held_lock:
+                if _held_leases.get(key, (None,))[0] == token:
+                    del _held_leases[key]
+
+
+def _heartbeat_loop() -> None:
+    while True:
+        time.sleep(SHARED_LEASE_HEARTBEAT_INTERVAL)
+        _renew_held_leases()
+
+
+def _track_lease(key: str, token: str, deadline: float) -> None:
+    global _heartbeat_thread
+    with _held_lock:
+        _held_leases[key] = (token, deadline)
+        if _heartbeat_thread is None or not _heartbeat_thread.is_alive():
+            _heartbeat_thread = threading.Thread(
+                target=_heartbeat_loop, name="lease-heartbeat", daemon=True
+            )
+            _heartbeat_thread.start()
+
+
+def acquire_lease(name: str, ttl: float = SHARED_LEASE_TTL) -> str | None:
+    """
+    嘗試取得主機層級租約。成功回傳持有者 token，已被其他持有者佔用回傳 None。
+    diskcache.add 僅在 key 不存在時寫入，於 SQLite 交易內完成，跨程序為原子操作。
+    租約僅以心跳效期（SHARED_LEASE_HEARTBEAT_TTL）寫入，由本程序心跳續約至 ttl 上限；
+    持有程序崩潰或容器重啟後停止續約，其他程序至多等待一個心跳效期即可接手。
+    """
+    token = f"{os.getpid()}:{threading.get_ident()}:{time.monotonic_ns()}"
+    key = _lease_key(name)
+    deadline = time.monotonic() + ttl
+    try:
+        acquired = _shared.add(key, token, expire=_heartbeat_expire(deadline))
+    except Exception as exc:
+        logger.debug("共享租約 %s 取得失敗，退化為單程序執行：%s", name, exc)
+        return token
+    if not acquired:
+        return None
+    if ttl > SHARED_LEASE_HEARTBEAT_TTL:
+        _track_lease(key, token, deadline)
+    return token
+
+
+def release_lease(name: str, token: str) -> None:
+    """釋放租約；僅在仍由 token 持有時刪除（過期後被他人取得的租約不受影響）。"""
+    key = _lease_key(name)
+    with _held_lock:
+        if _held_leases.get(key, (None,))[0] == token:
+            del _held_leases[key]
+    with contextlib.suppress(Exception), _shared.transact():
+        if _shared.get(key) == token:
+            _shared.delete(key)
+
+
+def is_lease_held(name: str) -> bool:
+    """租約目前是否由任一程序持有（已過期視為未持有）。"""
+    try:
+        return _lease_key(name) in _shared
+    except Exception:
+        return False
+
+
+def wait_for_lease_release(name: str, timeout: float) -> bool:
+    """輪詢等待租約釋放或過期。於 timeout 內釋放回傳 True。"""
+    deadline = time.monotonic() + timeout
+    while is_lease_held(name):
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(SHARED_LEASE_POLL_INTERVAL)
+    return True
+
+
+def host_single_flight(
+    name: str,
+    compute: Callable[[], T],
+    peek: Callable[[], T | None],
+    ttl: float = SHARED_LEASE_TTL,
+) -> T:
+    """
+    跨程序 single-flight：取得租約的程序執行 compute（其結果應寫入共享層）；
+    其餘程序等待租約釋放後以 peek 讀取結果。
+    持有者失敗（peek 仍未命中）時重新競爭租約，由一個等待者接手計算；
+    等待逾時則自行計算，確保不會無限阻塞。
+    """
+    deadline = time.monotonic() + ttl
+    while True:
+        token = acquire_lease(name, ttl)
+        if token is not None:
+            try:
+                return compute()
+            finally:
+                release_lease(name, token)
+
+        logger.debug("共享租約 %s 由其他 worker 持有，等待結果...", name)
+        released = wait_for_lease_release(name, max(0.0, deadline - time.monotonic()))
+        result = peek()
+        if result is not None:
+            return result
+        if not released:
+            logger.debug("共享租約 %s 等待逾時，自行計算。", name)
+            return compute()
+
+
+# ---------------------------------------------------------------------------
+# 每台主機執行一次的啟動任務
+# ---------------------------------------------------------------------------
+
+
+def claim_host_task(name: str, lease_ttl: float) -> str | None:
+    """
+    認領主機層級任務。近期已完成（complete_host_task 標記未過期）或
+    正由其他 worker 執行中時回傳 None；否則回傳租約 token。
+    取得租約後再檢查一次完成標記：另一 worker 可能在首次檢查與取得租約之間
+    完成任務並釋放租約，此時釋放租約、不重複執行。
+    """
+    if _host_task_done(name):
+        return None
+    token = acquire_lease(name, lease_ttl)
+    if token is not None and _host_task_done(name):
+        release_lease(name, token)
+        return None
+    return token
+
+
+def _host_task_done(name: str) -> bool:
+    """任務的完成標記是否仍有效（共享層不可用時視為未完成）。"""
+    try:
+        return f"{_DONE_PREFIX}:{name}" in _shared
+    except Exception:
+        return False
+
+
+def complete_host_task(name: str, token: str, done_ttl: float) -> None:
+    """標記任務完成（done_ttl 內其他 worker 不再認領）並釋放租約。"""
+    with contextlib.suppress(Exception):
+        _shared.set(f"{_DONE_PREFIX}:{name}", os.getpid(), expire=done_ttl)
+    release_lease(name, token)
@@ -74,6 +74,10 @@ async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
     yield
     logger.info("Folio 後端關閉中...")
 
+    from infrastructure.external.sec_edgar import close_http_client
+
+    close_http_client()
+
 
 # ---------------------------------------------------------------------------
 # App Factory
@@ -4,6 +4,7 @@ from sqlmodel import Session
 
 from domain.entities import ScanLog, Stock
 from domain.enums import StockCategory
+from infrastructure.repositories import record_signal_transitions
 from tests.conftest import test_engine
 
 
@@ -14,14 +15,14 @@ def test_backtest_summary_route_should_return_200_with_response_shape(client) ->
     )
 
     with Session(test_engine) as session:
-        session.add(
-            ScanLog(
-                stock_ticker="AAPL",
-                signal="OVERSOLD",
-                market_status="BULLISH",
-                scanned_at=datetime(2026, 1, 2, tzinfo=UTC),
-            )
+        log = ScanLog(
+            stock_ticker="AAPL",
+            signal="OVERSOLD",
+            market_status="BULLISH",
+            scanned_at=datetime(2026, 1, 2, tzinfo=UTC),
         )
+        session.add(log)
+        record_signal_transitions(session, [log])
         session.commit()
 
     resp = client.get("/backtest/summary")
@@ -44,14 +45,14 @@ def test_backtest_signal_detail_route_should_return_200_for_existing_signal(
         stock = session.get(Stock, "MSFT")
         assert stock is not None
         stock.category = StockCategory.GROWTH
-        session.add(
-            ScanLog(
-                stock_ticker="MSFT",
-                signal="OVERHEATED",
-                market_status="BULLISH",
-                scanned_at=datetime(2026, 1, 2, tzinfo=UTC),
-            )
+        log = ScanLog(
+            stock_ticker="MSFT",
+            signal="OVERHEATED",
+            market_status="BULLISH",
+            scanned_at=datetime(2026, 1, 2, tzinfo=UTC),
         )
+        session.add(log)
+        record_signal_transitions(session, [log])
         session.commit()
 
     resp = client.get("/backtest/signal/OVERHEATED")
@@ -273,6 +273,18 @@ class TestSyncAll:
         assert body["skipped"] == 1
         assert body["errors"] == 0
 
+    def test_sync_status_should_return_progress_shape(self, client):
+        resp = client.get("/gurus/sync-status")
+
+        assert resp.status_code == 200
+        assert set(resp.json()) == {
+            "is_syncing",
+            "total_gurus",
+            "completed_gurus",
+            "total_filings",
+            "completed_filings",
+        }
+
 
 # ===========================================================================
 # POST /gurus/{guru_id}/sync
@@ -1,6 +1,7 @@
 """Tests for scan routes (GET /scan/last, GET /scan/status)."""
 
 from datetime import UTC, datetime
+from unittest.mock import patch
 
 from sqlmodel import Session
 
@@ -209,3 +210,74 @@ class TestGetScanStatus:
             assert data["is_running"] is True
         finally:
             _scan_lock.release()
+
+
+class TestCompactScanLogs:
+    """Tests for POST /scan/compact-logs — ScanLog retention policy."""
+
+    def test_compact_logs_should_return_summary(self, client):
+        # Act
+        resp = client.post("/scan/compact-logs?retention_days=30")
+
+        # Assert
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["retention_days"] == 30
+        assert data["deleted"] == 0
+        assert data["seeded_transitions"] == 0
+        assert "cutoff" in data
+
+    def test_compact_logs_should_reject_too_short_retention(self, client):
+        # Act
+        resp = client.post("/scan/compact-logs?retention_days=1")
+
+        # Assert
+        assert resp.status_code == 422
+
+    def test_compact_logs_should_return_409_when_scan_running(self, client):
+        from api.routes.scan_routes import _scan_lock
+
+        # Arrange
+        _scan_lock.acquire()
+        try:
+            # Act
+            resp = client.post("/scan/compact-logs")
+
+            # Assert
+            assert resp.status_code == 409
+        finally:
+            _scan_lock.release()
+
+
+class TestGetMarketBreadth:
+    """Tests for GET /market/breadth — daily breadth history of trend setters."""
+
+    def test_market_breadth_should_pass_non_etf_trend_setters(self, client):
+        # Arrange
+        client.post(
+            "/ticker",
+            json={"ticker": "AAPL", "category": "Trend_Setter", "thesis": "Leader"},
+        )
+        point = {
+            "date": "2025-06-13",
+            "below": 0,
+            "valid": 1,
+            "below_60ma_pct": 0.0,
+            "status": "STRONG_BULLISH",
+        }
+
+        # Act
+        with patch(
+            "application.scan.scan_service.get_market_breadth_history",
+            return_value=[point],
+        ) as mock_history:
+            resp = client.get("/market/breadth?days=30")
+
+        # Assert
+        assert resp.status_code == 200
+        assert resp.json() == {"history": [point]}
+        mock_history.assert_called_once_with(["AAPL"], days=30)
+
+    def test_market_breadth_should_reject_out_of_range_days(self, client):
+        resp = client.get("/market/breadth?days=0")
+        assert resp.status_code == 422
@@ -7,6 +7,7 @@ from application.scan.backfill_service import backfill_scan_logs, get_backfill_s
 from domain.constants import BACKFILL_MARKET_STATUS
 from domain.entities import ScanLog, Stock
 from domain.enums import StockCategory
+from infrastructure import repositories as repo
 
 
 def _seed_stock(db_session, ticker: str, category: StockCategory) -> None:
@@ -120,3 +121,40 @@ def test_backfill_scan_logs_should_resume_only_missing_tickers(db_session) -> No
     assert inserted == 1
     mocked_download.assert_called_once()
     assert mocked_download.call_args.kwargs["tickers"] == ["MSFT"]
+
+
+def test_backfill_scan_logs_should_keep_batches_before_failed_batch(db_session) -> None:
+    _seed_stock(db_session, "AAPL", StockCategory.GROWTH)
+    _seed_stock(db_session, "MSFT", StockCategory.GROWTH)
+
+    mock_prices = [{"date": "2025-01-01", "close": 100.0}] * 220
+    mock_events = [(date(2025, 5, 1), "OVERSOLD")]
+    original_record = repo.record_signal_transitions
+
+    def _fail_for_msft(session, logs):
+        if any(log.stock_ticker == "MSFT" for log in logs):
+            raise RuntimeError("database is locked")
+        return original_record(session, logs)
+
+    with (
+        patch("application.scan.backfill_service.BACKFILL_COMMIT_TICKERS", 1),
+        patch(
+            "application.scan.backfill_service.batch_download_history_extended",
+            return_value={"AAPL": mock_prices, "MSFT": mock_prices},
+        ),
+        patch(
+            "application.scan.backfill_service.replay_historical_signals",
+            return_value=mock_events,
+        ),
+        patch.object(repo, "record_signal_transitions", side_effect=_fail_for_msft),
+    ):
+        inserted = backfill_scan_logs(db_session)
+
+    # Only the committed AAPL batch counts; the rolled-back MSFT rows are gone
+    assert inserted == 1
+    rows = db_session.exec(
+        select(ScanLog.stock_ticker).where(
+            ScanLog.market_status == BACKFILL_MARKET_STATUS
+        )
+    ).all()
+    assert rows == ["AAPL"]
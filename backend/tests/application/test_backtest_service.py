@@ -9,6 +9,7 @@ from application.scan.backtest_service import (
 )
 from domain.entities import ScanLog, Stock
 from domain.enums import StockCategory
+from infrastructure.repositories import record_signal_transitions
 
 
 def _seed_stock(db_session, ticker: str) -> None:
@@ -18,11 +19,18 @@ def _seed_stock(db_session, ticker: str) -> None:
     db_session.commit()
 
 
+def _record_scan_logs(db_session, *logs: ScanLog) -> None:
+    """寫入掃描紀錄並維護訊號區段（與 run_scan 相同路徑；回測僅讀取區段）。"""
+    db_session.add_all(logs)
+    record_signal_transitions(db_session, list(logs))
+
+
 def test_get_backtest_summary_should_aggregate_and_deduplicate(db_session) -> None:
     _seed_stock(db_session, "AAPL")
 
-    db_session.add_all(
-        [
+    _record_scan_logs(
+        db_session,
+        *[
             ScanLog(
                 stock_ticker="AAPL",
                 signal="OVERSOLD",
@@ -35,7 +43,7 @@ def test_get_backtest_summary_should_aggregate_and_deduplicate(db_session) -> No
                 market_status="BULLISH",
                 scanned_at=datetime(2026, 1, 3, tzinfo=UTC),
             ),
-        ]
+        ],
     )
     db_session.commit()
 
@@ -63,13 +71,14 @@ def test_get_backtest_summary_should_aggregate_and_deduplicate(db_session) -> No
 
 def test_get_backtest_summary_should_use_cache_until_invalidated(db_session) -> None:
     _seed_stock(db_session, "MSFT")
-    db_session.add(
+    _record_scan_logs(
+        db_session,
         ScanLog(
             stock_ticker="MSFT",
             signal="CAUTION_HIGH",
             market_status="BEARISH",
             scanned_at=datetime(2026, 1, 2, tzinfo=UTC),
-        )
+        ),
     )
     db_session.commit()
 
@@ -100,13 +109,14 @@ def test_get_backtest_summary_should_use_cache_until_invalidated(db_session) ->
 
 def test_get_backtest_detail_should_return_occurrences_for_signal(db_session) -> None:
     _seed_stock(db_session, "NVDA")
-    db_session.add(
+    _record_scan_logs(
+        db_session,
         ScanLog(
             stock_ticker="NVDA",
             signal="OVERHEATED",
             market_status="BULLISH",
             scanned_at=datetime(2026, 1, 2, tzinfo=UTC),
-        )
+        ),
     )
     db_session.commit()
 
@@ -132,8 +142,9 @@ def test_get_backtest_detail_should_return_occurrences_for_signal(db_session) ->
 def test_get_backtest_all_occurrences_should_flatten_all_signals(db_session) -> None:
     _seed_stock(db_session, "AAPL")
     _seed_stock(db_session, "MSFT")
-    db_session.add_all(
-        [
+    _record_scan_logs(
+        db_session,
+        *[
             ScanLog(
                 stock_ticker="AAPL",
                 signal="OVERSOLD",
@@ -146,7 +157,7 @@ def test_get_backtest_all_occurrences_should_flatten_all_signals(db_session) ->
                 market_status="BEARISH",
                 scanned_at=datetime(2026, 1, 3, tzinfo=UTC),
             ),
-        ]
+        ],
     )
     db_session.commit()
 
@@ -18,6 +18,13 @@ from domain.enums import StockCategory
 REBALANCE_MODULE = "application.portfolio.rebalance_service"
 
 
+@pytest.fixture(autouse=True)
+def _mock_prime_forex_history():
+    """匯率歷史批次預熱不得觸發實際下載。"""
+    with patch(f"{REBALANCE_MODULE}.prime_forex_history_batch", return_value=0):
+        yield
+
+
 def _make_holding(
     session: Session,
     ticker: str = "AAPL",
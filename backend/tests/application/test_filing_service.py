@@ -253,7 +253,9 @@ class TestSyncGuruFiling:
     @patch(
         f"{FILING_MODULE}.get_latest_13f_filings", return_value=_SAMPLE_EDGAR_FILINGS
     )
-    @patch(f"{FILING_MODULE}.map_cusip_to_ticker", side_effect=lambda c, n: None)
+    @patch(
+        f"{FILING_MODULE}.resolve_cusip", side_effect=lambda c, n: (None, "unresolved")
+    )
     def test_sync_should_return_synced_status(
         self, _mock_cusip, _mock_get, _mock_detail, db_session: Session
     ):
@@ -277,7 +279,9 @@ class TestSyncGuruFiling:
     @patch(
         f"{FILING_MODULE}.get_latest_13f_filings", return_value=_SAMPLE_EDGAR_FILINGS
     )
-    @patch(f"{FILING_MODULE}.map_cusip_to_ticker", side_effect=lambda c, n: None)
+    @patch(
+        f"{FILING_MODULE}.resolve_cusip", side_effect=lambda c, n: (None, "unresolved")
+    )
     def test_sync_should_persist_filing_to_db(
         self, _mock_cusip, _mock_get, _mock_detail, db_session: Session
     ):
@@ -299,7 +303,9 @@ class TestSyncGuruFiling:
     @patch(
         f"{FILING_MODULE}.get_latest_13f_filings", return_value=_SAMPLE_EDGAR_FILINGS
     )
-    @patch(f"{FILING_MODULE}.map_cusip_to_ticker", side_effect=lambda c, n: None)
+    @patch(
+        f"{FILING_MODULE}.resolve_cusip", side_effect=lambda c, n: (None, "unresolved")
+    )
     def test_sync_should_persist_holdings_to_db(
         self, _mock_cusip, _mock_get, _mock_detail, db_session: Session
     ):
@@ -318,7 +324,9 @@ class TestSyncGuruFiling:
     @patch(
         f"{FILING_MODULE}.get_latest_13f_filings", return_value=_SAMPLE_EDGAR_FILINGS
     )
-    @patch(f"{FILING_MODULE}.map_cusip_to_ticker", side_effect=lambda c, n: None)
+    @patch(
+        f"{FILING_MODULE}.resolve_cusip", side_effect=lambda c, n: (None, "unresolved")
+    )
     def test_sync_should_return_skipped_when_already_synced(
         self, _mock_cusip, _mock_get, db_session: Session
     ):
@@ -381,7 +389,9 @@ class TestSyncGuruFiling:
     @patch(
         f"{FILING_MODULE}.get_latest_13f_filings", return_value=_SAMPLE_EDGAR_FILINGS
     )
-    @patch(f"{FILING_MODULE}.map_cusip_to_ticker", side_effect=lambda c, n: None)
+    @patch(
+        f"{FILING_MODULE}.resolve_cusip", side_effect=lambda c, n: (None, "unresolved")
+    )
     def test_sync_should_be_idempotent(
         self, _mock_cusip, _mock_get, _mock_detail, db_session: Session
     ):
@@ -431,7 +441,9 @@ class TestSyncHoldingDiff:
         )
         return prev_filing
 
-    @patch(f"{FILING_MODULE}.map_cusip_to_ticker", side_effect=lambda c, n: None)
+    @patch(
+        f"{FILING_MODULE}.resolve_cusip", side_effect=lambda c, n: (None, "unresolved")
+    )
     @patch(
         f"{FILING_MODULE}.get_latest_13f_filings", return_value=_SAMPLE_EDGAR_FILINGS
     )
@@ -463,7 +475,9 @@ class TestSyncHoldingDiff:
         assert holdings[0].action == HoldingAction.NEW_POSITION.value
         assert holdings[0].change_pct is None
 
-    @patch(f"{FILING_MODULE}.map_cusip_to_ticker", side_effect=lambda c, n: None)
+    @patch(
+        f"{FILING_MODULE}.resolve_cusip", side_effect=lambda c, n: (None, "unresolved")
+    )
     @patch(
         f"{FILING_MODULE}.get_latest_13f_filings", return_value=_SAMPLE_EDGAR_FILINGS
     )
@@ -494,7 +508,9 @@ class TestSyncHoldingDiff:
         holdings = find_holdings_by_filing(db_session, latest.id)
         assert holdings[0].action == HoldingAction.SOLD_OUT.value
 
-    @patch(f"{FILING_MODULE}.map_cusip_to_ticker", side_effect=lambda c, n: None)
+    @patch(
+        f"{FILING_MODULE}.resolve_cusip", side_effect=lambda c, n: (None, "unresolved")
+    )
     @patch(
         f"{FILING_MODULE}.get_latest_13f_filings", return_value=_SAMPLE_EDGAR_FILINGS
     )
@@ -526,7 +542,9 @@ class TestSyncHoldingDiff:
         assert holdings[0].action == HoldingAction.INCREASED.value
         assert holdings[0].change_pct == pytest.approx(50.0)
 
-    @patch(f"{FILING_MODULE}.map_cusip_to_ticker", side_effect=lambda c, n: None)
+    @patch(
+        f"{FILING_MODULE}.resolve_cusip", side_effect=lambda c, n: (None, "unresolved")
+    )
     @patch(
         f"{FILING_MODULE}.get_latest_13f_filings", return_value=_SAMPLE_EDGAR_FILINGS
     )
@@ -558,7 +576,9 @@ class TestSyncHoldingDiff:
         assert holdings[0].action == HoldingAction.DECREASED.value
         assert holdings[0].change_pct == pytest.approx(-50.0)
 
-    @patch(f"{FILING_MODULE}.map_cusip_to_ticker", side_effect=lambda c, n: None)
+    @patch(
+        f"{FILING_MODULE}.resolve_cusip", side_effect=lambda c, n: (None, "unresolved")
+    )
     @patch(
         f"{FILING_MODULE}.get_latest_13f_filings", return_value=_SAMPLE_EDGAR_FILINGS
     )
@@ -595,7 +615,9 @@ class TestSyncHoldingDiff:
         assert sold[0].shares == 0.0
         assert sold[0].change_pct == pytest.approx(-100.0)
 
-    @patch(f"{FILING_MODULE}.map_cusip_to_ticker", side_effect=lambda c, n: None)
+    @patch(
+        f"{FILING_MODULE}.resolve_cusip", side_effect=lambda c, n: (None, "unresolved")
+    )
     @patch(
         f"{FILING_MODULE}.get_latest_13f_filings", return_value=_SAMPLE_EDGAR_FILINGS
     )
@@ -641,7 +663,9 @@ class TestSyncWeightAndTopHoldings:
     @patch(
         f"{FILING_MODULE}.get_latest_13f_filings", return_value=_SAMPLE_EDGAR_FILINGS
     )
-    @patch(f"{FILING_MODULE}.map_cusip_to_ticker", side_effect=lambda c, n: None)
+    @patch(
+        f"{FILING_MODULE}.resolve_cusip", side_effect=lambda c, n: (None, "unresolved")
+    )
     def test_weight_pct_should_sum_to_100(
         self, _mock_cusip, _mock_get, _mock_detail, db_session: Session
     ):
@@ -658,7 +682,9 @@ class TestSyncWeightAndTopHoldings:
         total_weight = sum(h.weight_pct or 0 for h in holdings)
         assert abs(total_weight - 100.0) < 0.1
 
-    @patch(f"{FILING_MODULE}.map_cusip_to_ticker", side_effect=lambda c, n: None)
+    @patch(
+        f"{FILING_MODULE}.resolve_cusip", side_effect=lambda c, n: (None, "unresolved")
+    )
     @patch(
         f"{FILING_MODULE}.get_latest_13f_filings", return_value=_SAMPLE_EDGAR_FILINGS
     )
@@ -685,7 +711,9 @@ class TestSyncWeightAndTopHoldings:
 
         assert len(result["top_holdings"]) == GURU_TOP_HOLDINGS_COUNT
 
-    @patch(f"{FILING_MODULE}.map_cusip_to_ticker", side_effect=lambda c, n: None)
+    @patch(
+        f"{FILING_MODULE}.resolve_cusip", side_effect=lambda c, n: (None, "unresolved")
+    )
     @patch(
         f"{FILING_MODULE}.get_latest_13f_filings", return_value=_SAMPLE_EDGAR_FILINGS
     )
@@ -731,7 +759,9 @@ class TestSyncAllGurus:
     @patch(
         f"{FILING_MODULE}.get_latest_13f_filings", return_value=_SAMPLE_EDGAR_FILINGS
     )
-    @patch(f"{FILING_MODULE}.map_cusip_to_ticker", side_effect=lambda c, n: None)
+    @patch(
+        f"{FILING_MODULE}.resolve_cusip", side_effect=lambda c, n: (None, "unresolved")
+    )
     def test_sync_all_should_return_result_for_each_active_guru(
         self, _mock_cusip, _mock_get, _mock_detail, db_session: Session
     ):
@@ -961,7 +991,9 @@ class TestBackfillGuruFilings:
         f"{FILING_MODULE}.get_latest_13f_filings",
         return_value=_BACKFILL_EDGAR_FILINGS,
     )
-    @patch(f"{FILING_MODULE}.map_cusip_to_ticker", side_effect=lambda c, n: None)
+    @patch(
+        f"{FILING_MODULE}.resolve_cusip", side_effect=lambda c, n: (None, "unresolved")
+    )
     def test_backfill_should_sync_all_in_window_filings(
         self, _mock_cusip, _mock_get, _mock_detail, db_session: Session
     ):
@@ -986,7 +1018,9 @@ class TestBackfillGuruFilings:
         f"{FILING_MODULE}.get_latest_13f_filings",
         return_value=_BACKFILL_EDGAR_FILINGS,
     )
-    @patch(f"{FILING_MODULE}.map_cusip_to_ticker", side_effect=lambda c, n: None)
+    @patch(
+        f"{FILING_MODULE}.resolve_cusip", side_effect=lambda c, n: (None, "unresolved")
+    )
     def test_backfill_should_be_idempotent(
         self, _mock_cusip, _mock_get, _mock_detail, db_session: Session
     ):
@@ -1011,7 +1045,9 @@ class TestBackfillGuruFilings:
         f"{FILING_MODULE}.get_latest_13f_filings",
         return_value=_BACKFILL_EDGAR_FILINGS,
     )
-    @patch(f"{FILING_MODULE}.map_cusip_to_ticker", side_effect=lambda c, n: None)
+    @patch(
+        f"{FILING_MODULE}.resolve_cusip", side_effect=lambda c, n: (None, "unresolved")
+    )
     def test_backfill_should_persist_all_filings_to_db(
         self, _mock_cusip, _mock_get, _mock_detail, db_session: Session
     ):
@@ -1030,7 +1066,9 @@ class TestBackfillGuruFilings:
         f"{FILING_MODULE}.get_latest_13f_filings",
         return_value=_BACKFILL_EDGAR_FILINGS,
     )
-    @patch(f"{FILING_MODULE}.map_cusip_to_ticker", side_effect=lambda c, n: None)
+    @patch(
+        f"{FILING_MODULE}.resolve_cusip", side_effect=lambda c, n: (None, "unresolved")
+    )
     def test_backfill_should_filter_out_filings_outside_window(
         self, _mock_cusip, _mock_get, db_session: Session
     ):
@@ -1076,7 +1114,9 @@ class TestBackfillGuruFilings:
         f"{FILING_MODULE}.get_latest_13f_filings",
         return_value=_BACKFILL_EDGAR_FILINGS,
     )
-    @patch(f"{FILING_MODULE}.map_cusip_to_ticker", side_effect=lambda c, n: None)
+    @patch(
+        f"{FILING_MODULE}.resolve_cusip", side_effect=lambda c, n: (None, "unresolved")
+    )
     def test_backfill_should_continue_after_single_filing_error(
         self, _mock_cusip, _mock_get, _mock_detail, db_session: Session
     ):
@@ -1104,6 +1144,175 @@ class TestBackfillGuruFilings:
         assert result["total_filings"] == 3
 
 
+class TestGuruFilingScheduler:
+    """Parallel EDGAR downloads with an ordered per-guru apply chain."""
+
+    @staticmethod
+    def _filings_for(cik: str, count: int = 20) -> list[dict]:
+        return [
+            {**f, "accession_number": f"{cik}-{f['accession_number']}"}
+            for f in _BACKFILL_EDGAR_FILINGS
+        ]
+
+    @patch(f"{FILING_MODULE}.fetch_13f_filing_detail")
+    @patch(f"{FILING_MODULE}.get_latest_13f_filings")
+    @patch(
+        f"{FILING_MODULE}.resolve_cusip", side_effect=lambda c, n: (None, "unresolved")
+    )
+    def test_backfill_all_should_apply_each_guru_oldest_first(
+        self, _mock_cusip, mock_get, mock_detail, db_session: Session
+    ):
+        import time
+
+        from application.stock import filing_service
+        from application.stock.filing_service import (
+            backfill_all_gurus,
+            get_guru_sync_status,
+        )
+
+        mock_get.side_effect = self._filings_for
+
+        def detail_side_effect(accession, cik):
+            # 最舊一季最後才下載完成，套用順序仍須舊→新
+            if accession.endswith("24-000006"):
+                time.sleep(0.05)
+            return _SAMPLE_RAW_HOLDINGS
+
+        mock_detail.side_effect = detail_side_effect
+        gurus = [
+            _make_guru(db_session, cik="0005000001"),
+            _make_guru(db_session, cik="0005000002"),
+        ]
+
+        with patch(
+            f"{FILING_MODULE}._apply_filing", wraps=filing_service._apply_filing
+        ) as mock_apply:
+            results = backfill_all_gurus(db_session, years=5, _today=_BACKFILL_TODAY)
+
+        assert [r["synced"] for r in results] == [3, 3]
+        for guru in gurus:
+            applied = [
+                c.args[2]["report_date"]
+                for c in mock_apply.call_args_list
+                if c.args[1].id == guru.id
+            ]
+            assert applied == ["2024-06-30", "2024-09-30", "2024-12-31"]
+        assert get_guru_sync_status() == {
+            "is_syncing": False,
+            "total_gurus": 2,
+            "completed_gurus": 2,
+            "total_filings": 6,
+            "completed_filings": 6,
+        }
+
+    @patch(f"{FILING_MODULE}.fetch_13f_filing_detail")
+    @patch(f"{FILING_MODULE}.get_latest_13f_filings")
+    @patch(
+        f"{FILING_MODULE}.resolve_cusip", side_effect=lambda c, n: (None, "unresolved")
+    )
+    def test_sync_all_should_isolate_edgar_failure_to_one_guru(
+        self, _mock_cusip, mock_get, mock_detail, db_session: Session
+    ):
+        from application.stock.filing_service import sync_all_gurus
+
+        def get_side_effect(cik, count):
+            if cik == "0005000004":
+                raise RuntimeError("EDGAR down")
+            return self._filings_for(cik)
+
+        mock_get.side_effect = get_side_effect
+        mock_detail.return_value = _SAMPLE_RAW_HOLDINGS
+        ok = _make_guru(db_session, cik="0005000003")
+        failed = _make_guru(db_session, cik="0005000004")
+
+        results = sync_all_gurus(db_session)
+
+        assert [(r["guru_id"], r["status"]) for r in results] == [
+            (ok.id, "synced"),
+            (failed.id, "error"),
+        ]
+        assert results[1]["error"] == "EDGAR down"
+        mock_detail.assert_called_once()
+
+    @staticmethod
+    def _ready_job(guru: Guru):
+        from concurrent.futures import Future
+
+        from application.stock.filing_service import _GuruFilingJob
+
+        job = _GuruFilingJob(guru=guru, known_accessions=set(), planned=True)
+        job.result = {"total_filings": 3, "synced": 0, "skipped": 0, "errors": 0}
+        for edgar in reversed(TestGuruFilingScheduler._filings_for(guru.cik)):
+            detail: Future = Future()
+            detail.set_result(_SAMPLE_RAW_HOLDINGS)
+            job.queue.append((edgar, detail))
+        return job
+
+    @patch(f"{FILING_MODULE}.GURU_FILING_COMMIT_BATCH", 2)
+    @patch(
+        f"{FILING_MODULE}.resolve_cusip", side_effect=lambda c, n: (None, "unresolved")
+    )
+    def test_drain_should_commit_once_per_filing_batch(
+        self, _mock_cusip, db_session: Session
+    ):
+        from application.stock.filing_service import _drain_guru_job
+        from infrastructure.repositories import defer_guru_analytics_refresh
+
+        guru = _make_guru(db_session, cik="0005000005")
+        job = self._ready_job(guru)
+
+        with (
+            defer_guru_analytics_refresh(db_session),
+            patch.object(db_session, "commit", wraps=db_session.commit) as commit,
+        ):
+            _drain_guru_job(db_session, job, "backfill")
+
+        # 3 筆申報、每批 2 筆 → 2 次 commit（而非每筆申報各 commit 兩次以上）
+        assert commit.call_count == 2
+        assert job.result["synced"] == 3
+        assert job.completed
+        for edgar in self._filings_for(guru.cik):
+            assert find_filing_by_accession(db_session, edgar["accession_number"])
+
+    @patch(f"{FILING_MODULE}.GURU_FILING_COMMIT_BATCH", 2)
+    @patch(
+        f"{FILING_MODULE}.resolve_cusip", side_effect=lambda c, n: (None, "unresolved")
+    )
+    def test_drain_should_roll_back_uncommitted_batch_on_write_failure(
+        self, _mock_cusip, db_session: Session
+    ):
+        from application.stock import filing_service
+        from application.stock.filing_service import _drain_guru_job
+        from infrastructure.repositories import defer_guru_analytics_refresh
+
+        guru = _make_guru(db_session, cik="0005000006")
+        job = self._ready_job(guru)
+        calls = 0
+
+        def save_side_effect(*args, **kwargs):
+            nonlocal calls
+            calls += 1
+            if calls == 2:
+                raise RuntimeError("disk full")
+            return save_holdings_batch(*args, **kwargs)
+
+        with (
+            defer_guru_analytics_refresh(db_session),
+            patch.object(
+                filing_service, "save_holdings_batch", side_effect=save_side_effect
+            ),
+        ):
+            _drain_guru_job(db_session, job, "backfill")
+
+        # 第 1 筆尚未 commit 即隨第 2 筆失敗 rollback；第 3 筆照常寫入
+        assert job.result["synced"] == 1
+        assert job.result["errors"] == 2
+        accessions = [f["accession_number"] for f in self._filings_for(guru.cik)]
+        assert find_filing_by_accession(db_session, accessions[0]) is not None
+        assert find_filing_by_accession(db_session, accessions[1]) is None
+        assert find_filing_by_accession(db_session, accessions[2]) is None
+
+
 # ===========================================================================
 # filing_service — get_top_holdings tests
 # ===========================================================================
@@ -1288,6 +1497,116 @@ class TestGetDashboardSummary:
         assert "DASH_TICKER" in bought_tickers
 
 
+class TestSyncSectorResolution:
+    """Sectors resolve in bulk during sync; misses are filled in the background."""
+
+    @patch(f"{FILING_MODULE}._schedule_sector_fill")
+    @patch(
+        f"{FILING_MODULE}.get_ticker_sectors_bulk",
+        return_value={"AAPL": "Technology", "BAC": None},
+    )
+    @patch(
+        f"{FILING_MODULE}.fetch_13f_filing_detail", return_value=_SAMPLE_RAW_HOLDINGS
+    )
+    @patch(
+        f"{FILING_MODULE}.get_latest_13f_filings", return_value=_SAMPLE_EDGAR_FILINGS
+    )
+    def test_sync_should_not_block_on_unknown_sectors(
+        self, _mock_get, _mock_detail, _mock_bulk, mock_schedule, db_session: Session
+    ):
+        from application.stock.filing_service import sync_guru_filing
+
+        guru = _make_guru(db_session)
+        sync_guru_filing(db_session, guru.id)
+
+        latest = find_latest_filing_by_guru(db_session, guru.id)
+        sectors = {
+            h.ticker: h.sector for h in find_holdings_by_filing(db_session, latest.id)
+        }
+        assert sectors == {"AAPL": "Technology", "AXP": None, "BAC": None}
+        mock_schedule.assert_called_once_with({"AXP"})
+
+    @patch(f"{FILING_MODULE}.prewarm_ticker_sector_batch")
+    @patch(
+        f"{FILING_MODULE}.get_ticker_sectors_bulk",
+        return_value={"AXP": "Financial Services", "BAC": None},
+    )
+    def test_fill_pending_should_backfill_holdings(
+        self, _mock_bulk, mock_prewarm, db_session: Session
+    ):
+        from application.stock.filing_service import fill_pending_holding_sectors
+
+        guru = _make_guru(db_session)
+        filing = save_filing(
+            db_session,
+            GuruFiling(
+                guru_id=guru.id,
+                accession_number="SECTOR-FILL-001",
+                report_date="2024-12-31",
+                filing_date="2025-02-14",
+            ),
+        )
+        save_holdings_batch(
+            db_session,
+            [
+                GuruHolding(
+                    filing_id=filing.id,
+                    guru_id=guru.id,
+                    cusip=cusip,
+                    ticker=ticker,
+                    company_name=ticker,
+                    value=1.0,
+                    shares=1.0,
+                    action=HoldingAction.NEW_POSITION.value,
+                )
+                for cusip, ticker in (("025816109", "AXP"), ("808513105", "BAC"))
+            ],
+        )
+
+        assert fill_pending_holding_sectors(db_session, {"AXP", "BAC"}) == {guru.id}
+        mock_prewarm.assert_called_once_with(["AXP", "BAC"])
+        sectors = {
+            h.ticker: h.sector for h in find_holdings_by_filing(db_session, filing.id)
+        }
+        assert sectors == {"AXP": "Financial Services", "BAC": None}
+
+
+class TestResolveManyCusips:
+    """Batch CUSIP resolution backed by the persistent CUSIP index."""
+
+    def test_should_resolve_once_and_reuse_index(self, db_session: Session):
+        from application.stock.filing_service import resolve_many_cusips
+
+        companies = {"RMC000001": "MICROSOFT CORP", "RMC000002": "OBSCURE CO"}
+        first = resolve_many_cusips(db_session, companies)
+
+        with patch(f"{FILING_MODULE}.resolve_cusip") as mock_resolve:
+            second = resolve_many_cusips(db_session, companies)
+            mock_resolve.assert_not_called()
+
+        assert first == second == {"RMC000001": "MSFT", "RMC000002": None}
+
+    def test_sold_out_without_name_should_use_indexed_ticker(self, db_session: Session):
+        from application.stock.filing_service import resolve_many_cusips
+
+        resolve_many_cusips(db_session, {"RMC000003": "NVIDIA CORP"})
+
+        assert resolve_many_cusips(db_session, {"RMC000003": ""}) == {
+            "RMC000003": "NVDA"
+        }
+
+    def test_unresolved_entry_should_retry_with_new_company_name(
+        self, db_session: Session
+    ):
+        from application.stock.filing_service import resolve_many_cusips
+
+        resolve_many_cusips(db_session, {"RMC000004": "UNKNOWN HOLDCO"})
+
+        assert resolve_many_cusips(db_session, {"RMC000004": "TESLA INC"}) == {
+            "RMC000004": "TSLA"
+        }
+
+
 # ===========================================================================
 # Phase 7 — enrich_holdings_with_performance tests
 # ===========================================================================
@@ -3,6 +3,8 @@
 from datetime import UTC, datetime, timedelta
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from domain.fx_analysis import FXTimingResult
 
 # ---------------------------------------------------------------------------
@@ -82,6 +84,13 @@ MOCK_HISTORY = [
 MODULE = "application.portfolio.fx_watch_service"
 
 
+@pytest.fixture(autouse=True)
+def _mock_prime_forex_history():
+    """監控邏輯的匯率歷史批次預熱不得觸發實際下載。"""
+    with patch(f"{MODULE}.prime_forex_history_batch", return_value=0) as mock_prime:
+        yield mock_prime
+
+
 # ===========================================================================
 # CRUD Tests
 # ===========================================================================
@@ -286,6 +295,28 @@ class TestCheckFXWatches:
         assert results[1]["watch_id"] == 2
         assert results[1]["pair"] == "EUR/TWD"
 
+    @patch(f"{MODULE}.assess_exchange_timing")
+    @patch(f"{MODULE}.get_forex_history_long")
+    @patch(f"{MODULE}.find_active_fx_watches")
+    @patch(f"{MODULE}.logger")
+    def test_should_prime_all_pairs_in_one_batch(
+        self, _logger, mock_find, mock_history, mock_assess, _mock_prime_forex_history
+    ):
+        from application.portfolio.fx_watch_service import check_fx_watches
+
+        mock_find.return_value = [
+            _make_watch(watch_id=1, base="USD", quote="TWD"),
+            _make_watch(watch_id=2, base="JPY", quote="TWD"),
+        ]
+        mock_history.return_value = MOCK_HISTORY
+        mock_assess.return_value = _make_timing_result()
+
+        check_fx_watches(MagicMock())
+
+        _mock_prime_forex_history.assert_called_once()
+        pairs = list(_mock_prime_forex_history.call_args.args[0])
+        assert pairs == [("USD", "TWD"), ("JPY", "TWD")]
+
     @patch(f"{MODULE}.assess_exchange_timing")
     @patch(f"{MODULE}.get_forex_history_long")
     @patch(f"{MODULE}.find_active_fx_watches")
@@ -600,3 +600,141 @@ class TestRebalanceAdviceTranslation:
             f"Expected list[str], got: {advice}"
         )
         assert any("overweight" in a.lower() for a in advice)
+
+
+class TestHoldingValuationPipeline:
+    """Prices are resolved once per distinct ticker / coin before aggregation."""
+
+    @patch("application.portfolio.rebalance_service.get_crypto_price")
+    @patch("application.portfolio.rebalance_service.get_crypto_prices_batch")
+    @patch("application.portfolio.rebalance_service.get_technical_signals")
+    @patch("application.portfolio.rebalance_service.prewarm_signals_batch")
+    @patch(
+        "application.portfolio.rebalance_service.are_all_signals_in_l1",
+        return_value=False,
+    )
+    def test_should_resolve_each_price_once_and_batch_crypto(
+        self,
+        _mock_in_l1,
+        mock_prewarm,
+        mock_signals,
+        mock_crypto_batch,
+        mock_crypto_single,
+    ):
+        from application.portfolio.rebalance_service import (
+            _compute_holding_market_values,
+        )
+
+        holdings = [
+            Holding(ticker="NVDA", category=StockCategory.GROWTH, quantity=2.0),
+            Holding(ticker="NVDA", category=StockCategory.GROWTH, quantity=3.0),
+            Holding(
+                ticker="BTC-USD",
+                category=StockCategory.CRYPTO,
+                coingecko_id="bitcoin",
+                quantity=0.5,
+            ),
+            Holding(
+                ticker="ETH-USD",
+                category=StockCategory.CRYPTO,
+                coingecko_id="ethereum",
+                quantity=1.0,
+            ),
+            Holding(
+                ticker="USD",
+                category=StockCategory.CASH,
+                quantity=100.0,
+                is_cash=True,
+            ),
+        ]
+        mock_signals.return_value = {"price": 10.0, "previous_close": 8.0}
+        mock_crypto_batch.return_value = {
+            "bitcoin": {"price_usd": 100.0, "change_24h_pct": 0.0},
+            "ethereum": {"price_usd": 20.0, "change_24h_pct": 0.0},
+        }
+
+        currency_values, cash_values, ticker_agg = _compute_holding_market_values(
+            holdings, {"USD": 1.0}
+        )
+
+        mock_prewarm.assert_called_once_with(["NVDA"])
+        mock_signals.assert_called_once_with("NVDA")
+        mock_crypto_batch.assert_called_once_with(["bitcoin", "ethereum"])
+        mock_crypto_single.assert_not_called()
+        assert ticker_agg["NVDA"]["mv"] == pytest.approx(50.0)
+        assert ticker_agg["NVDA"]["prev_mv"] == pytest.approx(40.0)
+        assert ticker_agg["BTC-USD"]["mv"] == pytest.approx(50.0)
+        assert currency_values["USD"] == pytest.approx(220.0)
+        assert cash_values["USD"] == pytest.approx(100.0)
+
+
+class TestRebalanceDataAge:
+    """Rebalance responses expose the age of the oldest price quote."""
+
+    @patch("application.portfolio.rebalance_service.get_technical_signals")
+    @patch("application.portfolio.rebalance_service.get_exchange_rates")
+    @patch("application.portfolio.rebalance_service.prewarm_signals_batch")
+    @patch("application.portfolio.rebalance_service.prewarm_etf_holdings_batch")
+    @patch("application.portfolio.rebalance_service.prewarm_etf_sector_weights_batch")
+    @patch(
+        "application.portfolio.rebalance_service.get_etf_top_holdings",
+        return_value=None,
+    )
+    @patch(
+        "application.portfolio.rebalance_service.get_etf_sector_weights",
+        return_value=None,
+    )
+    def test_calculate_rebalance_should_report_oldest_quote_age(
+        self,
+        _mock_etf_weights,
+        _mock_etf,
+        _mock_etf_sector_prewarm,
+        _mock_etf_prewarm,
+        _mock_prewarm,
+        mock_fx,
+        mock_signals,
+        db_session: Session,
+    ):
+        from datetime import UTC, datetime, timedelta
+
+        # Arrange
+        db_session.add(
+            UserInvestmentProfile(
+                user_id="default",
+                config=json.dumps({"Growth": 100}),
+                is_active=True,
+            )
+        )
+        for ticker in ("NVDA", "AMD"):
+            db_session.add(
+                Holding(
+                    user_id="default",
+                    ticker=ticker,
+                    category=StockCategory.GROWTH,
+                    quantity=1.0,
+                    cost_basis=100.0,
+                    currency="USD",
+                    is_cash=False,
+                )
+            )
+        db_session.commit()
+
+        now = datetime.now(UTC)
+        stale_at = (now - timedelta(minutes=10)).isoformat()
+        fetched = {
+            "NVDA": (now - timedelta(minutes=1)).isoformat(),
+            "AMD": stale_at,
+        }
+        mock_signals.side_effect = lambda ticker: {
+            "price": 120.0,
+            "previous_close": 110.0,
+            "fetched_at": fetched[ticker],
+        }
+        mock_fx.return_value = {"USD": 1.0}
+
+        # Act
+        result = calculate_rebalance(db_session, "USD")
+
+        # Assert
+        assert result["data_as_of"] == stale_at
+        assert 600 <= result["data_age_seconds"] < 660
@@ -620,3 +620,141 @@ class TestScanWarmL1SkipBatchDownload:
 
         mock_batch_download.assert_not_called()
         mock_prime_batch.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# TestScanSignalDiff — set-wise diff + bulk persistence
+# ---------------------------------------------------------------------------
+
+
+@patch("application.scan.scan_service.batch_download_history", new=lambda *a, **kw: {})
+@patch("application.scan.scan_service.send_telegram_message_dual")
+@patch("application.scan.scan_service.get_fear_greed_index", return_value=_MOCK_FG)
+@patch("application.scan.scan_service.analyze_moat_trend", return_value=_MOCK_MOAT)
+@patch("application.scan.scan_service.get_bias_distribution", return_value={})
+@patch(
+    "application.scan.scan_service.get_technical_signals", return_value=_BASE_SIGNALS
+)
+@patch(
+    "application.scan.scan_service.analyze_market_sentiment",
+    return_value=_MOCK_MARKET_SENTIMENT,
+)
+class TestScanSignalDiff:
+    def test_should_reset_signal_since_only_for_changed_stocks(
+        self,
+        _mock_sentiment,
+        _mock_signals,
+        _mock_bias_dist,
+        _mock_moat,
+        _mock_fg,
+        _mock_telegram,
+        db_session: Session,
+    ):
+        from datetime import datetime
+
+        from sqlmodel import select
+
+        from domain.entities import ScanLog
+
+        # Arrange — first scan establishes the signal produced by _BASE_SIGNALS
+        _add_growth_stock(db_session, "AAPL")
+        _add_growth_stock(db_session, "MSFT")
+        first = run_scan(db_session)
+        current = first["results"][0]["signal"]
+        other = (
+            ScanSignal.OVERSOLD.value
+            if current != ScanSignal.OVERSOLD.value
+            else ScanSignal.NORMAL.value
+        )
+        old_since = datetime(2024, 1, 1, tzinfo=UTC)
+        aapl = db_session.get(Stock, "AAPL")
+        msft = db_session.get(Stock, "MSFT")
+        aapl.last_scan_signal, aapl.signal_since = current, old_since
+        msft.last_scan_signal, msft.signal_since = other, old_since
+        db_session.commit()
+
+        # Act
+        run_scan(db_session)
+
+        # Assert
+        db_session.expire_all()
+        aapl = db_session.get(Stock, "AAPL")
+        msft = db_session.get(Stock, "MSFT")
+        assert aapl.signal_since.replace(tzinfo=UTC) == old_since
+        assert msft.last_scan_signal == current
+        assert msft.signal_since.replace(tzinfo=UTC) > old_since
+        assert len(db_session.exec(select(ScanLog)).all()) == 4
+
+    def test_should_record_signal_transitions_for_each_scan(
+        self,
+        _mock_sentiment,
+        _mock_signals,
+        _mock_bias_dist,
+        _mock_moat,
+        _mock_fg,
+        _mock_telegram,
+        db_session: Session,
+    ):
+        from sqlmodel import select
+
+        from domain.entities import SignalTransition
+
+        # Arrange
+        _add_growth_stock(db_session, "AAPL")
+
+        # Act — two scans with an unchanged signal extend one transition
+        run_scan(db_session)
+        run_scan(db_session)
+
+        # Assert
+        transitions = db_session.exec(select(SignalTransition)).all()
+        assert len(transitions) == 1
+        assert transitions[0].stock_ticker == "AAPL"
+        assert transitions[0].scan_count == 2
+
+
+class TestCompactScanLogs:
+    def test_should_delete_old_logs_and_keep_signal_activity(self, db_session: Session):
+        from datetime import datetime, timedelta
+
+        from sqlmodel import select
+
+        from application.scan.scan_service import compact_scan_logs, get_signal_activity
+        from domain.entities import ScanLog, SignalTransition
+
+        # Arrange — raw logs without transitions (pre-migration history)
+        _add_growth_stock(db_session, "AAPL")
+        db_session.get(Stock, "AAPL").last_scan_signal = "OVERSOLD"
+        now = datetime.now(UTC).replace(tzinfo=None)
+        for days_ago, signal in ((200, "NORMAL"), (150, "OVERSOLD"), (1, "OVERSOLD")):
+            db_session.add(
+                ScanLog(
+                    stock_ticker="AAPL",
+                    signal=signal,
+                    market_status="POSITIVE",
+                    scanned_at=now - timedelta(days=days_ago),
+                )
+            )
+        db_session.commit()
+
+        # Act
+        result = compact_scan_logs(db_session, retention_days=90)
+
+        # Assert — old raw rows gone, transitions seeded before deletion
+        assert result["deleted"] == 2
+        assert result["seeded_transitions"] == 2
+        assert result["retention_days"] == 90
+        assert len(db_session.exec(select(ScanLog)).all()) == 1
+        assert len(db_session.exec(select(SignalTransition)).all()) == 2
+
+        activity = {a["ticker"]: a for a in get_signal_activity(db_session)}
+        assert activity["AAPL"]["consecutive_scans"] == 2
+        assert activity["AAPL"]["previous_signal"] == "NORMAL"
+
+    def test_should_be_noop_without_old_logs(self, db_session: Session):
+        from application.scan.scan_service import compact_scan_logs
+
+        result = compact_scan_logs(db_session)
+
+        assert result["deleted"] == 0
+        assert result["seeded_transitions"] == 0
@@ -19,6 +19,7 @@ from application.portfolio.snapshot_service import (
     get_snapshots,
     take_daily_snapshot,
 )
+from domain.analysis import PriceSeries
 from domain.entities import PortfolioSnapshot
 
 # ---------------------------------------------------------------------------
@@ -287,8 +288,6 @@ class TestBackfillBenchmarkValues:
         self, db_session: Session
     ):
         """Snapshots with empty benchmark_values dict should be filled in."""
-        import pandas as pd
-
         today = date.today()
         snap = PortfolioSnapshot(
             snapshot_date=today,
@@ -300,11 +299,8 @@ class TestBackfillBenchmarkValues:
         db_session.add(snap)
         db_session.commit()
 
-        # Return a one-row Series with a price on `today`
-        mock_series = pd.Series(
-            [5000.0],
-            index=pd.DatetimeIndex([pd.Timestamp(today, tz="UTC")]),
-        )
+        # Return a one-row PriceSeries with a price on `today`
+        mock_series = PriceSeries.from_columns([today], [5000.0])
 
         with patch(_BENCHMARK_HISTORY_PATCH, return_value=mock_series):
             result = backfill_benchmark_values(db_session)
@@ -5,6 +5,8 @@ All infrastructure.market_data calls are mocked — no network I/O.
 
 from unittest.mock import patch
 
+import pytest
+
 STOCK_MODULE = "application.stock.stock_service"
 
 
@@ -313,6 +315,11 @@ class TestGetMoatForTicker:
 
 
 class TestGetEnrichedStocks:
+    @pytest.fixture(autouse=True)
+    def _no_quote_batch(self):
+        with patch(f"{STOCK_MODULE}.prewarm_quote_batch", return_value=0) as mock:
+            yield mock
+
     def test_returns_empty_list_when_no_active_stocks(self, db_session) -> None:
         from application.stock.stock_service import get_enriched_stocks
 
@@ -453,3 +460,31 @@ class TestGetEnrichedStocks:
         assert len(result) == 1
         mock_signals.assert_not_called()
         assert result[0]["signals"] is None
+
+    def test_quote_batch_prewarmed_before_per_ticker_calls(
+        self, db_session, _no_quote_batch
+    ) -> None:
+        """Crypto is excluded from the quote batch; Growth skips the dividend part."""
+        from domain.entities import Stock
+        from domain.enums import StockCategory
+        from infrastructure.repositories import save_stock
+
+        save_stock(db_session, Stock(ticker="KO", category=StockCategory.MOAT))
+        save_stock(db_session, Stock(ticker="TSLA", category=StockCategory.GROWTH))
+        save_stock(db_session, Stock(ticker="BTC-USD", category=StockCategory.CRYPTO))
+
+        with (
+            patch(f"{STOCK_MODULE}.get_technical_signals", return_value=None),
+            patch(f"{STOCK_MODULE}.get_crypto_price", return_value=None),
+            patch(f"{STOCK_MODULE}.get_earnings_date", return_value=None),
+            patch(f"{STOCK_MODULE}.get_dividend_info", return_value=None),
+            patch(f"{STOCK_MODULE}.get_fundamentals", return_value=None),
+            patch(f"{STOCK_MODULE}.get_ticker_sector_cached", return_value=None),
+        ):
+            from application.stock.stock_service import get_enriched_stocks
+
+            get_enriched_stocks(db_session)
+
+        quote_tickers, dividend_tickers = _no_quote_batch.call_args.args
+        assert sorted(quote_tickers) == ["KO", "TSLA"]
+        assert dividend_tickers == ["KO"]
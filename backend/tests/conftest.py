@@ -32,6 +32,10 @@ domain.constants.DISK_CACHE_DIR = os.path.join(
     tempfile.gettempdir(), "folio_test_cache"
 )
 domain.constants.DATA_DIR = os.path.join(tempfile.gettempdir(), "folio_test_data")
+# Per-process OHLCV store so xdist workers never serve each other's mocked bars
+domain.constants.PRICE_STORE_DIR = tempfile.mkdtemp(prefix="folio_test_price_store_")
+# Per-process shared cache so xdist workers never share leases or cached payloads
+domain.constants.SHARED_CACHE_DIR = tempfile.mkdtemp(prefix="folio_test_shared_cache_")
 
 from collections.abc import Generator  # noqa: E402
 from unittest.mock import patch  # noqa: E402
@@ -42,7 +46,7 @@ from sqlalchemy.pool import StaticPool  # noqa: E402
 from sqlmodel import Session, SQLModel, create_engine  # noqa: E402
 
 from infrastructure.database import engine as _db_engine  # noqa: E402
-from infrastructure.database import get_session  # noqa: E402
+from infrastructure.database import get_read_session, get_session  # noqa: E402
 from main import app  # noqa: E402
 
 # ---------------------------------------------------------------------------
@@ -140,6 +144,8 @@ def _clean_tables():
     from application.portfolio.rebalance_service import invalidate_rebalance_cache
     from application.scan.backtest_service import invalidate_backtest_cache
     from application.stock.stock_service import invalidate_enriched_cache
+    from infrastructure.market_data.price_store import clear_price_store
+    from infrastructure.shared_cache import clear_shared_cache
 
     invalidate_resonance_cache()
     invalidate_guru_backtest_cache()
@@ -147,6 +153,8 @@ def _clean_tables():
     invalidate_rebalance_cache()
     invalidate_backtest_cache()
     invalidate_enriched_cache()
+    clear_price_store()
+    clear_shared_cache()
 
 
 # All external service patches — collected as a list to avoid Python's
@@ -177,6 +185,7 @@ _PATCHES: list[tuple[str, object]] = [
     ("application.scan.scan_service.send_telegram_message_dual", None),
     ("application.messaging.notification_service.send_telegram_message_dual", None),
     ("application.portfolio.fx_watch_service.send_telegram_message_dual", None),
+    ("application.portfolio.fx_watch_service.prime_forex_history_batch", 0),
     (
         "application.messaging.telegram_settings_service.send_telegram_message_dual",
         None,
@@ -196,6 +205,7 @@ _PATCHES: list[tuple[str, object]] = [
     ("application.portfolio.rebalance_service.get_etf_sector_weights", None),
     ("application.portfolio.rebalance_service.get_forex_history", []),
     ("application.portfolio.rebalance_service.get_forex_history_long", []),
+    ("application.portfolio.rebalance_service.prime_forex_history_batch", 0),
     ("application.portfolio.rebalance_service.are_all_signals_in_l1", False),
     ("application.portfolio.rebalance_service.prewarm_signals_batch", {}),
     ("application.portfolio.rebalance_service.prewarm_etf_holdings_batch", {}),
@@ -214,6 +224,7 @@ _PATCHES: list[tuple[str, object]] = [
     ("application.stock.stock_service.get_technical_signals", MOCK_SIGNALS),
     ("application.stock.stock_service.get_earnings_date", _MOCK_EARNINGS),
     ("application.stock.stock_service.get_dividend_info", _MOCK_DIVIDEND),
+    ("application.stock.stock_service.prewarm_quote_batch", 0),
     ("application.stock.stock_service.detect_is_etf", False),
     # prewarm_service (prevent background prewarm during tests)
     ("application.scan.prewarm_service.prewarm_all_caches", None),
@@ -224,6 +235,7 @@ _PATCHES: list[tuple[str, object]] = [
 def client() -> Generator[TestClient, None, None]:
     """TestClient with overridden DB session and mocked external services."""
     app.dependency_overrides[get_session] = _override_get_session
+    app.dependency_overrides[get_read_session] = _override_get_session
 
     patchers = [patch(target, return_value=rv) for target, rv in _PATCHES]
     for p in patchers:
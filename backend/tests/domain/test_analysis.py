@@ -3,6 +3,7 @@
 from domain.analysis import (
     compute_beta,
     compute_bias_percentile,
+    compute_data_age_seconds,
     compute_signal_duration,
     compute_twr,
     detect_rogue_wave,
@@ -1032,3 +1033,38 @@ class TestComputeSignalDuration:
         days, is_new = compute_signal_duration(naive_since, now)
         assert days == 2
         assert is_new is False
+
+
+# ---------------------------------------------------------------------------
+# compute_data_age_seconds
+# ---------------------------------------------------------------------------
+
+
+class TestComputeDataAgeSeconds:
+    """Tests for compute_data_age_seconds() — staleness age for cached quotes."""
+
+    def test_should_return_age_in_whole_seconds(self):
+        from datetime import UTC, datetime, timedelta
+
+        now = datetime(2026, 3, 2, 12, 0, tzinfo=UTC)
+        fetched_at = (now - timedelta(minutes=7, seconds=30)).isoformat()
+        assert compute_data_age_seconds(fetched_at, now) == 450
+
+    def test_should_treat_naive_timestamp_as_utc(self):
+        from datetime import UTC, datetime
+
+        now = datetime(2026, 3, 2, 12, 0, tzinfo=UTC)
+        assert compute_data_age_seconds("2026-03-02T11:59:00", now) == 60
+
+    def test_should_clamp_future_timestamp_to_zero(self):
+        from datetime import UTC, datetime
+
+        now = datetime(2026, 3, 2, 12, 0, tzinfo=UTC)
+        assert compute_data_age_seconds("2026-03-02T12:05:00+00:00", now) == 0
+
+    def test_should_return_none_for_missing_or_invalid_timestamp(self):
+        from datetime import UTC, datetime
+
+        now = datetime.now(UTC)
+        assert compute_data_age_seconds(None, now) is None
+        assert compute_data_age_seconds("not-a-date", now) is None
@@ -1,9 +1,10 @@
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, date, datetime, timedelta
 
 from domain.analysis.backtest import (
     BacktestSignalEvent,
     classify_confidence,
     compute_forward_returns,
+    compute_forward_returns_batch,
     compute_signal_metrics,
     deduplicate_signal_events,
     replay_historical_signals,
@@ -72,6 +73,31 @@ def test_compute_forward_returns_should_return_none_when_window_out_of_range():
     assert returns[5] is None
 
 
+def test_compute_forward_returns_batch_should_match_single_event_results():
+    prices = [
+        {"date": "2026-01-02", "close": 100.0},
+        {"date": "2026-01-05", "close": 110.0},
+        {"date": "2026-01-06", "close": 0.0},
+        {"date": "2026-01-07", "close": 121.0},
+    ]
+    signal_dates = [
+        date(2026, 1, 1),
+        date(2026, 1, 5),
+        date(2026, 1, 3),
+        date(2026, 1, 8),
+    ]
+
+    batch = compute_forward_returns_batch(signal_dates, prices, windows=[1, 2])
+
+    assert batch == [
+        compute_forward_returns(signal_date, prices, windows=[1, 2])
+        for signal_date in signal_dates
+    ]
+    assert batch[0] == {1: 10.0, 2: None}
+    assert batch[1] == {1: None, 2: 10.0}
+    assert batch[3] == {1: None, 2: None}
+
+
 def test_compute_signal_metrics_should_calculate_buy_hit_and_false_positive_rates():
     metrics = compute_signal_metrics(
         forward_returns=[{30: 5.0}, {30: -2.0}, {30: 1.0}],
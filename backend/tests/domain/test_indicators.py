@@ -0,0 +1,99 @@
+"""Tests for the rolling indicator engine (domain/analysis/indicators.py)."""
+
+import math
+import random
+
+import pytest
+
+from domain.analysis.analysis import (
+    compute_moving_average,
+    compute_rsi,
+    compute_volume_ratio,
+)
+from domain.analysis.indicators import (
+    compute_indicator_series,
+    rolling_moving_average,
+    rolling_rsi,
+    rolling_volume_ratio,
+)
+from domain.constants import MA60_WINDOW, MA200_WINDOW
+
+
+def _random_walk(n: int, seed: int = 7) -> list[float]:
+    rng = random.Random(seed)
+    price = 100.0
+    closes = []
+    for _ in range(n):
+        price = max(1.0, price * (1 + rng.uniform(-0.03, 0.03)))
+        closes.append(round(price, 2))
+    return closes
+
+
+class TestRollingRsi:
+    def test_should_match_prefix_compute_rsi_at_every_index(self):
+        closes = _random_walk(300)
+
+        series = rolling_rsi(closes)
+
+        assert series == [compute_rsi(closes[: i + 1]) for i in range(len(closes))]
+
+    def test_should_return_100_when_no_losses(self):
+        closes = [float(i) for i in range(1, 30)]
+
+        assert rolling_rsi(closes)[-1] == 100.0
+
+    def test_should_be_all_none_when_history_too_short(self):
+        assert rolling_rsi([1.0, 2.0, 3.0]) == [None, None, None]
+
+
+class TestRollingMovingAverage:
+    @pytest.mark.parametrize("window", [MA60_WINDOW, MA200_WINDOW])
+    def test_should_match_prefix_moving_average(self, window):
+        closes = _random_walk(400)
+
+        series = rolling_moving_average(closes, window)
+
+        for i in range(len(closes)):
+            expected = compute_moving_average(closes[: i + 1], window)
+            if expected is None:
+                assert series[i] is None
+            else:
+                assert math.isclose(series[i], expected, abs_tol=0.011)
+
+
+class TestRollingVolumeRatio:
+    def test_should_match_prefix_volume_ratio(self):
+        rng = random.Random(3)
+        volumes = [float(rng.randint(1_000, 50_000)) for _ in range(120)]
+
+        series = rolling_volume_ratio(volumes)
+
+        for i in range(len(volumes)):
+            expected = compute_volume_ratio(volumes[: i + 1])
+            if expected is None:
+                assert series[i] is None
+            else:
+                assert math.isclose(series[i], expected, abs_tol=0.011)
+
+    def test_should_be_none_after_first_missing_volume(self):
+        volumes: list[float | None] = [1000.0] * 40
+        volumes[25] = None
+
+        series = rolling_volume_ratio(volumes)
+
+        assert series[24] == 1.0
+        assert all(value is None for value in series[25:])
+
+
+class TestComputeIndicatorSeries:
+    def test_should_align_all_series_with_closes(self):
+        closes = _random_walk(250)
+
+        indicators = compute_indicator_series(closes)
+
+        assert len(indicators.rsi) == len(closes)
+        assert len(indicators.ma60) == len(closes)
+        assert len(indicators.ma200) == len(closes)
+        assert indicators.volume_ratio == [None] * len(closes)
+        assert indicators.ma200[MA200_WINDOW - 2] is None
+        assert indicators.ma200[MA200_WINDOW - 1] is not None
@@ -0,0 +1,69 @@
+import pickle
+from datetime import date
+
+import pytest
+
+from domain.analysis.price_series import PriceSeries, as_price_series
+
+
+def _series() -> PriceSeries:
+    return PriceSeries.from_points(
+        [
+            {"date": "2025-01-06", "close": 103.0},
+            {"date": "2025-01-02", "close": 100.0},
+            {"date": "2025-01-03", "close": 0.0},
+            {"date": "2025-01-07", "close": 104.0},
+        ]
+    )
+
+
+def test_from_points_should_sort_by_date_once():
+    series = _series()
+
+    assert series.dates == [
+        date(2025, 1, 2),
+        date(2025, 1, 3),
+        date(2025, 1, 6),
+        date(2025, 1, 7),
+    ]
+    assert series.closes.tolist() == [100.0, 0.0, 103.0, 104.0]
+
+
+def test_lookups_should_skip_non_positive_closes_and_fall_back_over_holidays():
+    series = _series()
+
+    assert series.first_close_on_or_after(date(2025, 1, 3)) == 103.0
+    assert series.last_close_on_or_before(date(2025, 1, 5)) == 100.0
+    assert series.last_close_on_or_before(date(2025, 1, 1)) is None
+    assert series.first_close_on_or_after(date(2025, 1, 8)) is None
+    assert series.index_on_or_after(date(2025, 1, 4)) == 2
+    assert series.index_on_or_before(date(2025, 1, 4)) == 1
+
+
+def test_slices_should_share_storage_and_respect_view_bounds():
+    series = _series()
+
+    view = series[1:3]
+    window = series.between(date(2025, 1, 3), date(2025, 1, 6))
+
+    assert len(view) == 2
+    assert view.date_at(0) == date(2025, 1, 3)
+    assert view.close_at(-1) == 103.0
+    assert view.closes.obj is series.closes.obj
+    assert view.last_close_on_or_before(date(2025, 1, 31)) == 103.0
+    assert window == view
+    with pytest.raises(IndexError):
+        view.close_at(2)
+
+
+def test_round_trip_should_preserve_points_and_pickle_only_the_view():
+    points = [
+        {"date": "2025-01-02", "close": 100.0, "volume": 1_000.0},
+        {"date": "2025-01-03", "close": 101.0, "volume": None},
+    ]
+    series = as_price_series(points)
+
+    assert series.to_points() == points
+    assert pickle.loads(pickle.dumps(series[1:])).to_points() == points[1:]
+    assert as_price_series(series) is series
+    assert len(as_price_series(None)) == 0
@@ -0,0 +1,144 @@
+"""
+Tests for the vectorized beta engine (infrastructure/market_data/beta.py)
+and its use in prewarm_beta_batch.
+"""
+
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from domain.analysis import compute_beta
+from infrastructure.market_data import market_data
+from infrastructure.market_data.beta import (
+    compute_beta_matrix,
+    compute_return_matrix,
+)
+from infrastructure.market_data.close_matrix import build_close_matrix
+from infrastructure.market_data.market_data import prewarm_beta_batch
+
+MODULE = "infrastructure.market_data.market_data"
+
+
+def _series(n: int = 120, seed: int = 0) -> tuple[list[float], list[float]]:
+    """回傳 (stock, market) 收盤價：stock 日收益率約為 market 的 1.5 倍加雜訊。"""
+    rng = np.random.default_rng(seed)
+    market_ret = rng.normal(0, 0.01, n - 1)
+    stock_ret = 1.5 * market_ret + rng.normal(0, 0.005, n - 1)
+    market = np.concatenate([[100.0], 100.0 * np.cumprod(1 + market_ret)])
+    stock = np.concatenate([[50.0], 50.0 * np.cumprod(1 + stock_ret)])
+    return stock.tolist(), market.tolist()
+
+
+def _frame(closes: list[float], index: pd.DatetimeIndex | None = None) -> pd.DataFrame:
+    if index is None:
+        index = pd.bdate_range("2025-01-01", periods=len(closes))
+    return pd.DataFrame({"Close": closes}, index=index)
+
+
+class TestComputeBetaMatrix:
+    def test_should_match_scalar_compute_beta_on_aligned_history(self):
+        stock, market = _series()
+        matrix = build_close_matrix({"AAA": _frame(stock), "SPY": _frame(market)})
+
+        betas = compute_beta_matrix(matrix, ["SPY"])
+
+        assert betas.loc["AAA", "SPY"] == compute_beta(stock, market)
+        assert betas.loc["SPY", "SPY"] == 1.0
+
+    def test_should_support_multiple_benchmarks_and_skip_missing(self):
+        stock, market = _series()
+        other = [m * 2 for m in market]
+        matrix = build_close_matrix(
+            {"AAA": _frame(stock), "SPY": _frame(market), "VT": _frame(other)}
+        )
+
+        betas = compute_beta_matrix(matrix, ["SPY", "VT", "^N225"])
+
+        assert list(betas.columns) == ["SPY", "VT"]
+        assert betas.loc["AAA", "SPY"] == betas.loc["AAA", "VT"]
+
+    def test_should_align_on_dates_across_market_holidays(self):
+        stock, market = _series()
+        index = pd.bdate_range("2025-01-01", periods=len(stock))
+        # 股票市場休市 3 天：收益率改以復市當日計，不致錯位
+        holidays = index[[30, 31, 70]]
+        stock_frame = _frame(stock, index).drop(index=holidays)
+        matrix = build_close_matrix({"AAA": stock_frame, "SPY": _frame(market, index)})
+
+        betas = compute_beta_matrix(matrix, ["SPY"])
+
+        assert 1.3 < betas.loc["AAA", "SPY"] < 1.7
+
+    def test_should_return_nan_when_history_too_short(self):
+        stock, market = _series(30)
+        matrix = build_close_matrix({"AAA": _frame(stock), "SPY": _frame(market)})
+
+        betas = compute_beta_matrix(matrix, ["SPY"])
+
+        assert pd.isna(betas.loc["AAA", "SPY"])
+
+    def test_zero_close_should_not_produce_infinite_return(self):
+        matrix = pd.DataFrame({"AAA": [0.0, 1.0, 2.0]})
+
+        returns = compute_return_matrix(matrix)
+
+        assert returns["AAA"].isna().sum() == 2
+
+
+class TestPrewarmBetaBatchMatrix:
+    @pytest.fixture(autouse=True)
+    def _clear_beta_cache(self):
+        market_data._beta_cache.clear()
+        yield
+        market_data._beta_cache.clear()
+
+    def test_should_compute_all_betas_in_one_pass_and_fall_back_for_short(self):
+        stock, market = _series()
+        short, _ = _series(30)
+        hist_batch = {
+            "AAA": _frame(stock),
+            "BBB": _frame([s * 3 for s in stock]),
+            "NEW": _frame(short),
+            "SPY": _frame(market),
+        }
+        with (
+            patch(f"{MODULE}._disk_get", return_value=None),
+            patch(f"{MODULE}._disk_set"),
+            patch(f"{MODULE}.get_stock_beta", return_value=None) as mock_info,
+        ):
+            results = prewarm_beta_batch(
+                ["AAA", "BBB", "NEW", "CASHLIKE"], hist_batch=hist_batch
+            )
+
+        expected = compute_beta(stock, market)
+        assert results == {
+            "AAA": expected,
+            "BBB": expected,
+            "NEW": None,
+            "CASHLIKE": None,
+        }
+        assert sorted(c.args[0] for c in mock_info.call_args_list) == [
+            "CASHLIKE",
+            "NEW",
+        ]
+        assert market_data._beta_cache["AAA"] == expected
+
+    def test_download_history_should_only_fetch_uncached_tickers(self):
+        stock, market = _series()
+        market_data._beta_cache["CACHED"] = 0.8
+        with (
+            patch(f"{MODULE}._disk_get", return_value=None),
+            patch(f"{MODULE}._disk_set"),
+            patch(
+                f"{MODULE}.batch_download_history",
+                return_value={"AAA": _frame(stock), "SPY": _frame(market)},
+            ) as mock_download,
+            patch(f"{MODULE}.get_stock_beta") as mock_info,
+        ):
+            results = prewarm_beta_batch(["CACHED", "AAA"], download_history=True)
+
+        mock_download.assert_called_once_with(["AAA", "SPY"])
+        mock_info.assert_not_called()
+        assert results == {"CACHED": 0.8, "AAA": compute_beta(stock, market)}
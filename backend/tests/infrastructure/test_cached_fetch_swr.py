@@ -0,0 +1,202 @@
+"""
+Tests for the stale-while-revalidate mode of _cached_fetch.
+
+Covers:
+- L2 age below the soft TTL (L1 TTL) is served as fresh and refills L1.
+- L2 age between soft and hard TTL is served immediately with one background refresh.
+- L2 age beyond the hard TTL forces a synchronous fetch.
+- Production hard TTLs match the L2 TTLs, so any L2 hit is served without a sync fetch.
+- A recent failed refresh (L1 error sentinel) keeps serving the stale value.
+- _schedule_revalidate schedules at most one refresh per key.
+"""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+from cachetools import TTLCache
+
+from infrastructure.market_data import market_data as md
+from infrastructure.market_data.market_data import (
+    _cached_fetch,
+    _is_error_dict,
+    _schedule_revalidate,
+)
+
+DISK_PREFIX = "test_swr"
+DISK_TTL = 3600
+SOFT_TTL = 300
+STALE_TTL = 1800
+
+_STALE = {"ticker": "NVDA", "price": 100.0}
+_FRESH = {"ticker": "NVDA", "price": 120.0}
+
+
+def _fresh_l1() -> TTLCache:
+    return TTLCache(maxsize=100, ttl=SOFT_TTL)
+
+
+def _fetch(l1: TTLCache, fetcher: MagicMock):
+    return _cached_fetch(
+        l1,
+        "NVDA",
+        DISK_PREFIX,
+        DISK_TTL,
+        fetcher,
+        is_error=_is_error_dict,
+        stale_ttl=STALE_TTL,
+    )
+
+
+class TestCachedFetchStaleWhileRevalidate:
+    def test_should_serve_young_l2_value_as_fresh(self):
+        l1 = _fresh_l1()
+        fetcher = MagicMock(return_value=_FRESH)
+
+        with (
+            patch.object(md, "_disk_get", return_value=_STALE),
+            patch.object(md, "_disk_age", return_value=60.0),
+            patch.object(md, "_schedule_revalidate") as mock_schedule,
+        ):
+            result = _fetch(l1, fetcher)
+
+        assert result == _STALE
+        assert l1["NVDA"] == _STALE
+        fetcher.assert_not_called()
+        mock_schedule.assert_not_called()
+
+    def test_should_return_stale_value_and_schedule_refresh(self):
+        l1 = _fresh_l1()
+        fetcher = MagicMock(return_value=_FRESH)
+
+        with (
+            patch.object(md, "_disk_get", return_value=_STALE),
+            patch.object(md, "_disk_age", return_value=900.0),
+            patch.object(md, "_schedule_revalidate") as mock_schedule,
+        ):
+            result = _fetch(l1, fetcher)
+
+        assert result == _STALE
+        fetcher.assert_not_called()
+        mock_schedule.assert_called_once()
+        assert mock_schedule.call_args.args[0] == f"{DISK_PREFIX}:NVDA"
+        # L1 stays empty so the refreshed value replaces the stale one
+        assert l1.get("NVDA") is None
+
+    def test_scheduled_refresh_should_write_both_cache_layers(self):
+        l1 = _fresh_l1()
+        fetcher = MagicMock(return_value=_FRESH)
+
+        def _run_inline(key, do_fetch, result_getter, shared_getter=None):
+            do_fetch()
+            return True
+
+        with (
+            patch.object(md, "_disk_get", return_value=_STALE),
+            patch.object(md, "_disk_age", return_value=900.0),
+            patch.object(md, "_disk_set") as mock_disk_set,
+            patch.object(md, "_schedule_revalidate", side_effect=_run_inline),
+        ):
+            result = _fetch(l1, fetcher)
+
+        assert result == _STALE
+        assert l1["NVDA"] == _FRESH
+        mock_disk_set.assert_called_once_with(f"{DISK_PREFIX}:NVDA", _FRESH, DISK_TTL)
+
+    def test_should_fetch_synchronously_beyond_hard_ttl(self):
+        l1 = _fresh_l1()
+        fetcher = MagicMock(return_value=_FRESH)
+
+        with (
+            patch.object(md, "_disk_get", return_value=_STALE),
+            patch.object(md, "_disk_age", return_value=2400.0),
+            patch.object(md, "_disk_set"),
+            patch.object(md, "_schedule_revalidate") as mock_schedule,
+        ):
+            result = _fetch(l1, fetcher)
+
+        assert result == _FRESH
+        fetcher.assert_called_once_with("NVDA")
+        mock_schedule.assert_not_called()
+
+    def test_should_keep_stale_value_after_failed_refresh(self):
+        l1 = _fresh_l1()
+        l1["NVDA"] = {"error": "rate limited"}
+        fetcher = MagicMock(return_value=_FRESH)
+
+        with (
+            patch.object(md, "_disk_get", return_value=_STALE),
+            patch.object(md, "_disk_age", return_value=900.0),
+            patch.object(md, "_schedule_revalidate") as mock_schedule,
+        ):
+            result = _fetch(l1, fetcher)
+
+        assert result == _STALE
+        fetcher.assert_not_called()
+        mock_schedule.assert_not_called()
+
+    def test_should_ignore_age_when_stale_ttl_not_set(self):
+        l1 = _fresh_l1()
+        fetcher = MagicMock(return_value=_FRESH)
+
+        with (
+            patch.object(md, "_disk_get", return_value=_STALE),
+            patch.object(md, "_disk_age") as mock_age,
+        ):
+            result = _cached_fetch(l1, "NVDA", DISK_PREFIX, DISK_TTL, fetcher)
+
+        assert result == _STALE
+        mock_age.assert_not_called()
+
+
+class TestProductionStaleTtl:
+    def test_hard_ttls_should_not_be_shorter_than_disk_ttls(self):
+        assert md.SIGNALS_STALE_TTL >= md.DISK_SIGNALS_TTL
+        assert md.FUNDAMENTALS_STALE_TTL >= md.DISK_FUNDAMENTALS_TTL
+        assert md.DIVIDEND_STALE_TTL >= md.DISK_DIVIDEND_TTL
+        assert md.FOREX_STALE_TTL >= md.DISK_FOREX_TTL
+
+    def test_old_l2_fundamentals_should_not_fetch_synchronously(self):
+        # 2 hours: older than the former 1 h hard TTL, younger than the 24 h L2 TTL
+        fetcher = MagicMock(return_value=_FRESH)
+        md._fundamentals_cache.pop("NVDA", None)
+
+        with (
+            patch.object(md, "_fetch_fundamentals_from_yf", fetcher),
+            patch.object(md, "_disk_get", return_value=_STALE),
+            patch.object(md, "_disk_age", return_value=7200.0),
+            patch.object(md, "_schedule_revalidate") as mock_schedule,
+        ):
+            result = md.get_fundamentals("NVDA")
+
+        assert result == _STALE
+        fetcher.assert_not_called()
+        mock_schedule.assert_called_once()
+
+
+class TestScheduleRevalidate:
+    def test_should_schedule_only_one_refresh_per_key(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls: list[str] = []
+
+        def _slow_fetch():
+            calls.append("fetch")
+            started.set()
+            release.wait(timeout=5)
+            return _FRESH
+
+        key = f"{DISK_PREFIX}:dedupe"
+        first = _schedule_revalidate(key, _slow_fetch, lambda: _FRESH)
+        assert started.wait(timeout=5)
+        second = _schedule_revalidate(key, _slow_fetch, lambda: _FRESH)
+        release.set()
+
+        assert first is True
+        assert second is False
+        # 刷新完成後可再次排程
+        for _ in range(100):
+            if key not in md._revalidating:
+                break
+            threading.Event().wait(0.01)
+        assert key not in md._revalidating
+        assert calls == ["fetch"]
@@ -0,0 +1,60 @@
+"""Tests for the SQLite performance profile and read-only analytics engine."""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from infrastructure.database import build_engine, build_read_engine
+
+
+def _pragma(engine, name: str):
+    with engine.connect() as conn:
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+class TestBuildEngine:
+    def test_file_database_should_apply_profile_pragmas(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'radar.db'}"
+        engine = build_engine(url, "balanced")
+
+        try:
+            assert _pragma(engine, "journal_mode") == "wal"
+            assert _pragma(engine, "busy_timeout") == 5000
+            assert _pragma(engine, "synchronous") == 1  # NORMAL
+            assert _pragma(engine, "cache_size") == -65536
+            assert engine.pool.size() > 1
+        finally:
+            engine.dispose()
+
+    def test_unknown_profile_should_fall_back_to_default(self, tmp_path):
+        engine = build_engine(f"sqlite:///{tmp_path / 'radar.db'}", "no-such-profile")
+
+        try:
+            assert _pragma(engine, "journal_mode") == "wal"
+        finally:
+            engine.dispose()
+
+
+class TestBuildReadEngine:
+    def test_read_engine_should_see_committed_rows_but_reject_writes(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'radar.db'}"
+        engine = build_engine(url)
+        read_engine = build_read_engine(url, engine)
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (v INTEGER)"))
+            conn.execute(text("INSERT INTO t VALUES (1)"))
+
+        try:
+            assert read_engine is not engine
+            with read_engine.connect() as conn:
+                assert conn.execute(text("SELECT v FROM t")).scalar() == 1
+                with pytest.raises(OperationalError):
+                    conn.execute(text("INSERT INTO t VALUES (2)"))
+        finally:
+            read_engine.dispose()
+            engine.dispose()
+
+    def test_memory_database_should_reuse_write_engine(self):
+        engine = build_engine("sqlite://")
+
+        assert build_read_engine("sqlite://", engine) is engine
@@ -32,9 +32,9 @@ def test_fetch_fear_greed_should_fetch_all_components_in_parallel_path(
     mock_fetch_component.return_value = [100.0, 101.0, 102.0]
     mock_weighted.return_value = (FearGreedLevel.GREED, 55)
     mock_composite.return_value = (FearGreedLevel.GREED, 58)
-    real_pool_cls = market_data.ThreadPoolExecutor
+    real_pool_cls = market_data.LaneThreadPoolExecutor
     with patch(
-        "infrastructure.market_data.market_data.ThreadPoolExecutor",
+        "infrastructure.market_data.market_data.LaneThreadPoolExecutor",
         wraps=real_pool_cls,
     ) as mock_pool_cls:
         result = market_data._fetch_fear_greed("composite")
@@ -0,0 +1,172 @@
+"""
+Tests for the USD-pivot FX matrix (infrastructure/market_data/fx_matrix.py)
+and prime_forex_history_batch in market_data.py.
+"""
+
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from domain.constants import FX_HISTORY_DAYS, FX_LONG_TERM_PERIOD
+from infrastructure.market_data import market_data
+from infrastructure.market_data.fx_matrix import (
+    build_usd_pivot_matrix,
+    cross_rate,
+    cross_rate_history,
+    usd_pivot_symbol,
+)
+from infrastructure.market_data.market_data import (
+    get_exchange_rate,
+    get_exchange_rates,
+    prime_forex_history_batch,
+)
+
+MODULE = "infrastructure.market_data.market_data"
+
+
+def _frame(closes: list[float], start: str = "2026-01-05") -> pd.DataFrame:
+    index = pd.bdate_range(start, periods=len(closes), tz="Europe/London")
+    return pd.DataFrame({"Close": closes}, index=index)
+
+
+@pytest.fixture(autouse=True)
+def _clear_forex_caches():
+    caches = (
+        market_data._forex_cache,
+        market_data._forex_history_cache,
+        market_data._forex_history_long_cache,
+    )
+    for cache in caches:
+        cache.clear()
+    yield
+    for cache in caches:
+        cache.clear()
+
+
+class TestCrossRateHistory:
+    def test_should_derive_direct_inverse_and_cross_rates(self):
+        matrix = build_usd_pivot_matrix(
+            {"TWD": _frame([32.0, 32.5]), "JPY": _frame([150.0, 160.0])}
+        )
+
+        usd_twd = cross_rate_history(matrix, "USD", "TWD")
+        twd_usd = cross_rate_history(matrix, "TWD", "USD")
+        jpy_twd = cross_rate_history(matrix, "JPY", "TWD")
+
+        assert [p["close"] for p in usd_twd] == [32.0, 32.5]
+        assert [p["close"] for p in twd_usd] == [0.0312, 0.0308]
+        assert [p["close"] for p in jpy_twd] == [0.2133, 0.2031]
+        assert jpy_twd[0]["date"] == "2026-01-05"
+
+    def test_should_carry_forward_leg_closed_on_holiday(self):
+        twd = _frame([32.0, 32.0, 33.0]).drop(index=_frame([0, 0]).index[1])
+        matrix = build_usd_pivot_matrix({"TWD": twd, "JPY": _frame([150.0] * 3)})
+
+        jpy_twd = cross_rate_history(matrix, "JPY", "TWD")
+        usd_twd = cross_rate_history(matrix, "USD", "TWD")
+
+        assert len(jpy_twd) == 3
+        assert jpy_twd[1]["close"] == jpy_twd[0]["close"]
+        # USD 腿恆有值：僅保留 TWD 實際有報價的日期
+        assert len(usd_twd) == 2
+
+    def test_should_return_empty_for_same_or_unknown_currency(self):
+        matrix = build_usd_pivot_matrix({"TWD": _frame([32.0])})
+
+        assert cross_rate_history(matrix, "TWD", "TWD") == []
+        assert cross_rate_history(matrix, "EUR", "TWD") == []
+        assert cross_rate_history(build_usd_pivot_matrix({}), "USD", "TWD") == []
+
+
+class TestPrimeForexHistoryBatch:
+    def test_should_download_one_pivot_series_per_currency(self):
+        closes = [30.0 + i * 0.1 for i in range(10)]
+        frames = {
+            usd_pivot_symbol("TWD"): _frame(closes),
+            usd_pivot_symbol("JPY"): _frame([150.0] * 10),
+        }
+        with (
+            patch(f"{MODULE}._download_frames", return_value=frames) as mock_dl,
+            patch(f"{MODULE}._disk_set"),
+        ):
+            primed = prime_forex_history_batch(
+                [("usd", "twd"), ("JPY", "TWD"), ("USD", "TWD"), ("TWD", "TWD")]
+            )
+
+        assert primed == 2
+        mock_dl.assert_called_once_with(
+            ["USDJPY=X", "USDTWD=X"], period=FX_LONG_TERM_PERIOD
+        )
+        long_history = market_data._forex_history_long_cache["USD:TWD"]
+        short_history = market_data._forex_history_cache["USD:TWD"]
+        assert len(long_history) == 10
+        assert short_history == long_history[-FX_HISTORY_DAYS:]
+        assert market_data._forex_history_cache["JPY:TWD"][-1]["close"] == 0.206
+
+    def test_should_skip_pairs_already_cached(self):
+        market_data._forex_history_cache["USD:TWD"] = [{"close": 1.0}]
+        market_data._forex_history_long_cache["USD:TWD"] = [{"close": 1.0}]
+
+        with patch(f"{MODULE}._download_frames") as mock_dl:
+            assert prime_forex_history_batch([("USD", "TWD")]) == 0
+
+        mock_dl.assert_not_called()
+
+    def test_should_leave_missing_pairs_for_individual_fallback(self):
+        frames = {usd_pivot_symbol("TWD"): _frame([32.0, 32.1])}
+        with (
+            patch(f"{MODULE}._download_frames", return_value=frames),
+            patch(f"{MODULE}._disk_set"),
+        ):
+            primed = prime_forex_history_batch([("USD", "TWD"), ("EUR", "TWD")])
+
+        assert primed == 1
+        assert "EUR:TWD" not in market_data._forex_history_long_cache
+
+    def test_should_return_zero_when_download_fails(self):
+        with patch(f"{MODULE}._download_frames", side_effect=OSError("boom")):
+            assert prime_forex_history_batch([("USD", "TWD")]) == 0
+
+
+# 1 CUR = ? USD
+_USD_VALUES = {"TWD": 0.03125, "JPY": 0.00625}
+
+
+class TestCrossRate:
+    def test_should_derive_direct_inverse_and_cross_spot_rates(self):
+        assert cross_rate(_USD_VALUES, "TWD", "USD") == 32.0
+        assert cross_rate(_USD_VALUES, "USD", "TWD") == 0.03125
+        assert cross_rate(_USD_VALUES, "TWD", "JPY") == 0.2
+        assert cross_rate(_USD_VALUES, "JPY", "JPY") == 1.0
+
+    def test_should_fall_back_to_one_when_leg_missing(self):
+        assert cross_rate({}, "TWD", "JPY") == 1.0
+        assert cross_rate({"TWD": 0.0}, "TWD", "USD") == 1.0
+
+
+class TestGetExchangeRatesPivot:
+    def _fake_fetch(self, pair_key: str) -> float:
+        return _USD_VALUES[pair_key.split(":")[1]]
+
+    def test_should_fetch_each_currency_once_across_display_currencies(self):
+        with (
+            patch(
+                f"{MODULE}._fetch_forex_rate", side_effect=self._fake_fetch
+            ) as mock_fetch,
+            patch(f"{MODULE}._disk_get", return_value=None),
+            patch(f"{MODULE}._disk_set"),
+        ):
+            twd_rates = get_exchange_rates("TWD", ["USD", "JPY", "TWD"])
+            usd_rates = get_exchange_rates("USD", ["TWD", "JPY"])
+            jpy_rates = get_exchange_rates("JPY", ["USD", "TWD"])
+            single = get_exchange_rate("TWD", "JPY")
+
+        assert twd_rates == {"TWD": 1.0, "USD": 32.0, "JPY": 0.2}
+        assert usd_rates == {"USD": 1.0, "TWD": 0.03125, "JPY": 0.00625}
+        assert jpy_rates == {"JPY": 1.0, "USD": 160.0, "TWD": 5.0}
+        assert single == 0.2
+        assert sorted(c.args[0] for c in mock_fetch.call_args_list) == [
+            "USD:JPY",
+            "USD:TWD",
+        ]
@@ -4,24 +4,41 @@ Focus: Season Highlights cold-start exclusion (>= 2 filings guard).
 """
 
 from collections.abc import Iterator
+from unittest.mock import patch
 
 import pytest
-from sqlmodel import Session
-
-from domain.entities import Guru, GuruFiling, GuruHolding
+from sqlmodel import Session, delete, select
+
+from domain.entities import (
+    CusipTicker,
+    Guru,
+    GuruActivityStat,
+    GuruFiling,
+    GuruHolding,
+    GuruSectorStat,
+    GuruStat,
+    GuruTickerStat,
+)
 from domain.enums import HoldingAction
 from infrastructure.persistence.repositories import _compute_trend
 from infrastructure.repositories import (
+    defer_guru_analytics_refresh,
+    fill_missing_holding_sectors,
+    fill_missing_holding_tickers,
     find_activity_feed,
     find_all_guru_summaries,
     find_consensus_stocks,
+    find_cusip_tickers,
     find_grand_portfolio,
     find_holding_history_by_guru,
     find_notable_changes_all_gurus,
     find_sector_breakdown,
+    refresh_guru_analytics,
     save_filing,
     save_guru,
     save_holdings_batch,
+    update_guru,
+    upsert_cusip_tickers,
 )
 
 
@@ -322,6 +339,7 @@ class TestFindAllGuruSummaries:
             accession_number="SUM-001",
             report_date="2025-12-31",
         )
+        save_holdings_batch(test_session, [], guru_id=guru.id)
 
         summaries = find_all_guru_summaries(test_session)
 
@@ -339,6 +357,7 @@ class TestFindAllGuruSummaries:
         )
         _make_filing(test_session, guru.id, "SUM-002-F1", "2025-09-30")
         _make_filing(test_session, guru.id, "SUM-002-F2", "2025-12-31")
+        save_holdings_batch(test_session, [], guru_id=guru.id)
 
         summaries = find_all_guru_summaries(test_session)
 
@@ -1619,3 +1638,284 @@ class TestStyleFilter:
         names = [r["display_name"] for r in results]
         assert "Nil Value Guru" in names
         assert "Nil Growth Guru" in names
+
+
+# ---------------------------------------------------------------------------
+# Materialized guru analytics tables
+# ---------------------------------------------------------------------------
+
+
+class TestGuruAnalyticsMaterialization:
+    """Dashboard reads come from tables refreshed on 13F writes, not per request."""
+
+    def test_deferred_refresh_should_rebuild_once_on_exit(self, test_session: Session):
+        guru = _make_guru(test_session, cik="MV0001", display_name="Deferred Guru")
+
+        with defer_guru_analytics_refresh(test_session):
+            filing = _make_filing(test_session, guru.id, "MV-ACC-001", "2024-12-31")
+            _make_holding(
+                test_session,
+                filing.id,
+                guru.id,
+                "MV-C001",
+                "AAPL",
+                HoldingAction.NEW_POSITION,
+            )
+            assert test_session.exec(select(GuruStat)).first() is None
+
+        stat = test_session.get(GuruStat, guru.id)
+        assert stat is not None
+        assert stat.filing_id == filing.id
+        assert stat.turnover_pct == 50.0  # 1 new position / holdings_count 2
+        assert test_session.get(GuruTickerStat, ("", "AAPL")) is not None
+
+    def test_filing_then_holdings_should_rebuild_once(self, test_session: Session):
+        guru = _make_guru(test_session, cik="MV0005", display_name="Single Refresh")
+
+        with patch(
+            "infrastructure.persistence.repositories.refresh_guru_analytics"
+        ) as mock_refresh:
+            filing = _make_filing(test_session, guru.id, "MV-ACC-005", "2024-12-31")
+            mock_refresh.assert_not_called()
+            save_holdings_batch(test_session, [], guru_id=guru.id)
+
+        mock_refresh.assert_called_once_with(test_session, {guru.id})
+        assert filing.id is not None
+
+    def test_incremental_refresh_should_match_full_rebuild(self, test_session: Session):
+        tickers = ["MVI1", "MVI2", "MVI3", "MVI4"]
+        sectors = ["MVI Tech", "MVI Energy"]
+        guru_a = _make_guru(test_session, cik="MVI0001", display_name="Delta A")
+        guru_b = _make_guru(test_session, cik="MVI0002", display_name="Delta B")
+        guru_a.style = "MVI_STYLE"
+        update_guru(test_session, guru_a)
+
+        def _holdings(filing, guru, specs):
+            return [
+                GuruHolding(
+                    filing_id=filing.id,
+                    guru_id=guru.id,
+                    cusip=f"{filing.accession_number}-{ticker}",
+                    ticker=ticker,
+                    company_name=f"Company {ticker}",
+                    sector=sector,
+                    value=value,
+                    shares=10.0,
+                    action=action.value,
+                    weight_pct=weight,
+                )
+                for ticker, action, value, weight, sector in specs
+            ]
+
+        a_q1 = _make_filing(test_session, guru_a.id, "MVI-A-1", "2024-09-30")
+        save_holdings_batch(
+            test_session,
+            _holdings(
+                a_q1,
+                guru_a,
+                [
+                    ("MVI1", HoldingAction.NEW_POSITION, 300.0, 30.0, None),
+                    ("MVI2", HoldingAction.INCREASED, 200.0, 20.0, "MVI Energy"),
+                ],
+            ),
+            guru_id=guru_a.id,
+        )
+        b_q1 = _make_filing(test_session, guru_b.id, "MVI-B-1", "2024-09-30")
+        save_holdings_batch(
+            test_session,
+            _holdings(
+                b_q1,
+                guru_b,
+                [
+                    ("MVI1", HoldingAction.UNCHANGED, 100.0, 10.0, None),
+                    ("MVI3", HoldingAction.DECREASED, 50.0, None, "MVI Energy"),
+                ],
+            ),
+            guru_id=guru_b.id,
+        )
+        # New quarter for A replaces its Q1 contribution
+        a_q2 = _make_filing(test_session, guru_a.id, "MVI-A-2", "2024-12-31")
+        save_holdings_batch(
+            test_session,
+            _holdings(
+                a_q2,
+                guru_a,
+                [
+                    ("MVI1", HoldingAction.DECREASED, 150.0, 15.0, None),
+                    ("MVI4", HoldingAction.NEW_POSITION, 400.0, 40.0, None),
+                    ("MVI2", HoldingAction.SOLD_OUT, 0.0, 0.0, "MVI Energy"),
+                ],
+            ),
+            guru_id=guru_a.id,
+        )
+        # In-place updates and a holding added to an already-counted filing
+        fill_missing_holding_sectors(test_session, {"MVI1": "MVI Tech"})
+        save_holdings_batch(
+            test_session,
+            _holdings(
+                b_q1, guru_b, [("MVI4", HoldingAction.INCREASED, 80.0, 8.0, None)]
+            ),
+        )
+
+        def _snapshot() -> list[tuple[str, dict]]:
+            rows = [
+                *test_session.exec(
+                    select(GuruTickerStat).where(GuruTickerStat.ticker.in_(tickers))
+                ).all(),
+                *test_session.exec(
+                    select(GuruActivityStat).where(GuruActivityStat.ticker.in_(tickers))
+                ).all(),
+                *test_session.exec(
+                    select(GuruSectorStat).where(GuruSectorStat.sector.in_(sectors))
+                ).all(),
+            ]
+            return sorted(
+                ((type(row).__name__, row.model_dump()) for row in rows), key=str
+            )
+
+        incremental = _snapshot()
+        refresh_guru_analytics(test_session)
+
+        assert incremental == _snapshot()
+        mvi1 = test_session.get(GuruTickerStat, ("MVI_STYLE", "MVI1"))
+        assert mvi1 is not None
+        assert mvi1.guru_count == 1
+        assert mvi1.sector == "MVI Tech"
+
+    def test_single_guru_write_should_not_rebuild_scopes(self, test_session: Session):
+        guru = _make_guru(test_session, cik="MVI0003", display_name="No Rebuild")
+        filing = _make_filing(test_session, guru.id, "MVI-C-1", "2024-12-31")
+
+        with patch(
+            "infrastructure.persistence.repositories._rebuild_scope_stats"
+        ) as mock_rebuild:
+            _make_holding(
+                test_session,
+                filing.id,
+                guru.id,
+                "MVI-C-CUSIP",
+                "MVI5",
+                HoldingAction.NEW_POSITION,
+            )
+
+        mock_rebuild.assert_not_called()
+        assert test_session.get(GuruTickerStat, ("", "MVI5")) is not None
+
+    def test_guru_rename_should_refresh_consensus_names(self, test_session: Session):
+        guru_a = _make_guru(test_session, cik="MV0002", display_name="Old Name")
+        guru_b = _make_guru(test_session, cik="MV0003", display_name="Other Guru")
+        for guru, acc in ((guru_a, "MV-ACC-002"), (guru_b, "MV-ACC-003")):
+            filing = _make_filing(test_session, guru.id, acc, "2024-12-31")
+            _make_holding(
+                test_session,
+                filing.id,
+                guru.id,
+                f"{acc}-C",
+                "MSFT",
+                HoldingAction.UNCHANGED,
+            )
+
+        guru_a.display_name = "New Name"
+        update_guru(test_session, guru_a)
+
+        msft = next(
+            r for r in find_consensus_stocks(test_session) if r["ticker"] == "MSFT"
+        )
+        assert {g["display_name"] for g in msft["gurus"]} == {"New Name", "Other Guru"}
+
+    def test_full_refresh_should_rebuild_from_holdings(self, test_session: Session):
+        guru = _make_guru(test_session, cik="MV0004", display_name="Rebuilt Guru")
+        filing = _make_filing(test_session, guru.id, "MV-ACC-004", "2024-12-31")
+        _make_holding(
+            test_session, filing.id, guru.id, "MV-C004", "NVDA", HoldingAction.INCREASED
+        )
+        before = find_grand_portfolio(test_session)
+        for model in (GuruStat, GuruTickerStat):
+            test_session.exec(delete(model))
+        test_session.commit()
+
+        refresh_guru_analytics(test_session)
+
+        assert find_grand_portfolio(test_session) == before
+        assert find_activity_feed(test_session)["most_bought"][0]["ticker"] == "NVDA"
+
+
+class TestCusipTickerIndex:
+    """CUSIP → ticker 持久化索引與持倉代號回填。"""
+
+    def test_upsert_should_keep_company_name_when_not_provided(
+        self, test_session: Session
+    ):
+        upsert_cusip_tickers(
+            test_session,
+            [CusipTicker(cusip="CX0000001", company_name="ACME CORP")],
+        )
+        changed = upsert_cusip_tickers(
+            test_session,
+            [CusipTicker(cusip="CX0000001", ticker="ACME", source="name_hint")],
+        )
+
+        entry = find_cusip_tickers(test_session, ["CX0000001"])["CX0000001"]
+        assert changed == 1
+        assert (entry.ticker, entry.source, entry.company_name) == (
+            "ACME",
+            "name_hint",
+            "ACME CORP",
+        )
+        assert (
+            upsert_cusip_tickers(
+                test_session,
+                [CusipTicker(cusip="CX0000001", ticker="ACME", source="name_hint")],
+            )
+            == 0
+        )
+
+    def test_upsert_should_update_row_inserted_by_concurrent_session(
+        self, test_session: Session
+    ):
+        # 另一個 session 已寫入同一 CUSIP，本 session 的索引讀取仍為舊值（未命中）
+        upsert_cusip_tickers(
+            test_session,
+            [CusipTicker(cusip="CX0000009", company_name="RACE CORP")],
+        )
+        with patch(
+            "infrastructure.persistence.repositories.find_cusip_tickers",
+            return_value={},
+        ):
+            changed = upsert_cusip_tickers(
+                test_session,
+                [CusipTicker(cusip="CX0000009", ticker="RACE", source="name_hint")],
+            )
+
+        test_session.expire_all()
+        entry = find_cusip_tickers(test_session, ["CX0000009"])["CX0000009"]
+        assert changed == 1
+        assert (entry.ticker, entry.source, entry.company_name) == (
+            "RACE",
+            "name_hint",
+            "RACE CORP",
+        )
+
+    def test_fill_missing_holding_tickers_should_backfill_and_refresh(
+        self, test_session: Session
+    ):
+        guru = _make_guru(test_session, cik="CX0002", display_name="Index Guru")
+        filing = _make_filing(test_session, guru.id, "CX-ACC-002", "2024-12-31")
+        holding = _make_holding(
+            test_session,
+            filing.id,
+            guru.id,
+            "CX0000002",
+            None,
+            HoldingAction.NEW_POSITION,
+        )
+        upsert_cusip_tickers(
+            test_session,
+            [CusipTicker(cusip="CX0000002", ticker="IDXG", source="name_hint")],
+        )
+
+        assert fill_missing_holding_tickers(test_session) == {guru.id}
+        test_session.refresh(holding)
+        assert holding.ticker == "IDXG"
+        assert test_session.get(GuruTickerStat, ("", "IDXG")) is not None
+        assert fill_missing_holding_tickers(test_session) == set()
@@ -0,0 +1,199 @@
+"""
+Tests for HistoryCoalescer (micro-batching of single-ticker history requests).
+
+Covers:
+- concurrent requests with the same key are merged into one download
+- a request that was not coalesced uses its own single-ticker fetch
+- different keys are downloaded separately
+- a full batch is dispatched before the window ends
+- tickers missing from the batch result get an empty DataFrame
+- download errors are raised to every waiter
+- _yf_history routes store misses through the coalescer
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from infrastructure.market_data import market_data as md
+from infrastructure.market_data.history_coalescer import HistoryCoalescer
+
+
+def _frame(close: float) -> pd.DataFrame:
+    return pd.DataFrame(
+        {"Close": [close, close + 1]},
+        index=pd.to_datetime(["2026-01-05", "2026-01-06"]),
+    )
+
+
+def _fetch_all(
+    coalescer: HistoryCoalescer, requests: list[tuple[str, str]], download
+) -> dict[str, object]:
+    results: dict[str, object] = {}
+
+    def _run(ticker: str, key: str) -> None:
+        try:
+            results[ticker] = coalescer.fetch(ticker, key, download, lambda: _frame(-1))
+        except Exception as exc:
+            results[ticker] = exc
+
+    threads = [threading.Thread(target=_run, args=r) for r in requests]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    return results
+
+
+class TestHistoryCoalescer:
+    def test_concurrent_requests_should_share_one_download(self):
+        coalescer = HistoryCoalescer(window=0.2)
+        download = MagicMock(
+            side_effect=lambda group: {t: _frame(i) for i, t in enumerate(group)}
+        )
+
+        results = _fetch_all(
+            coalescer, [("NVDA", "1y"), ("AAPL", "1y"), ("MSFT", "1y")], download
+        )
+
+        download.assert_called_once()
+        assert sorted(download.call_args.args[0]) == ["AAPL", "MSFT", "NVDA"]
+        group = download.call_args.args[0]
+        for ticker in ("NVDA", "AAPL", "MSFT"):
+            expected = float(group.index(ticker))
+            assert results[ticker]["Close"].iloc[0] == expected
+
+    def test_different_keys_should_not_be_merged(self):
+        coalescer = HistoryCoalescer(window=0.1)
+        download = MagicMock(side_effect=lambda group: {t: _frame(1) for t in group})
+
+        results = _fetch_all(coalescer, [("NVDA", "1y"), ("AAPL", "3y")], download)
+
+        download.assert_not_called()
+        assert results["NVDA"]["Close"].iloc[0] == -1
+        assert results["AAPL"]["Close"].iloc[0] == -1
+
+    def test_lone_request_should_use_single_fetch(self):
+        coalescer = HistoryCoalescer(window=0.0)
+        download = MagicMock()
+        fetch_single = MagicMock(return_value=_frame(7))
+
+        result = coalescer.fetch("NVDA", "1y", download, fetch_single)
+
+        download.assert_not_called()
+        fetch_single.assert_called_once_with()
+        assert result["Close"].iloc[0] == 7
+
+    def test_full_batch_should_dispatch_before_window(self):
+        coalescer = HistoryCoalescer(window=5.0, max_batch=2)
+        download = MagicMock(side_effect=lambda group: {t: _frame(1) for t in group})
+
+        started = time.monotonic()
+        _fetch_all(coalescer, [("NVDA", "1y"), ("AAPL", "1y")], download)
+
+        assert time.monotonic() - started < 2.0
+        download.assert_called_once()
+
+    def test_missing_ticker_should_get_empty_frame(self):
+        coalescer = HistoryCoalescer(window=0.2)
+
+        results = _fetch_all(
+            coalescer,
+            [("NVDA", "1y"), ("DELISTED", "1y")],
+            lambda group: {"NVDA": _frame(1)},
+        )
+
+        assert isinstance(results["DELISTED"], pd.DataFrame)
+        assert results["DELISTED"].empty
+        assert not results["NVDA"].empty
+
+    def test_download_error_should_reach_every_waiter(self):
+        coalescer = HistoryCoalescer(window=0.2)
+        download = MagicMock(side_effect=OSError("curl: (6)"))
+
+        results = _fetch_all(coalescer, [("NVDA", "1y"), ("AAPL", "1y")], download)
+
+        download.assert_called_once()
+        assert all(isinstance(r, OSError) for r in results.values())
+
+    def test_next_request_should_open_new_batch(self):
+        coalescer = HistoryCoalescer(window=0.0)
+        fetch_single = MagicMock(return_value=_frame(1))
+
+        coalescer.fetch("NVDA", "1y", MagicMock(), fetch_single)
+        coalescer.fetch("NVDA", "1y", MagicMock(), fetch_single)
+
+        assert fetch_single.call_count == 2
+
+
+class TestYfHistoryCoalescing:
+    def test_store_misses_should_be_merged_into_one_download(self):
+        download = MagicMock(
+            side_effect=lambda group, **_: {t: _frame(1) for t in group}
+        )
+
+        def _read_through(ticker, period, fetch_period, fetch_since):
+            return fetch_period(period)
+
+        with (
+            patch.object(md, "_history_coalescer", HistoryCoalescer(window=0.2)),
+            patch.object(md.price_store, "read_through", side_effect=_read_through),
+            patch.object(md, "_download_frames", download),
+            patch.object(md.yf, "Ticker"),
+        ):
+            results = {}
+
+            def _run(ticker: str) -> None:
+                results[ticker] = md._yf_history(ticker, "1y")[1]
+
+            threads = [threading.Thread(target=_run, args=(t,)) for t in ("A", "B")]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(timeout=5)
+
+        download.assert_called_once()
+        assert sorted(download.call_args.args[0]) == ["A", "B"]
+        assert download.call_args.kwargs == {"period": "1y"}
+        assert set(results) == {"A", "B"}
+        assert not results["A"].empty
+
+    def test_empty_result_should_still_be_retryable(self):
+        with (
+            patch.object(md, "_history_coalescer", HistoryCoalescer(window=0.0)),
+            patch.object(
+                md.price_store,
+                "read_through",
+                side_effect=lambda t, p, fp, fs: fp(p),
+            ),
+            patch.object(md, "_download_frames", return_value={}),
+            patch.object(md, "_rate_limiter"),
+            patch.object(md.yf, "Ticker") as mock_ticker,
+            patch.object(md._yf_history.retry, "sleep"),
+        ):
+            mock_ticker.return_value.history.return_value = pd.DataFrame()
+            with pytest.raises(OSError, match="empty history"):
+                md._yf_history("DELISTED", "1y")
+
+    def test_lone_miss_should_use_history_endpoint(self):
+        with (
+            patch.object(md, "_history_coalescer", HistoryCoalescer(window=0.0)),
+            patch.object(
+                md.price_store,
+                "read_through",
+                side_effect=lambda t, p, fp, fs: fp(p),
+            ),
+            patch.object(md, "_download_frames") as mock_download,
+            patch.object(md, "_rate_limiter") as mock_rl,
+            patch.object(md.yf, "Ticker") as mock_ticker,
+        ):
+            mock_ticker.return_value.history.return_value = _frame(1)
+            _stock, hist = md._yf_history("NVDA", "1y")
+
+        mock_download.assert_not_called()
+        mock_ticker.return_value.history.assert_called_once_with(period="1y")
+        mock_rl.wait.assert_called_once_with(md.YF_ENDPOINT_HISTORY)
+        assert not hist.empty
@@ -0,0 +1,124 @@
+"""
+Tests for the market breadth engine (infrastructure/market_data/breadth.py),
+the shared close matrix builder (close_matrix.py) and their use in analyze_market_sentiment / get_market_breadth_history.
+"""
+
+from unittest.mock import patch
+
+import pandas as pd
+
+from domain.analysis import compute_moving_average
+from domain.constants import MA60_WINDOW
+from infrastructure.market_data.breadth import compute_breadth_series
+from infrastructure.market_data.close_matrix import build_close_matrix
+from infrastructure.market_data.market_data import (
+    analyze_market_sentiment,
+    get_market_breadth_history,
+)
+
+MODULE = "infrastructure.market_data.market_data"
+
+
+def _frame(closes: list[float], start: str = "2025-01-01") -> pd.DataFrame:
+    index = pd.bdate_range(start, periods=len(closes), tz="America/New_York")
+    return pd.DataFrame({"Close": closes, "Volume": [1_000] * len(closes)}, index=index)
+
+
+def _rising(n: int = 80) -> list[float]:
+    return [100.0 + i for i in range(n)]
+
+
+def _falling(n: int = 80) -> list[float]:
+    return [200.0 - i for i in range(n)]
+
+
+class TestBuildCloseMatrix:
+    def test_should_align_tickers_on_date_union_and_skip_empty(self):
+        matrix = build_close_matrix(
+            {
+                "AAA": _frame([1.0, 2.0, 3.0]),
+                "BBB": _frame([5.0, 6.0], start="2025-01-02"),
+                "EMPTY": pd.DataFrame(),
+            }
+        )
+
+        assert list(matrix.columns) == ["AAA", "BBB"]
+        assert len(matrix) == 3
+        assert matrix.index.tz is None
+        assert pd.isna(matrix["BBB"].iloc[0])
+
+    def test_should_return_empty_for_no_history(self):
+        assert build_close_matrix({}).empty
+
+
+class TestComputeBreadthSeries:
+    def test_latest_point_should_match_single_ticker_moving_average(self):
+        closes = {"UP": _rising(), "DOWN": _falling(), "SHORT": _rising(30)}
+        breadth = compute_breadth_series(
+            build_close_matrix({t: _frame(c) for t, c in closes.items()})
+        )
+
+        latest = breadth.iloc[-1]
+        expected_below = sum(
+            1
+            for c in closes.values()
+            if (ma := compute_moving_average(c, MA60_WINDOW)) is not None
+            and round(c[-1], 2) < ma
+        )
+        assert int(latest["valid"]) == 2  # SHORT 不足 60 筆
+        assert int(latest["below"]) == expected_below == 1
+        assert latest["below_pct"] == 50.0
+
+    def test_should_start_once_any_ticker_has_a_full_window(self):
+        breadth = compute_breadth_series(build_close_matrix({"UP": _frame(_rising())}))
+
+        assert len(breadth) == 80 - MA60_WINDOW + 1
+        assert (breadth["below"] == 0).all()
+
+    def test_should_carry_last_close_across_other_market_holidays(self):
+        matrix = build_close_matrix(
+            {"UP": _frame(_rising()), "DOWN": _frame(_falling(79))}
+        )
+        breadth = compute_breadth_series(matrix)
+
+        # DOWN 最後一天無資料，沿用前一日收盤與均線，仍計入有效檔數
+        assert int(breadth["valid"].iloc[-1]) == 2
+        assert int(breadth["below"].iloc[-1]) == 1
+
+
+class TestAnalyzeMarketSentimentWithHistory:
+    @patch(f"{MODULE}.get_technical_signals")
+    def test_should_not_fetch_signals_for_tickers_in_hist_map(self, mock_signals):
+        mock_signals.return_value = {"price": 90.0, "ma60": 100.0}
+
+        result = analyze_market_sentiment(
+            ["UP", "DOWN", "OTHER"],
+            hist_map={"UP": _frame(_rising()), "DOWN": _frame(_falling())},
+        )
+
+        mock_signals.assert_called_once_with("OTHER")
+        assert result["below_60ma_pct"] == round(2 / 3 * 100, 1)
+
+
+class TestGetMarketBreadthHistory:
+    @patch(f"{MODULE}.batch_download_history")
+    def test_should_return_daily_points_with_status(self, mock_batch):
+        mock_batch.return_value = {
+            "UP": _frame(_rising()),
+            "DOWN": _frame(_falling()),
+        }
+
+        history = get_market_breadth_history(["UP", "DOWN"], days=5)
+
+        assert len(history) == 5
+        assert history[-1] == {
+            "date": history[-1]["date"],
+            "below": 1,
+            "valid": 2,
+            "below_60ma_pct": 50.0,
+            "status": "NEUTRAL",
+        }
+        assert history[0]["date"] < history[-1]["date"]
+
+    def test_should_return_empty_without_tickers(self):
+        assert get_market_breadth_history([]) == []
@@ -0,0 +1,149 @@
+"""Tests for the multi-symbol quote batch prewarm in market_data."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+from cachetools import TTLCache
+
+from infrastructure.market_data.market_data import (
+    _yf_quote_batch,
+    prewarm_quote_batch,
+)
+
+_MODULE = "infrastructure.market_data.market_data"
+
+
+def _future_ts(days: int = 10) -> int:
+    return int((datetime.now(UTC) + timedelta(days=days)).timestamp())
+
+
+def _caches():
+    return (
+        patch(f"{_MODULE}._earnings_cache", TTLCache(maxsize=100, ttl=300)),
+        patch(f"{_MODULE}._dividend_cache", TTLCache(maxsize=100, ttl=300)),
+        patch(f"{_MODULE}._disk_get", return_value=None),
+        patch(f"{_MODULE}._disk_set"),
+    )
+
+
+class TestYfQuoteBatch:
+    def test_should_request_all_symbols_in_one_call(self):
+        mock_data = MagicMock()
+        mock_data.get_raw_json.return_value = {
+            "quoteResponse": {
+                "result": [{"symbol": "AAPL"}, {"symbol": "MSFT"}],
+                "error": None,
+            }
+        }
+
+        with (
+            patch(f"{_MODULE}.YfData", return_value=mock_data),
+            patch(f"{_MODULE}._rate_limiter"),
+        ):
+            rows = _yf_quote_batch(["AAPL", "MSFT"])
+
+        assert set(rows) == {"AAPL", "MSFT"}
+        mock_data.get_raw_json.assert_called_once()
+        assert mock_data.get_raw_json.call_args.kwargs["params"]["symbols"] == (
+            "AAPL,MSFT"
+        )
+
+
+class TestPrewarmQuoteBatch:
+    def test_should_prime_earnings_and_non_payer_dividends(self):
+        rows = {
+            "TSLA": {
+                "symbol": "TSLA",
+                "earningsTimestampStart": _future_ts(),
+                "trailingAnnualDividendRate": 0,
+                "dividendYield": None,
+            },
+            "VTI": {"symbol": "VTI", "quoteType": "ETF", "dividendYield": 1.3},
+        }
+        earnings_patch, dividend_patch, disk_get, disk_set = _caches()
+
+        with (
+            earnings_patch as earnings_l1,
+            dividend_patch as dividend_l1,
+            disk_get,
+            disk_set,
+            patch(f"{_MODULE}._yf_quote_batch", return_value=rows),
+        ):
+            primed = prewarm_quote_batch(
+                ["TSLA", "VTI"], dividend_tickers=["TSLA", "VTI"]
+            )
+
+            assert primed == 3
+            assert earnings_l1["TSLA"]["earnings_date"] is not None
+            assert earnings_l1["VTI"] == {"ticker": "VTI", "earnings_date": None}
+            assert dividend_l1["TSLA"]["ytd_dividend_per_share"] == 0.0
+            # Dividend payer needs ex-date / YTD history → left for per-ticker fetch
+            assert "VTI" not in dividend_l1
+
+    def test_missing_dividend_fields_should_fall_back_to_per_ticker_fetch(self):
+        rows = {"7203.T": {"symbol": "7203.T", "quoteType": "EQUITY"}}
+        earnings_patch, dividend_patch, disk_get, disk_set = _caches()
+
+        with (
+            earnings_patch,
+            dividend_patch as dividend_l1,
+            disk_get,
+            disk_set as mock_disk_set,
+            patch(f"{_MODULE}._yf_quote_batch", return_value=rows),
+        ):
+            prewarm_quote_batch(["7203.T"], dividend_tickers=["7203.T"])
+
+            # Absent keys are not proof of a non-payer → nothing cached
+            assert "7203.T" not in dividend_l1
+            assert not any(
+                call.args[0].startswith("dividend") for call in mock_disk_set.mock_calls
+            )
+
+    def test_past_earnings_timestamp_should_fall_back_to_calendar(self):
+        past = int((datetime.now(UTC) - timedelta(days=5)).timestamp())
+        rows = {"AAPL": {"symbol": "AAPL", "earningsTimestamp": past}}
+        earnings_patch, dividend_patch, disk_get, disk_set = _caches()
+
+        with (
+            earnings_patch as earnings_l1,
+            dividend_patch,
+            disk_get,
+            disk_set,
+            patch(f"{_MODULE}._yf_quote_batch", return_value=rows),
+        ):
+            primed = prewarm_quote_batch(["AAPL"])
+
+            assert primed == 0
+            assert "AAPL" not in earnings_l1
+
+    def test_should_skip_request_when_all_cached(self):
+        earnings_patch, dividend_patch, disk_get, disk_set = _caches()
+
+        with (
+            earnings_patch as earnings_l1,
+            dividend_patch,
+            disk_get,
+            disk_set,
+            patch(f"{_MODULE}._yf_quote_batch") as mock_batch,
+        ):
+            earnings_l1["AAPL"] = {"ticker": "AAPL", "earnings_date": None}
+
+            assert prewarm_quote_batch(["AAPL"]) == 0
+
+        mock_batch.assert_not_called()
+
+    def test_should_chunk_requests_by_batch_size(self):
+        tickers = [f"T{i}" for i in range(5)]
+        earnings_patch, dividend_patch, disk_get, disk_set = _caches()
+
+        with (
+            earnings_patch,
+            dividend_patch,
+            disk_get,
+            disk_set,
+            patch(f"{_MODULE}.YF_QUOTE_BATCH_SIZE", 2),
+            patch(f"{_MODULE}._yf_quote_batch", return_value={}) as mock_batch,
+        ):
+            prewarm_quote_batch(tickers)
+
+        assert mock_batch.call_count == 3
@@ -28,6 +28,7 @@ from infrastructure.market_data.market_data import (  # noqa: E402
     _etf_sector_weights_cache,
     get_etf_sector_weights,
     get_ticker_sector_cached,
+    get_ticker_sectors_bulk,
 )
 
 
@@ -58,6 +59,30 @@ class TestGetTickerSectorCached:
         mock_yf.assert_not_called()
 
 
+class TestGetTickerSectorsBulk:
+    """get_ticker_sectors_bulk resolves from disk cache then the static GICS map."""
+
+    @patch("infrastructure.market_data.market_data._fetch_sector_from_yf")
+    def test_should_combine_cache_static_map_and_pending(self, mock_yf):
+        _disk_set(f"{DISK_KEY_SECTOR}:BULK_CACHED", "Energy", DISK_SECTOR_TTL)
+        _disk_set(f"{DISK_KEY_SECTOR}:BULK_NONE", _SECTOR_NOT_FOUND, DISK_SECTOR_TTL)
+
+        result = get_ticker_sectors_bulk(
+            ["BULK_CACHED", "BULK_NONE", "JPM", "BULK_UNKNOWN", ""]
+        )
+
+        assert result == {
+            "BULK_CACHED": "Energy",
+            "BULK_NONE": None,
+            "JPM": "Financial Services",
+        }
+        mock_yf.assert_not_called()
+
+    def test_static_hit_should_be_written_to_disk_cache(self):
+        get_ticker_sectors_bulk(["KO"])
+        assert get_ticker_sector_cached("KO") == "Consumer Defensive"
+
+
 def _make_funds_data(sector_weightings):
     """Build a mock yfinance Ticker with funds_data.sector_weightings."""
     fd = MagicMock()
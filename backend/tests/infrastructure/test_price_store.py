@@ -0,0 +1,244 @@
+"""
+Tests for the local OHLCV price store (infrastructure/market_data/price_store.py).
+
+Covers:
+- period_start converts yfinance period strings (and rejects unsupported ones)
+- read_through downloads the full period once, then serves from the store
+- read_through fetches only the delta after the sync interval
+- read_through refetches the full history when the anchor close was re-adjusted
+- a longer period triggers a full download; shorter periods are sliced locally
+- read_through_batch groups delta / full tickers into one download each
+- read_through_batch skips a group whose download fails
+- read_through_batch serves local bars when the delta download fails
+"""
+
+import os
+import tempfile
+
+# Set environment variables BEFORE any app imports
+os.environ.setdefault("LOG_DIR", os.path.join(tempfile.gettempdir(), "folio_test_logs"))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from infrastructure.market_data import price_store
+
+_MODULE = "infrastructure.market_data.price_store"
+
+
+def _make_bars(rows: int, close: float = 100.0, end=None) -> pd.DataFrame:
+    end = end or pd.Timestamp.today().normalize()
+    idx = pd.bdate_range(end=end, periods=rows, tz="America/New_York")
+    closes = [close + i for i in range(rows)]
+    return pd.DataFrame(
+        {
+            "Open": closes,
+            "High": closes,
+            "Low": closes,
+            "Close": closes,
+            "Volume": 1_000_000,
+            "Dividends": 0.0,
+        },
+        index=idx,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _empty_store():
+    price_store.clear_price_store()
+    yield
+    price_store.clear_price_store()
+
+
+class TestPeriodStart:
+    def test_year_period_should_shift_calendar_year(self):
+        assert price_store.period_start("1y", date(2026, 3, 15)) == date(2025, 3, 15)
+
+    def test_month_period_should_clamp_day_to_month_end(self):
+        assert price_store.period_start("1mo", date(2026, 3, 31)) == date(2026, 2, 28)
+
+    def test_day_period_should_include_weekend_buffer(self):
+        assert price_store.period_start("5d", date(2026, 3, 16)) == date(2026, 3, 5)
+
+    def test_unsupported_period_should_return_none(self):
+        assert price_store.period_start("max", date(2026, 3, 16)) is None
+
+
+class TestReadThrough:
+    def test_first_call_should_download_full_period_and_normalize(self):
+        # Arrange
+        fetch_period = MagicMock(return_value=_make_bars(250))
+        fetch_since = MagicMock()
+
+        # Act
+        hist = price_store.read_through("AAPL", "1y", fetch_period, fetch_since)
+
+        # Assert
+        fetch_period.assert_called_once_with("1y")
+        fetch_since.assert_not_called()
+        assert list(hist.columns) == ["Open", "High", "Low", "Close", "Volume"]
+        assert hist.index.tz is None
+
+    def test_second_call_within_sync_interval_should_not_fetch(self):
+        # Arrange
+        fetch_period = MagicMock(return_value=_make_bars(250))
+        fetch_since = MagicMock()
+        price_store.read_through("AAPL", "1y", fetch_period, fetch_since)
+
+        # Act
+        hist = price_store.read_through("AAPL", "5d", fetch_period, fetch_since)
+
+        # Assert
+        assert fetch_period.call_count == 1
+        fetch_since.assert_not_called()
+        assert len(hist) == 5
+
+    def test_stale_store_should_fetch_delta_from_anchor_bar(self):
+        # Arrange
+        stored = _make_bars(250)
+        price_store.read_through("AAPL", "1y", MagicMock(return_value=stored), None)
+        anchor = stored.index[-2].tz_localize(None).normalize()
+        delta = stored.iloc[-2:].copy()
+        delta.iloc[-1, delta.columns.get_loc("Close")] = 999.0
+        fetch_period = MagicMock()
+        fetch_since = MagicMock(return_value=delta)
+
+        # Act
+        with patch(f"{_MODULE}.PRICE_STORE_SYNC_INTERVAL", 0):
+            hist = price_store.read_through("AAPL", "1y", fetch_period, fetch_since)
+
+        # Assert
+        fetch_since.assert_called_once_with(anchor.date())
+        fetch_period.assert_not_called()
+        assert hist["Close"].iloc[-1] == 999.0
+        assert len(hist) == 250
+
+    def test_adjusted_anchor_close_should_trigger_full_refetch(self):
+        # Arrange
+        price_store.read_through(
+            "AAPL", "1y", MagicMock(return_value=_make_bars(250)), None
+        )
+        split_adjusted = _make_bars(250, close=25.0)
+        fetch_period = MagicMock(return_value=split_adjusted)
+        fetch_since = MagicMock(return_value=split_adjusted.iloc[-2:])
+
+        # Act
+        with patch(f"{_MODULE}.PRICE_STORE_SYNC_INTERVAL", 0):
+            hist = price_store.read_through("AAPL", "1y", fetch_period, fetch_since)
+
+        # Assert
+        fetch_period.assert_called_once_with("1y")
+        assert hist["Close"].iloc[0] == 25.0
+
+    def test_longer_period_should_download_full_then_serve_shorter_locally(self):
+        # Arrange
+        price_store.read_through(
+            "AAPL", "1y", MagicMock(return_value=_make_bars(250)), None
+        )
+        fetch_3y = MagicMock(return_value=_make_bars(750))
+
+        # Act
+        hist_3y = price_store.read_through("AAPL", "3y", fetch_3y, None)
+        hist_1y = price_store.read_through("AAPL", "1y", MagicMock(), None)
+
+        # Assert
+        fetch_3y.assert_called_once_with("3y")
+        assert len(hist_3y) == 750
+        assert 240 <= len(hist_1y) <= 265
+
+    def test_empty_full_download_should_not_be_stored(self):
+        # Arrange
+        fetch_period = MagicMock(return_value=pd.DataFrame())
+
+        # Act
+        hist = price_store.read_through("DEAD", "1y", fetch_period, None)
+        price_store.read_through("DEAD", "1y", fetch_period, None)
+
+        # Assert
+        assert hist.empty
+        assert fetch_period.call_count == 2
+
+    def test_unsupported_period_should_bypass_store(self):
+        # Arrange
+        raw = _make_bars(10)
+        fetch_period = MagicMock(return_value=raw)
+
+        # Act
+        hist = price_store.read_through("AAPL", "max", fetch_period, None)
+
+        # Assert
+        assert hist is raw
+        assert price_store._load("AAPL") is None
+
+
+class TestReadThroughBatch:
+    def test_should_group_delta_and_full_tickers_into_single_downloads(self):
+        # Arrange
+        stored = _make_bars(250)
+        price_store.read_through("AAPL", "1y", MagicMock(return_value=stored), None)
+        download_period = MagicMock(return_value={"MSFT": _make_bars(250)})
+        download_since = MagicMock(return_value={"AAPL": stored.iloc[-2:]})
+
+        # Act
+        with patch(f"{_MODULE}.PRICE_STORE_SYNC_INTERVAL", 0):
+            frames = price_store.read_through_batch(
+                ["AAPL", "MSFT"], "1y", download_period, download_since
+            )
+
+        # Assert
+        download_period.assert_called_once_with(["MSFT"], "1y")
+        download_since.assert_called_once()
+        assert download_since.call_args.args[0] == ["AAPL"]
+        assert set(frames) == {"AAPL", "MSFT"}
+
+    def test_fresh_tickers_should_not_be_downloaded(self):
+        # Arrange
+        price_store.read_through(
+            "AAPL", "2y", MagicMock(return_value=_make_bars(500)), None
+        )
+        download_period = MagicMock(return_value={})
+        download_since = MagicMock()
+
+        # Act
+        frames = price_store.read_through_batch(
+            ["AAPL"], "1y", download_period, download_since
+        )
+
+        # Assert
+        download_period.assert_not_called()
+        download_since.assert_not_called()
+        assert 240 <= len(frames["AAPL"]) <= 265
+
+    def test_failed_group_download_should_be_skipped(self):
+        # Arrange
+        download_period = MagicMock(side_effect=RuntimeError("rate limited"))
+
+        # Act
+        frames = price_store.read_through_batch(
+            ["AAPL", "MSFT"], "1y", download_period, MagicMock()
+        )
+
+        # Assert
+        assert frames == {}
+
+    def test_failed_delta_download_should_serve_local_bars(self):
+        # Arrange
+        stored = _make_bars(250)
+        price_store.read_through("AAPL", "1y", MagicMock(return_value=stored), None)
+        download_period = MagicMock(return_value={})
+        download_since = MagicMock(side_effect=RuntimeError("rate limited"))
+
+        # Act
+        with patch(f"{_MODULE}.PRICE_STORE_SYNC_INTERVAL", 0):
+            frames = price_store.read_through_batch(
+                ["AAPL"], "1y", download_period, download_since
+            )
+
+        # Assert
+        download_since.assert_called_once()
+        download_period.assert_not_called()
+        assert 240 <= len(frames["AAPL"]) <= 250
@@ -0,0 +1,234 @@
+"""
+Tests for the yfinance token-bucket RateLimiter in market_data.py.
+
+Covers:
+- burst credit lets the first calls after idle through without waiting
+- calls beyond the burst wait for the token deficit
+- waiting on one endpoint does not block other endpoints
+- endpoints have independent budgets
+- endpoint rates split the recommended global budget; global burst is shared
+- interactive requests overtake queued lower-priority lanes
+- report_throttled halves the endpoint rate; report_success recovers it
+- _yf_request reports 429 errors as throttling
+- empty yf.download results count as throttling only when yfinance logged a 429
+"""
+
+import os
+import tempfile
+
+# Set environment variables BEFORE any app imports
+os.environ.setdefault("LOG_DIR", os.path.join(tempfile.gettempdir(), "folio_test_logs"))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import domain.constants
+
+domain.constants.DISK_CACHE_DIR = os.path.join(
+    tempfile.gettempdir(), "folio_test_cache_rate_limiter"
+)
+
+import threading  # noqa: E402
+import time  # noqa: E402
+from unittest.mock import MagicMock, patch  # noqa: E402
+
+import pytest  # noqa: E402
+
+from domain.constants import (  # noqa: E402  # noqa: E402
+    YF_LANE_BACKFILL,
+    YF_LANE_INTERACTIVE,
+    YFINANCE_ENDPOINT_RATE_LIMITS,
+    YFINANCE_GLOBAL_RATE_LIMIT_CPS,
+    YFINANCE_RATE_LIMIT_CPS,
+)
+from infrastructure.market_data.market_data import (  # noqa: E402
+    RateLimiter,
+    _download_was_throttled,
+    _yf_request,
+)
+from infrastructure.market_data.request_scheduler import request_lane  # noqa: E402
+
+_MODULE = "infrastructure.market_data.market_data"
+
+
+def _limiter(rate: float = 1.0, burst: float = 2) -> RateLimiter:
+    return RateLimiter(
+        calls_per_second=100.0,
+        endpoint_rates={"history": rate, "info": rate},
+        burst=burst,
+    )
+
+
+def _timed_wait(limiter: RateLimiter, endpoint: str) -> float:
+    started = time.monotonic()
+    limiter.wait(endpoint)
+    return time.monotonic() - started
+
+
+class TestTokenBucket:
+    def test_burst_credit_should_allow_calls_without_waiting(self):
+        limiter = _limiter(burst=2)
+
+        assert _timed_wait(limiter, "history") < 0.05
+        assert _timed_wait(limiter, "history") < 0.05
+
+    def test_call_beyond_burst_should_wait_for_token_deficit(self):
+        limiter = _limiter(rate=5.0, burst=1)
+
+        limiter.wait("history")
+        elapsed = _timed_wait(limiter, "history")
+
+        assert elapsed == pytest.approx(0.2, abs=0.1)
+
+    def test_endpoints_should_have_independent_budgets(self):
+        limiter = _limiter(rate=0.5, burst=1)
+
+        limiter.wait("history")
+
+        assert _timed_wait(limiter, "info") < 0.05
+
+    def test_waiter_should_not_block_other_endpoints(self):
+        limiter = _limiter(rate=1.0, burst=1)
+        limiter.wait("history")  # drain the burst credit
+        waiter = threading.Thread(target=limiter.wait, args=("history",))
+        waiter.start()
+        for _ in range(100):
+            if limiter.queue_depths():
+                break
+            time.sleep(0.005)
+
+        # Act — another endpoint must get its token while the first still waits
+        elapsed = _timed_wait(limiter, "info")
+        waiter.join(timeout=5)
+
+        assert elapsed < 0.5
+        assert limiter.queue_depths() == {}
+
+
+class TestBudget:
+    def test_global_bucket_should_be_the_only_hard_cap(self):
+        assert YFINANCE_GLOBAL_RATE_LIMIT_CPS == YFINANCE_RATE_LIMIT_CPS
+        assert all(
+            rate == YFINANCE_GLOBAL_RATE_LIMIT_CPS
+            for rate in YFINANCE_ENDPOINT_RATE_LIMITS.values()
+        )
+
+    def test_busy_endpoint_should_use_idle_endpoints_budget(self):
+        limiter = RateLimiter(
+            calls_per_second=10.0,
+            endpoint_rates={"history": 10.0, "download": 10.0},
+            burst=1,
+        )
+
+        limiter.wait("download")
+        elapsed = _timed_wait(limiter, "download")
+
+        assert elapsed == pytest.approx(0.1, abs=0.08)
+
+    def test_global_burst_should_be_shared_across_endpoints(self):
+        limiter = RateLimiter(
+            calls_per_second=5.0, endpoint_rates={"history": 100, "info": 100}, burst=2
+        )
+
+        limiter.wait("history")
+        limiter.wait("info")
+        elapsed = _timed_wait(limiter, "info")
+
+        assert elapsed == pytest.approx(0.2, abs=0.1)
+
+
+class TestLanePriority:
+    def test_interactive_request_should_overtake_queued_backfill(self):
+        limiter = RateLimiter(
+            calls_per_second=10.0, endpoint_rates={"history": 100.0}, burst=1
+        )
+        limiter.wait("history")  # drain the global burst credit
+        order: list[str] = []
+
+        def _call(lane: str, label: str) -> None:
+            with request_lane(lane):
+                limiter.wait("history")
+            order.append(label)
+
+        threads = [
+            threading.Thread(target=_call, args=(YF_LANE_BACKFILL, f"backfill-{i}"))
+            for i in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for _ in range(200):
+            if limiter.queue_depths().get(YF_LANE_BACKFILL, 0) + len(order) == 4:
+                break
+            time.sleep(0.005)
+        interactive = threading.Thread(
+            target=_call, args=(YF_LANE_INTERACTIVE, "interactive")
+        )
+        interactive.start()
+        for thread in [*threads, interactive]:
+            thread.join(timeout=5)
+
+        assert len(order) == 5
+        # 最多只讓已在隊首的回填請求先行
+        assert order.index("interactive") <= 2
+        assert limiter.queue_depths() == {}
+
+
+class TestAdaptiveBackoff:
+    def test_report_throttled_should_halve_endpoint_rate(self):
+        limiter = _limiter(rate=0.4)
+
+        limiter.report_throttled("history")
+
+        assert limiter.current_rates()["history"] == pytest.approx(0.2)
+        assert limiter.current_rates()["info"] == pytest.approx(0.4)
+
+    def test_backoff_should_not_drop_below_minimum_multiplier(self):
+        limiter = _limiter(rate=0.8)
+
+        for _ in range(10):
+            limiter.report_throttled("history")
+
+        assert limiter.current_rates()["history"] == pytest.approx(0.1)
+
+    def test_report_success_should_recover_rate_gradually(self):
+        limiter = _limiter(rate=1.0)
+        limiter.report_throttled("history")
+
+        limiter.report_success("history")
+        assert limiter.current_rates()["history"] == pytest.approx(0.55)
+
+        for _ in range(20):
+            limiter.report_success("history")
+        assert limiter.current_rates()["history"] == pytest.approx(1.0)
+
+
+class TestYfRequest:
+    def test_429_error_should_report_throttled_and_reraise(self):
+        mock_rl = MagicMock()
+
+        with (
+            patch(f"{_MODULE}._rate_limiter", mock_rl),
+            pytest.raises(RuntimeError),
+            _yf_request("info"),
+        ):
+            raise RuntimeError("HTTP Error 429: Too Many Requests")
+
+        mock_rl.wait.assert_called_once_with("info")
+        mock_rl.report_throttled.assert_called_once_with("info")
+        mock_rl.report_success.assert_not_called()
+
+    def test_success_should_report_success(self):
+        mock_rl = MagicMock()
+
+        with patch(f"{_MODULE}._rate_limiter", mock_rl), _yf_request("history"):
+            pass
+
+        mock_rl.report_success.assert_called_once_with("history")
+        mock_rl.report_throttled.assert_not_called()
+
+    def test_empty_download_should_only_count_as_throttled_on_429(self):
+        with patch(f"{_MODULE}.yf.shared._ERRORS", {"NVDA": "DNSError('curl: (6)')"}):
+            assert not _download_was_throttled()
+        with patch(
+            f"{_MODULE}.yf.shared._ERRORS",
+            {"NVDA": "YFRateLimitError('Too Many Requests. Rate limited.')"},
+        ):
+            assert _download_was_throttled()
@@ -9,11 +9,14 @@ from sqlmodel import Session
 from domain.entities import RemovalLog, ScanLog, Stock, ThesisLog
 from domain.enums import StockCategory
 from infrastructure.repositories import (
+    bulk_create_scan_logs,
+    bulk_update_scan_signals,
     create_removal_log,
     create_scan_log,
     create_thesis_log,
     find_latest_removal,
     find_latest_removals_batch,
+    find_recent_scan_logs_for_tickers,
     find_removal_history,
     find_scan_history,
     find_thesis_history,
@@ -187,6 +190,32 @@ class TestScanLogRepository:
         history = find_scan_history(test_session, "MSFT", limit=2)
         assert len(history) <= 2
 
+    def test_find_recent_scan_logs_for_tickers_limits_per_ticker(
+        self, test_session: Session
+    ):
+        base = datetime(2026, 1, 5, 9, 0)
+        logs = [
+            ScanLog(
+                stock_ticker=ticker,
+                signal=f"S{i}",
+                market_status="NEUTRAL",
+                scanned_at=base + timedelta(minutes=i),
+            )
+            for ticker in ("AAPL", "MSFT")
+            for i in range(5)
+        ]
+        bulk_create_scan_logs(test_session, logs)
+        test_session.commit()
+
+        grouped = find_recent_scan_logs_for_tickers(
+            test_session, ["AAPL", "MSFT"], limit_per_ticker=3
+        )
+
+        assert set(grouped) == {"AAPL", "MSFT"}
+        assert [row.signal for row in grouped["AAPL"]] == ["S4", "S3", "S2"]
+        assert grouped["MSFT"][0].scanned_at == base + timedelta(minutes=4)
+        assert find_recent_scan_logs_for_tickers(test_session, []) == {}
+
     def test_find_scan_history_ordered_desc(self, test_session: Session):
         now = datetime.now(UTC)
         for i in range(3):
@@ -206,3 +235,47 @@ class TestScanLogRepository:
     def test_find_scan_history_empty_for_unknown_ticker(self, test_session: Session):
         history = find_scan_history(test_session, "NO_SCAN_TICKER")
         assert history == []
+
+    def test_bulk_create_scan_logs_should_insert_all_rows(self, test_session: Session):
+        scanned_at = datetime(2025, 1, 2, tzinfo=UTC)
+        logs = [
+            ScanLog(
+                stock_ticker=ticker,
+                signal="OVERSOLD",
+                market_status="NEUTRAL",
+                scanned_at=scanned_at,
+            )
+            for ticker in ("AAPL", "MSFT")
+        ]
+
+        inserted = bulk_create_scan_logs(test_session, logs)
+        test_session.commit()
+
+        assert inserted == 2
+        for ticker in ("AAPL", "MSFT"):
+            history = find_scan_history(test_session, ticker)
+            assert [h.signal for h in history] == ["OVERSOLD"]
+
+    def test_bulk_create_scan_logs_should_noop_on_empty_list(
+        self, test_session: Session
+    ):
+        assert bulk_create_scan_logs(test_session, []) == 0
+
+    def test_bulk_update_scan_signals_should_skip_unknown_tickers(
+        self, test_session: Session
+    ):
+        since = datetime(2025, 3, 1, tzinfo=UTC)
+
+        bulk_update_scan_signals(
+            test_session,
+            {"AAPL": "OVERSOLD", "MSFT": "CAUTION_HIGH", "ZZZZ": "OVERSOLD"},
+            {"AAPL": since},
+        )
+
+        test_session.expire_all()
+        aapl = test_session.get(Stock, "AAPL")
+        msft = test_session.get(Stock, "MSFT")
+        assert aapl.last_scan_signal == "OVERSOLD"
+        assert aapl.signal_since.replace(tzinfo=UTC) == since
+        assert msft.last_scan_signal == "CAUTION_HIGH"
+        assert test_session.get(Stock, "ZZZZ") is None
@@ -0,0 +1,140 @@
+"""
+Tests for the yfinance request scheduler (request lanes + weighted fair queue).
+
+Covers:
+- request_lane sets / restores the context lane and works as a decorator
+- LaneThreadPoolExecutor propagates the caller's lane to worker threads
+- FairRequestQueue serves higher-weight lanes first without starving low lanes
+- idle lanes do not bank credit; eligibility filter and cancel
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from domain.constants import (
+    YF_LANE_BACKFILL,
+    YF_LANE_INTERACTIVE,
+    YF_LANE_SCAN,
+    YF_LANE_WEIGHTS,
+)
+from infrastructure.market_data.request_scheduler import (
+    FairRequestQueue,
+    LaneThreadPoolExecutor,
+    current_request_lane,
+    request_lane,
+)
+
+
+class TestRequestLane:
+    def test_default_lane_should_be_interactive(self):
+        assert current_request_lane() == YF_LANE_INTERACTIVE
+
+    def test_context_manager_should_restore_previous_lane(self):
+        with request_lane(YF_LANE_SCAN):
+            assert current_request_lane() == YF_LANE_SCAN
+            with request_lane(YF_LANE_BACKFILL):
+                assert current_request_lane() == YF_LANE_BACKFILL
+            assert current_request_lane() == YF_LANE_SCAN
+        assert current_request_lane() == YF_LANE_INTERACTIVE
+
+    def test_decorator_should_apply_lane_per_call(self):
+        @request_lane(YF_LANE_BACKFILL)
+        def _job() -> str:
+            return current_request_lane()
+
+        assert _job() == YF_LANE_BACKFILL
+        assert _job() == YF_LANE_BACKFILL
+        assert current_request_lane() == YF_LANE_INTERACTIVE
+
+    def test_unknown_lane_should_raise(self):
+        with pytest.raises(ValueError, match="urgent"), request_lane("urgent"):
+            pass
+
+
+class TestLaneThreadPoolExecutor:
+    def test_worker_should_inherit_caller_lane(self):
+        with (
+            request_lane(YF_LANE_SCAN),
+            LaneThreadPoolExecutor(max_workers=2) as pool,
+        ):
+            lanes = list(pool.map(lambda _: current_request_lane(), range(4)))
+
+        assert lanes == [YF_LANE_SCAN] * 4
+
+    def test_plain_executor_should_not_inherit_lane(self):
+        with request_lane(YF_LANE_SCAN), ThreadPoolExecutor(max_workers=1) as pool:
+            lane = pool.submit(current_request_lane).result()
+
+        assert lane == YF_LANE_INTERACTIVE
+
+
+def _drain(queue: FairRequestQueue, count: int) -> list[str]:
+    served = []
+    for _ in range(count):
+        head = queue.first()
+        assert head is not None
+        queue.dispatch(head)
+        served.append(head.lane)
+        # 持續積壓：被服務的通道立即補上一筆
+        queue.enqueue(head.lane, head.endpoint)
+    return served
+
+
+class TestFairRequestQueue:
+    def test_higher_weight_lane_should_be_served_first(self):
+        queue = FairRequestQueue()
+        queue.enqueue(YF_LANE_BACKFILL, "history")
+        queue.enqueue(YF_LANE_BACKFILL, "history")
+        queue.enqueue(YF_LANE_INTERACTIVE, "history")
+
+        served = []
+        while (head := queue.first()) is not None:
+            queue.dispatch(head)
+            served.append(head.lane)
+
+        # 同標記依到達順序；其後互動請求先於第二筆回填
+        assert served == [YF_LANE_BACKFILL, YF_LANE_INTERACTIVE, YF_LANE_BACKFILL]
+
+    def test_backlogged_lanes_should_share_by_weight(self):
+        queue = FairRequestQueue()
+        queue.enqueue(YF_LANE_INTERACTIVE, "history")
+        queue.enqueue(YF_LANE_BACKFILL, "history")
+
+        served = _drain(queue, 90)
+
+        interactive = YF_LANE_WEIGHTS[YF_LANE_INTERACTIVE]
+        backfill = YF_LANE_WEIGHTS[YF_LANE_BACKFILL]
+        expected = 90 * backfill / (interactive + backfill)
+        assert served.count(YF_LANE_BACKFILL) == pytest.approx(expected, abs=1)
+
+    def test_idle_lane_should_not_bank_credit(self):
+        queue = FairRequestQueue()
+        queue.enqueue(YF_LANE_SCAN, "history")
+        _drain(queue, 20)
+
+        # 長時間閒置的互動通道回來後不得一次搶走大量額度
+        late = queue.enqueue(YF_LANE_INTERACTIVE, "history")
+        head = queue.first()
+
+        assert head is not None
+        assert late.start_tag >= head.start_tag
+
+    def test_first_should_respect_eligibility(self):
+        queue = FairRequestQueue()
+        queue.enqueue(YF_LANE_INTERACTIVE, "info")
+        scan = queue.enqueue(YF_LANE_SCAN, "history")
+
+        assert queue.first(lambda r: r.endpoint == "history") is scan
+        assert queue.first(lambda r: False) is None
+
+    def test_cancel_should_remove_without_advancing(self):
+        queue = FairRequestQueue()
+        request = queue.enqueue(YF_LANE_SCAN, "history")
+
+        queue.cancel(request)
+        queue.cancel(request)  # idempotent
+
+        assert len(queue) == 0
+        assert queue.depths() == {}
+        assert queue.enqueue(YF_LANE_INTERACTIVE, "history").start_tag == 0.0
@@ -10,11 +10,13 @@ from sqlmodel import Session
 from domain.entities import Guru, GuruFiling, GuruHolding
 from infrastructure.external.sec_edgar import (
     _discover_infotable_filename,
+    _NameHintMatcher,
     _parse_13f_xml,
     fetch_13f_filing_detail,
     fetch_company_filings,
     get_latest_13f_filings,
     map_cusip_to_ticker,
+    resolve_cusip,
 )
 from infrastructure.repositories import (
     deactivate_guru,
@@ -136,6 +138,43 @@ class TestParse13fXml:
         result = _parse_13f_xml("")
         assert result == []
 
+    def test_parse_13f_xml_should_match_namespaced_tags(self):
+        xml = (
+            '<ns1:informationTable xmlns:ns1="http://www.sec.gov/edgar/document/'
+            'thirteenf/informationtable">'
+            "<ns1:infoTable><ns1:nameOfIssuer>APPLE INC</ns1:nameOfIssuer>"
+            "<ns1:cusip>037833100</ns1:cusip><ns1:value>10</ns1:value>"
+            "<ns1:shrsOrPrnAmt><ns1:sshPrnamt>5</ns1:sshPrnamt></ns1:shrsOrPrnAmt>"
+            "</ns1:infoTable></ns1:informationTable>"
+        )
+        assert _parse_13f_xml(xml) == [
+            {
+                "cusip": "037833100",
+                "company_name": "APPLE INC",
+                "value": 10.0,
+                "shares": 5.0,
+            }
+        ]
+
+    def test_parse_13f_xml_should_stream_across_chunk_boundaries(self):
+        rows = "".join(
+            f"<infoTable><nameOfIssuer>CO {i}</nameOfIssuer><cusip>C{i:08d}</cusip>"
+            f"<value>{i}</value><shrsOrPrnAmt><sshPrnamt>{i}</sshPrnamt>"
+            "</shrsOrPrnAmt></infoTable>"
+            for i in range(500)
+        )
+        xml = f"<informationTable>{rows}</informationTable>".encode()
+
+        with patch("infrastructure.external.sec_edgar._XML_FEED_CHUNK_SIZE", 37):
+            result = _parse_13f_xml(xml)
+
+        assert len(result) == 500
+        assert result[-1]["cusip"] == "C00000499"
+
+    def test_parse_13f_xml_should_discard_partial_results_when_truncated(self):
+        truncated = _SAMPLE_13F_XML[: _SAMPLE_13F_XML.index("<infoTable>", 100)]
+        assert _parse_13f_xml(truncated) == []
+
     def test_parse_13f_xml_should_uppercase_cusip(self):
         xml = _SAMPLE_13F_XML.replace("037833100", "037833100")
         result = _parse_13f_xml(xml)
@@ -171,6 +210,19 @@ class TestMapCusipToTicker:
         result = map_cusip_to_ticker("037833100", "")
         assert result == "AAPL"
 
+    def test_resolve_cusip_should_report_resolution_source(self):
+        assert resolve_cusip("037833100", "") == ("AAPL", "static")
+        assert resolve_cusip("XXXXXXXXX", "NVIDIA CORP COM") == ("NVDA", "name_hint")
+        assert resolve_cusip("XXXXXXXXX", "UNKNOWN CORP") == (None, "unresolved")
+
+    def test_name_hint_matcher_should_prefer_earlier_hint_when_several_match(self):
+        matcher = _NameHintMatcher({"HERS": "B", "SHE": "A", "HE": "C"})
+        # "USHERS" 同時含 SHE / HE / HERS，依對照表順序 HERS 優先
+        assert matcher.match("USHERS") == "B"
+        assert matcher.match("USHE") == "A"
+        assert matcher.match("THE") == "C"
+        assert matcher.match("SH") is None
+
 
 # ---------------------------------------------------------------------------
 # fetch_company_filings (mocked HTTP)
@@ -227,6 +279,59 @@ class TestFetchCompanyFilings:
         assert mock_get.call_count == 1
 
 
+class TestConditionalRequests:
+    """Submissions are revalidated with ETag / Last-Modified via the pooled client."""
+
+    def test_should_send_validators_and_reuse_stored_payload_on_304(self):
+        import httpx
+
+        from infrastructure.external.sec_edgar import _http_get_json
+
+        disk: dict = {}
+        seen_headers: list[httpx.Headers] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_headers.append(request.headers)
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(
+                200,
+                json=_SAMPLE_SUBMISSIONS,
+                headers={
+                    "ETag": '"v1"',
+                    "Last-Modified": "Mon, 03 Feb 2025 00:00:00 GMT",
+                },
+            )
+
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        with (
+            patch("infrastructure.external.sec_edgar._get_client", return_value=client),
+            patch("infrastructure.external.sec_edgar._disk_get", side_effect=disk.get),
+            patch(
+                "infrastructure.external.sec_edgar._disk_set",
+                side_effect=lambda key, value, _ttl: disk.__setitem__(key, value),
+            ),
+        ):
+            first = _http_get_json("https://example.test/s.json", revalidate_key="k")
+            second = _http_get_json("https://example.test/s.json", revalidate_key="k")
+
+        assert first == second == _SAMPLE_SUBMISSIONS
+        assert "If-None-Match" not in seen_headers[0]
+        assert seen_headers[1]["If-None-Match"] == '"v1"'
+        assert seen_headers[1]["If-Modified-Since"] == "Mon, 03 Feb 2025 00:00:00 GMT"
+        assert disk["k"]["etag"] == '"v1"'
+
+    def test_pooled_client_should_be_reused_until_closed(self):
+        from infrastructure.external.sec_edgar import _get_client, close_http_client
+
+        client = _get_client()
+
+        assert _get_client() is client
+        close_http_client()
+        assert _get_client() is not client
+        close_http_client()
+
+
 # ---------------------------------------------------------------------------
 # get_latest_13f_filings (mocked fetch_company_filings)
 # ---------------------------------------------------------------------------
@@ -383,8 +488,8 @@ class TestFetch13fFilingDetail:
                 return_value="50240.xml",
             ),
             patch(
-                "infrastructure.external.sec_edgar._http_get_text",
-                return_value=_SAMPLE_13F_XML,
+                "infrastructure.external.sec_edgar._http_stream_13f_holdings",
+                return_value=_parse_13f_xml(_SAMPLE_13F_XML),
             ),
         ):
             result = fetch_13f_filing_detail("0001067983-25-000006", "0001067983")
@@ -403,7 +508,7 @@ class TestFetch13fFilingDetail:
                 return_value="infotable.xml",
             ),
             patch(
-                "infrastructure.external.sec_edgar._http_get_text",
+                "infrastructure.external.sec_edgar._http_stream_13f_holdings",
                 side_effect=Exception("network error"),
             ),
         ):
@@ -422,8 +527,8 @@ class TestFetch13fFilingDetail:
                 return_value=None,  # Discovery failed
             ),
             patch(
-                "infrastructure.external.sec_edgar._http_get_text",
-                return_value=_SAMPLE_13F_XML,
+                "infrastructure.external.sec_edgar._http_stream_13f_holdings",
+                return_value=_parse_13f_xml(_SAMPLE_13F_XML),
             ) as mock_get_text,
         ):
             result = fetch_13f_filing_detail("0001067983-25-000006", "0001067983")
@@ -434,6 +539,42 @@ class TestFetch13fFilingDetail:
         called_url = mock_get_text.call_args[0][0]
         assert "infotable.xml" in called_url
 
+    def test_infotable_should_be_streamed_into_parser(self):
+        import httpx
+
+        from infrastructure.external import sec_edgar
+
+        payload = _SAMPLE_13F_XML.encode()
+        fed: list[int] = []
+        real_parse_chunks = sec_edgar._parse_13f_chunks
+
+        def _recording_parse(chunks):
+            def _record():
+                for chunk in chunks:
+                    fed.append(len(chunk))
+                    yield chunk
+
+            return real_parse_chunks(_record())
+
+        client = httpx.Client(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, content=payload)
+            )
+        )
+        with (
+            patch.object(sec_edgar, "_get_client", return_value=client),
+            patch.object(sec_edgar, "_XML_FEED_CHUNK_SIZE", 64),
+            patch.object(sec_edgar, "_parse_13f_chunks", side_effect=_recording_parse),
+        ):
+            result = sec_edgar._http_stream_13f_holdings(
+                "https://example.test/infotable.xml"
+            )
+
+        assert result == _parse_13f_xml(_SAMPLE_13F_XML)
+        # 以回應區塊逐段餵入，從未一次取得整份文件
+        assert len(fed) > 1
+        assert max(fed) <= 64
+
 
 # ---------------------------------------------------------------------------
 # Guru Repository tests (in-memory SQLite)
@@ -0,0 +1,177 @@
+"""
+Tests for the host-shared cache tier (infrastructure/shared_cache.py).
+
+Covers:
+- SharedCache: a second instance (another worker) reads what the first wrote
+- SharedCache.clear() invalidates other instances' L1 via the shared generation
+- leases are exclusive and only released by their holder
+- leases are renewed by the holder's heartbeat and expire soon after it dies
+- host_single_flight: waiters read the holder's result instead of recomputing
+- claim_host_task: a task runs once per host until its done marker expires
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+from infrastructure import shared_cache
+from infrastructure.shared_cache import (
+    SharedCache,
+    acquire_lease,
+    claim_host_task,
+    complete_host_task,
+    host_single_flight,
+    is_lease_held,
+    release_lease,
+)
+
+
+class TestSharedCache:
+    def test_second_worker_should_read_value_written_by_first(self):
+        worker_a = SharedCache("test-ns", maxsize=8, ttl=60)
+        worker_b = SharedCache("test-ns", maxsize=8, ttl=60)
+
+        worker_a.set("key", {"value": 1})
+
+        assert worker_b.get("key") == {"value": 1}
+
+    def test_clear_should_invalidate_other_workers_l1(self):
+        worker_a = SharedCache("test-ns", maxsize=8, ttl=60)
+        worker_b = SharedCache("test-ns", maxsize=8, ttl=60)
+        worker_a.set("key", "stale")
+        assert worker_b.get("key") == "stale"  # now in worker B's L1
+
+        worker_a.clear()
+
+        assert worker_b.get("key") is None
+
+    def test_namespaces_should_not_collide(self):
+        SharedCache("ns-a", maxsize=8, ttl=60).set("key", "a")
+
+        assert SharedCache("ns-b", maxsize=8, ttl=60).get("key") is None
+
+
+class TestLease:
+    def test_lease_should_be_exclusive_until_released(self):
+        token = acquire_lease("job")
+
+        assert token is not None
+        assert acquire_lease("job") is None
+
+        release_lease("job", token)
+        assert not is_lease_held("job")
+
+    def test_release_with_foreign_token_should_keep_lease(self):
+        token = acquire_lease("job")
+
+        release_lease("job", "someone-else")
+
+        assert is_lease_held("job")
+        release_lease("job", token)
+
+    def test_heartbeat_should_keep_live_holder_lease(self):
+        with patch.object(shared_cache, "SHARED_LEASE_HEARTBEAT_TTL", 0.3):
+            token = acquire_lease("long-job", ttl=60)
+            assert token is not None
+            for _ in range(4):
+                time.sleep(0.15)
+                shared_cache._renew_held_leases()
+
+            assert is_lease_held("long-job")
+            release_lease("long-job", token)
+
+        assert not is_lease_held("long-job")
+
+    def test_dead_holder_lease_should_expire_after_heartbeat_ttl(self):
+        with patch.object(shared_cache, "SHARED_LEASE_HEARTBEAT_TTL", 0.3):
+            token = acquire_lease("crashed-job", ttl=1800)
+            assert token is not None
+            # 模擬持有程序崩潰：不再續約
+            shared_cache._held_leases.clear()
+            time.sleep(0.4)
+
+            assert not is_lease_held("crashed-job")
+            assert acquire_lease("crashed-job", ttl=60) is not None
+
+    def test_heartbeat_should_stop_at_lease_ttl(self):
+        with patch.object(shared_cache, "SHARED_LEASE_HEARTBEAT_TTL", 0.2):
+            token = acquire_lease("capped-job", ttl=0.5)
+            assert token is not None
+            shared_cache._track_lease(
+                shared_cache._lease_key("capped-job"), token, time.monotonic() + 0.25
+            )
+            time.sleep(0.15)
+            shared_cache._renew_held_leases()
+            time.sleep(0.2)
+            shared_cache._renew_held_leases()
+
+            assert not is_lease_held("capped-job")
+            assert "lease:capped-job" not in shared_cache._held_leases
+
+
+class TestHostSingleFlight:
+    def test_waiter_should_use_holder_result_without_computing(self):
+        shared: dict[str, str] = {}
+        compute_calls = {"n": 0}
+        token = acquire_lease("fetch:NVDA")  # another worker is fetching
+        result: dict[str, str] = {}
+
+        def _compute() -> str:
+            compute_calls["n"] += 1
+            return "recomputed"
+
+        def _waiter() -> None:
+            result["value"] = host_single_flight(
+                "fetch:NVDA", _compute, lambda: shared.get("NVDA")
+            )
+
+        waiter = threading.Thread(target=_waiter)
+        waiter.start()
+        time.sleep(0.2)
+        shared["NVDA"] = "from-holder"
+        release_lease("fetch:NVDA", token)
+        waiter.join(timeout=5)
+
+        assert result["value"] == "from-holder"
+        assert compute_calls["n"] == 0
+
+    def test_waiter_should_compute_when_holder_left_no_result(self):
+        token = acquire_lease("fetch:AAPL")
+        release_lease("fetch:AAPL", token)
+
+        value = host_single_flight("fetch:AAPL", lambda: "computed", lambda: None)
+
+        assert value == "computed"
+        assert not is_lease_held("fetch:AAPL")
+
+
+class TestHostTask:
+    def test_task_should_be_claimed_once_until_done_marker_expires(self):
+        lease = claim_host_task("prewarm-test", lease_ttl=60)
+
+        assert lease is not None
+        assert claim_host_task("prewarm-test", lease_ttl=60) is None
+
+        complete_host_task("prewarm-test", lease, done_ttl=60)
+
+        assert not is_lease_held("prewarm-test")
+        assert claim_host_task("prewarm-test", lease_ttl=60) is None
+
+    def test_claim_should_release_lease_when_task_completes_during_claim(self):
+        real_acquire = shared_cache.acquire_lease
+
+        def acquire_after_other_worker_finishes(name, ttl):
+            # 另一 worker 於完成標記檢查與取得租約之間完成任務並釋放租約
+            other = real_acquire(name, ttl)
+            complete_host_task(name, other, done_ttl=60)
+            return real_acquire(name, ttl)
+
+        with patch.object(
+            shared_cache,
+            "acquire_lease",
+            side_effect=acquire_after_other_worker_finishes,
+        ):
+            lease = claim_host_task("prewarm-race-test", lease_ttl=60)
+
+        assert lease is None
+        assert not is_lease_held("prewarm-race-test")
@@ -0,0 +1,288 @@
+"""Tests for SignalTransition repository functions (record / seed / lookups) and ScanLog retention."""
+
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlmodel import Session, select
+
+from domain.entities import ScanLog, SignalTransition, Stock
+from domain.enums import StockCategory
+from infrastructure.repositories import (
+    count_consecutive_scans,
+    delete_scan_logs_before,
+    find_previous_distinct_signal,
+    find_recent_transitions_for_tickers,
+    find_transitions_for_backtest,
+    record_signal_transitions,
+    save_stock,
+    seed_signal_transitions,
+)
+
+_T0 = datetime(2026, 1, 5, 9, 0)
+
+
+@pytest.fixture
+def test_session() -> Iterator[Session]:
+    from tests.conftest import test_engine
+
+    with Session(test_engine) as session:
+        yield session
+
+
+@pytest.fixture(autouse=True)
+def seed_stock(test_session: Session):
+    """Ensure Stock rows exist for FK constraints before each test."""
+    for ticker in ("AAPL", "MSFT"):
+        if test_session.get(Stock, ticker) is None:
+            save_stock(test_session, Stock(ticker=ticker, category=StockCategory.MOAT))
+
+
+def _log(ticker: str, signal: str, hours: int) -> ScanLog:
+    return ScanLog(
+        stock_ticker=ticker,
+        signal=signal,
+        market_status="POSITIVE",
+        scanned_at=_T0 + timedelta(hours=hours),
+    )
+
+
+def _record(session: Session, *logs: ScanLog) -> int:
+    session.add_all(logs)
+    created = record_signal_transitions(session, list(logs))
+    session.commit()
+    return created
+
+
+def _transitions(session: Session, ticker: str) -> list[SignalTransition]:
+    return list(
+        session.exec(
+            select(SignalTransition)
+            .where(SignalTransition.stock_ticker == ticker)
+            .order_by(SignalTransition.started_at)  # type: ignore[arg-type]
+        ).all()
+    )
+
+
+# ===========================================================================
+# record_signal_transitions
+# ===========================================================================
+
+
+class TestRecordSignalTransitions:
+    def test_same_signal_extends_latest_transition(self, test_session: Session):
+        assert _record(test_session, _log("AAPL", "NORMAL", 0)) == 1
+        assert _record(test_session, _log("AAPL", "NORMAL", 1)) == 0
+        assert _record(test_session, _log("AAPL", "NORMAL", 2)) == 0
+
+        rows = _transitions(test_session, "AAPL")
+        assert len(rows) == 1
+        assert rows[0].scan_count == 3
+        assert rows[0].started_at == _T0
+        assert rows[0].ended_at == _T0 + timedelta(hours=2)
+
+    def test_signal_change_opens_new_transition(self, test_session: Session):
+        _record(test_session, _log("AAPL", "NORMAL", 0), _log("AAPL", "NORMAL", 1))
+        assert _record(test_session, _log("AAPL", "OVERSOLD", 2)) == 1
+        _record(test_session, _log("AAPL", "NORMAL", 3))
+
+        rows = _transitions(test_session, "AAPL")
+        assert [(r.signal, r.scan_count) for r in rows] == [
+            ("NORMAL", 2),
+            ("OVERSOLD", 1),
+            ("NORMAL", 1),
+        ]
+
+    def test_batch_folds_per_ticker_regardless_of_input_order(
+        self, test_session: Session
+    ):
+        created = _record(
+            test_session,
+            _log("MSFT", "OVERSOLD", 1),
+            _log("AAPL", "NORMAL", 1),
+            _log("MSFT", "OVERSOLD", 0),
+            _log("AAPL", "NORMAL", 0),
+        )
+
+        assert created == 2
+        assert [r.scan_count for r in _transitions(test_session, "AAPL")] == [2]
+        assert [r.scan_count for r in _transitions(test_session, "MSFT")] == [2]
+
+    def test_log_older_than_latest_is_stored_as_separate_run(
+        self, test_session: Session
+    ):
+        _record(test_session, _log("AAPL", "NORMAL", 10))
+        _record(test_session, _log("AAPL", "NORMAL", 0))
+
+        rows = _transitions(test_session, "AAPL")
+        assert [(r.started_at, r.scan_count) for r in rows] == [
+            (_T0, 1),
+            (_T0 + timedelta(hours=10), 1),
+        ]
+        # 新掃描仍延長最新區段
+        _record(test_session, _log("AAPL", "NORMAL", 11))
+        assert _transitions(test_session, "AAPL")[-1].scan_count == 2
+
+    def test_backfill_after_live_scan_merges_consecutive_history(
+        self, test_session: Session
+    ):
+        _record(test_session, _log("AAPL", "NORMAL", 100))
+
+        backfill = [_log("AAPL", "NORMAL", i) for i in range(10)]
+        backfill += [_log("AAPL", "OVERSOLD", 10), _log("AAPL", "OVERSOLD", 11)]
+        created = _record(test_session, *backfill)
+
+        assert created == 2
+        rows = _transitions(test_session, "AAPL")
+        assert [(r.signal, r.scan_count) for r in rows] == [
+            ("NORMAL", 10),
+            ("OVERSOLD", 2),
+            ("NORMAL", 1),
+        ]
+        assert rows[0].ended_at == _T0 + timedelta(hours=9)
+        # 最新區段不受回填影響，之後的即時掃描仍延長它
+        _record(test_session, _log("AAPL", "NORMAL", 101))
+        assert _transitions(test_session, "AAPL")[-1].scan_count == 2
+
+    def test_timezone_aware_scanned_at_is_normalized(self, test_session: Session):
+        log = _log("AAPL", "NORMAL", 0)
+        log.scanned_at = _T0.replace(tzinfo=UTC)
+        _record(test_session, log)
+        _record(test_session, _log("AAPL", "NORMAL", 1))
+
+        rows = _transitions(test_session, "AAPL")
+        assert len(rows) == 1
+        assert rows[0].scan_count == 2
+
+    def test_empty_logs_is_noop(self, test_session: Session):
+        assert record_signal_transitions(test_session, []) == 0
+
+
+# ===========================================================================
+# Lookups built on transitions
+# ===========================================================================
+
+
+class TestTransitionLookups:
+    def test_consecutive_scans_and_previous_signal(self, test_session: Session):
+        _record(
+            test_session,
+            _log("AAPL", "NORMAL", 0),
+            _log("AAPL", "NORMAL", 1),
+            _log("AAPL", "OVERSOLD", 2),
+            _log("AAPL", "OVERSOLD", 3),
+            _log("AAPL", "OVERSOLD", 4),
+        )
+
+        assert count_consecutive_scans(test_session, "AAPL", "OVERSOLD") == 3
+        previous, changed_at = find_previous_distinct_signal(
+            test_session, "AAPL", "OVERSOLD"
+        )
+        assert previous == "NORMAL"
+        assert changed_at == _T0 + timedelta(hours=1)
+
+    def test_previous_signal_none_without_history(self, test_session: Session):
+        _record(test_session, _log("AAPL", "NORMAL", 0))
+        assert find_previous_distinct_signal(test_session, "AAPL", "NORMAL") == (
+            None,
+            None,
+        )
+
+    def test_recent_transitions_grouped_newest_first(self, test_session: Session):
+        _record(
+            test_session,
+            _log("AAPL", "NORMAL", 0),
+            _log("AAPL", "OVERSOLD", 1),
+            _log("MSFT", "CAUTION_HIGH", 0),
+        )
+
+        grouped = find_recent_transitions_for_tickers(test_session, ["AAPL", "MSFT"])
+        assert [t.signal for t in grouped["AAPL"]] == ["OVERSOLD", "NORMAL"]
+        assert [t.signal for t in grouped["MSFT"]] == ["CAUTION_HIGH"]
+        assert find_recent_transitions_for_tickers(test_session, []) == {}
+
+    def test_recent_transitions_limited_per_ticker(self, test_session: Session):
+        _record(
+            test_session,
+            *[_log("AAPL", "OVERSOLD" if i % 2 else "NORMAL", i) for i in range(6)],
+            _log("MSFT", "NORMAL", 0),
+        )
+
+        grouped = find_recent_transitions_for_tickers(
+            test_session, ["AAPL", "MSFT"], limit_per_ticker=2
+        )
+        assert [t.started_at for t in grouped["AAPL"]] == [
+            _T0 + timedelta(hours=5),
+            _T0 + timedelta(hours=4),
+        ]
+        assert len(grouped["MSFT"]) == 1
+
+    def test_backtest_transitions_exclude_normal_and_finished_runs(
+        self, test_session: Session
+    ):
+        _record(
+            test_session,
+            _log("AAPL", "OVERSOLD", 0),
+            _log("AAPL", "NORMAL", 5),
+            _log("AAPL", "OVERSOLD", 10),
+            _log("AAPL", "OVERSOLD", 12),
+        )
+
+        rows = find_transitions_for_backtest(test_session, _T0 + timedelta(hours=6))
+        assert [(r.signal, r.started_at) for r in rows] == [
+            ("OVERSOLD", _T0 + timedelta(hours=10))
+        ]
+
+
+# ===========================================================================
+# seed_signal_transitions / delete_scan_logs_before
+# ===========================================================================
+
+
+class TestSeedAndRetention:
+    def test_seed_rebuilds_transitions_from_raw_logs(self, test_session: Session):
+        test_session.add_all(
+            [
+                _log("AAPL", "NORMAL", 0),
+                _log("AAPL", "NORMAL", 1),
+                _log("AAPL", "OVERSOLD", 2),
+                _log("MSFT", "NORMAL", 0),
+            ]
+        )
+        test_session.commit()
+
+        assert seed_signal_transitions(test_session) == 3
+        test_session.commit()
+        assert [
+            (r.signal, r.scan_count) for r in _transitions(test_session, "AAPL")
+        ] == [
+            ("NORMAL", 2),
+            ("OVERSOLD", 1),
+        ]
+        # 已有區段者不再重建
+        assert seed_signal_transitions(test_session) == 0
+
+    def test_seed_can_be_limited_to_tickers(self, test_session: Session):
+        test_session.add_all([_log("AAPL", "NORMAL", 0), _log("MSFT", "NORMAL", 0)])
+        test_session.commit()
+
+        assert seed_signal_transitions(test_session, ["MSFT"]) == 1
+        test_session.commit()
+        assert _transitions(test_session, "AAPL") == []
+
+    def test_delete_scan_logs_before_keeps_transitions(self, test_session: Session):
+        _record(
+            test_session,
+            _log("AAPL", "NORMAL", 0),
+            _log("AAPL", "OVERSOLD", 48),
+        )
+
+        deleted = delete_scan_logs_before(test_session, _T0 + timedelta(hours=24))
+        test_session.commit()
+
+        assert deleted == 1
+        remaining = test_session.exec(
+            select(ScanLog).where(ScanLog.stock_ticker == "AAPL")
+        ).all()
+        assert len(remaining) == 1
+        assert len(_transitions(test_session, "AAPL")) == 2
@@ -30,6 +30,7 @@ echo "$(date) Running startup snapshot..."
 #   30 */6 * * *       FX watch timing alert every 6 hours (offset 30min to avoid concurrent yfinance calls)
 #   0 2 * * *          13F sync daily 02:00 UTC (sync-13f.sh handles filing-season logic)
 #   0 23 * * *         daily portfolio snapshot 23:00 UTC (after markets close)
+#   30 3 * * *         ScanLog compaction daily 03:30 UTC (drop raw scan logs beyond retention window)
 (
   echo "*/15 * * * * /usr/local/bin/smart-scan.sh >> /proc/1/fd/1 2>&1"
   echo "15 21 * * 1-5 /usr/local/bin/folio-curl.sh -X POST http://backend:8000/scan > /dev/null 2>&1"
@@ -38,6 +39,7 @@ echo "$(date) Running startup snapshot..."
   echo "30 */6 * * * /usr/local/bin/folio-curl.sh -X POST http://backend:8000/fx-watch/alert > /dev/null 2>&1"
   echo "0 2 * * * /usr/local/bin/sync-13f.sh >> /proc/1/fd/1 2>&1"
   echo "0 23 * * * /usr/local/bin/take-snapshot.sh >> /proc/1/fd/1 2>&1"
+  echo "30 3 * * * /usr/local/bin/folio-curl.sh -X POST http://backend:8000/scan/compact-logs > /dev/null 2>&1"
 ) | crontab -
 
 crond -f -l 2